@@ -0,0 +1,142 @@
+"""Benchmark offset vs keyset pagination over synthetic catalog listings.
+
+Fills a temporary SQLite database with N marketplace catalog entries, then
+times fetching one page at increasing depths for every catalog sort, once
+with ``OFFSET`` and once continuing from a keyset cursor, plus an exact
+``COUNT`` against ``cached_count``. Keyset pages should cost the same at any
+depth while offset pages grow linearly.
+
+Usage:
+    python -m benchmarks.browse_pagination --listings 100000 --page-size 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.config.database import Base
+from src.core import pagination
+from src.core.pagination import cached_count, count_key
+from src.domains.marketplace.catalog import SORT_ORDERS
+from src.domains.marketplace.models import (
+    MarketplaceCatalogEntry,
+    TemplateCategory,
+    TemplateDifficulty,
+    TemplateType,
+)
+
+DEPTHS = (0, 100, 1_000, 10_000, 50_000)
+BATCH_SIZE = 5_000
+
+
+def _entries(count: int):
+    rng = random.Random(42)
+    categories = list(TemplateCategory)
+    difficulties = list(TemplateDifficulty)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        yield {
+            "template_id": uuid.uuid4(),
+            "template_type": TemplateType.WORKOUT,
+            "title": f"Plano {rng.randrange(count):06d}",
+            "price_cents": rng.choice((0, 4990, 9990, 19990, 29990)),
+            "currency": "BRL",
+            "category": rng.choice(categories),
+            "difficulty": rng.choice(difficulties),
+            "purchase_count": rng.randrange(500),
+            "rating_average": Decimal(rng.randrange(100, 500)) / 100 if rng.random() < 0.7 else None,
+            "rating_count": rng.randrange(100),
+            "is_featured": rng.random() < 0.05,
+            "creator_id": uuid.uuid4(),
+            "creator_name": f"Personal {i % 1000}",
+            "listed_at": start + timedelta(minutes=rng.randrange(60 * 24 * 700)),
+        }
+
+
+async def _seed(engine, count: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[MarketplaceCatalogEntry.__table__])
+        batch = []
+        for entry in _entries(count):
+            batch.append(entry)
+            if len(batch) == BATCH_SIZE:
+                await conn.execute(insert(MarketplaceCatalogEntry), batch)
+                batch = []
+        if batch:
+            await conn.execute(insert(MarketplaceCatalogEntry), batch)
+
+
+async def _timed(coro) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = await coro
+    return (time.perf_counter() - started) * 1000, result
+
+
+async def run(listings: int, page_size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        started = time.perf_counter()
+        await _seed(engine, listings)
+        print(f"seeded {listings} listings in {time.perf_counter() - started:.1f}s\n")
+
+        depths = [d for d in DEPTHS if d < listings]
+        print(f"{'sort':<26}" + "".join(f"{'@' + str(d):>18}" for d in depths))
+        async with session_factory() as db:
+            for (sort_by, desc), order in SORT_ORDERS.items():
+                cells = []
+                for depth in depths:
+                    query, key_count = order.paginate(select(MarketplaceCatalogEntry))
+                    offset_ms, _ = await _timed(db.execute(query.limit(page_size).offset(depth)))
+
+                    # Cursor of the row just before this depth, as a client would hold it
+                    cursor = None
+                    if depth:
+                        prev = (await db.execute(query.limit(1).offset(depth - 1))).all()
+                        cursor = order.encode(tuple(prev[0])[-key_count:])
+                    query, _ = order.paginate(select(MarketplaceCatalogEntry), cursor)
+                    keyset_ms, _ = await _timed(db.execute(query.limit(page_size)))
+                    cells.append(f"{offset_ms:7.1f}/{keyset_ms:<7.1f}ms")
+                label = f"{sort_by} {'desc' if desc else 'asc'}"
+                print(f"{label:<26}" + "".join(f"{c:>18}" for c in cells))
+        print("(offset/keyset per page)\n")
+
+        count_query = select(func.count(MarketplaceCatalogEntry.template_id))
+        key = count_key("bench_catalog", {})
+        store: dict[str, str] = {}
+
+        async def cache_get(k):
+            return store.get(k)
+
+        async def cache_set(k, v, ttl=None):
+            store[k] = v
+
+        # In-process cache so the benchmark doesn't need Redis
+        with patch.object(pagination, "cache_get", cache_get), patch.object(pagination, "cache_set", cache_set):
+            async with session_factory() as db:
+                exact_ms, total = await _timed(cached_count(db, key, count_query))
+                cached_ms, _ = await _timed(cached_count(db, key, count_query))
+        print(f"count ({total} rows): exact {exact_ms:.1f}ms, cached {cached_ms:.2f}ms")
+
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--listings", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.listings, args.page_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+"""HTTP load test of the API against a seeded local database.
+
+Fills a temporary SQLite database (or an empty ``--database-url``) with
+``src.scripts.generate_dataset`` plus a shared live session per student;
+boots the app with uvicorn in a subprocess; then:
+
+1. drives a weighted mix of the endpoints the apps poll (student dashboard,
+   trainer roster, set logging, notification inbox, available slots, and
+   ``/health`` as an event loop probe) from ``--concurrency`` workers for
+   ``--duration`` seconds;
+2. opens a student and a trainer SSE stream on ``--sse-sessions`` shared
+   workout sessions and times how long a logged set takes to reach both.
+
+Queries per request are read from the ``Server-Timing`` header set by
+``src.core.query_stats``. Results are compared with ``http_load_baseline.json``:
+
+- each operation's p95 must stay under its budget (measured x headroom);
+- each operation's worst query count must not grow: an N+1 shows up here
+  whatever the machine;
+- a slow ``health`` p95 means something blocked the event loop.
+
+Refresh the baseline after an intended change with ``--update``; it only
+applies to the dataset size it was recorded with.
+
+Usage:
+    python -m benchmarks.http_load [--trainers 20 --students-per-trainer 50 --history-days 60]
+        [--concurrency 16 --duration 20 --sse-sessions 100] [--update]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import httpx
+
+BASELINE_PATH = Path(__file__).with_name("http_load_baseline.json")
+ROOT = Path(__file__).resolve().parent.parent
+API = "/api/v1"
+
+# Latency budget = measured p95 x headroom, when regenerated with --update
+HEADROOM = 2.0
+# Budgets are never set below this, to absorb scheduler noise on fast routes
+MIN_BUDGET_MS = 20.0
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+@dataclass
+class Student:
+    id: uuid.UUID
+    token: str
+    trainer_id: uuid.UUID
+    session_id: uuid.UUID
+    exercise_id: uuid.UUID
+    next_set: int = 1
+
+
+@dataclass
+class Dataset:
+    trainers: list[tuple[uuid.UUID, str]]
+    students: list[Student]
+
+
+@dataclass
+class Results:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    queries: dict[str, list[int]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+
+# --- Dataset ----------------------------------------------------------------
+
+
+async def seed(args: argparse.Namespace) -> Dataset:
+    """Generate the dataset, then open a shared live session per student."""
+    from sqlalchemy import insert, select
+
+    from src.config.database import AsyncSessionLocal
+    from src.core.security.jwt import create_access_token
+    from src.domains.organizations.models import OrganizationMembership, UserRole
+    from src.domains.workouts.models import SessionStatus, Workout, WorkoutExercise, WorkoutSession
+    from src.scripts.generate_dataset import DatasetConfig, prepare_schema, write_dataset
+
+    await prepare_schema()
+    await write_dataset(DatasetConfig(
+        seed=args.seed,
+        trainers=args.trainers,
+        students_per_trainer=args.students_per_trainer,
+        history_days=args.history_days,
+    ))
+
+    async with AsyncSessionLocal() as db:
+        trainer_ids = (await db.scalars(
+            select(OrganizationMembership.user_id).where(OrganizationMembership.role == UserRole.TRAINER)
+        )).all()
+        students = (await db.execute(
+            select(OrganizationMembership.user_id, OrganizationMembership.invited_by_id)
+            .where(OrganizationMembership.role == UserRole.STUDENT)
+        )).all()
+        workouts = dict((await db.execute(
+            select(Workout.created_by_id, Workout.id).where(Workout.created_by_id.in_(trainer_ids))
+        )).all())
+        exercises = dict((await db.execute(
+            select(WorkoutExercise.workout_id, WorkoutExercise.exercise_id)
+            .where(WorkoutExercise.workout_id.in_(workouts.values()))
+        )).all())
+
+        dataset = Dataset(
+            trainers=[(trainer_id, create_access_token(user_id=str(trainer_id))) for trainer_id in trainer_ids],
+            students=[],
+        )
+        now = datetime.now(timezone.utc)
+        live_sessions = []
+        for student_id, trainer_id in students:
+            workout_id = workouts[trainer_id]
+            student = Student(
+                student_id, create_access_token(user_id=str(student_id)), trainer_id, uuid.uuid4(),
+                exercises[workout_id],
+            )
+            dataset.students.append(student)
+            live_sessions.append({
+                "id": student.session_id, "workout_id": workout_id, "user_id": student_id,
+                "trainer_id": trainer_id, "is_shared": True, "status": SessionStatus.ACTIVE, "started_at": now,
+            })
+        await db.execute(insert(WorkoutSession), live_sessions)
+        await db.commit()
+    return dataset
+
+
+# --- Server -----------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_server(env: dict[str, str], port: int) -> subprocess.Popen:
+    """Boot the app with uvicorn and wait until it answers."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        for _ in range(300):
+            if server.poll() is not None:
+                raise RuntimeError("server exited during startup")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return server
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("server did not start")
+
+
+# --- Workload ---------------------------------------------------------------
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def operations(dataset: Dataset, rng: random.Random) -> list[tuple[str, int, Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]]]:
+    """(name, weight, request factory) of the mixed workload."""
+    today = date.today().isoformat()
+
+    def dashboard(client):
+        student = rng.choice(dataset.students)
+        return client.get(f"{API}/users/me/dashboard", headers=_auth(student.token))
+
+    def roster(client):
+        _, token = rng.choice(dataset.trainers)
+        return client.get(f"{API}/trainers/students", headers=_auth(token))
+
+    def log_set(client):
+        student = rng.choice(dataset.students)
+        student.next_set += 1
+        return client.post(
+            f"{API}/workouts/sessions/{student.session_id}/sets",
+            headers=_auth(student.token),
+            json={"exercise_id": str(student.exercise_id), "set_number": student.next_set, "reps_completed": 10},
+        )
+
+    def inbox(client):
+        student = rng.choice(dataset.students)
+        return client.get(f"{API}/notifications/notifications", headers=_auth(student.token))
+
+    def slots(client):
+        student = rng.choice(dataset.students)
+        return client.get(
+            f"{API}/schedule/available-slots",
+            headers=_auth(student.token),
+            params={"trainer_id": str(student.trainer_id), "date": today},
+        )
+
+    def health(client):
+        return client.get("/health")
+
+    return [
+        ("dashboard", 25, dashboard),
+        ("roster", 15, roster),
+        ("log_set", 25, log_set),
+        ("inbox", 20, inbox),
+        ("slots", 10, slots),
+        ("health", 5, health),
+    ]
+
+
+async def run_mix(client: httpx.AsyncClient, dataset: Dataset, concurrency: int, duration: float, rng: random.Random) -> Results:
+    """Run the weighted mix from ``concurrency`` workers for ``duration`` seconds."""
+    ops = operations(dataset, rng)
+    names = [name for name, _, _ in ops]
+    weights = [weight for _, weight, _ in ops]
+    factories = {name: factory for name, _, factory in ops}
+    results = Results()
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            response = await factories[name](client)
+            results.latencies[name].append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                results.errors[name] += 1
+            match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+            if match:
+                results.queries[name].append(int(match.group(1)))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+async def _read_events(client: httpx.AsyncClient, url: str, token: str, ready: asyncio.Event, inbox: asyncio.Queue):
+    async with client.stream("GET", url, headers=_auth(token)) as response:
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            event_type = json.loads(line[6:])["event_type"]
+            if event_type == "sync_request":
+                ready.set()
+            else:
+                await inbox.put((event_type, time.perf_counter()))
+
+
+async def run_fanout(client: httpx.AsyncClient, dataset: Dataset, sessions: int, concurrency: int, rng: random.Random) -> Results:
+    """Time set delivery to the student and trainer streams of shared sessions."""
+    results = Results()
+    readers = []
+    subscribed = []
+    for student in rng.sample(dataset.students, min(sessions, len(dataset.students))):
+        url = f"{API}/workouts/sessions/{student.session_id}/stream"
+        trainer_token = next(token for trainer_id, token in dataset.trainers if trainer_id == student.trainer_id)
+        streams = []
+        for token in (student.token, trainer_token):
+            ready, inbox = asyncio.Event(), asyncio.Queue()
+            readers.append(asyncio.create_task(_read_events(client, url, token, ready, inbox)))
+            streams.append((ready, inbox))
+        subscribed.append((student, streams))
+
+    started = time.perf_counter()
+    await asyncio.wait_for(
+        asyncio.gather(*(ready.wait() for _, streams in subscribed for ready, _ in streams)), timeout=60,
+    )
+    results.latencies["sse_connect"].append((time.perf_counter() - started) * 1000 / max(len(readers), 1))
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def deliver(student: Student, streams):
+        async with semaphore:
+            student.next_set += 1
+            sent = time.perf_counter()
+            response = await client.post(
+                f"{API}/workouts/sessions/{student.session_id}/sets",
+                headers=_auth(student.token),
+                json={"exercise_id": str(student.exercise_id), "set_number": student.next_set, "reps_completed": 8},
+            )
+            if response.status_code >= 400:
+                results.errors["sse_fanout"] += 1
+                return
+            for _, inbox in streams:
+                while True:
+                    event_type, received = await asyncio.wait_for(inbox.get(), timeout=10)
+                    if event_type == "set_completed":
+                        results.latencies["sse_fanout"].append((received - sent) * 1000)
+                        break
+
+    try:
+        await asyncio.gather(*(deliver(student, streams) for student, streams in subscribed))
+    finally:
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+    return results
+
+
+# --- Report -----------------------------------------------------------------
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def summarize(results: Results) -> dict[str, dict]:
+    """p50/p95/p99 latency and query counts per operation."""
+    summary = {}
+    for name, latencies in sorted(results.latencies.items()):
+        queries = results.queries.get(name, [])
+        summary[name] = {
+            "requests": len(latencies),
+            "errors": results.errors.get(name, 0),
+            "p50_ms": round(percentile(latencies, 0.50), 1),
+            "p95_ms": round(percentile(latencies, 0.95), 1),
+            "p99_ms": round(percentile(latencies, 0.99), 1),
+            "mean_queries": round(sum(queries) / len(queries), 1) if queries else None,
+            "max_queries": max(queries) if queries else None,
+        }
+    return summary
+
+
+def check(baseline: dict, dataset: dict, summary: dict[str, dict]) -> list[str]:
+    """Regressions against the baseline, one message each."""
+    if baseline.get("dataset") != dataset:
+        return [f"baseline was recorded for {baseline.get('dataset')}, not {dataset}; rerun with --update"]
+    problems = []
+    for name, budget in baseline["operations"].items():
+        measured = summary.get(name)
+        if measured is None:
+            problems.append(f"{name}: not measured")
+            continue
+        if measured["errors"]:
+            problems.append(f"{name}: {measured['errors']} failed requests")
+        if measured["p95_ms"] > budget["p95_ms"]:
+            problems.append(f"{name}: p95 {measured['p95_ms']}ms > {budget['p95_ms']}ms")
+        if budget.get("max_queries") is not None and (measured["max_queries"] or 0) > budget["max_queries"]:
+            problems.append(f"{name}: {measured['max_queries']} queries > {budget['max_queries']}")
+    return problems
+
+
+def updated(dataset: dict, summary: dict[str, dict]) -> dict:
+    """Baseline regenerated from ``summary``."""
+    return {
+        "dataset": dataset,
+        "operations": {
+            name: {
+                "p95_ms": round(max(measured["p95_ms"] * HEADROOM, MIN_BUDGET_MS)),
+                "max_queries": measured["max_queries"],
+            }
+            for name, measured in summary.items()
+        },
+    }
+
+
+async def run(args: argparse.Namespace, env: dict[str, str]) -> dict[str, dict]:
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    dataset = await seed(args)
+    print(f"seeded {len(dataset.trainers)} trainers, {len(dataset.students)} students "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    port = _free_port()
+    server = await start_server(env, port)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=args.concurrency),
+            timeout=httpx.Timeout(30.0),
+        ) as client:
+            mix = await run_mix(client, dataset, args.concurrency, args.duration, rng)
+            fanout = await run_fanout(client, dataset, args.sse_sessions, args.concurrency, rng)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    mix.latencies.update(fanout.latencies)
+    mix.errors.update(fanout.errors)
+    return summarize(mix)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trainers", type=int, default=20)
+    parser.add_argument("--students-per-trainer", type=float, default=50.0, help="mean roster size")
+    parser.add_argument("--history-days", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of mixed load")
+    parser.add_argument("--sse-sessions", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="empty database to use instead of a temporary SQLite file")
+    parser.add_argument("--update", action="store_true", help="rewrite the baseline from this run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{tmp}/bench.db"
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url,
+            "DEBUG": "false",
+            "RATE_LIMIT_ENABLED": "false",
+            # Every fan-out trainer watches many sessions at once
+            "SSE_MAX_STREAMS_PER_USER": str(args.sse_sessions * 2),
+        }
+        # Settings are read when src is first imported, by this process too
+        os.environ.update(env)
+        summary = asyncio.run(run(args, env))
+
+    print(f"{'operation':12} {'requests':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8}")
+    for name, m in summary.items():
+        print(f"{name:12} {m['requests']:8} {m['p50_ms']:7.1f}ms {m['p95_ms']:7.1f}ms {m['p99_ms']:7.1f}ms "
+              f"{m['mean_queries'] if m['mean_queries'] is not None else '-':>8}")
+
+    dataset = {
+        "seed": args.seed,
+        "trainers": args.trainers,
+        "students_per_trainer": args.students_per_trainer,
+        "history_days": args.history_days,
+    }
+    if args.update:
+        BASELINE_PATH.write_text(json.dumps(updated(dataset, summary), indent=2) + "\n")
+        print(f"updated {BASELINE_PATH.name}")
+        return
+
+    if not BASELINE_PATH.exists():
+        print(f"no {BASELINE_PATH.name} yet: record one with --update")
+        sys.exit(1)
+    problems = check(json.loads(BASELINE_PATH.read_text()), dataset, summary)
+    for problem in problems:
+        print(f"REGRESSION  {problem}")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
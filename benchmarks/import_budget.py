@@ -0,0 +1,123 @@
+"""Check cold-start import time against the checked-in budget.
+
+Imports each entry point in a fresh interpreter with ``python -X importtime``
+and compares the result with ``import_budget.json``:
+
+- ``forbidden`` modules (heavy SDKs behind ``src.core.sdk`` and friends) must
+  not be imported at all by any entry point;
+- each entry point's total import time must stay under ``total_ms``;
+- each module listed under ``modules`` must stay under its cumulative budget.
+
+Timings are the best of ``--runs`` cold imports. Budgets carry headroom for
+machine noise; refresh them after an intended change with ``--update``.
+
+Usage:
+    python -m benchmarks.import_budget [--runs 3] [--update]
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_PATH = Path(__file__).with_name("import_budget.json")
+ROOT = Path(__file__).resolve().parent.parent
+
+# Budget = measured time x headroom, when regenerated with --update
+HEADROOM = 1.5
+# Modules slower than this get a budget of their own with --update
+TRACKED_MODULE_MS = 50.0
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def measure(modules: list[str]) -> dict[str, float]:
+    """Cumulative import time in ms of every module loaded by importing ``modules``."""
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: dict[str, float] = {}
+    total = 0.0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        timings[name] = int(cumulative_us) / 1000
+        total += int(self_us) / 1000
+    timings["<total>"] = total
+    return timings
+
+
+def best_of(modules: list[str], runs: int) -> dict[str, float]:
+    """Fastest timing of each module over ``runs`` cold imports."""
+    best: dict[str, float] = {}
+    for _ in range(runs):
+        for name, ms in measure(modules).items():
+            best[name] = min(ms, best.get(name, ms))
+    return best
+
+
+def check(budget: dict, measurements: dict[str, dict[str, float]]) -> list[str]:
+    """Budget violations, one message each."""
+    problems = []
+    for entrypoint, timings in measurements.items():
+        for module in budget["forbidden"]:
+            if module in timings:
+                problems.append(f"{entrypoint}: imports {module} at startup")
+        limit = budget["entrypoints"][entrypoint]["total_ms"]
+        if timings["<total>"] > limit:
+            problems.append(f"{entrypoint}: total {timings['<total>']:.0f}ms > {limit}ms")
+        for module, limit in budget["modules"].get(entrypoint, {}).items():
+            if timings.get(module, 0.0) > limit:
+                problems.append(f"{entrypoint}: {module} {timings[module]:.0f}ms > {limit}ms")
+    return problems
+
+
+def updated(budget: dict, measurements: dict[str, dict[str, float]]) -> dict:
+    """Budget regenerated from ``measurements``, keeping entry points and forbidden modules."""
+    modules = {}
+    for entrypoint, timings in measurements.items():
+        budget["entrypoints"][entrypoint]["total_ms"] = round(timings["<total>"] * HEADROOM)
+        modules[entrypoint] = {
+            module: round(ms * HEADROOM)
+            for module, ms in sorted(timings.items())
+            if module.startswith("src.") and ms >= TRACKED_MODULE_MS
+        }
+    return {**budget, "modules": modules}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--update", action="store_true", help="rewrite the budget from this run")
+    args = parser.parse_args()
+
+    budget = json.loads(BUDGET_PATH.read_text())
+    measurements = {
+        name: best_of(entrypoint["imports"], args.runs)
+        for name, entrypoint in budget["entrypoints"].items()
+    }
+    for name, timings in measurements.items():
+        print(f"{name:8} {timings['<total>']:8.0f}ms (budget {budget['entrypoints'][name]['total_ms']}ms)")
+
+    if args.update:
+        BUDGET_PATH.write_text(json.dumps(updated(budget, measurements), indent=2) + "\n")
+        print(f"updated {BUDGET_PATH.name}")
+        return
+
+    problems = check(budget, measurements)
+    for problem in problems:
+        print(f"OVER BUDGET  {problem}")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
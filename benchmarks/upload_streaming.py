@@ -0,0 +1,125 @@
+"""Benchmark concurrent large uploads through the streaming storage pipeline.
+
+Runs N concurrent exercise-video uploads through ``StorageService`` against a
+local S3 stand-in that writes parts to a temporary directory, and reports
+throughput plus the peak Python heap measured with ``tracemalloc``. Peak
+memory should stay near ``concurrency * S3_PART_SIZE`` regardless of file
+size.
+
+Usage:
+    python -m benchmarks.upload_streaming --concurrency 8 --size-mb 48
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from botocore.exceptions import ClientError
+
+from src.core.storage import S3_PART_SIZE, UPLOAD_CHUNK_SIZE, StorageService
+
+MP4_HEADER = b"\x00\x00\x00\x18ftypmp42"
+
+
+class SyntheticVideo:
+    """Async reader generating a unique MP4-looking stream of ``size`` bytes."""
+
+    def __init__(self, size: int):
+        self.remaining = size
+        self.header = MP4_HEADER
+
+    async def read(self, size: int = -1) -> bytes:
+        size = min(size, self.remaining)
+        if size <= 0:
+            return b""
+        chunk = (self.header + os.urandom(size))[:size]
+        self.header = b""
+        self.remaining -= size
+        # Yield like a real socket-backed UploadFile would
+        await asyncio.sleep(0)
+        return chunk
+
+
+class DiskS3:
+    """S3 stand-in backed by a directory, so stored data never sits in RAM."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._uploads = 0
+
+    def _path(self, key: str) -> Path:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    async def head_object(self, Bucket, Key):
+        if not (self.root / Key).exists():
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {}
+
+    async def put_object(self, Bucket, Key, Body, **kwargs):
+        self._path(Key).write_bytes(Body)
+
+    async def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self._uploads += 1
+        return {"UploadId": f"upload-{self._uploads}"}
+
+    async def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self._path(f".parts/{UploadId}/{PartNumber:05d}").write_bytes(Body)
+        return {"ETag": str(PartNumber)}
+
+    async def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts_dir = self.root / ".parts" / UploadId
+        with open(self._path(Key), "wb") as out:
+            for part in MultipartUpload["Parts"]:
+                with open(parts_dir / f"{part['PartNumber']:05d}", "rb") as f:
+                    shutil.copyfileobj(f, out)
+        shutil.rmtree(parts_dir)
+
+    async def abort_multipart_upload(self, Bucket, Key, UploadId):
+        shutil.rmtree(self.root / ".parts" / UploadId, ignore_errors=True)
+
+    async def copy_object(self, Bucket, Key, CopySource, **kwargs):
+        shutil.copyfile(self.root / CopySource["Key"], self._path(Key))
+
+    async def delete_object(self, Bucket, Key):
+        (self.root / Key).unlink(missing_ok=True)
+
+
+async def run(concurrency: int, size_mb: int) -> None:
+    size = size_mb * 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        service = StorageService(s3_client=DiskS3(Path(tmp)))
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            service.upload_exercise_media(SyntheticVideo(size), "video/mp4", user_id=f"bench-{i}")
+            for i in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    total_mb = concurrency * size_mb
+    bound_mb = concurrency * (S3_PART_SIZE + UPLOAD_CHUNK_SIZE) / (1024 * 1024)
+    print(f"uploads:        {concurrency} x {size_mb}MB")
+    print(f"elapsed:        {elapsed:.2f}s ({total_mb / elapsed:.1f} MB/s)")
+    print(f"peak heap:      {peak / (1024 * 1024):.1f}MB")
+    print(f"expected bound: {bound_mb:.1f}MB (concurrency x (part + chunk))")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--size-mb", type=int, default=48)
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency, args.size_mb))
+
+
+if __name__ == "__main__":
+    main()
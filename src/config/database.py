@@ -1,11 +1,14 @@
 import structlog
+import time
 from contextvars import ContextVar
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.config.settings import settings
+from src.core.metrics import Gauge, Histogram
 
 logger = structlog.get_logger(__name__)
 
@@ -26,6 +29,24 @@ def _get_async_database_url(url: str) -> str:
     return url
 
 
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time waited for a connection from the pool (includes opening new ones).",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long each checkout waited."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started)
+
+
 # Get async-compatible database URL
 _database_url = _get_async_database_url(settings.DATABASE_URL)
 
@@ -46,9 +67,30 @@ else:
         pool_timeout=settings.DB_POOL_TIMEOUT,
         pool_recycle=settings.DB_POOL_RECYCLE,
         pool_pre_ping=True,
+        poolclass=InstrumentedQueuePool,
         echo=settings.DEBUG,
     )
 
+
+def _collect_pool() -> dict[tuple[str, ...], float]:
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {}
+    return {
+        ("size",): pool.size(),
+        ("checked_out",): pool.checkedout(),
+        ("checked_in",): pool.checkedin(),
+        ("overflow",): max(pool.overflow(), 0),
+    }
+
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Connections of the database pool by state (size is the configured pool size).",
+    labels=("state",),
+    collect=_collect_pool,
+)
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -75,154 +117,148 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def init_db() -> None:
-    """Initialize database tables.
+    """Bring the database schema up to date.
 
-    This imports all models to ensure they are registered with SQLAlchemy's
-    metadata before creating the tables.
+    Schema setup steps are recorded in a migration ledger (see
+    ``src.migrations.ledger``), so a worker booting against an up-to-date
+    database only reads the ledger; pending steps are applied once, by
+    whichever worker takes the migration lock first. A failed step is
+    re-raised, which stops a production startup.
     """
-    # Import all models to register them with Base.metadata
-    from src.domains import models  # noqa: F401
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    # Add missing enum values for PostgreSQL (enums don't auto-update with create_all)
-    if not _is_sqlite:
-        await _sync_enum_values()
+    from src.migrations.ledger import run_migrations
+
+    await run_migrations(engine)
+
+
+# Missing enum values for PostgreSQL (enums don't auto-update with create_all)
+ENUM_VALUES = [
+    ("exercise_mode_enum", ["strength", "duration", "interval", "distance", "stretching"]),
+    ("checkin_status_enum", ["pending", "pending_acceptance", "confirmed", "rejected"]),
+    ("subscription_status_enum", ["pending", "active", "cancelled", "expired", "trial"]),
+]
+
+# Columns added to existing tables, which create_all() doesn't alter:
+# (column_name, table_name, column_definition, default_value)
+COLUMN_MIGRATIONS = [
+    # Users table
+    # NOTE: user_type was removed - we now use organization_members.role
+    ("auth_provider", "users", "VARCHAR(20)", "'email'"),
+    ("google_id", "users", "VARCHAR(255)", None),
+    ("apple_id", "users", "VARCHAR(255)", None),
+    ("cref", "users", "VARCHAR(20)", None),
+    ("cref_verified", "users", "BOOLEAN", "FALSE"),
+    ("cref_verified_at", "users", "TIMESTAMP", None),
+    ("is_verified", "users", "BOOLEAN", "FALSE"),
+    # Plan assignments table
+    ("training_mode", "plan_assignments", "VARCHAR(20)", "'presencial'"),
+    ("acknowledged_at", "plan_assignments", "TIMESTAMP", None),
+    ("plan_snapshot", "plan_assignments", "JSONB", None),
+    ("version", "plan_assignments", "INTEGER", "1"),
+    ("last_version_viewed", "plan_assignments", "INTEGER", None),
+    ("status", "plan_assignments", "VARCHAR(20)", "'accepted'"),
+    ("accepted_at", "plan_assignments", "TIMESTAMP", None),
+    ("declined_reason", "plan_assignments", "TEXT", None),
+    # Organization invites table
+    ("short_code", "organization_invites", "VARCHAR(10)", None),
+    # User settings table
+    ("dnd_enabled", "user_settings", "BOOLEAN", "FALSE"),
+    ("dnd_start_time", "user_settings", "VARCHAR(5)", None),
+    ("dnd_end_time", "user_settings", "VARCHAR(5)", None),
+    # Training plans table
+    ("status", "training_plans", "VARCHAR(20)", "'published'"),
+    # Extended student onboarding fields
+    ("preferred_duration", "users", "VARCHAR(10)", None),
+    ("training_location", "users", "VARCHAR(500)", None),
+    ("preferred_activities", "users", "VARCHAR(500)", None),
+    ("can_do_impact", "users", "BOOLEAN", None),
+    # Training session fields on trainer_locations
+    ("session_active", "trainer_locations", "BOOLEAN", "FALSE"),
+    ("session_started_at", "trainer_locations", "TIMESTAMP", None),
+    # Check-in expiration and acceptance
+    ("expires_at", "check_ins", "TIMESTAMP", None),
+    ("initiated_by", "check_ins", "UUID", None),
+    ("accepted_at", "check_ins", "TIMESTAMP", None),
+    ("training_mode", "check_ins", "VARCHAR(20)", None),
+    # Workout session pause tracking
+    ("paused_at", "workout_sessions", "TIMESTAMP WITH TIME ZONE", None),
+    # Subscribable calendar feed
+    ("calendar_feed_token", "trainer_settings", "VARCHAR(64)", None),
+    # Client op ids of sets logged through batch sync
+    ("client_op_id", "workout_session_sets", "VARCHAR(64)", None),
+    # Group session fields
+    ("is_group", "appointments", "BOOLEAN", "FALSE"),
+    ("max_participants", "appointments", "INTEGER", None),
+]
+
+# Schema fixes: correct column types (PostgreSQL only)
+SCHEMA_FIXES = [
+    # Fix dnd_start_time/dnd_end_time from TIME to VARCHAR(5)
+    ("ALTER TABLE user_settings ALTER COLUMN dnd_start_time TYPE VARCHAR(5) USING dnd_start_time::VARCHAR(5)", "user_settings.dnd_start_time TIME->VARCHAR(5)"),
+    ("ALTER TABLE user_settings ALTER COLUMN dnd_end_time TYPE VARCHAR(5) USING dnd_end_time::VARCHAR(5)", "user_settings.dnd_end_time TIME->VARCHAR(5)"),
+]
+
+# Data fixes: correct invalid enum values
+DATA_FIXES = [
+    # Fix 'active' -> 'published' for training_plans.status
+    ("UPDATE training_plans SET status = 'published' WHERE status = 'active'", "training_plans.status active->published"),
+]
+
+
+async def _run_pending_migrations(conn: AsyncConnection) -> None:
+    """Add missing columns to existing tables and apply schema/data fixes.
+
+    SQLAlchemy's create_all() doesn't add columns to existing tables, so
+    they are added here. Existing columns are read once per table and each
+    statement runs in a savepoint, so one failure doesn't abort the rest.
+    """
+    from sqlalchemy import inspect, text
 
-    # Run pending migrations (for columns added to existing tables)
-    await _run_pending_migrations()
+    tables = sorted({table_name for _, table_name, _, _ in COLUMN_MIGRATIONS})
 
+    def existing_columns(sync_conn) -> dict[str, set[str]]:
+        inspector = inspect(sync_conn)
+        return {
+            table: {column["name"] for column in inspector.get_columns(table)}
+            for table in tables
+            if inspector.has_table(table)
+        }
 
-async def _run_pending_migrations() -> None:
-    """Run any pending migrations for existing tables.
+    existing = await conn.run_sync(existing_columns)
 
-    SQLAlchemy's create_all() doesn't add columns to existing tables,
-    so we need to run migrations manually. Each migration runs with
-    a fresh connection to avoid transaction state issues.
-    """
-    from sqlalchemy import text
-    from sqlalchemy.ext.asyncio import create_async_engine
-
-    migrations = [
-        # (column_name, table_name, column_definition, default_value)
-        # Users table
-        # NOTE: user_type was removed - we now use organization_members.role
-        ("auth_provider", "users", "VARCHAR(20)", "'email'"),
-        ("google_id", "users", "VARCHAR(255)", None),
-        ("apple_id", "users", "VARCHAR(255)", None),
-        ("cref", "users", "VARCHAR(20)", None),
-        ("cref_verified", "users", "BOOLEAN", "FALSE"),
-        ("cref_verified_at", "users", "TIMESTAMP", None),
-        ("is_verified", "users", "BOOLEAN", "FALSE"),
-        # Plan assignments table
-        ("training_mode", "plan_assignments", "VARCHAR(20)", "'presencial'"),
-        ("acknowledged_at", "plan_assignments", "TIMESTAMP", None),
-        ("plan_snapshot", "plan_assignments", "JSONB", None),
-        ("version", "plan_assignments", "INTEGER", "1"),
-        ("last_version_viewed", "plan_assignments", "INTEGER", None),
-        ("status", "plan_assignments", "VARCHAR(20)", "'accepted'"),
-        ("accepted_at", "plan_assignments", "TIMESTAMP", None),
-        ("declined_reason", "plan_assignments", "TEXT", None),
-        # Organization invites table
-        ("short_code", "organization_invites", "VARCHAR(10)", None),
-        # User settings table
-        ("dnd_enabled", "user_settings", "BOOLEAN", "FALSE"),
-        ("dnd_start_time", "user_settings", "VARCHAR(5)", None),
-        ("dnd_end_time", "user_settings", "VARCHAR(5)", None),
-        # Training plans table
-        ("status", "training_plans", "VARCHAR(20)", "'published'"),
-        # Extended student onboarding fields
-        ("preferred_duration", "users", "VARCHAR(10)", None),
-        ("training_location", "users", "VARCHAR(500)", None),
-        ("preferred_activities", "users", "VARCHAR(500)", None),
-        ("can_do_impact", "users", "BOOLEAN", None),
-        # Training session fields on trainer_locations
-        ("session_active", "trainer_locations", "BOOLEAN", "FALSE"),
-        ("session_started_at", "trainer_locations", "TIMESTAMP", None),
-        # Check-in expiration and acceptance
-        ("expires_at", "check_ins", "TIMESTAMP", None),
-        ("initiated_by", "check_ins", "UUID", None),
-        ("accepted_at", "check_ins", "TIMESTAMP", None),
-        ("training_mode", "check_ins", "VARCHAR(20)", None),
-        # Workout session pause tracking
-        ("paused_at", "workout_sessions", "TIMESTAMP WITH TIME ZONE", None),
-        # Group session fields
-        ("is_group", "appointments", "BOOLEAN", "FALSE"),
-        ("max_participants", "appointments", "INTEGER", None),
-    ]
-
-    # Create a separate engine for migrations to avoid connection state issues
-    migration_engine = create_async_engine(_database_url, pool_pre_ping=True)
-
-    try:
-        for column_name, table_name, column_type, default_value in migrations:
-            try:
-                async with migration_engine.connect() as conn:
-                    # Check if column exists
-                    result = await conn.execute(
-                        text("""
-                            SELECT column_name FROM information_schema.columns
-                            WHERE table_name = :table_name AND column_name = :column_name
-                        """),
-                        {"table_name": table_name, "column_name": column_name},
-                    )
-                    row = result.fetchone()
-                    await conn.commit()
-
-                    if row is None:
-                        # Column doesn't exist, add it in a new transaction
-                        async with migration_engine.connect() as conn2:
-                            default_clause = f" DEFAULT {default_value}" if default_value else ""
-                            sql = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}{default_clause}"
-                            await conn2.execute(text(sql))
-                            await conn2.commit()
-                            logger.info("column_added", table=table_name, column=column_name)
-            except Exception as e:
-                # Column might already exist or other error - continue with next
-                err_str = str(e)
-                if "already exists" not in err_str.lower():
-                    logger.info("migration_note", table=table_name, column=column_name, error=str(e))
-
-        # Schema fixes: correct column types
-        schema_fixes = [
-            # Fix dnd_start_time/dnd_end_time from TIME to VARCHAR(5)
-            ("ALTER TABLE user_settings ALTER COLUMN dnd_start_time TYPE VARCHAR(5) USING dnd_start_time::VARCHAR(5)", "user_settings.dnd_start_time TIME->VARCHAR(5)"),
-            ("ALTER TABLE user_settings ALTER COLUMN dnd_end_time TYPE VARCHAR(5) USING dnd_end_time::VARCHAR(5)", "user_settings.dnd_end_time TIME->VARCHAR(5)"),
-        ]
-
-        for sql, description in schema_fixes:
+    for column_name, table_name, column_type, default_value in COLUMN_MIGRATIONS:
+        if table_name not in existing or column_name in existing[table_name]:
+            continue
+        default_clause = f" DEFAULT {default_value}" if default_value else ""
+        sql = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}{default_clause}"
+        try:
+            async with conn.begin_nested():
+                await conn.execute(text(sql))
+            logger.info("column_added", table=table_name, column=column_name)
+        except Exception as e:
+            logger.info("migration_note", table=table_name, column=column_name, error=str(e))
+
+    if conn.dialect.name == "postgresql":
+        for sql, description in SCHEMA_FIXES:
             try:
-                async with migration_engine.connect() as conn:
+                async with conn.begin_nested():
                     await conn.execute(text(sql))
-                    await conn.commit()
-                    logger.info("schema_fix_applied", description=description)
+                logger.info("schema_fix_applied", description=description)
             except Exception as e:
                 err_str = str(e).lower()
                 if "does not exist" not in err_str and "already" not in err_str:
                     logger.info("schema_fix_note", description=description, error=str(e))
 
-        # Data fixes: correct invalid enum values
-        data_fixes = [
-            # Fix 'active' -> 'published' for training_plans.status
-            ("UPDATE training_plans SET status = 'published' WHERE status = 'active'", "training_plans.status active->published"),
-        ]
-
-        for sql, description in data_fixes:
-            try:
-                async with migration_engine.connect() as conn:
-                    result = await conn.execute(text(sql))
-                    await conn.commit()
-                    if result.rowcount > 0:
-                        logger.info("data_fix_applied", description=description, rows_updated=result.rowcount)
-            except Exception as e:
-                logger.info("data_fix_note", description=description, error=str(e))
-
-    finally:
-        await migration_engine.dispose()
+    for sql, description in DATA_FIXES:
+        try:
+            async with conn.begin_nested():
+                result = await conn.execute(text(sql))
+            if result.rowcount > 0:
+                logger.info("data_fix_applied", description=description, rows_updated=result.rowcount)
+        except Exception as e:
+            logger.info("data_fix_note", description=description, error=str(e))
 
 
-async def _sync_enum_values() -> None:
+async def _sync_enum_values(conn: AsyncConnection) -> None:
     """Add missing enum values to PostgreSQL enums.
 
     PostgreSQL enums don't automatically update when model enums change.
@@ -230,30 +266,25 @@ async def _sync_enum_values() -> None:
     """
     from sqlalchemy import text
 
-    # Define expected enum values
-    enum_updates = [
-        ("exercise_mode_enum", ["strength", "duration", "interval", "distance", "stretching"]),
-        ("checkin_status_enum", ["pending", "pending_acceptance", "confirmed", "rejected"]),
-        ("subscription_status_enum", ["pending", "active", "cancelled", "expired", "trial"]),
-    ]
-
-    async with engine.begin() as conn:
-        for enum_name, expected_values in enum_updates:
-            # Get current enum values
-            result = await conn.execute(
-                text(f"""
-                    SELECT enumlabel FROM pg_enum
-                    WHERE enumtypid = (SELECT oid FROM pg_type WHERE typname = :enum_name)
-                """),
-                {"enum_name": enum_name},
-            )
-            current_values = {row[0] for row in result.fetchall()}
-
-            # Add missing values
-            for value in expected_values:
-                if value not in current_values:
-                    logger.info("enum_value_adding", enum=enum_name, value=value)
-                    await conn.execute(
-                        text(f"ALTER TYPE {enum_name} ADD VALUE '{value}'")
-                    )
-                    logger.info("enum_value_added", enum=enum_name, value=value)
+    result = await conn.execute(
+        text("""
+            SELECT t.typname, e.enumlabel FROM pg_enum e
+            JOIN pg_type t ON t.oid = e.enumtypid
+            WHERE t.typname = ANY(:enum_names)
+        """),
+        {"enum_names": [enum_name for enum_name, _ in ENUM_VALUES]},
+    )
+    current_values: dict[str, set[str]] = {}
+    for enum_name, label in result.fetchall():
+        current_values.setdefault(enum_name, set()).add(label)
+
+    for enum_name, expected_values in ENUM_VALUES:
+        if enum_name not in current_values:
+            continue  # type not created yet; create_all defines it with every value
+        for value in expected_values:
+            if value not in current_values[enum_name]:
+                logger.info("enum_value_adding", enum=enum_name, value=value)
+                await conn.execute(
+                    text(f"ALTER TYPE {enum_name} ADD VALUE '{value}'")
+                )
+                logger.info("enum_value_added", enum=enum_name, value=value)
@@ -31,6 +31,12 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30  # Seconds to wait for connection
     DB_POOL_RECYCLE: int = 1800  # Recycle connections after 30 min
+    DB_QUERY_WARN_COUNT: int = 25  # Log requests issuing more queries than this
+
+    # Server-Sent Events
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_MAX_STREAMS_PER_USER: int = 5
+    SSE_MAX_STREAMS_PER_NODE: int = 5000
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -93,6 +99,12 @@ class Settings(BaseSettings):
     GLITCHTIP_TRACES_SAMPLE_RATE: float = 0.2
     GLITCHTIP_PROFILES_SAMPLE_RATE: float = 0.1
 
+    # Metrics (Prometheus text format at /metrics)
+    METRICS_ENABLED: bool = False
+    # Scrapes must send "Authorization: Bearer <token>"; outside DEBUG the
+    # endpoint is not mounted without one
+    METRICS_TOKEN: str = ""
+
     @property
     def email_enabled(self) -> bool:
         """Check if email is configured."""
@@ -12,17 +12,22 @@ Railway deployment:
     Create a separate service with start command:
     celery -A src.core.celery_app worker -B -l info --concurrency=2
 """
+import logging
 import os
+import time
 from datetime import timedelta
 
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import task_postrun, task_prerun
 
 # Load environment variables
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Redis URL for broker and backend
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
@@ -108,6 +113,12 @@ celery_app.conf.beat_schedule = {
         "schedule": crontab(minute=0, hour=23),
     },
 
+    # Drain the transactional email outbox - every 30 seconds
+    "deliver-email-outbox": {
+        "task": "src.tasks.notifications.deliver_email_outbox",
+        "schedule": timedelta(seconds=30),
+    },
+
     # Send appointment reminders (24h + 1h) - every hour at :15
     "send-appointment-reminders-hourly": {
         "task": "src.tasks.notifications.send_appointment_reminders",
@@ -125,3 +136,37 @@ if os.getenv("RAILWAY_ENVIRONMENT"):
         # Store beat schedule in Redis instead of file
         beat_scheduler="celery.beat:PersistentScheduler",
     )
+
+
+# Task durations for the API's /metrics: workers are separate processes, so
+# each run is added to a Redis hash ("<task>|<state>|count" / "|seconds")
+# that the API reads when rendering metrics.
+_task_started: dict[str, float] = {}
+_metrics_client = None
+
+
+@task_prerun.connect
+def _record_task_start(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _record_task_run(task_id=None, task=None, state=None, **kwargs):
+    global _metrics_client
+    started = _task_started.pop(task_id, None)
+    if started is None or task is None:
+        return
+    from src.core.metrics import CELERY_TASKS_KEY
+
+    prefix = f"{task.name}|{state or 'UNKNOWN'}"
+    try:
+        if _metrics_client is None:
+            import redis
+
+            _metrics_client = redis.Redis.from_url(REDIS_URL)
+        pipe = _metrics_client.pipeline(transaction=False)
+        pipe.hincrby(CELERY_TASKS_KEY, f"{prefix}|count", 1)
+        pipe.hincrbyfloat(CELERY_TASKS_KEY, f"{prefix}|seconds", time.perf_counter() - started)
+        pipe.execute()
+    except Exception as e:  # catch-all: metrics must never fail a task
+        logger.warning("Failed to record task metrics for %s: %s", task.name, e)
@@ -0,0 +1,104 @@
+"""Set-based deep copy of row graphs using INSERT ... SELECT.
+
+Duplicating a plan (or a diet plan) used to clone every child row through the
+ORM: one object per exercise, a flush per level and a refresh at the end.
+This module clones whole levels of the graph with a single
+``INSERT INTO t (...) SELECT ... FROM t WHERE ...`` statement each, remapping
+primary and foreign keys in SQL so no row ever round-trips through Python.
+
+Typical usage for a parent/child pair::
+
+    plan_map = {old_plan_id: uuid.uuid4()}
+    await copy_rows(db, TrainingPlan.__table__, TrainingPlan.id == old_plan_id,
+                    overrides={"id": remap(TrainingPlan.id, plan_map), "name": "New"})
+    await copy_rows(db, PlanWorkout.__table__, PlanWorkout.plan_id == old_plan_id,
+                    overrides={"id": new_uuid(db), "plan_id": remap(PlanWorkout.plan_id, plan_map)})
+
+All statements run on the caller's session, so the copy commits or rolls back
+as one transaction, and the copied tables are marked changed for the
+response cache when it commits.
+"""
+import uuid
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from sqlalchemy import ColumnElement, Table, case, func, insert, literal, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.response_cache import mark_tables_changed
+
+# Columns filled by server defaults on insert instead of being copied
+TIMESTAMP_COLUMNS = ("created_at", "updated_at")
+
+
+def new_uuid(db: AsyncSession) -> ColumnElement:
+    """SQL expression that generates a fresh UUID per row for the session's dialect."""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.gen_random_uuid()
+    # SQLite stores UUIDs as 32 hex chars (SQLAlchemy's non-native UUID type)
+    return literal_column("lower(hex(randomblob(16)))")
+
+
+def remap(column: ColumnElement, mapping: Mapping[uuid.UUID, uuid.UUID]) -> ColumnElement:
+    """SQL expression translating old ids in ``column`` to new ids.
+
+    Ids that are not in the mapping are kept as-is, which is what callers
+    want for references that point outside the copied graph.
+    """
+    if not mapping:
+        return column
+    return case(
+        {old: literal(new, type_=column.type) for old, new in mapping.items()},
+        value=column,
+        else_=column,
+    )
+
+
+async def copy_rows(
+    db: AsyncSession,
+    table: Table,
+    where: ColumnElement[bool],
+    overrides: Mapping[str, Any] | None = None,
+    exclude: Iterable[str] = TIMESTAMP_COLUMNS,
+) -> int:
+    """Copy every row of ``table`` matching ``where`` with a single INSERT ... SELECT.
+
+    Args:
+        table: Table to copy rows within.
+        where: Filter selecting the source rows.
+        overrides: Column name -> SQL expression or plain value used instead of
+            the source column. Plain values are bound with the column's type.
+        exclude: Columns left out of the insert so their server defaults apply.
+
+    Returns:
+        Number of rows inserted (as reported by the driver).
+    """
+    overrides = overrides or {}
+    excluded = set(exclude) - set(overrides)
+
+    target_columns = []
+    source_exprs = []
+    for column in table.columns:
+        if column.name in excluded:
+            continue
+        target_columns.append(column)
+        if column.name in overrides:
+            value = overrides[column.name]
+            if not isinstance(value, ColumnElement) and not hasattr(value, "__clause_element__"):
+                value = literal(value, type_=column.type)
+            source_exprs.append(value.label(column.name))
+        else:
+            source_exprs.append(column)
+
+    statement = insert(table).from_select(
+        target_columns,
+        select(*source_exprs).where(where),
+    )
+    result = await db.execute(statement)
+    mark_tables_changed(db.sync_session, table.name)
+    return result.rowcount
+
+
+def id_map(ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, uuid.UUID]:
+    """Assign a fresh UUID to each source id."""
+    return {old_id: uuid.uuid4() for old_id in ids}
@@ -1,16 +1,19 @@
-"""Email service for sending transactional emails using Resend."""
-import logging
-from typing import Optional
+"""Email service for sending transactional emails using Resend.
 
-import resend
+Request handlers don't talk to Resend directly: they queue emails in the
+outbox (``src.domains.notifications.email_outbox``), which renders them with
+``render_email`` by template name when the worker delivers them.
+"""
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import NamedTuple, Optional
 
 from src.config.settings import settings
+from src.core.sdk import get_resend
 
 logger = logging.getLogger(__name__)
 
-# Initialize Resend with API key
-resend.api_key = settings.RESEND_API_KEY
-
 
 class EmailService:
     """Service for sending emails via Resend."""
@@ -37,6 +40,7 @@ class EmailService:
             logger.warning(f"Email not sent to {to_email}: Resend API key not configured")
             return False
 
+        resend = get_resend()
         try:
             params: resend.Emails.SendParams = {
                 "from": settings.EMAIL_FROM,
@@ -48,7 +52,8 @@ class EmailService:
             if text_content:
                 params["text"] = text_content
 
-            email = resend.Emails.send(params)
+            # The Resend SDK is blocking; keep it off the event loop
+            email = await asyncio.to_thread(resend.Emails.send, params)
             logger.info(f"Email sent successfully to {to_email}, id: {email.get('id')}")
             return True
 
@@ -379,86 +384,11 @@ Este email foi enviado pelo MyFit.
     """.strip()
 
 
-async def send_verification_code_email(
-    to_email: str,
-    name: str,
-    code: str,
-) -> bool:
-    """Send email verification code."""
-    html_content = get_verification_code_email_html(name, code)
-    text_content = get_verification_code_email_text(name, code)
-
-    return await EmailService.send_email(
-        to_email=to_email,
-        subject=f"Seu código de verificação MyFit: {code}",
-        html_content=html_content,
-        text_content=text_content,
-    )
-
-
-async def send_welcome_email(
-    to_email: str,
-    name: str,
-    temp_password: str,
-    trainer_name: str,
-) -> bool:
-    """Send welcome email with temporary password to new student."""
-    html_content = get_welcome_email_html(name, to_email, temp_password, trainer_name)
-    text_content = get_welcome_email_text(name, to_email, temp_password, trainer_name)
-
-    return await EmailService.send_email(
-        to_email=to_email,
-        subject="Bem-vindo ao MyFit! 🎉",
-        html_content=html_content,
-        text_content=text_content,
-    )
-
-
-async def send_invite_email(
-    to_email: str,
-    trainer_name: str,
-    org_name: str,
-    invite_token: str,
-) -> bool:
-    """Send organization invite email."""
-    invite_url = f"https://myfit.app/invite/{invite_token}"
-    html_content = get_invite_email_html(to_email, trainer_name, org_name, invite_url)
-    text_content = get_invite_email_text(to_email, trainer_name, org_name, invite_url)
-
-    return await EmailService.send_email(
-        to_email=to_email,
-        subject=f"{trainer_name} convidou você para o MyFit!",
-        html_content=html_content,
-        text_content=text_content,
-    )
-
-
-async def send_invite_reminder_email(
-    to_email: str,
-    inviter_name: str,
-    org_name: str,
-    invite_token: str,
-    is_final: bool = False,
-) -> bool:
-    """Send invite reminder email.
-
-    Args:
-        to_email: Recipient email
-        inviter_name: Name of the person who sent the invite
-        org_name: Organization name
-        invite_token: Invite token for the link
-        is_final: True if this is the final reminder (14 days)
-    """
-    invite_url = f"https://myfit.app/invite/{invite_token}"
-
-    if is_final:
-        subject = f"Último lembrete: {inviter_name} ainda está esperando sua resposta!"
-        urgency_text = "Este é seu último lembrete. O convite expira em breve!"
-    else:
-        subject = f"Lembrete: {inviter_name} convidou você para o MyFit"
-        urgency_text = "Não deixe seu personal esperando!"
-
-    html_content = f"""
+def get_invite_reminder_email_html(
+    inviter_name: str, org_name: str, invite_url: str, urgency_text: str, is_final: bool
+) -> str:
+    """Generate HTML for invite reminder email."""
+    return f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -511,10 +441,155 @@ async def send_invite_reminder_email(
     </html>
     """
 
-    return await EmailService.send_email(
-        to_email=to_email,
+
+class RenderedEmail(NamedTuple):
+    """Subject and bodies of a rendered email template."""
+
+    subject: str
+    html_content: str
+    text_content: str | None = None
+
+
+def render_verification_code_email(to_email: str, name: str, code: str) -> RenderedEmail:
+    """Render email verification code."""
+    return RenderedEmail(
+        subject=f"Seu código de verificação MyFit: {code}",
+        html_content=get_verification_code_email_html(name, code),
+        text_content=get_verification_code_email_text(name, code),
+    )
+
+
+def render_welcome_email(
+    to_email: str, name: str, temp_password: str, trainer_name: str
+) -> RenderedEmail:
+    """Render welcome email with temporary password to new student."""
+    return RenderedEmail(
+        subject="Bem-vindo ao MyFit! 🎉",
+        html_content=get_welcome_email_html(name, to_email, temp_password, trainer_name),
+        text_content=get_welcome_email_text(name, to_email, temp_password, trainer_name),
+    )
+
+
+def render_invite_email(
+    to_email: str, trainer_name: str, org_name: str, invite_token: str
+) -> RenderedEmail:
+    """Render organization invite email."""
+    invite_url = f"https://myfit.app/invite/{invite_token}"
+    return RenderedEmail(
+        subject=f"{trainer_name} convidou você para o MyFit!",
+        html_content=get_invite_email_html(to_email, trainer_name, org_name, invite_url),
+        text_content=get_invite_email_text(to_email, trainer_name, org_name, invite_url),
+    )
+
+
+def render_invite_reminder_email(
+    to_email: str,
+    inviter_name: str,
+    org_name: str,
+    invite_token: str,
+    is_final: bool = False,
+) -> RenderedEmail:
+    """Render invite reminder email.
+
+    Args:
+        to_email: Recipient email
+        inviter_name: Name of the person who sent the invite
+        org_name: Organization name
+        invite_token: Invite token for the link
+        is_final: True if this is the final reminder (14 days)
+    """
+    invite_url = f"https://myfit.app/invite/{invite_token}"
+
+    if is_final:
+        subject = f"Último lembrete: {inviter_name} ainda está esperando sua resposta!"
+        urgency_text = "Este é seu último lembrete. O convite expira em breve!"
+    else:
+        subject = f"Lembrete: {inviter_name} convidou você para o MyFit"
+        urgency_text = "Não deixe seu personal esperando!"
+
+    return RenderedEmail(
         subject=subject,
-        html_content=html_content,
+        html_content=get_invite_reminder_email_html(
+            inviter_name, org_name, invite_url, urgency_text, is_final
+        ),
+    )
+
+
+def render_workout_reminder_email(
+    to_email: str, name: str, workout_name: str, trainer_name: str
+) -> RenderedEmail:
+    """Render workout reminder email."""
+    return RenderedEmail(
+        subject=f"Lembrete: {workout_name} está esperando por você!",
+        html_content=get_workout_reminder_email_html(name, workout_name, trainer_name),
+    )
+
+
+def render_payment_reminder_email(
+    to_email: str, name: str, amount: float, due_date: str, trainer_name: str
+) -> RenderedEmail:
+    """Render payment reminder email."""
+    return RenderedEmail(
+        subject="Lembrete de Pagamento - MyFit",
+        html_content=get_payment_reminder_email_html(name, amount, due_date, trainer_name),
+    )
+
+
+# Template name (as stored in the outbox) -> renderer
+EMAIL_TEMPLATES: dict[str, Callable[..., RenderedEmail]] = {
+    "verification_code": render_verification_code_email,
+    "welcome": render_welcome_email,
+    "invite": render_invite_email,
+    "invite_reminder": render_invite_reminder_email,
+    "workout_reminder": render_workout_reminder_email,
+    "payment_reminder": render_payment_reminder_email,
+}
+
+
+async def send_verification_code_email(
+    to_email: str,
+    name: str,
+    code: str,
+) -> bool:
+    """Send email verification code."""
+    return await EmailService.send_email(to_email, *render_verification_code_email(to_email, name, code))
+
+
+async def send_welcome_email(
+    to_email: str,
+    name: str,
+    temp_password: str,
+    trainer_name: str,
+) -> bool:
+    """Send welcome email with temporary password to new student."""
+    return await EmailService.send_email(
+        to_email, *render_welcome_email(to_email, name, temp_password, trainer_name)
+    )
+
+
+async def send_invite_email(
+    to_email: str,
+    trainer_name: str,
+    org_name: str,
+    invite_token: str,
+) -> bool:
+    """Send organization invite email."""
+    return await EmailService.send_email(
+        to_email, *render_invite_email(to_email, trainer_name, org_name, invite_token)
+    )
+
+
+async def send_invite_reminder_email(
+    to_email: str,
+    inviter_name: str,
+    org_name: str,
+    invite_token: str,
+    is_final: bool = False,
+) -> bool:
+    """Send invite reminder email."""
+    return await EmailService.send_email(
+        to_email,
+        *render_invite_reminder_email(to_email, inviter_name, org_name, invite_token, is_final),
     )
 
 
@@ -525,12 +600,8 @@ async def send_workout_reminder_email(
     trainer_name: str,
 ) -> bool:
     """Send workout reminder email."""
-    html_content = get_workout_reminder_email_html(name, workout_name, trainer_name)
-
     return await EmailService.send_email(
-        to_email=to_email,
-        subject=f"Lembrete: {workout_name} está esperando por você!",
-        html_content=html_content,
+        to_email, *render_workout_reminder_email(to_email, name, workout_name, trainer_name)
     )
 
 
@@ -542,10 +613,16 @@ async def send_payment_reminder_email(
     trainer_name: str,
 ) -> bool:
     """Send payment reminder email."""
-    html_content = get_payment_reminder_email_html(name, amount, due_date, trainer_name)
-
     return await EmailService.send_email(
-        to_email=to_email,
-        subject="Lembrete de Pagamento - MyFit",
-        html_content=html_content,
+        to_email, *render_payment_reminder_email(to_email, name, amount, due_date, trainer_name)
     )
+
+
+def render_email(template: str, to_email: str, context: dict | None) -> RenderedEmail:
+    """Render a template by name, as stored in the outbox.
+
+    Raises:
+        KeyError: If the template is unknown
+        TypeError: If the context doesn't match the template's arguments
+    """
+    return EMAIL_TEMPLATES[template](to_email, **(context or {}))
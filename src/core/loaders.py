@@ -0,0 +1,34 @@
+"""Named loader profiles for ORM queries.
+
+Relationships are lazy by default; a model only marks one eager when nearly
+every read of the entity renders it (e.g. an appointment's trainer and
+student). Anything else a query needs is declared with a profile, so the
+extra round trips are visible where the query is written:
+
+    USER_WITH_MEMBERSHIPS = LoaderProfile(
+        "user.memberships", selectinload(User.memberships)
+    )
+    select(User).options(*USER_WITH_MEMBERSHIPS)
+"""
+from collections.abc import Iterator
+
+from sqlalchemy.orm.interfaces import ORMOption
+
+
+class LoaderProfile:
+    """A named, reusable set of loader options."""
+
+    __slots__ = ("name", "options")
+
+    def __init__(self, name: str, *options: ORMOption):
+        self.name = name
+        self.options = options
+
+    def __iter__(self) -> Iterator[ORMOption]:
+        return iter(self.options)
+
+    def __add__(self, other: "LoaderProfile") -> "LoaderProfile":
+        return LoaderProfile(f"{self.name}+{other.name}", *self.options, *other.options)
+
+    def __repr__(self) -> str:
+        return f"<LoaderProfile {self.name}>"
@@ -0,0 +1,294 @@
+"""In-process metrics in the Prometheus text format.
+
+Metrics are plain counters, gauges and histograms aggregated in memory by
+the process that records them (a dict lookup and a few additions per
+observation) and rendered on demand by ``GET /metrics``. Subsystems declare
+their own metrics next to the code they measure:
+
+- ``MetricsMiddleware``: request latency per method, route template and
+  status class;
+- ``src.core.query_stats``: time of every database statement and queries
+  per request per route;
+- ``src.config.database``: connection pool checkout wait and pool gauges;
+- ``src.core.redis``, push dispatch, the background scheduler loops and the
+  SSE hub.
+
+Celery workers run in other processes; their task durations are added to
+the ``CELERY_TASKS_KEY`` hash in Redis and read back when rendering.
+"""
+import functools
+import inspect
+import logging
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CELERY_TASKS_KEY = "metrics:celery_tasks"
+
+LabelValues = tuple[str, ...]
+# Returns {label values: value}; may be a coroutine function
+Collector = Callable[[], dict[LabelValues, float] | Any]
+
+REGISTRY: list["Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    """A named metric with fixed label names."""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        collect: Collector | None = None,
+        registry: list["Metric"] = REGISTRY,
+    ):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._collect = collect
+        self._values: dict[LabelValues, float] = {}
+        registry.append(self)
+
+    def _key(self, labels: dict[str, Any]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    async def _samples(self) -> Iterator[str]:
+        values = self._values
+        if self._collect is not None:
+            values = self._collect()
+            if inspect.isawaitable(values):
+                values = await values
+        return (
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in values.items()
+        )
+
+    async def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(await self._samples())
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Value that goes up and down, usually read from ``collect`` when rendered."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    """Distribution of observations over cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        registry: list["Metric"] = REGISTRY,
+    ):
+        super().__init__(name, help, labels, registry=registry)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (last is +Inf)..., sum]
+        self._series: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the wall time of the ``with`` block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    async def _samples(self) -> Iterator[str]:
+        lines = []
+        for key, series in self._series.items():
+            cumulative = 0
+            # The series ends with the sum after the +Inf bucket
+            for bound, count in zip((*self.buckets, float("inf")), series, strict=False):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                bucket_labels = _format_labels(self.label_names, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return iter(lines)
+
+
+def timed(histogram: Histogram, **labels: Any) -> Callable:
+    """Decorator observing the duration of each call of a coroutine function."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, **labels)
+
+        return wrapper
+
+    return decorator
+
+
+async def render_metrics(registry: list[Metric] = REGISTRY) -> str:
+    """All metrics of ``registry`` in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for metric in registry:
+        try:
+            lines.extend(await metric.render())
+        except Exception as e:  # catch-all: one broken collector must not hide the rest
+            logger.warning("Failed to collect metric %s: %s", metric.name, e)
+    return "\n".join(lines) + "\n"
+
+
+# --- HTTP requests ----------------------------------------------------------
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve HTTP requests, up to the end of the response body.",
+    labels=("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served (streams excluded)."
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template.
+
+    Server-Sent Events responses are left out: they last as long as the
+    client stays connected (see the ``sse_*`` gauges instead).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = {"status": 500, "stream": False}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == b"content-type" and value.startswith(b"text/event-stream"):
+                        response["stream"] = True
+                        HTTP_REQUESTS_IN_PROGRESS.inc(-1)
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc(1)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not response["stream"]:
+                HTTP_REQUESTS_IN_PROGRESS.inc(-1)
+                route = getattr(scope.get("route"), "path", None)
+                if route is None:
+                    # Cached responses are only kept for fixed paths
+                    route = scope["path"] if scope.get("response_cache_hit") else "<unmatched>"
+                HTTP_REQUEST_SECONDS.observe(
+                    time.perf_counter() - started,
+                    method=scope["method"],
+                    route=route,
+                    status=f"{response['status'] // 100}xx",
+                )
+
+
+# --- Background work --------------------------------------------------------
+
+SCHEDULER_RUN_SECONDS = Histogram(
+    "scheduler_run_duration_seconds",
+    "Duration of background scheduler loop iterations.",
+    labels=("task",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0),
+)
+SCHEDULER_ERRORS = Counter(
+    "scheduler_errors_total", "Background scheduler loop iterations that failed.", labels=("task",)
+)
+
+
+async def _collect_celery_tasks(stat: str) -> dict[LabelValues, float]:
+    from src.core.redis import get_redis
+
+    client = await get_redis()
+    if client is None:
+        return {}
+    values = {}
+    for field, value in (await client.hgetall(CELERY_TASKS_KEY)).items():
+        task, state, field_stat = field.rsplit("|", 2)
+        if field_stat == stat:
+            values[(task, state)] = float(value)
+    return values
+
+
+CELERY_TASK_RUNS = Counter(
+    "celery_task_runs_total",
+    "Celery task runs by final state, reported by the workers.",
+    labels=("task", "state"),
+    collect=functools.partial(_collect_celery_tasks, "count"),
+)
+CELERY_TASK_SECONDS = Counter(
+    "celery_task_seconds_total",
+    "Time spent running Celery tasks by final state, reported by the workers.",
+    labels=("task", "state"),
+    collect=functools.partial(_collect_celery_tasks, "seconds"),
+)
@@ -2,16 +2,12 @@
 Observability module for MyFit API.
 
 Provides error tracking and performance monitoring using GlitchTip
-(open-source, Sentry-compatible).
+(open-source, Sentry-compatible). ``sentry_sdk`` is only imported when a DSN
+is configured; without one every helper here is a no-op.
 """
 
 import structlog
 
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
-from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
-from sentry_sdk.integrations.starlette import StarletteIntegration
-
 from src.config.settings import settings
 
 logger = structlog.get_logger(__name__)
@@ -23,6 +19,11 @@ def init_observability() -> None:
         logger.info("observability_disabled", reason="no DSN configured")
         return
 
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+    from sentry_sdk.integrations.sqlalchemy import SqlalchemyIntegration
+    from sentry_sdk.integrations.starlette import StarletteIntegration
+
     # Determine sample rates based on environment
     traces_sample_rate = settings.GLITCHTIP_TRACES_SAMPLE_RATE
     profiles_sample_rate = settings.GLITCHTIP_PROFILES_SAMPLE_RATE
@@ -73,6 +74,10 @@ def set_user_context(
     organization_id: str | None = None,
 ) -> None:
     """Set user context for error reports."""
+    if not settings.GLITCHTIP_DSN:
+        return
+    import sentry_sdk
+
     sentry_sdk.set_user(
         {
             "id": user_id,
@@ -85,6 +90,10 @@ def set_user_context(
 
 def clear_user_context() -> None:
     """Clear user context."""
+    if not settings.GLITCHTIP_DSN:
+        return
+    import sentry_sdk
+
     sentry_sdk.set_user(None)
 
 
@@ -94,6 +103,10 @@ def capture_exception(
     tags: dict[str, str] | None = None,
 ) -> str | None:
     """Capture an exception with optional context."""
+    if not settings.GLITCHTIP_DSN:
+        return None
+    import sentry_sdk
+
     with sentry_sdk.push_scope() as scope:
         if extra:
             for key, value in extra.items():
@@ -111,6 +124,10 @@ def capture_message(
     extra: dict | None = None,
 ) -> str | None:
     """Capture a message event."""
+    if not settings.GLITCHTIP_DSN:
+        return None
+    import sentry_sdk
+
     with sentry_sdk.push_scope() as scope:
         if extra:
             for key, value in extra.items():
@@ -0,0 +1,232 @@
+"""Keyset pagination and cached totals for browsing endpoints.
+
+Offset pagination rescans every skipped row, so deep pages get slower as
+listings grow. A ``KeysetOrder`` instead orders a query by its sort keys plus a
+unique tiebreaker and continues after the last row of the previous page,
+which an index on the same columns serves at any depth:
+
+    NEWEST = KeysetOrder("newest", SortKey(Listing.created_at, descending=True),
+                         SortKey(Listing.id, descending=True))
+    query, keys = NEWEST.paginate(select(Listing).where(...), cursor)
+    rows = (await db.execute(query.limit(limit))).all()
+    next_cursor = NEWEST.next_cursor(rows, limit, keys)
+
+Cursors are opaque to clients (URL-safe base64 of the last row's sort key
+values) and only valid for the order that issued them. Nullable sort
+columns should be wrapped in ``coalesce`` so every row has a comparable key.
+
+``cached_count`` serves totals from the cache with stale-while-revalidate:
+an exact count runs once, after which stale values are returned while a
+background task recounts. Key counts on bounded filters only; free-text
+searches would add a cache entry per distinct query, so count those directly.
+"""
+import asyncio
+import base64
+import hashlib
+import logging
+import time
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from sqlalchemy import ColumnElement, DateTime, Row, Select, and_, literal, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from src.config.database import AsyncSessionLocal
+from src.core.redis import cache_get, cache_set
+
+logger = logging.getLogger(__name__)
+
+COUNT_FRESH_SECONDS = 300
+COUNT_STALE_SECONDS = 3600
+COUNT_PREFIX = "count:"
+
+
+class InvalidCursorError(ValueError):
+    """Cursor that wasn't issued by this order or was tampered with."""
+
+
+class _Timestamp(FunctionElement):
+    """A timestamp as ordered and compared by keyset pagination.
+
+    SQLite stores timestamps as text whose format depends on the writer
+    (server defaults drop the microseconds), so equal instants don't always
+    compare equal; they're compared as ``julianday()`` numbers there. Other
+    databases use the column itself, so its index still serves the order.
+    """
+
+    inherit_cache = True
+
+
+@compiles(_Timestamp)
+def _compile_timestamp(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(_Timestamp, "sqlite")
+def _compile_timestamp_sqlite(element, compiler, **kw):
+    return f"julianday({compiler.process(element.clauses, **kw)})"
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One column (or expression) of a keyset order."""
+
+    column: ColumnElement
+    descending: bool = False
+
+    def _compared(self, expr: ColumnElement) -> ColumnElement:
+        return _Timestamp(expr) if isinstance(self.column.type, DateTime) else expr
+
+    def _value(self, value: Any) -> ColumnElement:
+        return self._compared(literal(value, self.column.type))
+
+    def order_by(self) -> ColumnElement:
+        key = self._compared(self.column)
+        return key.desc() if self.descending else key.asc()
+
+    def equals(self, value: Any) -> ColumnElement:
+        return self._compared(self.column) == self._value(value)
+
+    def after(self, value: Any) -> ColumnElement:
+        key = self._compared(self.column)
+        return key < self._value(value) if self.descending else key > self._value(value)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _decode_value(column: ColumnElement, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type in (Decimal, uuid.UUID):
+        return python_type(value)
+    return value
+
+
+class KeysetOrder:
+    """A total order for keyset pagination: sort keys ending in a unique key."""
+
+    def __init__(self, name: str, *keys: SortKey):
+        self.name = name
+        self.keys = keys
+
+    def encode(self, values: Sequence[Any]) -> str:
+        payload = orjson.dumps({"o": self.name, "k": [_encode_value(v) for v in values]})
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> list[Any]:
+        try:
+            payload = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            if payload["o"] != self.name or len(payload["k"]) != len(self.keys):
+                raise InvalidCursorError(cursor)
+            return [_decode_value(key.column, v) for key, v in zip(self.keys, payload["k"], strict=True)]
+        except (ValueError, TypeError, KeyError) as e:
+            raise InvalidCursorError(cursor) from e
+
+    def paginate(self, query: Select, cursor: str | None = None) -> tuple[Select, int]:
+        """Order ``query``, continue after ``cursor`` and select the key values.
+
+        Returns the query and the number of key columns appended to each row,
+        for ``next_cursor``. Raises ``InvalidCursorError`` for a bad cursor.
+        """
+        query = query.order_by(*(key.order_by() for key in self.keys))
+        if cursor:
+            values = self.decode(cursor)
+            # (k1 after v1) or (k1 = v1 and k2 after v2) or ...
+            query = query.where(
+                or_(
+                    *(
+                        and_(
+                            *(prev.equals(v) for prev, v in zip(self.keys[:i], values, strict=False)),
+                            key.after(values[i]),
+                        )
+                        for i, key in enumerate(self.keys)
+                    )
+                )
+            )
+        labels = [key.column.label(f"_keyset_{i}") for i, key in enumerate(self.keys)]
+        return query.add_columns(*labels), len(labels)
+
+    def next_cursor(self, rows: Sequence[Row], limit: int, key_count: int) -> str | None:
+        """Cursor of the page after ``rows``, or None if this was the last one."""
+        if len(rows) < limit:
+            return None
+        return self.encode(tuple(rows[-1])[-key_count:])
+
+
+# --- Cached totals ---------------------------------------------------------
+
+_refreshing: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+def count_key(name: str, params: dict[str, Any]) -> str:
+    """Cache key of a count over ``params`` (filters)."""
+    digest = hashlib.sha1(orjson.dumps(params, option=orjson.OPT_SORT_KEYS, default=str)).hexdigest()
+    return f"{COUNT_PREFIX}{name}:{digest}"
+
+
+async def _store_count(key: str, count: int) -> None:
+    payload = {"fresh_until": time.time() + COUNT_FRESH_SECONDS, "count": count}
+    await cache_set(key, orjson.dumps(payload).decode(), COUNT_FRESH_SECONDS + COUNT_STALE_SECONDS)
+
+
+def _recount(key: str, query: Select) -> None:
+    if key in _refreshing:
+        return
+    _refreshing.add(key)
+
+    async def run() -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await _store_count(key, (await db.execute(query)).scalar() or 0)
+        except Exception as e:
+            logger.warning(f"Count refresh failed for {key}: {e}")
+        finally:
+            _refreshing.discard(key)
+
+    task = asyncio.get_running_loop().create_task(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def cached_count(db: AsyncSession, key: str, query: Select) -> int:
+    """Total of a ``select(func.count(...))`` query, served from the cache.
+
+    May be up to ``COUNT_FRESH_SECONDS`` old, plus one background refresh.
+    """
+    try:
+        raw = await cache_get(key)
+    except Exception as e:
+        logger.warning(f"Count cache unavailable: {e}")
+        raw = None
+    if raw:
+        cached = orjson.loads(raw)
+        if cached["fresh_until"] < time.time():
+            _recount(key, query)
+        return cached["count"]
+
+    count = (await db.execute(query)).scalar() or 0
+    try:
+        await _store_count(key, count)
+    except Exception as e:
+        logger.warning(f"Count cache write failed for {key}: {e}")
+    return count
@@ -0,0 +1,151 @@
+"""Per-request database query counting and timing.
+
+Engine cursor events add every statement, and the time it took, to the
+``QueryStats`` of the request being served (a context variable set by
+``QueryStatsMiddleware``). For each request the middleware:
+
+- reports the totals in a ``Server-Timing: db;dur=<ms>;desc="<n> queries"``
+  response header;
+- logs a warning when the request issued more than
+  ``settings.DB_QUERY_WARN_COUNT`` queries;
+- adds the totals to ``route_stats``, keyed by method and route template, for
+  export, and to the per-route query histograms served by ``/metrics``.
+
+Every statement, in a request or not, is also added to the
+``db_query_duration_seconds`` histogram.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.settings import settings
+from src.core.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Queries issued while serving one request."""
+
+    count: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class RouteStats:
+    """Query totals of all requests served by one route."""
+
+    requests: int = 0
+    queries: int = 0
+    query_seconds: float = 0.0
+    max_queries: int = 0
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+# (method, route template) -> totals since process start
+route_stats: dict[tuple[str, str], RouteStats] = {}
+
+_STARTED = "query_stats_started"
+
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Time to execute database statements.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_REQUEST_QUERIES = Histogram(
+    "db_queries_per_request",
+    "Database statements issued while serving one HTTP request.",
+    labels=("method", "route"),
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250),
+)
+DB_REQUEST_SECONDS = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent in the database while serving one HTTP request.",
+    labels=("method", "route"),
+)
+
+
+def current_query_stats() -> QueryStats | None:
+    """Stats of the request being served, if any."""
+    return _current.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_STARTED, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get(_STARTED)
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    DB_QUERY_SECONDS.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_started(context) -> None:
+    # Failed statements don't reach after_cursor_execute
+    started = context.connection.info.get(_STARTED) if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def _record(scope: Scope, stats: QueryStats) -> None:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    totals = route_stats.setdefault((scope["method"], path), RouteStats())
+    totals.requests += 1
+    totals.queries += stats.count
+    totals.query_seconds += stats.seconds
+    totals.max_queries = max(totals.max_queries, stats.count)
+    DB_REQUEST_QUERIES.observe(stats.count, method=scope["method"], route=path)
+    DB_REQUEST_SECONDS.observe(stats.seconds, method=scope["method"], route=path)
+
+    if stats.count > settings.DB_QUERY_WARN_COUNT:
+        logger.warning(
+            f"{scope['method']} {path} issued {stats.count} queries "
+            f"({stats.seconds * 1000:.1f} ms in the database)"
+        )
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware counting and timing the queries of each HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            _record(scope, stats)
@@ -3,9 +3,17 @@ import logging
 from typing import Any
 
 from src.config.settings import settings
+from src.core.metrics import Histogram, timed
 
 logger = logging.getLogger(__name__)
 
+REDIS_COMMAND_SECONDS = Histogram(
+    "redis_command_duration_seconds",
+    "Time of cache helper calls, connection included (in-memory fallback too).",
+    labels=("command",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0),
+)
+
 # Redis-specific exception type for narrowed catch blocks
 _RedisError: type = Exception  # fallback
 try:
@@ -63,6 +71,7 @@ class TokenBlacklist:
             _memory_store[key] = ("1", time.time() + expires_in_seconds)
 
     @classmethod
+    @timed(REDIS_COMMAND_SECONDS, command="is_blacklisted")
     async def is_blacklisted(cls, token: str) -> bool:
         """Check if a token is blacklisted."""
         client = await get_redis()
@@ -116,6 +125,7 @@ class TokenBlacklist:
                 del _memory_store[key]
 
 
+@timed(REDIS_COMMAND_SECONDS, command="get")
 async def cache_get(key: str) -> Any | None:
     """Get a value from cache."""
     client = await get_redis()
@@ -132,6 +142,7 @@ async def cache_get(key: str) -> Any | None:
         return None
 
 
+@timed(REDIS_COMMAND_SECONDS, command="set")
 async def cache_set(key: str, value: Any, expire_seconds: int = 3600) -> None:
     """Set a value in cache with optional expiration."""
     client = await get_redis()
@@ -142,6 +153,7 @@ async def cache_set(key: str, value: Any, expire_seconds: int = 3600) -> None:
         _memory_store[key] = (value, time.time() + expire_seconds)
 
 
+@timed(REDIS_COMMAND_SECONDS, command="delete")
 async def cache_delete(key: str) -> None:
     """Delete a value from cache."""
     client = await get_redis()
@@ -0,0 +1,302 @@
+"""Conditional GET and serialized-body caching for read-heavy routes.
+
+Each cached route has a ``CachePolicy`` naming the tables its payload is
+built from. Every table has a change counter (a version token in Redis)
+that is rotated after any commit touching it, so a response's ETag can be
+derived from the request and the counters *before* the route runs:
+
+- ``If-None-Match`` matching the current ETag is answered with 304 without
+  running the route;
+- otherwise the pre-encoded body stored under that ETag (with the policy's
+  ``replay_headers``, e.g. a pagination cursor) is returned as is, skipping
+  the queries and pydantic serialization;
+- on a miss the route runs and its JSON body is stored for the next caller.
+
+The ETag also rolls over every ``max_age_seconds`` so data from untracked
+tables (or anything time dependent) is never served staler than that.
+Counters follow ORM flushes; code writing a tracked table with a Core
+statement (bulk insert, ``UPDATE ... RETURNING``, upserts) calls
+``mark_tables_changed`` on the session instead.
+
+Authenticated routes verify the bearer token (signature, expiry, blacklist)
+before serving from cache and key the entry by user when the payload is per
+user. Requests without a valid token fall through to the route, which
+produces the usual 401.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.redis import TokenBlacklist, cache_get, cache_set
+from src.core.security import decode_token
+
+logger = logging.getLogger(__name__)
+
+VERSION_PREFIX = "respcache:version:"
+BODY_PREFIX = "respcache:body:"
+VERSION_TTL_SECONDS = 86400
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How one GET route is cached."""
+
+    tables: tuple[str, ...]
+    vary_user: bool = False  # payload depends on the caller
+    vary_org: bool = False  # payload depends on X-Organization-Id
+    public: bool = False  # route does not require authentication
+    max_age_seconds: int = 300
+    replay_headers: tuple[str, ...] = ()  # route headers stored with the body, lowercase
+
+
+# --- Change counters -------------------------------------------------------
+
+_tracked_tables: set[str] = set()
+_stale_tables: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+def track_tables(tables: Iterable[str]) -> None:
+    """Maintain change counters for these tables."""
+    _tracked_tables.update(tables)
+
+
+async def table_versions(tables: Iterable[str]) -> list[str]:
+    """Current version token of each table, rotating those changed in this process."""
+    versions = []
+    for table in tables:
+        key = f"{VERSION_PREFIX}{table}"
+        version = None
+        if table in _stale_tables:
+            _stale_tables.discard(table)
+        else:
+            version = await cache_get(key)
+        if not version:
+            version = uuid.uuid4().hex
+            await cache_set(key, version, VERSION_TTL_SECONDS)
+        versions.append(version)
+    return versions
+
+
+def _spawn(coro: Awaitable[Any]) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+_CHANGED_TABLES = "response_cache_changed_tables"
+
+
+def mark_tables_changed(session: Session, *tables: str) -> None:
+    """Rotate these tables' change counters when ``session`` commits.
+
+    For writes that bypass the ORM flush (Core bulk statements).
+    """
+    changed = set(tables) & _tracked_tables
+    if changed:
+        session.info.setdefault(_CHANGED_TABLES, set()).update(changed)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_tables(session: Session, flush_context) -> None:
+    if not _tracked_tables:
+        return
+    changed = {
+        obj.__table__.name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if getattr(obj, "__table__", None) is not None
+    } & _tracked_tables
+    if changed:
+        session.info.setdefault(_CHANGED_TABLES, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_versions(session: Session) -> None:
+    changed = session.info.pop(_CHANGED_TABLES, None)
+    if not changed:
+        return
+    _stale_tables.update(changed)
+    try:
+        _spawn(table_versions(changed))  # publish to other processes right away
+    except RuntimeError:
+        pass  # no running loop: the next read rotates them
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tables(session: Session) -> None:
+    session.info.pop(_CHANGED_TABLES, None)
+
+
+# --- Middleware ------------------------------------------------------------
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in (etag, "*"):
+            return True
+    return False
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving cached GET responses according to per-path policies."""
+
+    def __init__(self, app: ASGIApp, policies: dict[str, CachePolicy]):
+        self.app = app
+        self.policies = policies
+        track_tables(t for policy in policies.values() for t in policy.tables)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        policy = None
+        if scope["type"] == "http" and scope["method"] == "GET":
+            policy = self.policies.get(scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        identity = await self._identity(policy, headers)
+        if identity is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            etag = await self._etag(policy, scope, headers, identity)
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        cache_headers = [
+            (b"etag", etag.encode()),
+            (b"cache-control", b"public, no-cache" if policy.public else b"private, no-cache"),
+            (b"vary", b"Authorization, X-Organization-Id"),
+        ]
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            scope["response_cache_hit"] = True  # for metrics: no route was matched
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body_key = BODY_PREFIX + etag.strip('"')
+        cached = await self._read_body(body_key)
+        if cached is not None:
+            scope["response_cache_hit"] = True
+            replayed: list[tuple[bytes, bytes]] = []
+            if policy.replay_headers:
+                envelope = orjson.loads(cached)
+                cached = envelope["body"].encode()
+                replayed = [(name.encode(), value.encode()) for name, value in envelope["headers"]]
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(cached)).encode()),
+                    *replayed,
+                    *cache_headers,
+                ],
+            })
+            await send({"type": "http.response.body", "body": cached})
+            return
+
+        await self._run_and_store(scope, receive, send, policy, body_key, cache_headers)
+
+    async def _identity(self, policy: CachePolicy, headers: Headers) -> str | None:
+        """Cache identity of the caller; None when the route must handle the request."""
+        if policy.public:
+            return ""
+        authorization = headers.get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        token_data = decode_token(token, is_refresh=False)
+        if not token_data:
+            return None
+        try:
+            if await TokenBlacklist.is_blacklisted(token):
+                return None
+        except Exception:
+            return None
+        return token_data.user_id if policy.vary_user else "authenticated"
+
+    async def _etag(
+        self, policy: CachePolicy, scope: Scope, headers: Headers, identity: str
+    ) -> str:
+        versions = await table_versions(policy.tables)
+        parts = [
+            scope["path"],
+            scope.get("query_string", b"").decode("latin-1"),
+            identity,
+            headers.get("x-organization-id", "") if policy.vary_org else "",
+            str(int(time.time() // policy.max_age_seconds)),
+            *versions,
+        ]
+        digest = hashlib.sha1("\n".join(parts).encode()).hexdigest()
+        return f'"{digest}"'
+
+    async def _read_body(self, key: str) -> bytes | None:
+        try:
+            raw = await cache_get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed for {key}: {e}")
+            return None
+        return raw.encode() if raw else None
+
+    async def _run_and_store(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        policy: CachePolicy,
+        body_key: str,
+        cache_headers: list[tuple[bytes, bytes]],
+    ) -> None:
+        cacheable = False
+        chunks: list[bytes] = []
+        replayed: list[tuple[str, str]] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal cacheable
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                cacheable = (
+                    message["status"] == 200
+                    and response_headers.get("content-type", "").startswith("application/json")
+                )
+                if cacheable:
+                    replayed.extend(
+                        (name, response_headers[name])
+                        for name in policy.replay_headers
+                        if name in response_headers
+                    )
+                    for name, value in cache_headers:
+                        response_headers.append(name.decode(), value.decode())
+            elif message["type"] == "http.response.body" and cacheable:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    body = b"".join(chunks).decode()
+                    if policy.replay_headers:
+                        body = orjson.dumps({"headers": replayed, "body": body}).decode()
+                    try:
+                        await cache_set(body_key, body, policy.max_age_seconds)
+                    except Exception as e:
+                        logger.warning(f"Response cache write failed for {body_key}: {e}")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
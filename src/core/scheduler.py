@@ -8,6 +8,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.database import AsyncSessionLocal
+from src.core.metrics import SCHEDULER_ERRORS, SCHEDULER_RUN_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,7 @@ class BackgroundScheduler:
         self._tasks = [
             asyncio.create_task(self._reminder_loop()),
             asyncio.create_task(self._package_expiry_loop()),
+            asyncio.create_task(self._checkin_expiry_loop()),
         ]
         logger.info("BackgroundScheduler started with %d tasks", len(self._tasks))
 
@@ -41,10 +43,12 @@ class BackgroundScheduler:
         """Check for upcoming appointments every 5 minutes and send reminders."""
         while not self._stop_event.is_set():
             try:
-                async with AsyncSessionLocal() as db:
-                    await self._send_24h_reminders(db)
-                    await self._send_1h_reminders(db)
+                with SCHEDULER_RUN_SECONDS.time(task="reminders"):
+                    async with AsyncSessionLocal() as db:
+                        await self._send_24h_reminders(db)
+                        await self._send_1h_reminders(db)
             except Exception as e:  # catch-all for logging: background loop must not crash
+                SCHEDULER_ERRORS.inc(task="reminders")
                 logger.error("Reminder loop error: %s", e)
             try:
                 await asyncio.wait_for(self._stop_event.wait(), timeout=300)  # 5 min
@@ -56,9 +60,11 @@ class BackgroundScheduler:
         """Check for expiring packages every hour."""
         while not self._stop_event.is_set():
             try:
-                async with AsyncSessionLocal() as db:
-                    await self._send_package_expiry_alerts(db)
+                with SCHEDULER_RUN_SECONDS.time(task="package_expiry"):
+                    async with AsyncSessionLocal() as db:
+                        await self._send_package_expiry_alerts(db)
             except Exception as e:  # catch-all for logging: background loop must not crash
+                SCHEDULER_ERRORS.inc(task="package_expiry")
                 logger.error("Package expiry loop error: %s", e)
             try:
                 await asyncio.wait_for(self._stop_event.wait(), timeout=3600)  # 1 hour
@@ -66,6 +72,26 @@ class BackgroundScheduler:
             except asyncio.TimeoutError:
                 pass
 
+    async def _checkin_expiry_loop(self):
+        """Check out expired check-ins every minute."""
+        from src.domains.checkin.service import CheckInService
+
+        while not self._stop_event.is_set():
+            try:
+                with SCHEDULER_RUN_SECONDS.time(task="checkin_expiry"):
+                    async with AsyncSessionLocal() as db:
+                        expired = await CheckInService(db).expire_stale_checkins()
+                if expired:
+                    logger.info("Auto-expired %d check-ins", expired)
+            except Exception as e:  # catch-all for logging: background loop must not crash
+                SCHEDULER_ERRORS.inc(task="checkin_expiry")
+                logger.error("Check-in expiry loop error: %s", e)
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=60)  # 1 min
+                break
+            except TimeoutError:
+                pass
+
     async def _send_24h_reminders(self, db: AsyncSession):
         """Send 24-hour reminders for upcoming appointments."""
         from src.domains.schedule.models import Appointment, AppointmentStatus
@@ -0,0 +1,43 @@
+"""Lazy accessors for heavy third-party SDKs.
+
+``openai`` and ``resend`` take a noticeable share of cold start and most
+processes (Celery workers, autoscaled instances serving plain CRUD) never use
+them. Modules that need one call the accessor here at use time instead of
+importing the SDK at module load, so the import happens on first use only.
+"""
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from src.config.settings import settings
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    from openai import AsyncOpenAI
+
+
+@lru_cache
+def get_openai_client() -> "AsyncOpenAI | None":
+    """Shared OpenAI client, or None when no API key is configured."""
+    if not settings.OPENAI_API_KEY:
+        return None
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+
+
+def openai_error() -> type[Exception]:
+    """Base exception class of the OpenAI SDK."""
+    from openai import OpenAIError
+
+    return OpenAIError
+
+
+@lru_cache
+def get_resend() -> "ModuleType":
+    """The Resend SDK module, configured with the API key."""
+    import resend
+
+    resend.api_key = settings.RESEND_API_KEY
+    return resend
+
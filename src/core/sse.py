@@ -0,0 +1,179 @@
+"""Server-Sent Events connection hub.
+
+An open SSE stream costs this process nothing but a queue:
+
+- endpoints authorize with a short-lived database session
+  (``StreamUser``) that is released before streaming starts, so idle
+  streams don't hold pool connections;
+- heartbeats for every stream come from one timer wheel ticking once a
+  second: a stream sits in one of ``SSE_HEARTBEAT_SECONDS`` slots and gets
+  a heartbeat when its slot comes round and nothing was sent to it since
+  the previous round, instead of each stream running its own timeout;
+- ``SSE_MAX_STREAMS_PER_USER`` and ``SSE_MAX_STREAMS_PER_NODE`` cap open
+  streams (``StreamLimitError``, answered with 429);
+- ``ConnectionHub.stats`` reports the open stream gauges, also served by
+  ``/metrics``.
+
+Producers put items on ``Connection.queue``; stream generators read them
+with ``Connection.receive``, which returns ``HEARTBEAT`` for heartbeats.
+"""
+import asyncio
+import itertools
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from src.config.settings import settings
+from src.core import metrics
+
+HEARTBEAT = object()
+HEARTBEAT_FRAME = ": heartbeat\n\n"
+TICK_SECONDS = 1.0
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+class StreamLimitError(Exception):
+    """Raised when opening a stream would exceed a stream limit."""
+
+
+@dataclass(eq=False)
+class Connection:
+    """One open stream of a user on a channel."""
+
+    user_id: uuid.UUID
+    channel: str
+    slot: int
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    active: bool = True  # something was sent since the slot last came round
+
+    async def receive(self) -> Any:
+        """Next item put on the queue, or ``HEARTBEAT``."""
+        item = await self.queue.get()
+        if item is not HEARTBEAT:
+            self.active = True
+        return item
+
+
+class ConnectionHub:
+    """Open SSE streams of this process, their limits and heartbeats."""
+
+    def __init__(
+        self,
+        heartbeat_seconds: int,
+        max_streams_per_user: int,
+        max_streams_per_node: int,
+    ):
+        self.max_streams_per_user = max_streams_per_user
+        self.max_streams_per_node = max_streams_per_node
+        self._wheel: list[set[Connection]] = [set() for _ in range(max(1, heartbeat_seconds))]
+        self._position = 0
+        self._slots = itertools.count()
+        self._by_user: Counter[uuid.UUID] = Counter()
+        self._by_channel: Counter[str] = Counter()
+        self._timer: asyncio.Task | None = None
+        self.rejected = 0
+
+    @property
+    def open_streams(self) -> int:
+        return sum(self._by_channel.values())
+
+    def connect(self, user_id: uuid.UUID, channel: str) -> Connection:
+        """Register a stream; raises ``StreamLimitError`` over a limit."""
+        if self.open_streams >= self.max_streams_per_node:
+            self.rejected += 1
+            raise StreamLimitError("Too many open streams on this server")
+        if self._by_user[user_id] >= self.max_streams_per_user:
+            self.rejected += 1
+            raise StreamLimitError("Too many open streams for this user")
+
+        # Round-robin slots spread heartbeats evenly over the wheel
+        connection = Connection(user_id, channel, next(self._slots) % len(self._wheel))
+        self._wheel[connection.slot].add(connection)
+        self._by_user[user_id] += 1
+        self._by_channel[channel] += 1
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.get_running_loop().create_task(self._run())
+        return connection
+
+    def disconnect(self, connection: Connection) -> None:
+        """Unregister a stream; safe to call more than once."""
+        if connection not in self._wheel[connection.slot]:
+            return
+        self._wheel[connection.slot].discard(connection)
+        for counter, key in ((self._by_user, connection.user_id), (self._by_channel, connection.channel)):
+            counter[key] -= 1
+            if counter[key] <= 0:
+                del counter[key]
+
+    def tick(self) -> int:
+        """Advance the wheel one slot; returns the number of heartbeats queued."""
+        self._position = (self._position + 1) % len(self._wheel)
+        queued = 0
+        for connection in self._wheel[self._position]:
+            if not connection.active and connection.queue.empty():
+                connection.queue.put_nowait(HEARTBEAT)
+                queued += 1
+            connection.active = False
+        return queued
+
+    async def _run(self) -> None:
+        while self.open_streams:
+            await asyncio.sleep(TICK_SECONDS)
+            self.tick()
+
+    def response(self, connection: Connection, body: AsyncIterator[str]) -> StreamingResponse:
+        """SSE response streaming ``body``, unregistering ``connection`` at the end."""
+        return StreamingResponse(
+            self._stream(connection, body),
+            media_type="text/event-stream",
+            headers=SSE_HEADERS,
+            # Also runs when the client leaves before the body was started
+            background=BackgroundTask(self.disconnect, connection),
+        )
+
+    async def _stream(self, connection: Connection, body: AsyncIterator[str]) -> AsyncIterator[str]:
+        try:
+            async with aclosing(body):
+                async for chunk in body:
+                    yield chunk
+        finally:
+            self.disconnect(connection)
+
+    def stats(self) -> dict[str, Any]:
+        """Open stream gauges of this process."""
+        return {
+            "open_streams": self.open_streams,
+            "users": len(self._by_user),
+            "by_channel": dict(self._by_channel),
+            "rejected": self.rejected,
+        }
+
+
+sse_hub = ConnectionHub(
+    heartbeat_seconds=settings.SSE_HEARTBEAT_SECONDS,
+    max_streams_per_user=settings.SSE_MAX_STREAMS_PER_USER,
+    max_streams_per_node=settings.SSE_MAX_STREAMS_PER_NODE,
+)
+
+SSE_OPEN_STREAMS = metrics.Gauge(
+    "sse_open_streams",
+    "Open Server-Sent Events streams of this process by channel.",
+    labels=("channel",),
+    collect=lambda: {(channel,): count for channel, count in sse_hub.stats()["by_channel"].items()},
+)
+SSE_REJECTED_STREAMS = metrics.Counter(
+    "sse_rejected_streams_total",
+    "Server-Sent Events streams refused over a stream limit.",
+    collect=lambda: {(): sse_hub.rejected},
+)
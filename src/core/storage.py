@@ -4,14 +4,22 @@ Supports:
 - AWS S3
 - Cloudflare R2 (S3-compatible)
 - Local filesystem (for development)
+
+Uploads are streamed: the request body is read in ``UPLOAD_CHUNK_SIZE``
+chunks, size limits and content sniffing are enforced as bytes arrive, and
+data goes straight to disk or to an S3 multipart upload. A SHA-256 of the
+content is computed on the fly and used as the object name, so re-uploading
+the same file reuses the existing object instead of storing a copy.
 """
+import asyncio
 import hashlib
 import logging
-import os
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack
 from datetime import datetime
 from pathlib import Path
-from typing import BinaryIO, Literal
+from typing import Literal, Protocol
 
 import aiofiles
 import aiofiles.os
@@ -25,11 +33,24 @@ logger = logging.getLogger(__name__)
 MAX_AVATAR_SIZE = 5 * 1024 * 1024  # 5MB
 MAX_EXERCISE_MEDIA_SIZE = 50 * 1024 * 1024  # 50MB
 
+# Streaming
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB read from the request at a time
+S3_PART_SIZE = 8 * 1024 * 1024  # Multipart part size (S3 minimum is 5MB)
+
 # Allowed content types
 ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 ALLOWED_VIDEO_TYPES = {"video/mp4", "video/quicktime", "video/webm"}
 ALLOWED_MEDIA_TYPES = ALLOWED_IMAGE_TYPES | ALLOWED_VIDEO_TYPES
 
+# MP4 and QuickTime share the ISO base media container; phones routinely
+# label one as the other.
+_EQUIVALENT_TYPES = {
+    "video/mp4": {"video/mp4", "video/quicktime"},
+    "video/quicktime": {"video/mp4", "video/quicktime"},
+}
+
+CACHE_CONTROL_IMMUTABLE = "public, max-age=31536000, immutable"
+
 
 class StorageError(Exception):
     """Base exception for storage errors."""
@@ -49,23 +70,144 @@ class InvalidContentTypeError(StorageError):
     pass
 
 
+class AsyncReadable(Protocol):
+    """Anything with an async ``read(size)``, e.g. FastAPI's ``UploadFile``."""
+
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+UploadSource = bytes | AsyncReadable
+
+
+class _BytesReader:
+    """Adapts in-memory bytes to the ``AsyncReadable`` interface."""
+
+    def __init__(self, data: bytes):
+        self._view = memoryview(data)
+        self._offset = 0
+        self.size = len(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            size = len(self._view) - self._offset
+        chunk = self._view[self._offset:self._offset + size]
+        self._offset += len(chunk)
+        return bytes(chunk)
+
+
+def sniff_content_type(head: bytes) -> str | None:
+    """Detect the media type from the leading bytes of a file."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "video/webm"
+    if head[4:8] == b"ftyp":
+        return "video/quicktime" if head[8:12] == b"qt  " else "video/mp4"
+    return None
+
+
+class StreamedUpload:
+    """Reads an upload chunk by chunk, validating and hashing as it goes.
+
+    Only one chunk is held at a time. The declared content type must match
+    what the first bytes say, and ``FileTooLargeError`` is raised as soon as
+    the running size passes ``max_size`` rather than after the whole body has
+    been read.
+    """
+
+    def __init__(
+        self,
+        source: UploadSource,
+        content_type: str,
+        max_size: int,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+    ):
+        self._source = _BytesReader(source) if isinstance(source, (bytes, bytearray)) else source
+        self.content_type = content_type
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._hasher = hashlib.sha256()
+
+    @property
+    def declared_size(self) -> int | None:
+        """Size reported by the client (``UploadFile.size``), if any."""
+        return getattr(self._source, "size", None)
+
+    @property
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+    def _check_size(self, size: int) -> None:
+        if size > self.max_size:
+            raise FileTooLargeError(
+                f"File size exceeds maximum allowed {self.max_size / (1024 * 1024):.0f}MB"
+            )
+
+    def _check_signature(self, head: bytes) -> None:
+        sniffed = sniff_content_type(head)
+        accepted = _EQUIVALENT_TYPES.get(self.content_type, {self.content_type})
+        if sniffed not in accepted:
+            raise InvalidContentTypeError(
+                f"File content does not match declared type '{self.content_type}'"
+            )
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        """Yield validated chunks of the upload."""
+        if self.declared_size is not None:
+            self._check_size(self.declared_size)
+
+        first = True
+        while True:
+            chunk = await self._source.read(self.chunk_size)
+            if not chunk:
+                break
+            self.size += len(chunk)
+            self._check_size(self.size)
+            if first:
+                self._check_signature(chunk)
+                first = False
+            self._hasher.update(chunk)
+            yield chunk
+
+        if first:
+            raise InvalidContentTypeError("Empty file")
+
+
 class StorageService:
     """Service for uploading and managing files in cloud storage."""
 
-    def __init__(self):
-        self._s3_client = None
-        self._initialized = False
+    def __init__(self, s3_client=None):
+        # A pre-built client may be injected (tests, benchmarks); otherwise one
+        # long-lived client is opened on first use and closed by ``close()``.
+        self._s3_client = s3_client
+        self._s3_exit_stack: AsyncExitStack | None = None
+        self._client_lock = asyncio.Lock()
+        self._initialized = s3_client is not None
 
     async def _get_s3_client(self):
-        """Get or create S3 client (lazy initialization)."""
+        """Get or create the shared S3 client (lazy initialization)."""
         if self._s3_client is not None:
             return self._s3_client
 
         if settings.STORAGE_PROVIDER == "local":
             return None
 
-        try:
-            import aioboto3
+        async with self._client_lock:
+            if self._s3_client is not None:
+                return self._s3_client
+
+            try:
+                import aioboto3
+            except ImportError:
+                logger.warning("aioboto3 not installed, using local storage")
+                return None
 
             session = aioboto3.Session(
                 aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
@@ -76,20 +218,27 @@ class StorageService:
             # Build endpoint URL for R2 if configured
             endpoint_url = settings.S3_ENDPOINT_URL or None
 
-            self._s3_client = session.client(
-                "s3",
-                endpoint_url=endpoint_url,
+            # Enter the client context once and keep it for the process
+            # lifetime; aiobotocore clients can't be re-entered per call.
+            stack = AsyncExitStack()
+            self._s3_client = await stack.enter_async_context(
+                session.client("s3", endpoint_url=endpoint_url)
             )
+            self._s3_exit_stack = stack
             self._initialized = True
             return self._s3_client
 
-        except ImportError:
-            logger.warning("aioboto3 not installed, using local storage")
-            return None
+    async def close(self) -> None:
+        """Close the shared S3 client, if this service opened one."""
+        if self._s3_exit_stack is not None:
+            await self._s3_exit_stack.aclose()
+            self._s3_exit_stack = None
+            self._s3_client = None
+            self._initialized = False
 
     def _generate_file_path(
         self,
-        file_type: Literal["avatars", "exercises", "media"],
+        file_type: Literal["avatars", "exercises", "media", "incoming"],
         user_id: str | None = None,
         extension: str = "",
     ) -> str:
@@ -103,6 +252,18 @@ class StorageService:
             return f"{file_type}/{user_id}/{timestamp}_{unique_id}{extension}"
         return f"{file_type}/{timestamp}_{unique_id}{extension}"
 
+    def _content_file_path(
+        self,
+        file_type: Literal["avatars", "exercises", "media"],
+        digest: str,
+        user_id: str | None = None,
+        extension: str = "",
+    ) -> str:
+        """Content-addressed path: identical uploads map to the same object."""
+        if user_id:
+            return f"{file_type}/{user_id}/{digest[:32]}{extension}"
+        return f"{file_type}/{digest[:32]}{extension}"
+
     def _get_extension_from_content_type(self, content_type: str) -> str:
         """Get file extension from content type."""
         extensions = {
@@ -116,6 +277,20 @@ class StorageService:
         }
         return extensions.get(content_type, "")
 
+    def _public_url(self, path: str) -> str:
+        """Public URL of an object stored in S3/R2."""
+        # Return CDN URL if configured, otherwise construct S3 URL
+        if settings.CDN_BASE_URL:
+            return f"{settings.CDN_BASE_URL.rstrip('/')}/{path}"
+
+        # Direct S3 URL
+        if settings.S3_ENDPOINT_URL:
+            # R2 URL
+            return f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{settings.S3_BUCKET_NAME}/{path}"
+
+        # AWS S3 URL
+        return f"https://{settings.S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{path}"
+
     def _validate_file(
         self,
         content_type: str,
@@ -139,77 +314,184 @@ class StorageService:
 
     async def _upload_to_local(
         self,
-        file_content: bytes,
-        path: str,
-        content_type: str,
+        upload: StreamedUpload,
+        file_type: Literal["avatars", "exercises", "media"],
+        user_id: str | None,
+        extension: str,
     ) -> str:
-        """Upload file to local filesystem (development only)."""
-        local_path = Path(settings.LOCAL_STORAGE_PATH) / path
+        """Stream an upload to the local filesystem (development only)."""
+        root = Path(settings.LOCAL_STORAGE_PATH)
+        staging_path = root / ".incoming" / uuid.uuid4().hex
+        await aiofiles.os.makedirs(staging_path.parent, exist_ok=True)
 
-        # Create directories if needed
-        await aiofiles.os.makedirs(local_path.parent, exist_ok=True)
-
-        # Write file
-        async with aiofiles.open(local_path, "wb") as f:
-            await f.write(file_content)
-
-        logger.info(f"Uploaded file to local storage: {path}")
+        try:
+            async with aiofiles.open(staging_path, "wb") as f:
+                async for chunk in upload.chunks():
+                    await f.write(chunk)
+
+            path = self._content_file_path(file_type, upload.hexdigest, user_id, extension)
+            local_path = root / path
+            if await aiofiles.os.path.exists(local_path):
+                await aiofiles.os.remove(staging_path)
+                logger.info(f"Reused existing local file: {path}")
+            else:
+                await aiofiles.os.makedirs(local_path.parent, exist_ok=True)
+                await aiofiles.os.replace(staging_path, local_path)
+                logger.info(f"Uploaded file to local storage: {path}")
+        except BaseException:
+            if await aiofiles.os.path.exists(staging_path):
+                await aiofiles.os.remove(staging_path)
+            raise
 
         # Return URL (assuming static file server is configured)
         return f"/uploads/{path}"
 
+    async def _s3_object_exists(self, s3, path: str) -> bool:
+        try:
+            await s3.head_object(Bucket=settings.S3_BUCKET_NAME, Key=path)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
     async def _upload_to_s3(
         self,
-        file_content: bytes,
-        path: str,
-        content_type: str,
+        s3,
+        upload: StreamedUpload,
+        file_type: Literal["avatars", "exercises", "media"],
+        user_id: str | None,
+        extension: str,
     ) -> str:
-        """Upload file to S3 or R2."""
-        client = await self._get_s3_client()
-        if client is None:
-            # Fallback to local
-            return await self._upload_to_local(file_content, path, content_type)
+        """Stream an upload to S3 or R2.
+
+        Files smaller than one part go up with a single ``put_object`` once
+        their hash is known. Larger files are sent as a multipart upload to a
+        staging key, then copied server-side to their content-addressed key.
+        At most one part is buffered in memory.
+        """
+        bucket = settings.S3_BUCKET_NAME
+        buffer = bytearray()
+        parts: list[dict] = []
+        staging_key: str | None = None
+        upload_id: str | None = None
+
+        async def flush_part() -> None:
+            part = await s3.upload_part(
+                Bucket=bucket,
+                Key=staging_key,
+                UploadId=upload_id,
+                PartNumber=len(parts) + 1,
+                # Sent as-is; copying to bytes would double the part in memory
+                Body=buffer,
+            )
+            parts.append({"ETag": part["ETag"], "PartNumber": len(parts) + 1})
+            buffer.clear()
 
         try:
-            async with client as s3:
-                await s3.put_object(
-                    Bucket=settings.S3_BUCKET_NAME,
-                    Key=path,
-                    Body=file_content,
-                    ContentType=content_type,
-                    # Cache for 1 year (immutable files with unique names)
-                    CacheControl="public, max-age=31536000, immutable",
+            async for chunk in upload.chunks():
+                buffer += chunk
+                if len(buffer) < S3_PART_SIZE:
+                    continue
+                if upload_id is None:
+                    staging_key = self._generate_file_path("incoming", user_id, extension)
+                    response = await s3.create_multipart_upload(
+                        Bucket=bucket,
+                        Key=staging_key,
+                        ContentType=upload.content_type,
+                    )
+                    upload_id = response["UploadId"]
+                await flush_part()
+
+            path = self._content_file_path(file_type, upload.hexdigest, user_id, extension)
+            exists = await self._s3_object_exists(s3, path)
+
+            if upload_id is None:
+                if not exists:
+                    await s3.put_object(
+                        Bucket=bucket,
+                        Key=path,
+                        Body=buffer,
+                        ContentType=upload.content_type,
+                        # Cache for 1 year (content-addressed names never change)
+                        CacheControl=CACHE_CONTROL_IMMUTABLE,
+                    )
+            else:
+                if buffer:
+                    await flush_part()
+                await s3.complete_multipart_upload(
+                    Bucket=bucket,
+                    Key=staging_key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts},
                 )
+                upload_id = None
+                if not exists:
+                    await s3.copy_object(
+                        Bucket=bucket,
+                        Key=path,
+                        CopySource={"Bucket": bucket, "Key": staging_key},
+                        ContentType=upload.content_type,
+                        CacheControl=CACHE_CONTROL_IMMUTABLE,
+                        MetadataDirective="REPLACE",
+                    )
+                await s3.delete_object(Bucket=bucket, Key=staging_key)
+
+        except BaseException as e:
+            if upload_id is not None:
+                try:
+                    await s3.abort_multipart_upload(
+                        Bucket=bucket, Key=staging_key, UploadId=upload_id
+                    )
+                except (BotoCoreError, ClientError, OSError) as abort_error:
+                    logger.warning(f"Failed to abort multipart upload: {abort_error}")
+            if isinstance(e, (BotoCoreError, ClientError, OSError)):
+                logger.error(f"Failed to upload to S3: {e}")
+                raise StorageError(f"Failed to upload file: {e}") from e
+            raise
+
+        logger.info(
+            f"Uploaded file to S3: {path} ({upload.size} bytes"
+            f"{', deduplicated' if exists else ''})"
+        )
+        return self._public_url(path)
 
-            logger.info(f"Uploaded file to S3: {path}")
-
-            # Return CDN URL if configured, otherwise construct S3 URL
-            if settings.CDN_BASE_URL:
-                return f"{settings.CDN_BASE_URL.rstrip('/')}/{path}"
-
-            # Direct S3 URL
-            if settings.S3_ENDPOINT_URL:
-                # R2 URL
-                return f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{settings.S3_BUCKET_NAME}/{path}"
+    async def _upload(
+        self,
+        source: UploadSource,
+        content_type: str,
+        file_type: Literal["avatars", "exercises", "media"],
+        allowed_types: set[str],
+        max_size: int,
+        user_id: str | None,
+    ) -> str:
+        upload = StreamedUpload(source, content_type, max_size)
 
-            # AWS S3 URL
-            return f"https://{settings.S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{path}"
+        # Reject on the declared metadata before reading a single byte
+        self._validate_file(
+            content_type=content_type,
+            file_size=upload.declared_size or 0,
+            allowed_types=allowed_types,
+            max_size=max_size,
+        )
 
-        except (BotoCoreError, ClientError, OSError) as e:
-            logger.error(f"Failed to upload to S3: {e}")
-            raise StorageError(f"Failed to upload file: {e}") from e
+        extension = self._get_extension_from_content_type(content_type)
+        s3 = await self._get_s3_client()
+        if s3 is None:
+            return await self._upload_to_local(upload, file_type, user_id, extension)
+        return await self._upload_to_s3(s3, upload, file_type, user_id, extension)
 
     async def upload_avatar(
         self,
         user_id: str,
-        file_content: bytes,
+        source: UploadSource,
         content_type: str,
     ) -> str:
         """Upload user avatar image.
 
         Args:
             user_id: UUID of the user
-            file_content: Raw file bytes
+            source: File to upload, streamed (``UploadFile``) or raw bytes
             content_type: MIME type of the file
 
         Returns:
@@ -217,36 +499,29 @@ class StorageService:
 
         Raises:
             InvalidContentTypeError: If content type is not an allowed image type
+                or the file content doesn't match it
             FileTooLargeError: If file exceeds maximum size
             StorageError: If upload fails
         """
-        # Validate
-        self._validate_file(
-            content_type=content_type,
-            file_size=len(file_content),
+        return await self._upload(
+            source,
+            content_type,
+            file_type="avatars",
             allowed_types=ALLOWED_IMAGE_TYPES,
             max_size=MAX_AVATAR_SIZE,
+            user_id=user_id,
         )
 
-        # Generate path
-        extension = self._get_extension_from_content_type(content_type)
-        path = self._generate_file_path("avatars", user_id, extension)
-
-        # Upload
-        if settings.STORAGE_PROVIDER == "local":
-            return await self._upload_to_local(file_content, path, content_type)
-        return await self._upload_to_s3(file_content, path, content_type)
-
     async def upload_exercise_media(
         self,
-        file_content: bytes,
+        source: UploadSource,
         content_type: str,
         user_id: str | None = None,
     ) -> str:
         """Upload exercise media (image or video).
 
         Args:
-            file_content: Raw file bytes
+            source: File to upload, streamed (``UploadFile``) or raw bytes
             content_type: MIME type of the file
             user_id: Optional UUID of the user uploading (for custom exercises)
 
@@ -254,27 +529,20 @@ class StorageService:
             Public URL of the uploaded file
 
         Raises:
-            InvalidContentTypeError: If content type is not allowed
+            InvalidContentTypeError: If content type is not allowed or the file
+                content doesn't match it
             FileTooLargeError: If file exceeds maximum size
             StorageError: If upload fails
         """
-        # Validate
-        self._validate_file(
-            content_type=content_type,
-            file_size=len(file_content),
+        return await self._upload(
+            source,
+            content_type,
+            file_type="exercises",
             allowed_types=ALLOWED_MEDIA_TYPES,
             max_size=MAX_EXERCISE_MEDIA_SIZE,
+            user_id=user_id,
         )
 
-        # Generate path
-        extension = self._get_extension_from_content_type(content_type)
-        path = self._generate_file_path("exercises", user_id, extension)
-
-        # Upload
-        if settings.STORAGE_PROVIDER == "local":
-            return await self._upload_to_local(file_content, path, content_type)
-        return await self._upload_to_s3(file_content, path, content_type)
-
     async def delete_file(self, url: str) -> bool:
         """Delete a file from storage.
 
@@ -305,15 +573,14 @@ class StorageService:
                 logger.warning(f"Could not extract path from URL: {url}")
                 return False
 
-            client = await self._get_s3_client()
-            if client is None:
+            s3 = await self._get_s3_client()
+            if s3 is None:
                 return False
 
-            async with client as s3:
-                await s3.delete_object(
-                    Bucket=settings.S3_BUCKET_NAME,
-                    Key=path,
-                )
+            await s3.delete_object(
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=path,
+            )
 
             logger.info(f"Deleted S3 file: {path}")
             return True
@@ -350,31 +617,22 @@ class StorageService:
         extension = self._get_extension_from_content_type(content_type)
         path = self._generate_file_path(file_type, user_id, extension)
 
-        client = await self._get_s3_client()
-        if client is None:
+        s3 = await self._get_s3_client()
+        if s3 is None:
             raise StorageError("S3 client not available")
 
         try:
-            async with client as s3:
-                upload_url = await s3.generate_presigned_url(
-                    "put_object",
-                    Params={
-                        "Bucket": settings.S3_BUCKET_NAME,
-                        "Key": path,
-                        "ContentType": content_type,
-                    },
-                    ExpiresIn=expires_in,
-                )
-
-            # Generate final URL
-            if settings.CDN_BASE_URL:
-                final_url = f"{settings.CDN_BASE_URL.rstrip('/')}/{path}"
-            elif settings.S3_ENDPOINT_URL:
-                final_url = f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{settings.S3_BUCKET_NAME}/{path}"
-            else:
-                final_url = f"https://{settings.S3_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{path}"
+            upload_url = await s3.generate_presigned_url(
+                "put_object",
+                Params={
+                    "Bucket": settings.S3_BUCKET_NAME,
+                    "Key": path,
+                    "ContentType": content_type,
+                },
+                ExpiresIn=expires_in,
+            )
 
-            return upload_url, final_url
+            return upload_url, self._public_url(path)
 
         except (BotoCoreError, ClientError, OSError) as e:
             logger.error(f"Failed to generate presigned URL: {e}")
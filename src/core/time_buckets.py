@@ -0,0 +1,36 @@
+"""Portable SQL expressions for calendar buckets and durations.
+
+PostgreSQL has ``date_trunc``; SQLite (tests, local development) only has
+``date()`` with modifiers. Both return the first day of the bucket as a date,
+with weeks starting on Monday.
+"""
+from typing import Literal
+
+from sqlalchemy import ColumnElement, Date, Integer, cast, func
+
+BucketUnit = Literal["day", "week", "month"]
+
+_SQLITE_MODIFIERS: dict[str, tuple[str, ...]] = {
+    "day": (),
+    # 'weekday 0' moves forward to Sunday (or stays on it), then back to Monday
+    "week": ("weekday 0", "-6 days"),
+    "month": ("start of month",),
+}
+
+
+def bucket_start(column: ColumnElement, unit: BucketUnit, dialect: str) -> ColumnElement:
+    """SQL expression for the first day of the ``unit`` containing ``column``."""
+    if unit not in _SQLITE_MODIFIERS:
+        raise ValueError(f"Unsupported bucket unit: {unit}")
+    if dialect == "postgresql":
+        return cast(func.date_trunc(unit, column), Date)
+    return func.date(column, *_SQLITE_MODIFIERS[unit], type_=Date)
+
+
+def whole_minutes_between(start: ColumnElement, end: ColumnElement, dialect: str) -> ColumnElement:
+    """SQL expression for the whole minutes elapsed from ``start`` to ``end``."""
+    if dialect == "postgresql":
+        return func.floor(func.extract("epoch", end - start) / 60)
+    # Round to whole seconds first: julianday() differences aren't exact
+    seconds = func.round((func.julianday(end) - func.julianday(start)) * 86400)
+    return cast(seconds / 60, Integer)
@@ -6,7 +6,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.config.database import get_db
+from src.config.database import AsyncSessionLocal, get_db
 from src.core.redis import TokenBlacklist
 from src.core.security import decode_token
 from src.domains.auth.service import AuthService
@@ -87,6 +87,25 @@ async def get_current_user(
     return user
 
 
+async def get_stream_user(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
+) -> User:
+    """Get the current authenticated user for a streaming response.
+
+    Uses its own short-lived database session, closed before the response
+    starts, instead of the request session, which ``get_db`` keeps open
+    until the response ends.
+
+    Args:
+        credentials: HTTP Bearer credentials
+
+    Returns:
+        The authenticated User object
+    """
+    async with AsyncSessionLocal() as db:
+        return await get_current_user(credentials, db)
+
+
 async def get_current_active_user(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
@@ -135,3 +154,4 @@ async def get_current_verified_user(
 CurrentUser = Annotated[User, Depends(get_current_user)]
 ActiveUser = Annotated[User, Depends(get_current_active_user)]
 VerifiedUser = Annotated[User, Depends(get_current_verified_user)]
+StreamUser = Annotated[User, Depends(get_stream_user)]
@@ -157,7 +157,7 @@ class Payment(Base, UUIDMixin, TimestampMixin):
     payer = relationship("User", foreign_keys=[payer_id], lazy="selectin")
     payee = relationship("User", foreign_keys=[payee_id], lazy="selectin")
     organization = relationship("Organization", lazy="selectin")
-    parent_payment = relationship("Payment", remote_side="Payment.id", lazy="selectin")
+    parent_payment = relationship("Payment", remote_side="Payment.id")
     service_plan = relationship("ServicePlan", lazy="selectin")
 
 
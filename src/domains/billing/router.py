@@ -5,13 +5,13 @@ from uuid import UUID
 
 import json
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import and_, extract, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.database import get_db
-from src.core.email import send_payment_reminder_email
 from src.domains.auth.dependencies import CurrentUser
+from src.domains.notifications.email_outbox import enqueue_email
 from src.domains.users.models import User
 
 from .models import (
@@ -307,7 +307,6 @@ async def send_payment_reminder(
     payment_id: UUID,
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
-    background_tasks: BackgroundTasks,
     request: SendReminderRequest | None = None,
 ) -> None:
     """Send a payment reminder to the payer."""
@@ -331,20 +330,27 @@ async def send_payment_reminder(
             detail="Payment is already paid",
         )
 
-    # Send payment reminder email in background
+    now = datetime.now(timezone.utc)
+
+    # Queue payment reminder email with the reminder flag (at most one per
+    # payment per day, so repeated clicks don't spam the payer)
     payer = await db.get(User, payment.payer_id)
     if payer:
-        background_tasks.add_task(
-            send_payment_reminder_email,
+        await enqueue_email(
+            db,
+            "payment_reminder",
             to_email=payer.email,
-            name=payer.name,
-            amount=payment.amount_cents / 100,
-            due_date=payment.due_date.strftime("%d/%m/%Y") if payment.due_date else "Não definido",
-            trainer_name=current_user.name,
+            context={
+                "name": payer.name,
+                "amount": payment.amount_cents / 100,
+                "due_date": payment.due_date.strftime("%d/%m/%Y") if payment.due_date else "Não definido",
+                "trainer_name": current_user.name,
+            },
+            dedup_key=f"payment_reminder:{payment.id}:{now.date().isoformat()}",
         )
 
     payment.reminder_sent = True
-    payment.reminder_sent_at = datetime.now(timezone.utc)
+    payment.reminder_sent_at = now
 
     await db.commit()
 
@@ -858,7 +864,7 @@ async def student_confirm_payment(
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> dict:
     """Student signals they've paid. Creates notification for trainer."""
-    from src.domains.notifications.router import create_notification
+    from src.domains.notifications.service import create_notification
     from src.domains.notifications.models import NotificationType, NotificationPriority
     from src.domains.notifications.schemas import NotificationCreate
 
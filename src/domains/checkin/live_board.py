@@ -0,0 +1,269 @@
+"""Trainer live board: today's check-ins of a trainer's active session.
+
+The board is a small read model kept in the cache, one entry per trainer. It
+is built with two column-only queries when missing and invalidated whenever a
+commit touches one of the trainer's check-ins or their location, so serving
+it never writes and costs no queries while it is fresh.
+
+Time-dependent fields (elapsed minutes, session expiry) are computed when the
+board is rendered; stale confirmed check-ins are closed by the scheduler with
+``CheckInService.expire_stale_checkins``.
+
+Subscribers of ``stream_board`` get the rendered board whenever it changes:
+right away for commits made by this process, and on the next idle heartbeat
+of their stream (see ``src.core.sse``) for commits made by other processes.
+"""
+import asyncio
+import hashlib
+import logging
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+import orjson
+from sqlalchemy import and_, event, select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config.database import AsyncSessionLocal
+from src.core.redis import cache_delete, cache_get, cache_set
+from src.core.sse import HEARTBEAT_FRAME, Connection
+from src.domains.checkin.models import CheckIn, TrainerLocation
+from src.domains.users.models import User
+
+logger = logging.getLogger(__name__)
+
+BOARD_PREFIX = "checkin:live_board:"
+# Safety net for changes the session events don't see (e.g. a student's name)
+BOARD_TTL_SECONDS = 300
+
+# Trainers whose board was changed by this process and not rebuilt yet
+_stale_trainers: set[uuid.UUID] = set()
+_subscribers: dict[uuid.UUID, list[asyncio.Queue]] = {}
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _utc(dt: datetime | None) -> datetime | None:
+    if dt is not None and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _iso(dt: datetime | None) -> str | None:
+    return _utc(dt).isoformat() if dt else None
+
+
+async def build_board(db: AsyncSession, trainer_id: uuid.UUID) -> dict[str, Any]:
+    """Board of ``trainer_id`` read from the database."""
+    now = datetime.now(timezone.utc)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    result = await db.execute(
+        select(
+            TrainerLocation.id,
+            TrainerLocation.session_started_at,
+            TrainerLocation.updated_at,
+            TrainerLocation.expires_at,
+            TrainerLocation.latitude,
+            TrainerLocation.longitude,
+        ).where(
+            TrainerLocation.user_id == trainer_id,
+            TrainerLocation.session_active == True,  # noqa: E712
+        )
+    )
+    loc = result.one_or_none()
+
+    checkins = []
+    if loc:
+        result = await db.execute(
+            select(
+                CheckIn.id,
+                CheckIn.checked_in_at,
+                CheckIn.accepted_at,
+                CheckIn.checked_out_at,
+                User.name,
+                User.avatar_url,
+            )
+            .outerjoin(User, User.id == CheckIn.user_id)
+            .where(
+                and_(
+                    CheckIn.approved_by_id == trainer_id,
+                    CheckIn.checked_in_at >= today_start,
+                )
+            )
+            .order_by(CheckIn.checked_in_at.desc())
+        )
+        checkins = [
+            {
+                "id": str(row.id),
+                "student_name": row.name or "Aluno",
+                "student_avatar": row.avatar_url,
+                "checked_in_at": _iso(row.checked_in_at),
+                "started_at": _iso(row.accepted_at or row.checked_in_at),
+                "checked_out_at": _iso(row.checked_out_at),
+            }
+            for row in result
+        ]
+
+    board = {
+        "day": today_start.date().isoformat(),
+        "session": {
+            "id": str(loc.id),
+            "started_at": _iso(loc.session_started_at or loc.updated_at) or _iso(now),
+            "expires_at": _iso(loc.expires_at),
+            "latitude": loc.latitude,
+            "longitude": loc.longitude,
+        } if loc else None,
+        "checkins": checkins,
+    }
+    # Derived from the content, so rebuilding an unchanged board is not re-sent
+    content = orjson.dumps(board, option=orjson.OPT_SORT_KEYS)
+    board["version"] = hashlib.sha1(content).hexdigest()
+    return board
+
+
+async def get_board(trainer_id: uuid.UUID, db: AsyncSession | None = None) -> dict[str, Any]:
+    """Cached board of ``trainer_id``, rebuilt if missing, stale or from another day.
+
+    Rebuilding uses ``db`` when given, otherwise a short-lived session. When
+    the cache is unavailable the board is built from the database.
+    """
+    key = f"{BOARD_PREFIX}{trainer_id}"
+    today = datetime.now(timezone.utc).date().isoformat()
+    if trainer_id in _stale_trainers:
+        _stale_trainers.discard(trainer_id)
+    else:
+        try:
+            cached = await cache_get(key)
+        except Exception as e:
+            logger.warning(f"Live board cache read failed for {trainer_id}: {e}")
+            cached = None
+        if cached:
+            board = orjson.loads(cached)
+            if board["day"] == today:
+                return board
+
+    if db is None:
+        async with AsyncSessionLocal() as session:
+            board = await build_board(session, trainer_id)
+    else:
+        board = await build_board(db, trainer_id)
+    try:
+        await cache_set(key, orjson.dumps(board).decode(), BOARD_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Live board cache write failed for {trainer_id}: {e}")
+    return board
+
+
+def render_board(board: dict[str, Any]) -> dict[str, Any] | None:
+    """API payload of a board, or None when the trainer has no active session."""
+    session = board["session"]
+    now = datetime.now(timezone.utc)
+    if not session or not session["expires_at"] or datetime.fromisoformat(session["expires_at"]) <= now:
+        return None
+
+    return {
+        "session": {
+            "id": session["id"],
+            "started_at": session["started_at"],
+            "status": "active",
+            "latitude": session["latitude"],
+            "longitude": session["longitude"],
+        },
+        "checkins": [
+            {
+                "id": c["id"],
+                "student_name": c["student_name"],
+                "student_avatar": c["student_avatar"],
+                "checked_in_at": c["checked_in_at"],
+                "elapsed_minutes": int(
+                    (now - datetime.fromisoformat(c["started_at"])).total_seconds() / 60
+                ),
+                "status": "completed" if c["checked_out_at"] else "active",
+                "checked_out_at": c["checked_out_at"],
+            }
+            for c in board["checkins"]
+        ],
+    }
+
+
+def _spawn(coro: Awaitable[Any]) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def invalidate_boards(trainer_ids: Iterable[uuid.UUID]) -> None:
+    """Mark boards changed: rebuild on next read and wake their subscribers."""
+    trainer_ids = {trainer_id for trainer_id in trainer_ids if trainer_id}
+    if not trainer_ids:
+        return
+    _stale_trainers.update(trainer_ids)
+    for trainer_id in trainer_ids:
+        for queue in _subscribers.get(trainer_id, []):
+            queue.put_nowait(trainer_id)
+        try:
+            _spawn(cache_delete(f"{BOARD_PREFIX}{trainer_id}"))  # other processes
+        except RuntimeError:
+            pass  # no running loop: other processes catch up on TTL
+
+
+async def stream_board(connection: Connection) -> AsyncGenerator[str, None]:
+    """Stream the connected trainer's rendered board whenever it changes.
+
+    Doesn't hold a database session between updates.
+    """
+    trainer_id = connection.user_id
+    _subscribers.setdefault(trainer_id, []).append(connection.queue)
+    try:
+        sent_version = None
+        while True:
+            board = await get_board(trainer_id)
+            if board["version"] != sent_version:
+                sent_version = board["version"]
+                yield f"data: {orjson.dumps(render_board(board)).decode()}\n\n"
+            else:
+                yield HEARTBEAT_FRAME
+            await connection.receive()  # an invalidation or a heartbeat
+    finally:
+        _subscribers[trainer_id].remove(connection.queue)
+        if not _subscribers[trainer_id]:
+            del _subscribers[trainer_id]
+
+
+# --- Invalidation ----------------------------------------------------------
+
+_CHANGED_TRAINERS = "live_board_changed_trainers"
+
+
+def _trainer_ids(obj: object) -> set[uuid.UUID]:
+    if isinstance(obj, TrainerLocation):
+        return {obj.user_id}
+    if isinstance(obj, CheckIn):
+        history = sa_inspect(obj).attrs.approved_by_id.history
+        return {obj.approved_by_id, *history.deleted}
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_trainers(session: Session, flush_context) -> None:
+    changed = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        changed |= _trainer_ids(obj)
+    changed.discard(None)
+    if changed:
+        session.info.setdefault(_CHANGED_TRAINERS, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed(session: Session) -> None:
+    changed = session.info.pop(_CHANGED_TRAINERS, None)
+    if changed:
+        invalidate_boards(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed(session: Session) -> None:
+    session.info.pop(_CHANGED_TRAINERS, None)
@@ -63,7 +63,6 @@ class Gym(Base, UUIDMixin, TimestampMixin):
     check_in_codes: Mapped[list["CheckInCode"]] = relationship(
         "CheckInCode",
         back_populates="gym",
-        lazy="selectin",
     )
 
     def __repr__(self) -> str:
@@ -153,7 +152,7 @@ class CheckIn(Base, UUIDMixin):
     initiated_by_user: Mapped["User | None"] = relationship(
         "User", foreign_keys=[initiated_by]
     )
-    appointment: Mapped["Appointment | None"] = relationship("Appointment", lazy="selectin")
+    appointment: Mapped["Appointment | None"] = relationship("Appointment")
     service_plan: Mapped["ServicePlan | None"] = relationship("ServicePlan", lazy="selectin")
 
     @property
@@ -5,11 +5,14 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.database import get_db
-from src.domains.auth.dependencies import CurrentUser
+from src.core.sse import StreamLimitError, sse_hub
+from src.domains.auth.dependencies import CurrentUser, StreamUser
+from src.domains.checkin.live_board import stream_board
 from src.domains.checkin.models import CheckInMethod, CheckInStatus
 from src.domains.checkin.schemas import (
     ActiveSessionResponse,
@@ -81,7 +84,7 @@ async def _auto_mark_attendance(db: AsyncSession, appointment_id: UUID, trainer_
                 try:
                     from src.domains.notifications.models import NotificationType, NotificationPriority
                     from src.domains.notifications.schemas import NotificationCreate
-                    from src.domains.notifications.router import create_notification
+                    from src.domains.notifications.service import create_notification
 
                     student_name = appointment.student.name if appointment.student else "Aluno"
                     if plan.remaining_sessions == 0:
@@ -1233,6 +1236,21 @@ async def get_active_session(
     return session
 
 
+@router.get("/training-sessions/active/stream")
+async def stream_active_session(current_user: StreamUser) -> StreamingResponse:
+    """Stream the trainer's live board via Server-Sent Events (SSE).
+
+    Sends the same payload as GET /training-sessions/active (null without an
+    active session) on connect and whenever it changes.
+    """
+    try:
+        connection = sse_hub.connect(current_user.id, "live_board")
+    except StreamLimitError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e)) from e
+
+    return sse_hub.response(connection, stream_board(connection))
+
+
 # --- Session Context (smart check-in) ---
 
 
@@ -4,10 +4,13 @@ import secrets
 import uuid
 from datetime import date, datetime, timedelta, timezone
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.response_cache import mark_tables_changed
+from src.core.time_buckets import whole_minutes_between
+from src.domains.checkin.live_board import get_board, invalidate_boards, render_board
 from src.domains.checkin.models import (
     CheckIn,
     CheckInCode,
@@ -663,76 +666,32 @@ class CheckInService:
         self,
         user_id: uuid.UUID,
     ) -> dict | None:
-        """Get trainer's active session with student check-ins."""
-        result = await self.db.execute(
-            select(TrainerLocation).where(
-                and_(
-                    TrainerLocation.user_id == user_id,
-                    TrainerLocation.session_active == True,
-                    TrainerLocation.expires_at > func.now(),
-                )
-            )
-        )
-        loc = result.scalar_one_or_none()
-        if not loc:
-            return None
+        """Get trainer's active session with today's student check-ins (read-only)."""
+        return render_board(await get_board(user_id, self.db))
 
-        # Get all active check-ins approved by this trainer (today)
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    async def expire_stale_checkins(self) -> int:
+        """Check out confirmed check-ins past their expiry. Returns how many."""
+        now = datetime.now(timezone.utc)
         result = await self.db.execute(
-            select(CheckIn)
+            update(CheckIn)
             .where(
-                and_(
-                    CheckIn.approved_by_id == user_id,
-                    CheckIn.checked_in_at >= today_start,
-                )
+                CheckIn.status == CheckInStatus.CONFIRMED,
+                CheckIn.checked_out_at.is_(None),
+                CheckIn.expires_at < now,
             )
-            .options(selectinload(CheckIn.user))
-            .order_by(CheckIn.checked_in_at.desc())
+            .values(
+                checked_out_at=now,
+                notes=func.coalesce(CheckIn.notes, "") + " [auto-expirado 20min]",
+            )
+            .returning(CheckIn.approved_by_id)
+            .execution_options(synchronize_session=False)
         )
-        checkins = result.scalars().all()
-
-        now = datetime.now(timezone.utc)
-
-        # Lazy expiration: cancel expired pending check-ins
-        checkin_list = []
-        for c in checkins:
-            start = c.accepted_at or c.checked_in_at
-            start = start.replace(tzinfo=timezone.utc) if start and start.tzinfo is None else (start or now)
-            elapsed = int((now - start).total_seconds() / 60)
-
-            # Auto-cancel if pending and expired (20 min)
-            exp = c.expires_at.replace(tzinfo=timezone.utc) if c.expires_at and c.expires_at.tzinfo is None else c.expires_at
-            if exp and exp < now and c.checked_out_at is None and c.status == CheckInStatus.CONFIRMED:
-                c.checked_out_at = now
-                c.notes = (c.notes or "") + " [auto-expirado 20min]"
-
-            status = "active"
-            if c.checked_out_at:
-                status = "completed"
-
-            checkin_list.append({
-                "id": str(c.id),
-                "student_name": c.user.name if c.user else "Aluno",
-                "student_avatar": c.user.avatar_url if c.user and hasattr(c.user, 'avatar_url') else None,
-                "checked_in_at": self._to_utc_iso(c.checked_in_at),
-                "elapsed_minutes": elapsed,
-                "status": status,
-                "checked_out_at": self._to_utc_iso(c.checked_out_at) if c.checked_out_at else None,
-            })
-
+        trainer_ids = list(result.scalars().all())
+        mark_tables_changed(self.db.sync_session, CheckIn.__tablename__)
         await self.db.commit()
-
-        return {
-            "session": {
-                "id": str(loc.id),
-                "started_at": self._to_utc_iso(loc.session_started_at or loc.updated_at),
-                "status": "active",
-                "latitude": loc.latitude,
-                "longitude": loc.longitude,
-            },
-            "checkins": checkin_list,
-        }
+        # Bulk updates bypass the session events that keep live boards fresh
+        invalidate_boards(trainer_ids)
+        return len(trainer_ids)
 
     # Accept/Reject pending check-ins
 
@@ -845,21 +804,27 @@ class CheckInService:
     ) -> dict:
         """Get check-in statistics for a user."""
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-
-        checkins = await self.list_checkins(
-            user_id=user_id,
-            from_date=cutoff_date.date(),
-            limit=1000,
+        duration = whole_minutes_between(
+            func.coalesce(CheckIn.accepted_at, CheckIn.checked_in_at),
+            CheckIn.checked_out_at,
+            self.db.bind.dialect.name,
         )
 
-        total_duration = 0
-        for checkin in checkins:
-            if checkin.duration_minutes:
-                total_duration += checkin.duration_minutes
+        result = await self.db.execute(
+            select(
+                func.count(CheckIn.id),
+                func.coalesce(func.sum(duration), 0),
+            ).where(
+                CheckIn.user_id == user_id,
+                func.date(CheckIn.checked_in_at) >= cutoff_date.date(),
+            )
+        )
+        total_checkins, total_duration = result.one()
+        total_duration = int(total_duration)
 
         return {
             "period_days": days,
-            "total_checkins": len(checkins),
+            "total_checkins": total_checkins,
             "total_duration_minutes": total_duration,
-            "avg_duration_minutes": total_duration / len(checkins) if checkins else 0,
+            "avg_duration_minutes": total_duration / total_checkins if total_checkins else 0,
         }
@@ -14,6 +14,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -115,7 +116,7 @@ class ProfessionalProfile(Base, UUIDMixin, TimestampMixin):
 
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
-    listings = relationship("ConsultancyListing", back_populates="professional", lazy="selectin")
+    listings = relationship("ConsultancyListing", back_populates="professional")
 
     def __repr__(self) -> str:
         return f"<ProfessionalProfile user={self.user_id}>"
@@ -129,6 +130,12 @@ class ConsultancyListing(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
     """
 
     __tablename__ = "consultancy_listings"
+    __table_args__ = (
+        # One index per browse sort, ending in the keyset tiebreaker
+        Index("ix_consultancy_listings_featured_id", "is_featured", "created_at", "id"),
+        Index("ix_consultancy_listings_created_id", "created_at", "id"),
+        Index("ix_consultancy_listings_price_id", "price_cents", "id"),
+    )
 
     professional_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -179,7 +186,7 @@ class ConsultancyListing(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
 
     # Relationships
     professional = relationship("ProfessionalProfile", back_populates="listings")
-    transactions = relationship("ConsultancyTransaction", back_populates="listing", lazy="selectin")
+    transactions = relationship("ConsultancyTransaction", back_populates="listing")
 
     @property
     def price_display(self) -> str:
@@ -200,6 +207,13 @@ class ConsultancyListing(Base, UUIDMixin, TimestampMixin, SoftDeleteMixin):
         return f"<ConsultancyListing {self.title}>"
 
 
+Index(
+    "ix_consultancy_listings_rating_id",
+    func.coalesce(ConsultancyListing.rating_average, -1),
+    ConsultancyListing.id,
+)
+
+
 class ConsultancyTransaction(Base, UUIDMixin, TimestampMixin):
     """A purchase/subscription of a consultancy service.
 
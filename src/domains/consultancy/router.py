@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.config.database import get_db
+from src.core.pagination import InvalidCursorError, KeysetOrder, SortKey, cached_count, count_key
 from src.domains.auth.dependencies import CurrentUser
 from src.domains.users.models import User
 
@@ -39,6 +40,36 @@ from .schemas import (
 
 router = APIRouter(tags=["consultancy"])
 
+LISTING_SORTS = {
+    "featured": KeysetOrder(
+        "consultancy:featured",
+        SortKey(ConsultancyListing.is_featured, descending=True),
+        SortKey(ConsultancyListing.created_at, descending=True),
+        SortKey(ConsultancyListing.id, descending=True),
+    ),
+    "price_asc": KeysetOrder(
+        "consultancy:price_asc",
+        SortKey(ConsultancyListing.price_cents),
+        SortKey(ConsultancyListing.id),
+    ),
+    "price_desc": KeysetOrder(
+        "consultancy:price_desc",
+        SortKey(ConsultancyListing.price_cents, descending=True),
+        SortKey(ConsultancyListing.id, descending=True),
+    ),
+    # Unrated listings last
+    "rating": KeysetOrder(
+        "consultancy:rating",
+        SortKey(func.coalesce(ConsultancyListing.rating_average, -1), descending=True),
+        SortKey(ConsultancyListing.id, descending=True),
+    ),
+    "newest": KeysetOrder(
+        "consultancy:newest",
+        SortKey(ConsultancyListing.created_at, descending=True),
+        SortKey(ConsultancyListing.id, descending=True),
+    ),
+}
+
 
 # --- Helper functions ---
 
@@ -300,8 +331,13 @@ async def list_consultancies(
     sort: Annotated[str, Query()] = "featured",  # featured, price_asc, price_desc, rating, newest
     limit: Annotated[int, Query(ge=1, le=50)] = 20,
     offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: Annotated[str | None, Query(max_length=500)] = None,
 ) -> ConsultancyListingListResponse:
-    """Browse consultancy listings on the marketplace."""
+    """Browse consultancy listings on the marketplace.
+
+    Pass ``next_cursor`` of a page as ``cursor`` to get the next one (``offset``
+    is then ignored). ``total`` may lag recent changes by a few minutes.
+    """
     base_filter = [
         ConsultancyListing.is_active == True,  # noqa: E712
         ConsultancyListing.deleted_at.is_(None),
@@ -321,39 +357,50 @@ async def list_consultancies(
             | ConsultancyListing.short_description.ilike(f"%{search}%")
         )
 
-    # Count
+    # Count (free-text searches are counted directly: one cache key per
+    # distinct search text would grow without bound)
     count_query = select(func.count(ConsultancyListing.id)).where(and_(*base_filter))
-    count_result = await db.execute(count_query)
-    total = count_result.scalar() or 0
+    if search:
+        total = (await db.execute(count_query)).scalar() or 0
+    else:
+        total = await cached_count(
+            db,
+            count_key(
+                "consultancy_listings",
+                {
+                    "category": category,
+                    "format": format,
+                    "min_price": min_price,
+                    "max_price": max_price,
+                },
+            ),
+            count_query,
+        )
 
     # Sort
-    order_by = ConsultancyListing.is_featured.desc()
-    if sort == "price_asc":
-        order_by = ConsultancyListing.price_cents.asc()
-    elif sort == "price_desc":
-        order_by = ConsultancyListing.price_cents.desc()
-    elif sort == "rating":
-        order_by = ConsultancyListing.rating_average.desc().nullslast()
-    elif sort == "newest":
-        order_by = ConsultancyListing.created_at.desc()
-
-    query = (
-        select(ConsultancyListing)
-        .options(
-            selectinload(ConsultancyListing.professional).selectinload(ProfessionalProfile.user)
+    order = LISTING_SORTS.get(sort, LISTING_SORTS["featured"])
+    try:
+        query, key_count = order.paginate(
+            select(ConsultancyListing)
+            .options(
+                selectinload(ConsultancyListing.professional).selectinload(ProfessionalProfile.user)
+            )
+            .where(and_(*base_filter)),
+            cursor,
         )
-        .where(and_(*base_filter))
-        .order_by(order_by)
-        .limit(limit)
-        .offset(offset)
-    )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido",
+        ) from e
 
-    result = await db.execute(query)
-    listings = list(result.scalars().all())
+    result = await db.execute(query.limit(limit).offset(0 if cursor else offset))
+    rows = result.all()
 
     return ConsultancyListingListResponse(
-        listings=[_listing_to_response(l) for l in listings],
+        listings=[_listing_to_response(row[0]) for row in rows],
         total=total,
+        next_cursor=order.next_cursor(rows, limit, key_count),
     )
 
 
@@ -151,6 +151,7 @@ class ConsultancyListingListResponse(BaseModel):
 
     listings: list[ConsultancyListingResponse]
     total: int
+    next_cursor: str | None = None
 
 
 # --- Transactions ---
@@ -41,7 +41,6 @@ class UserPoints(Base, UUIDMixin):
     transactions: Mapped[list["PointTransaction"]] = relationship(
         "PointTransaction",
         back_populates="user_points",
-        lazy="selectin",
     )
 
     def __repr__(self) -> str:
@@ -105,7 +104,6 @@ class Achievement(Base, UUIDMixin, TimestampMixin):
     user_achievements: Mapped[list["UserAchievement"]] = relationship(
         "UserAchievement",
         back_populates="achievement",
-        lazy="selectin",
     )
 
     def __repr__(self) -> str:
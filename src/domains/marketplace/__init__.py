@@ -2,11 +2,14 @@
 from src.domains.marketplace.models import (
     CreatorEarnings,
     CreatorPayout,
+    MarketplaceCatalogEntry,
+    MarketplaceCatalogFacet,
     MarketplaceTemplate,
     OrganizationTemplateAccess,
     PaymentProvider,
     PayoutMethod,
     PayoutStatus,
+    PriceBand,
     PurchaseStatus,
     TemplateCategory,
     TemplateDifficulty,
@@ -21,6 +24,8 @@ __all__ = [
     "router",
     "MarketplaceService",
     "MarketplaceTemplate",
+    "MarketplaceCatalogEntry",
+    "MarketplaceCatalogFacet",
     "TemplatePurchase",
     "TemplateReview",
     "CreatorEarnings",
@@ -29,6 +34,7 @@ __all__ = [
     "TemplateType",
     "TemplateCategory",
     "TemplateDifficulty",
+    "PriceBand",
     "PurchaseStatus",
     "PayoutStatus",
     "PaymentProvider",
@@ -0,0 +1,653 @@
+"""Marketplace catalog read model.
+
+Browsing is served from ``marketplace_catalog_entries`` (one denormalized card
+per listed template, creator name included) and ``marketplace_catalog_facets``
+(precomputed counts per category, difficulty, type and price band). Both are
+maintained from session events in the same transaction as the change to a
+template or to its creator's profile, so they never drift from the source
+rows. A change to a listing column (one that decides whether and under which
+facets a template is listed) re-projects the template's card and applies the
+count differences to the facets as upserts; any other change, such as a
+purchase bumping ``purchase_count``, updates the card in place.
+
+On top of that, the first pages of every filter combination and the facet
+counts are cached with stale-while-revalidate: a stale page is served
+immediately while a background task reloads it. Cache keys carry a catalog
+version that is rotated after every commit touching the catalog, so changes
+show up on the next request instead of after the TTL.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+import orjson
+from sqlalchemy import (
+    Connection,
+    String,
+    case,
+    cast,
+    delete,
+    event,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config.database import AsyncSessionLocal
+from src.core.pagination import KeysetOrder, SortKey
+from src.core.redis import cache_get, cache_set
+from src.core.response_cache import mark_tables_changed
+from src.domains.marketplace.models import (
+    MarketplaceCatalogEntry,
+    MarketplaceCatalogFacet,
+    MarketplaceTemplate,
+    PriceBand,
+    TemplateCategory,
+    TemplateDifficulty,
+    TemplateType,
+)
+from src.domains.marketplace.schemas import (
+    CatalogFacetsResponse,
+    CreatorInfo,
+    TemplateListResponse,
+)
+from src.domains.users.models import User
+
+logger = logging.getLogger(__name__)
+
+PAGE_FRESH_SECONDS = 60
+PAGE_STALE_SECONDS = 600
+CACHED_PAGE_DEPTH = 100  # pages starting at or beyond this offset are not cached
+VERSION_TTL_SECONDS = 86400
+CACHE_PREFIX = "marketplace:catalog:"
+VERSION_KEY = f"{CACHE_PREFIX}version"
+
+# Inclusive price ranges in cents; None = no upper bound
+PRICE_BANDS: dict[PriceBand, tuple[int, int | None]] = {
+    PriceBand.FREE: (0, 0),
+    PriceBand.UNDER_50: (1, 4999),
+    PriceBand.FROM_50_TO_100: (5000, 9999),
+    PriceBand.FROM_100_TO_200: (10000, 19999),
+    PriceBand.OVER_200: (20000, None),
+}
+
+# Unrated templates sort as the lowest rating; each sort has a matching index
+SORT_COLUMNS = {
+    "created_at": MarketplaceCatalogEntry.listed_at,
+    "price_cents": MarketplaceCatalogEntry.price_cents,
+    "purchase_count": MarketplaceCatalogEntry.purchase_count,
+    "rating_average": func.coalesce(MarketplaceCatalogEntry.rating_average, -1),
+    "title": MarketplaceCatalogEntry.title,
+}
+
+SORT_ORDERS = {
+    (sort_by, desc): KeysetOrder(
+        f"catalog:{sort_by}:{'desc' if desc else 'asc'}",
+        SortKey(column, descending=desc),
+        SortKey(MarketplaceCatalogEntry.template_id, descending=desc),
+    )
+    for sort_by, column in SORT_COLUMNS.items()
+    for desc in (True, False)
+}
+
+_FACET_COLUMNS = {
+    "category": MarketplaceCatalogEntry.category,
+    "difficulty": MarketplaceCatalogEntry.difficulty,
+    "template_type": MarketplaceCatalogEntry.template_type,
+}
+
+# Template attributes deciding whether and under which facets it is listed
+_LISTING_ATTRS = (
+    "category", "difficulty", "template_type", "price_cents",
+    "is_active", "approved_at", "creator_id",
+)
+# Attributes only shown on the card
+_CARD_ATTRS = (
+    "title", "short_description", "cover_image_url", "currency",
+    "purchase_count", "rating_average", "rating_count", "is_featured",
+)
+
+
+def price_band(price_cents) -> Any:
+    """SQL expression mapping a price column to its ``PriceBand`` value."""
+    whens = [
+        (price_cents <= high, band.value)
+        for band, (_, high) in PRICE_BANDS.items()
+        if high is not None
+    ]
+    return case(*whens, else_=PriceBand.OVER_200.value)
+
+
+# --- Projection (sync, runs on the writer's connection) --------------------
+
+
+def project_templates(
+    conn: Connection,
+    template_ids: Iterable[uuid.UUID] | None = None,
+    creator_ids: Iterable[uuid.UUID] | None = None,
+) -> int:
+    """Rewrite the catalog entries of the given templates and creators.
+
+    With neither argument the whole catalog is rebuilt. Returns the number
+    of entries removed plus inserted (0 means nothing was listed).
+    """
+    entries = MarketplaceCatalogEntry.__table__
+    entry_scope = []
+    source_scope = []
+    if template_ids is not None:
+        template_ids = list(template_ids)
+        entry_scope.append(entries.c.template_id.in_(template_ids))
+        source_scope.append(MarketplaceTemplate.id.in_(template_ids))
+    if creator_ids is not None:
+        creator_ids = list(creator_ids)
+        entry_scope.append(entries.c.creator_id.in_(creator_ids))
+        source_scope.append(MarketplaceTemplate.creator_id.in_(creator_ids))
+
+    removed = conn.execute(
+        delete(entries).where(or_(*entry_scope)) if entry_scope else delete(entries)
+    ).rowcount
+
+    source = (
+        select(
+            MarketplaceTemplate.id,
+            MarketplaceTemplate.template_type,
+            MarketplaceTemplate.title,
+            MarketplaceTemplate.short_description,
+            MarketplaceTemplate.cover_image_url,
+            MarketplaceTemplate.price_cents,
+            MarketplaceTemplate.currency,
+            MarketplaceTemplate.category,
+            MarketplaceTemplate.difficulty,
+            MarketplaceTemplate.purchase_count,
+            MarketplaceTemplate.rating_average,
+            MarketplaceTemplate.rating_count,
+            MarketplaceTemplate.is_featured,
+            MarketplaceTemplate.creator_id,
+            User.name,
+            User.avatar_url,
+            MarketplaceTemplate.created_at,
+        )
+        .join(User, User.id == MarketplaceTemplate.creator_id)
+        .where(
+            MarketplaceTemplate.is_active == True,  # noqa: E712
+            MarketplaceTemplate.approved_at.isnot(None),
+        )
+    )
+    if source_scope:
+        source = source.where(or_(*source_scope))
+
+    inserted = conn.execute(
+        insert(entries).from_select(
+            [
+                "template_id", "template_type", "title", "short_description",
+                "cover_image_url", "price_cents", "currency", "category",
+                "difficulty", "purchase_count", "rating_average", "rating_count",
+                "is_featured", "creator_id", "creator_name", "creator_avatar_url",
+                "listed_at",
+            ],
+            source,
+        )
+    ).rowcount
+    return max(removed, 0) + max(inserted, 0)
+
+
+def refresh_cards(conn: Connection, template_ids: Iterable[uuid.UUID]) -> int:
+    """Copy the card-only columns of the given templates onto their entries.
+
+    Returns the number of entries updated.
+    """
+    entries = MarketplaceCatalogEntry.__table__
+    templates = MarketplaceTemplate.__table__
+    values = {
+        name: select(templates.c[name]).where(templates.c.id == entries.c.template_id).scalar_subquery()
+        for name in _CARD_ATTRS
+    }
+    return conn.execute(
+        update(entries).where(entries.c.template_id.in_(list(template_ids))).values(**values)
+    ).rowcount
+
+
+def refresh_creator_cards(conn: Connection, creator_ids: Iterable[uuid.UUID]) -> int:
+    """Copy the current name and avatar of the given creators onto their entries."""
+    entries = MarketplaceCatalogEntry.__table__
+    users = User.__table__
+    return conn.execute(
+        update(entries)
+        .where(entries.c.creator_id.in_(list(creator_ids)))
+        .values(
+            creator_name=select(users.c.name).where(users.c.id == entries.c.creator_id).scalar_subquery(),
+            creator_avatar_url=(
+                select(users.c.avatar_url).where(users.c.id == entries.c.creator_id).scalar_subquery()
+            ),
+        )
+    ).rowcount
+
+
+def _facet_expressions() -> dict[str, Any]:
+    return {
+        **{name: cast(column, String(50)) for name, column in _FACET_COLUMNS.items()},
+        "price_band": price_band(MarketplaceCatalogEntry.price_cents),
+        "total": literal("all", String(50)),
+    }
+
+
+def count_facets(conn: Connection, template_ids: Iterable[uuid.UUID]) -> Counter[tuple[str, str]]:
+    """Facet values of the listed entries among ``template_ids``, counted."""
+    columns = _facet_expressions()
+    rows = conn.execute(
+        select(*(column.label(name) for name, column in columns.items()))
+        .where(MarketplaceCatalogEntry.template_id.in_(list(template_ids)))
+    )
+    counts: Counter[tuple[str, str]] = Counter()
+    for row in rows.mappings():
+        for facet, value in row.items():
+            if value is not None:
+                counts[facet, value] += 1
+    return counts
+
+
+def apply_facet_deltas(conn: Connection, deltas: Counter[tuple[str, str]]) -> None:
+    """Add ``deltas`` to the facet counts, dropping values no longer listed.
+
+    Each count is adjusted with a single upsert, so concurrent transactions
+    only wait on the facet rows they both touch instead of conflicting.
+    """
+    changes = [
+        {"facet": facet, "value": value, "template_count": delta}
+        for (facet, value), delta in deltas.items()
+        if delta
+    ]
+    if not changes:
+        return
+
+    facets = MarketplaceCatalogFacet.__table__
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        upsert = dialect_insert(facets)
+        conn.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["facet", "value"],
+                set_={"template_count": facets.c.template_count + upsert.excluded.template_count},
+            ),
+            changes,
+        )
+    else:
+        for change in changes:
+            updated = conn.execute(
+                update(facets)
+                .where(facets.c.facet == change["facet"], facets.c.value == change["value"])
+                .values(template_count=facets.c.template_count + change["template_count"])
+            ).rowcount
+            if not updated:
+                conn.execute(insert(facets).values(**change))
+    conn.execute(delete(facets).where(facets.c.template_count <= 0))
+
+
+def refresh_facets(conn: Connection) -> None:
+    """Recount every facet from the catalog entries."""
+    facets = MarketplaceCatalogFacet.__table__
+    conn.execute(delete(facets))
+
+    for name, column in _facet_expressions().items():
+        # Group on a subquery column so the CASE expression is not repeated
+        values = select(column.label("value")).select_from(MarketplaceCatalogEntry).subquery()
+        conn.execute(
+            insert(facets).from_select(
+                ["facet", "value", "template_count"],
+                select(literal(name, String(30)), values.c.value, func.count())
+                .where(values.c.value.isnot(None))
+                .group_by(values.c.value),
+            )
+        )
+
+
+def rebuild_catalog(conn: Connection) -> None:
+    """Rebuild the entries and facets from the templates table."""
+    project_templates(conn)
+    refresh_facets(conn)
+
+
+# --- Page cache ------------------------------------------------------------
+
+_version_stale = False
+_refreshing: set[str] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _catalog_version() -> str:
+    """Current catalog version, rotating it first if this process changed the catalog."""
+    global _version_stale
+    if not _version_stale:
+        version = await cache_get(VERSION_KEY)
+        if version:
+            return version
+    _version_stale = False
+    version = uuid.uuid4().hex
+    await cache_set(VERSION_KEY, version, VERSION_TTL_SECONDS)
+    return version
+
+
+def _spawn(coro: Awaitable[Any]) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _store(key: str, data: Any) -> None:
+    payload = {"fresh_until": time.time() + PAGE_FRESH_SECONDS, "data": data}
+    await cache_set(key, orjson.dumps(payload).decode(), PAGE_FRESH_SECONDS + PAGE_STALE_SECONDS)
+
+
+def _revalidate(key: str, loader: Callable[[AsyncSession], Awaitable[Any]]) -> None:
+    if key in _refreshing:
+        return
+    _refreshing.add(key)
+
+    async def run() -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await _store(key, await loader(db))
+        except Exception as e:
+            logger.warning(f"Catalog cache refresh failed for {key}: {e}")
+        finally:
+            _refreshing.discard(key)
+
+    _spawn(run())
+
+
+# --- Read side -------------------------------------------------------------
+
+
+def _card(entry: MarketplaceCatalogEntry) -> dict[str, Any]:
+    return TemplateListResponse(
+        id=entry.template_id,
+        template_type=entry.template_type,
+        title=entry.title,
+        short_description=entry.short_description,
+        cover_image_url=entry.cover_image_url,
+        price_cents=entry.price_cents,
+        price_display=entry.price_display,
+        is_free=entry.is_free,
+        category=entry.category,
+        difficulty=entry.difficulty,
+        purchase_count=entry.purchase_count,
+        rating_average=entry.rating_average,
+        rating_count=entry.rating_count,
+        is_featured=entry.is_featured,
+        creator=CreatorInfo(
+            id=entry.creator_id,
+            name=entry.creator_name,
+            avatar_url=entry.creator_avatar_url,
+        ),
+    ).model_dump(mode="json")
+
+
+async def _load_facets(db: AsyncSession) -> dict[str, Any]:
+    result = await db.execute(
+        select(
+            MarketplaceCatalogFacet.facet,
+            MarketplaceCatalogFacet.value,
+            MarketplaceCatalogFacet.template_count,
+        ).order_by(MarketplaceCatalogFacet.facet, MarketplaceCatalogFacet.template_count.desc())
+    )
+    grouped: dict[str, list[dict[str, Any]]] = {}
+    for facet, value, count in result.all():
+        grouped.setdefault(facet, []).append({"value": value, "count": count})
+
+    total = grouped.pop("total", [])
+    return {
+        "total": total[0]["count"] if total else 0,
+        "categories": grouped.get("category", []),
+        "difficulties": grouped.get("difficulty", []),
+        "template_types": grouped.get("template_type", []),
+        "price_bands": grouped.get("price_band", []),
+    }
+
+
+class MarketplaceCatalog:
+    """Browsing and faceting over the catalog read model."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_cards(self, **filters: Any) -> list[TemplateListResponse]:
+        """List template cards; takes the same filters as ``list_page``."""
+        cards, _ = await self.list_page(**filters)
+        return cards
+
+    async def list_page(
+        self,
+        template_type: TemplateType | None = None,
+        category: TemplateCategory | None = None,
+        difficulty: TemplateDifficulty | None = None,
+        price_band: PriceBand | None = None,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        free_only: bool = False,
+        featured_only: bool = False,
+        search: str | None = None,
+        sort_by: str = "created_at",
+        sort_desc: bool = True,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> tuple[list[TemplateListResponse], str | None]:
+        """A page of template cards and the cursor of the next page.
+
+        With a cursor, the page continues after it and ``offset`` is ignored.
+        First pages without a search term come from cache. Raises
+        ``InvalidCursorError`` for a cursor not issued for this sort.
+        """
+        if price_band:
+            min_price, max_price = PRICE_BANDS[price_band]
+        if free_only:
+            min_price, max_price = 0, 0
+        if sort_by not in SORT_COLUMNS:
+            sort_by = "created_at"
+        if cursor:
+            offset = 0
+
+        params = {
+            "template_type": template_type.value if template_type else None,
+            "category": category.value if category else None,
+            "difficulty": difficulty.value if difficulty else None,
+            "min_price": min_price,
+            "max_price": max_price,
+            "featured_only": featured_only,
+            "search": search,
+            "sort_by": sort_by,
+            "sort_desc": sort_desc,
+            "limit": limit,
+            "offset": offset,
+            "cursor": cursor,
+        }
+
+        async def load(db: AsyncSession) -> dict[str, Any]:
+            return await self._query_cards(db, **params)
+
+        if search or cursor or offset >= CACHED_PAGE_DEPTH:
+            data = await load(self.db)
+        else:
+            data = await self._cached("template_pages", params, load)
+        return [TemplateListResponse.model_validate(card) for card in data["cards"]], data["next_cursor"]
+
+    async def facets(self) -> CatalogFacetsResponse:
+        """Precomputed facet counts for the whole catalog."""
+        return CatalogFacetsResponse.model_validate(
+            await self._cached("facets", {}, _load_facets)
+        )
+
+    @staticmethod
+    async def _query_cards(
+        db: AsyncSession,
+        template_type: str | None,
+        category: str | None,
+        difficulty: str | None,
+        min_price: int | None,
+        max_price: int | None,
+        featured_only: bool,
+        search: str | None,
+        sort_by: str,
+        sort_desc: bool,
+        limit: int,
+        offset: int,
+        cursor: str | None,
+    ) -> dict[str, Any]:
+        entry = MarketplaceCatalogEntry
+        query = select(entry)
+        if template_type:
+            query = query.where(entry.template_type == TemplateType(template_type))
+        if category:
+            query = query.where(entry.category == TemplateCategory(category))
+        if difficulty:
+            query = query.where(entry.difficulty == TemplateDifficulty(difficulty))
+        if min_price is not None:
+            query = query.where(entry.price_cents >= min_price)
+        if max_price is not None:
+            query = query.where(entry.price_cents <= max_price)
+        if featured_only:
+            query = query.where(entry.is_featured == True)  # noqa: E712
+        if search:
+            query = query.where(
+                or_(
+                    entry.title.ilike(f"%{search}%"),
+                    entry.short_description.ilike(f"%{search}%"),
+                )
+            )
+
+        order = SORT_ORDERS[sort_by, sort_desc]
+        query, key_count = order.paginate(query, cursor)
+        rows = (await db.execute(query.limit(limit).offset(offset))).all()
+        return {
+            "cards": [_card(row[0]) for row in rows],
+            "next_cursor": order.next_cursor(rows, limit, key_count),
+        }
+
+    async def _cached(
+        self,
+        name: str,
+        params: dict[str, Any],
+        loader: Callable[[AsyncSession], Awaitable[Any]],
+    ) -> Any:
+        try:
+            version = await _catalog_version()
+            digest = hashlib.sha1(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+            key = f"{CACHE_PREFIX}{version}:{name}:{digest}"
+            raw = await cache_get(key)
+        except Exception as e:
+            logger.warning(f"Catalog cache unavailable: {e}")
+            return await loader(self.db)
+
+        if raw:
+            cached = orjson.loads(raw)
+            if cached["fresh_until"] < time.time():
+                _revalidate(key, loader)
+            return cached["data"]
+
+        data = await loader(self.db)
+        try:
+            await _store(key, data)
+        except Exception as e:
+            logger.warning(f"Catalog cache write failed for {key}: {e}")
+        return data
+
+
+# --- Session events --------------------------------------------------------
+
+_CATALOG_CHANGED = "marketplace_catalog_changed"
+_FACETS_BEFORE = "marketplace_catalog_facets_before"
+
+
+def _has_changes(obj: Any, names: Iterable[str]) -> bool:
+    attrs = sa_inspect(obj).attrs
+    return any(attrs[name].history.has_changes() for name in names)
+
+
+def _changed_templates(session: Session) -> tuple[set[uuid.UUID], set[uuid.UUID]]:
+    """Ids of existing templates to re-list and of those whose card changed only."""
+    relisted: set[uuid.UUID] = set()
+    updated: set[uuid.UUID] = set()
+    for obj in session.dirty:
+        if not isinstance(obj, MarketplaceTemplate):
+            continue
+        if _has_changes(obj, _LISTING_ATTRS):
+            relisted.add(obj.id)
+        elif _has_changes(obj, _CARD_ATTRS):
+            updated.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, MarketplaceTemplate):
+            relisted.add(obj.id)
+    return relisted, updated
+
+
+@event.listens_for(Session, "before_flush")
+def _count_listed_facets(session: Session, flush_context, instances) -> None:
+    # Counted before the flush: deleting a template cascades to its entry
+    relisted, _ = _changed_templates(session)
+    if relisted:
+        before = session.info.setdefault(_FACETS_BEFORE, Counter())
+        before.update(count_facets(session.connection(), relisted))
+
+
+@event.listens_for(Session, "after_flush")
+def _project_changes(session: Session, flush_context) -> None:
+    before = session.info.pop(_FACETS_BEFORE, Counter())
+    relisted, updated = _changed_templates(session)
+    relisted.update(obj.id for obj in session.new if isinstance(obj, MarketplaceTemplate))
+    creator_ids = {
+        obj.id for obj in session.dirty
+        if isinstance(obj, User) and _has_changes(obj, ("name", "avatar_url"))
+    }
+
+    if not (relisted or updated or creator_ids):
+        return
+
+    conn = session.connection()
+    changed = 0
+    if relisted:
+        changed += project_templates(conn, template_ids=relisted)
+        deltas = count_facets(conn, relisted)
+        deltas.subtract(before)
+        apply_facet_deltas(conn, deltas)
+    if updated:
+        changed += refresh_cards(conn, updated)
+    if creator_ids:
+        changed += refresh_creator_cards(conn, creator_ids)
+    if changed:
+        session.info[_CATALOG_CHANGED] = True
+        mark_tables_changed(
+            session, MarketplaceCatalogEntry.__tablename__, MarketplaceCatalogFacet.__tablename__
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _rotate_version(session: Session) -> None:
+    global _version_stale
+    if not session.info.pop(_CATALOG_CHANGED, False):
+        return
+    _version_stale = True
+    try:
+        _spawn(_catalog_version())  # publish to other processes right away
+    except RuntimeError:
+        pass  # no running loop: the next read rotates it
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_CATALOG_CHANGED, None)
+    session.info.pop(_FACETS_BEFORE, None)
@@ -9,6 +9,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -51,6 +52,16 @@ class TemplateDifficulty(str, enum.Enum):
     ADVANCED = "advanced"
 
 
+class PriceBand(str, enum.Enum):
+    """Price ranges used for catalog facets (BRL)."""
+
+    FREE = "free"
+    UNDER_50 = "under_50"
+    FROM_50_TO_100 = "50_to_100"
+    FROM_100_TO_200 = "100_to_200"
+    OVER_200 = "over_200"
+
+
 class PurchaseStatus(str, enum.Enum):
     """Purchase status."""
 
@@ -163,12 +174,10 @@ class MarketplaceTemplate(Base, UUIDMixin, TimestampMixin):
     purchases: Mapped[list["TemplatePurchase"]] = relationship(
         "TemplatePurchase",
         back_populates="template",
-        lazy="selectin",
     )
     reviews: Mapped[list["TemplateReview"]] = relationship(
         "TemplateReview",
         back_populates="template",
-        lazy="selectin",
     )
 
     @property
@@ -340,7 +349,6 @@ class CreatorEarnings(Base, UUIDMixin):
     payouts: Mapped[list["CreatorPayout"]] = relationship(
         "CreatorPayout",
         back_populates="earnings",
-        lazy="selectin",
     )
 
     @property
@@ -428,3 +436,97 @@ from src.domains.nutrition.models import DietPlan  # noqa: E402, F401
 from src.domains.organizations.models import Organization  # noqa: E402, F401
 from src.domains.users.models import User  # noqa: E402, F401
 from src.domains.workouts.models import Workout  # noqa: E402, F401
+
+
+class MarketplaceCatalogEntry(Base):
+    """Denormalized template card served by catalog browsing.
+
+    One row per active, approved template with the creator's name and avatar
+    copied in. Maintained by ``src.domains.marketplace.catalog`` whenever a
+    template or its creator changes, so browsing never joins or scans the
+    transactional tables.
+    """
+
+    __tablename__ = "marketplace_catalog_entries"
+    __table_args__ = (
+        Index("ix_marketplace_catalog_category_listed", "category", "listed_at"),
+        Index("ix_marketplace_catalog_featured_listed", "is_featured", "listed_at"),
+        # One index per browse sort, ending in the keyset tiebreaker
+        Index("ix_marketplace_catalog_listed_id", "listed_at", "template_id"),
+        Index("ix_marketplace_catalog_price_id", "price_cents", "template_id"),
+        Index("ix_marketplace_catalog_purchases_id", "purchase_count", "template_id"),
+        Index("ix_marketplace_catalog_title_id", "title", "template_id"),
+    )
+
+    template_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("marketplace_templates.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    template_type: Mapped[TemplateType] = mapped_column(
+        Enum(TemplateType, name="template_type_enum", values_callable=lambda x: [e.value for e in x]),
+        nullable=False,
+    )
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    short_description: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    cover_image_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    price_cents: Mapped[int] = mapped_column(Integer, nullable=False)
+    currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    category: Mapped[TemplateCategory | None] = mapped_column(
+        Enum(TemplateCategory, name="template_category_enum", values_callable=lambda x: [e.value for e in x]),
+        nullable=True,
+    )
+    difficulty: Mapped[TemplateDifficulty] = mapped_column(
+        Enum(TemplateDifficulty, name="template_difficulty_enum", values_callable=lambda x: [e.value for e in x]),
+        nullable=False,
+    )
+    purchase_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    rating_average: Mapped[Decimal | None] = mapped_column(Numeric(3, 2), nullable=True)
+    rating_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    is_featured: Mapped[bool] = mapped_column(Boolean, nullable=False)
+
+    creator_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
+    creator_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    creator_avatar_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    # Template creation time; the default sort key
+    listed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    @property
+    def price_display(self) -> str:
+        """Format price for display."""
+        if self.price_cents == 0:
+            return "Grátis"
+        price = self.price_cents / 100
+        return f"R$ {price:.2f}"
+
+    @property
+    def is_free(self) -> bool:
+        return self.price_cents == 0
+
+    def __repr__(self) -> str:
+        return f"<MarketplaceCatalogEntry {self.title}>"
+
+
+Index(
+    "ix_marketplace_catalog_rating_id",
+    func.coalesce(MarketplaceCatalogEntry.rating_average, -1),
+    MarketplaceCatalogEntry.template_id,
+)
+
+
+class MarketplaceCatalogFacet(Base):
+    """Precomputed number of catalog entries per facet value.
+
+    ``facet`` is one of ``category``, ``difficulty``, ``template_type`` or
+    ``price_band``; ``total`` holds the catalog size under the value ``all``.
+    """
+
+    __tablename__ = "marketplace_catalog_facets"
+
+    facet: Mapped[str] = mapped_column(String(30), primary_key=True)
+    value: Mapped[str] = mapped_column(String(50), primary_key=True)
+    template_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<MarketplaceCatalogFacet {self.facet}={self.value}: {self.template_count}>"
@@ -2,19 +2,22 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.database import get_db
+from src.core.pagination import InvalidCursorError
 from src.domains.auth.dependencies import CurrentUser
 from src.domains.marketplace.models import (
     PaymentProvider,
+    PriceBand,
     PurchaseStatus,
     TemplateCategory,
     TemplateDifficulty,
     TemplateType,
 )
 from src.domains.marketplace.schemas import (
+    CatalogFacetsResponse,
     CategoryResponse,
     CheckoutRequest,
     CheckoutResponse,
@@ -49,9 +52,11 @@ router = APIRouter()
 async def list_templates(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
+    response: Response,
     template_type: Annotated[TemplateType | None, Query()] = None,
     category: Annotated[TemplateCategory | None, Query()] = None,
     difficulty: Annotated[TemplateDifficulty | None, Query()] = None,
+    price_band: Annotated[PriceBand | None, Query()] = None,
     min_price: Annotated[int | None, Query(ge=0)] = None,
     max_price: Annotated[int | None, Query(ge=0)] = None,
     free_only: Annotated[bool, Query()] = False,
@@ -60,47 +65,38 @@ async def list_templates(
     sort_desc: Annotated[bool, Query()] = True,
     limit: Annotated[int, Query(ge=1, le=100)] = 50,
     offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: Annotated[str | None, Query(max_length=500)] = None,
 ) -> list[TemplateListResponse]:
-    """List marketplace templates with filters."""
-    service = MarketplaceService(db)
-    templates = await service.list_templates(
-        template_type=template_type,
-        category=category,
-        difficulty=difficulty,
-        min_price=min_price,
-        max_price=max_price,
-        free_only=free_only,
-        search=search,
-        sort_by=sort_by,
-        sort_desc=sort_desc,
-        limit=limit,
-        offset=offset,
-    )
+    """List marketplace templates with filters.
 
-    return [
-        TemplateListResponse(
-            id=t.id,
-            template_type=t.template_type,
-            title=t.title,
-            short_description=t.short_description,
-            cover_image_url=t.cover_image_url,
-            price_cents=t.price_cents,
-            price_display=t.price_display,
-            is_free=t.is_free,
-            category=t.category,
-            difficulty=t.difficulty,
-            purchase_count=t.purchase_count,
-            rating_average=t.rating_average,
-            rating_count=t.rating_count,
-            is_featured=t.is_featured,
-            creator=CreatorInfo(
-                id=t.creator.id,
-                name=t.creator.name,
-                avatar_url=t.creator.avatar_url if hasattr(t.creator, 'avatar_url') else None,
-            ),
+    Pass the X-Next-Cursor header of a page as ``cursor`` to get the next one
+    (``offset`` is then ignored); the header is absent on the last page.
+    """
+    service = MarketplaceService(db)
+    try:
+        templates, next_cursor = await service.list_templates_page(
+            cursor=cursor,
+            template_type=template_type,
+            category=category,
+            difficulty=difficulty,
+            price_band=price_band,
+            min_price=min_price,
+            max_price=max_price,
+            free_only=free_only,
+            search=search,
+            sort_by=sort_by,
+            sort_desc=sort_desc,
+            limit=limit,
+            offset=offset,
         )
-        for t in templates
-    ]
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from e
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return templates
 
 
 @router.get("/templates/featured", response_model=list[TemplateListResponse])
@@ -111,32 +107,17 @@ async def list_featured_templates(
 ) -> list[TemplateListResponse]:
     """List featured templates."""
     service = MarketplaceService(db)
-    templates = await service.list_featured_templates(limit=limit)
+    return await service.list_featured_templates(limit=limit)
 
-    return [
-        TemplateListResponse(
-            id=t.id,
-            template_type=t.template_type,
-            title=t.title,
-            short_description=t.short_description,
-            cover_image_url=t.cover_image_url,
-            price_cents=t.price_cents,
-            price_display=t.price_display,
-            is_free=t.is_free,
-            category=t.category,
-            difficulty=t.difficulty,
-            purchase_count=t.purchase_count,
-            rating_average=t.rating_average,
-            rating_count=t.rating_count,
-            is_featured=t.is_featured,
-            creator=CreatorInfo(
-                id=t.creator.id,
-                name=t.creator.name,
-                avatar_url=t.creator.avatar_url if hasattr(t.creator, 'avatar_url') else None,
-            ),
-        )
-        for t in templates
-    ]
+
+@router.get("/catalog/facets", response_model=CatalogFacetsResponse)
+async def get_catalog_facets(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> CatalogFacetsResponse:
+    """Template counts per category, difficulty, type and price band."""
+    service = MarketplaceService(db)
+    return await service.get_catalog_facets()
 
 
 @router.get("/templates/{template_id}", response_model=TemplateResponse)
@@ -368,3 +368,20 @@ class CategoryResponse(BaseModel):
     name: str
     template_count: int
     icon: str | None = None
+
+
+class FacetCount(BaseModel):
+    """Number of listed templates with a given facet value."""
+
+    value: str
+    count: int
+
+
+class CatalogFacetsResponse(BaseModel):
+    """Precomputed facet counts for catalog browsing."""
+
+    total: int
+    categories: list[FacetCount] = []
+    difficulties: list[FacetCount] = []
+    template_types: list[FacetCount] = []
+    price_bands: list[FacetCount] = []
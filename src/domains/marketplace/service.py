@@ -2,11 +2,14 @@
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Any
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.deep_copy import copy_rows, id_map, new_uuid, remap
+from src.domains.marketplace.catalog import MarketplaceCatalog
 from src.domains.marketplace.models import (
     CreatorEarnings,
     CreatorPayout,
@@ -15,6 +18,7 @@ from src.domains.marketplace.models import (
     PaymentProvider,
     PayoutMethod,
     PayoutStatus,
+    PriceBand,
     PurchaseStatus,
     TemplateCategory,
     TemplateDifficulty,
@@ -22,6 +26,7 @@ from src.domains.marketplace.models import (
     TemplateReview,
     TemplateType,
 )
+from src.domains.marketplace.schemas import CatalogFacetsResponse, TemplateListResponse
 from src.domains.nutrition.service import NutritionService
 from src.domains.workouts.service import WorkoutService
 
@@ -69,58 +74,38 @@ class MarketplaceService:
         sort_desc: bool = True,
         limit: int = 50,
         offset: int = 0,
-    ) -> list[MarketplaceTemplate]:
-        """List templates with filters."""
-        query = select(MarketplaceTemplate).where(
-            MarketplaceTemplate.is_active == True,
-            MarketplaceTemplate.approved_at.isnot(None),
-        ).options(
-            selectinload(MarketplaceTemplate.creator),
+        price_band: PriceBand | None = None,
+    ) -> list[TemplateListResponse]:
+        """List template cards with filters, served from the catalog read model."""
+        return await MarketplaceCatalog(self.db).list_cards(
+            template_type=template_type,
+            category=category,
+            difficulty=difficulty,
+            price_band=price_band,
+            min_price=min_price,
+            max_price=max_price,
+            free_only=free_only,
+            featured_only=featured_only,
+            search=search,
+            sort_by=sort_by,
+            sort_desc=sort_desc,
+            limit=limit,
+            offset=offset,
         )
 
-        if template_type:
-            query = query.where(MarketplaceTemplate.template_type == template_type)
-
-        if category:
-            query = query.where(MarketplaceTemplate.category == category)
-
-        if difficulty:
-            query = query.where(MarketplaceTemplate.difficulty == difficulty)
-
-        if free_only:
-            query = query.where(MarketplaceTemplate.price_cents == 0)
-        else:
-            if min_price is not None:
-                query = query.where(MarketplaceTemplate.price_cents >= min_price)
-            if max_price is not None:
-                query = query.where(MarketplaceTemplate.price_cents <= max_price)
+    async def list_templates_page(
+        self, cursor: str | None = None, **filters: Any
+    ) -> tuple[list[TemplateListResponse], str | None]:
+        """A page of template cards and the cursor of the next page.
 
-        if featured_only:
-            query = query.where(MarketplaceTemplate.is_featured == True)
-
-        if search:
-            query = query.where(
-                or_(
-                    MarketplaceTemplate.title.ilike(f"%{search}%"),
-                    MarketplaceTemplate.short_description.ilike(f"%{search}%"),
-                )
-            )
-
-        # Sorting
-        sort_column = getattr(MarketplaceTemplate, sort_by, MarketplaceTemplate.created_at)
-        if sort_desc:
-            query = query.order_by(sort_column.desc())
-        else:
-            query = query.order_by(sort_column.asc())
-
-        query = query.limit(limit).offset(offset)
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        Takes the filters of ``list_templates``.
+        """
+        return await MarketplaceCatalog(self.db).list_page(cursor=cursor, **filters)
 
     async def list_featured_templates(
         self,
         limit: int = 10,
-    ) -> list[MarketplaceTemplate]:
+    ) -> list[TemplateListResponse]:
         """Get featured templates."""
         return await self.list_templates(
             featured_only=True,
@@ -611,15 +596,12 @@ class MarketplaceService:
 
     async def get_category_counts(self) -> dict[TemplateCategory, int]:
         """Get template counts by category."""
-        result = await self.db.execute(
-            select(MarketplaceTemplate.category, func.count(MarketplaceTemplate.id))
-            .where(
-                MarketplaceTemplate.is_active == True,
-                MarketplaceTemplate.approved_at.isnot(None),
-            )
-            .group_by(MarketplaceTemplate.category)
-        )
-        return {cat: count for cat, count in result.all() if cat}
+        facets = await self.get_catalog_facets()
+        return {TemplateCategory(f.value): f.count for f in facets.categories}
+
+    async def get_catalog_facets(self) -> CatalogFacetsResponse:
+        """Get precomputed catalog facet counts."""
+        return await MarketplaceCatalog(self.db).facets()
 
     # ==================== Diet Plan Duplication ====================
 
@@ -629,47 +611,48 @@ class MarketplaceService:
         new_owner_id: uuid.UUID,
         new_name: str | None = None,
     ):
-        """Duplicate a diet plan for another user."""
+        """Duplicate a diet plan for another user.
+
+        Plan, meals and meal foods are cloned set-based, one INSERT ... SELECT
+        per level, in the caller's transaction.
+        """
         from src.domains.nutrition.models import DietPlan, DietPlanMeal, DietPlanMealFood
 
-        new_plan = DietPlan(
-            name=new_name or f"Copy of {plan.name}",
-            description=plan.description,
-            target_calories=plan.target_calories,
-            target_protein=plan.target_protein,
-            target_carbs=plan.target_carbs,
-            target_fat=plan.target_fat,
-            tags=plan.tags,
-            is_template=False,
-            is_public=False,
-            created_by_id=new_owner_id,
+        plan_ids = id_map([plan.id])
+        await copy_rows(
+            self.db,
+            DietPlan.__table__,
+            DietPlan.id == plan.id,
+            {
+                "id": remap(DietPlan.id, plan_ids),
+                "name": new_name or f"Copy of {plan.name}",
+                "is_template": False,
+                "is_public": False,
+                "created_by_id": new_owner_id,
+                "organization_id": None,
+            },
         )
-        self.db.add(new_plan)
-        await self.db.flush()
-
-        # Copy meals
-        for meal in plan.meals:
-            new_meal = DietPlanMeal(
-                plan_id=new_plan.id,
-                name=meal.name,
-                meal_time=meal.meal_time,
-                order=meal.order,
-                notes=meal.notes,
+
+        meal_ids = id_map(meal.id for meal in plan.meals)
+        if meal_ids:
+            await copy_rows(
+                self.db,
+                DietPlanMeal.__table__,
+                DietPlanMeal.plan_id == plan.id,
+                {
+                    "id": remap(DietPlanMeal.id, meal_ids),
+                    "plan_id": remap(DietPlanMeal.plan_id, plan_ids),
+                },
+            )
+            await copy_rows(
+                self.db,
+                DietPlanMealFood.__table__,
+                DietPlanMealFood.meal_id.in_(list(meal_ids)),
+                {
+                    "id": new_uuid(self.db),
+                    "meal_id": remap(DietPlanMealFood.meal_id, meal_ids),
+                },
             )
-            self.db.add(new_meal)
-            await self.db.flush()
-
-            # Copy meal foods
-            for mf in meal.foods:
-                new_mf = DietPlanMealFood(
-                    meal_id=new_meal.id,
-                    food_id=mf.food_id,
-                    servings=mf.servings,
-                    portion_description=mf.portion_description,
-                    notes=mf.notes,
-                )
-                self.db.add(new_mf)
 
         await self.db.commit()
-        await self.db.refresh(new_plan)
-        return new_plan
+        return await self.db.get(DietPlan, plan_ids[plan.id])
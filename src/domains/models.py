@@ -26,17 +26,21 @@ from src.domains.organizations.models import (
 from src.domains.workouts.models import (
     Difficulty,
     Exercise,
+    ExerciseStrengthRollup,
     MuscleGroup,
     NoteAuthorRole,
     NoteContextType,
     PlanAssignment,
+    PlanSnapshotBlob,
     PlanWorkout,
     PrescriptionNote,
+    PrescriptionNoteAudience,
     SplitType,
     TrainingPlan,
     Workout,
     WorkoutAssignment,
     WorkoutExercise,
+    WeeklyTrainingVolume,
     WorkoutGoal,
     WorkoutSession,
     WorkoutSessionSet,
@@ -90,11 +94,14 @@ from src.domains.gamification.models import (
 from src.domains.marketplace.models import (
     CreatorEarnings,
     CreatorPayout,
+    MarketplaceCatalogEntry,
+    MarketplaceCatalogFacet,
     MarketplaceTemplate,
     OrganizationTemplateAccess,
     PaymentProvider,
     PayoutMethod,
     PayoutStatus,
+    PriceBand,
     PurchaseStatus,
     TemplateCategory,
     TemplateDifficulty,
@@ -135,6 +142,8 @@ from src.domains.chat.models import (
 
 # Notifications domain
 from src.domains.notifications.models import (
+    EmailOutbox,
+    EmailOutboxStatus,
     Notification,
     NotificationPriority,
     NotificationType,
@@ -201,10 +210,14 @@ __all__ = [
     "WorkoutAssignment",
     "WorkoutSession",
     "WorkoutSessionSet",
+    "ExerciseStrengthRollup",
+    "WeeklyTrainingVolume",
     "TrainingPlan",
     "PlanWorkout",
     "PlanAssignment",
+    "PlanSnapshotBlob",
     "PrescriptionNote",
+    "PrescriptionNoteAudience",
     "Difficulty",
     "MuscleGroup",
     "WorkoutGoal",
@@ -245,6 +258,8 @@ __all__ = [
     "LeaderboardEntry",
     # Marketplace
     "MarketplaceTemplate",
+    "MarketplaceCatalogEntry",
+    "MarketplaceCatalogFacet",
     "TemplatePurchase",
     "TemplateReview",
     "CreatorEarnings",
@@ -253,6 +268,7 @@ __all__ = [
     "TemplateType",
     "TemplateCategory",
     "TemplateDifficulty",
+    "PriceBand",
     "PurchaseStatus",
     "PayoutStatus",
     "PaymentProvider",
@@ -279,6 +295,8 @@ __all__ = [
     "Message",
     "MessageType",
     # Notifications
+    "EmailOutbox",
+    "EmailOutboxStatus",
     "Notification",
     "NotificationPriority",
     "NotificationType",
@@ -0,0 +1,170 @@
+"""Durable outbox for transactional emails.
+
+``enqueue_email`` writes an ``EmailOutbox`` row in the caller's transaction
+and ``deliver_pending_emails`` (run by the Celery worker) drains the outbox
+in batches through Resend's batch API, with retry/backoff. Templates are
+rendered by name with ``src.core.email.render_email`` at delivery time.
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.settings import settings
+from src.core.email import EMAIL_TEMPLATES, render_email
+from src.core.sdk import get_resend
+
+from .models import EmailOutbox, EmailOutboxStatus
+
+logger = logging.getLogger(__name__)
+
+EMAIL_BATCH_SIZE = 100  # Resend batch API limit
+EMAIL_MAX_ATTEMPTS = 8
+EMAIL_RETRY_BASE_SECONDS = 30
+EMAIL_RETRY_MAX_SECONDS = 3600
+
+# Context values that grant access; not kept once an email is done with
+SENSITIVE_CONTEXT_KEYS = frozenset({"temp_password", "code", "invite_token"})
+
+
+async def enqueue_email(
+    db: AsyncSession,
+    template: str,
+    to_email: str,
+    context: dict,
+    dedup_key: str | None = None,
+) -> None:
+    """Queue an email in the caller's transaction.
+
+    Nothing is sent until the caller commits; rolling back drops the email
+    together with the change that triggered it. Enqueuing a ``dedup_key``
+    that already exists is a no-op.
+
+    Raises:
+        ValueError: If the template is unknown
+    """
+    if template not in EMAIL_TEMPLATES:
+        raise ValueError(f"Unknown email template '{template}'")
+
+    values = {
+        "template": template,
+        "to_email": to_email,
+        "context": context,
+        "dedup_key": dedup_key,
+    }
+    dialect = db.get_bind().dialect.name
+    if dedup_key and dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        await db.execute(
+            insert(EmailOutbox).values(**values).on_conflict_do_nothing(index_elements=["dedup_key"])
+        )
+        return
+
+    if dedup_key:
+        existing = await db.scalar(select(EmailOutbox.id).where(EmailOutbox.dedup_key == dedup_key))
+        if existing is not None:
+            return
+    db.add(EmailOutbox(**values))
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1), EMAIL_RETRY_MAX_SECONDS))
+
+
+def _give_up(message: EmailOutbox, error: str) -> None:
+    """Fail a message for good, keeping its context minus the secrets."""
+    message.status = EmailOutboxStatus.FAILED
+    message.last_error = error[:1000]
+    if message.context:
+        message.context = {k: v for k, v in message.context.items() if k not in SENSITIVE_CONTEXT_KEYS}
+
+
+def _record_failure(message: EmailOutbox, error: str, now: datetime) -> None:
+    message.attempts += 1
+    if message.attempts >= EMAIL_MAX_ATTEMPTS:
+        _give_up(message, error)
+        logger.error(f"Giving up on email {message.id} to {message.to_email}: {error}")
+    else:
+        message.last_error = error[:1000]
+        message.next_attempt_at = now + _retry_delay(message.attempts)
+
+
+async def deliver_pending_emails(db: AsyncSession, batch_size: int = EMAIL_BATCH_SIZE) -> int:
+    """Send one batch of due outbox emails.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so several workers can
+    drain the outbox concurrently. The batch request carries an idempotency
+    key derived from the row ids, so a retry after a timeout that Resend did
+    process is not delivered twice.
+
+    Returns:
+        Number of emails handed to the provider
+    """
+    if not settings.email_enabled:
+        return 0
+
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(EmailOutbox)
+        .where(
+            EmailOutbox.status == EmailOutboxStatus.PENDING,
+            EmailOutbox.next_attempt_at <= now,
+        )
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    messages = list(result.scalars().all())
+    if not messages:
+        return 0
+
+    resend = get_resend()
+    batch: list[EmailOutbox] = []
+    params: list[resend.Emails.SendParams] = []
+    for message in messages:
+        try:
+            rendered = render_email(message.template, message.to_email, message.context)
+        except (KeyError, TypeError) as e:
+            # Broken template/context never gets better by retrying
+            _give_up(message, f"Render failed: {e!r}")
+            continue
+        email: resend.Emails.SendParams = {
+            "from": settings.EMAIL_FROM,
+            "to": [message.to_email],
+            "subject": rendered.subject,
+            "html": rendered.html_content,
+        }
+        if rendered.text_content:
+            email["text"] = rendered.text_content
+        params.append(email)
+        batch.append(message)
+
+    if batch:
+        ids = ",".join(sorted(str(m.id) for m in batch))
+        options = {"idempotency_key": f"outbox-{hashlib.sha256(ids.encode()).hexdigest()[:32]}"}
+        try:
+            response = await asyncio.to_thread(resend.Batch.send, params, options)
+        except (resend.exceptions.ResendError, ConnectionError, OSError) as e:
+            logger.warning(f"Email batch of {len(batch)} failed, will retry: {e}")
+            for message in batch:
+                _record_failure(message, str(e), now)
+            batch = []
+        else:
+            sent = response.get("data") or []
+            for index, message in enumerate(batch):
+                message.status = EmailOutboxStatus.SENT
+                message.sent_at = now
+                message.attempts += 1
+                message.context = None
+                if index < len(sent):
+                    message.provider_message_id = sent[index].get("id")
+            logger.info(f"Delivered {len(batch)} outbox emails")
+
+    await db.commit()
+    return len(batch)
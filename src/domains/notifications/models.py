@@ -4,12 +4,16 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import (
+    JSON,
     Boolean,
     DateTime,
     Enum,
     ForeignKey,
+    Index,
+    Integer,
     String,
     Text,
+    func,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -148,9 +152,9 @@ class Notification(Base, UUIDMixin, TimestampMixin):
     push_sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    user = relationship("User", foreign_keys=[user_id], lazy="selectin")
+    user = relationship("User", foreign_keys=[user_id])
     sender = relationship("User", foreign_keys=[sender_id], lazy="selectin")
-    organization = relationship("Organization", lazy="selectin")
+    organization = relationship("Organization")
 
 
 class DevicePlatform(str, enum.Enum):
@@ -180,7 +184,51 @@ class DeviceToken(Base, UUIDMixin, TimestampMixin):
     last_used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    user = relationship("User", lazy="selectin")
+    user = relationship("User")
+
+
+class EmailOutboxStatus(str, enum.Enum):
+    """Delivery state of a queued transactional email."""
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"  # Gave up after the maximum number of attempts
+
+
+class EmailOutbox(Base, UUIDMixin, TimestampMixin):
+    """Transactional email waiting to be delivered.
+
+    Rows are written in the same transaction as the change that triggers the
+    email and drained in batches by a background worker, so a slow or failing
+    provider never blocks the request and a crash never loses the email.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    template: Mapped[str] = mapped_column(String(50), nullable=False)
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Template arguments; cleared once delivered since it may hold credentials
+    context: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Same key enqueued twice results in a single email
+    dedup_key: Mapped[str | None] = mapped_column(String(255), nullable=True, unique=True)
+
+    status: Mapped[EmailOutboxStatus] = mapped_column(
+        Enum(EmailOutboxStatus, name="email_outbox_status_enum", values_callable=lambda x: [e.value for e in x]),
+        default=EmailOutboxStatus.PENDING,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    provider_message_id: Mapped[str | None] = mapped_column(String(100), nullable=True)
 
 
 class NotificationCategory(str, enum.Enum):
@@ -220,7 +268,7 @@ class NotificationPreference(Base, UUIDMixin, TimestampMixin):
     email_enabled: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Relationships
-    user = relationship("User", lazy="selectin")
+    user = relationship("User")
 
     class Meta:
         unique_together = ["user_id", "notification_type"]
@@ -11,8 +11,18 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.metrics import Counter, Histogram, timed
+
 logger = logging.getLogger(__name__)
 
+PUSH_DISPATCH_SECONDS = Histogram(
+    "push_dispatch_duration_seconds",
+    "Time to send a push notification to all devices of a user.",
+)
+PUSH_MESSAGES = Counter(
+    "push_messages_total", "Push messages sent to devices by result.", labels=("result",)
+)
+
 # Firebase Admin SDK (lazy import to avoid errors if not installed)
 _firebase_app = None
 
@@ -111,6 +121,7 @@ def get_firebase_status() -> dict:
     return status
 
 
+@timed(PUSH_DISPATCH_SECONDS)
 async def send_push_notification(
     db: AsyncSession,
     user_id: UUID,
@@ -248,6 +259,8 @@ async def send_push_notification(
     if failed_tokens:
         await db.commit()
 
+    PUSH_MESSAGES.inc(success_count, result="sent")
+    PUSH_MESSAGES.inc(len(tokens) - success_count, result="failed")
     logger.info(f"🔔 [PUSH] Push notifications completed: {success_count}/{len(tokens)} sent for user {user_id}")
     return success_count
 
@@ -0,0 +1,314 @@
+"""Notification creation and delivery checks used by other domains.
+
+Kept apart from the router so Celery tasks and services can create
+notifications without importing FastAPI routing and auth dependencies.
+"""
+from uuid import UUID
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Notification, NotificationPreference, NotificationPriority, NotificationType
+from .schemas import NotificationCreate
+
+
+async def create_notification(
+    db: AsyncSession,
+    notification_data: NotificationCreate,
+) -> Notification:
+    """Create a new notification (internal use by other services)."""
+    notification = Notification(
+        user_id=notification_data.user_id,
+        notification_type=notification_data.notification_type,
+        priority=notification_data.priority,
+        title=notification_data.title,
+        body=notification_data.body,
+        icon=notification_data.icon,
+        action_type=notification_data.action_type,
+        action_data=notification_data.action_data,
+        reference_type=notification_data.reference_type,
+        reference_id=notification_data.reference_id,
+        organization_id=notification_data.organization_id,
+        sender_id=notification_data.sender_id,
+    )
+
+    db.add(notification)
+    await db.commit()
+    await db.refresh(notification)
+
+    return notification
+
+
+async def create_bulk_notifications(
+    db: AsyncSession,
+    notifications_data: list[NotificationCreate],
+) -> list[Notification]:
+    """Create multiple notifications at once (internal use)."""
+    notifications = []
+
+    for data in notifications_data:
+        notification = Notification(
+            user_id=data.user_id,
+            notification_type=data.notification_type,
+            priority=data.priority,
+            title=data.title,
+            body=data.body,
+            icon=data.icon,
+            action_type=data.action_type,
+            action_data=data.action_data,
+            reference_type=data.reference_type,
+            reference_id=data.reference_id,
+            organization_id=data.organization_id,
+            sender_id=data.sender_id,
+        )
+        db.add(notification)
+        notifications.append(notification)
+
+    await db.commit()
+
+    for n in notifications:
+        await db.refresh(n)
+
+    return notifications
+
+
+# Helper functions for common notification types
+
+
+async def notify_workout_assigned(
+    db: AsyncSession,
+    user_id: UUID,
+    workout_name: str,
+    trainer_id: UUID,
+    trainer_name: str,
+    workout_id: UUID,
+    organization_id: UUID | None = None,
+) -> Notification:
+    """Create notification for workout assignment."""
+    return await create_notification(
+        db,
+        NotificationCreate(
+            user_id=user_id,
+            notification_type=NotificationType.WORKOUT_ASSIGNED,
+            title="Novo treino atribuído",
+            body=f"{trainer_name} atribuiu o treino '{workout_name}' para você",
+            icon="dumbbell",
+            action_type="navigate",
+            action_data=f'{{"route": "/workouts/{workout_id}"}}',
+            reference_type="workout",
+            reference_id=workout_id,
+            organization_id=organization_id,
+            sender_id=trainer_id,
+        ),
+    )
+
+
+async def notify_achievement_unlocked(
+    db: AsyncSession,
+    user_id: UUID,
+    achievement_name: str,
+    achievement_id: UUID,
+    points_earned: int,
+) -> Notification:
+    """Create notification for achievement unlocked."""
+    return await create_notification(
+        db,
+        NotificationCreate(
+            user_id=user_id,
+            notification_type=NotificationType.ACHIEVEMENT_UNLOCKED,
+            priority=NotificationPriority.HIGH,
+            title="Conquista desbloqueada!",
+            body=f"Você desbloqueou '{achievement_name}' e ganhou {points_earned} pontos!",
+            icon="trophy",
+            action_type="navigate",
+            action_data=f'{{"route": "/achievements/{achievement_id}"}}',
+            reference_type="achievement",
+            reference_id=achievement_id,
+        ),
+    )
+
+
+async def notify_new_message(
+    db: AsyncSession,
+    user_id: UUID,
+    sender_id: UUID,
+    sender_name: str,
+    conversation_id: UUID,
+    message_preview: str,
+) -> Notification:
+    """Create notification for new message."""
+    return await create_notification(
+        db,
+        NotificationCreate(
+            user_id=user_id,
+            notification_type=NotificationType.NEW_MESSAGE,
+            title=f"Nova mensagem de {sender_name}",
+            body=message_preview[:100] + ("..." if len(message_preview) > 100 else ""),
+            icon="message",
+            action_type="navigate",
+            action_data=f'{{"route": "/chat/{conversation_id}"}}',
+            reference_type="conversation",
+            reference_id=conversation_id,
+            sender_id=sender_id,
+        ),
+    )
+
+
+async def notify_payment_due(
+    db: AsyncSession,
+    user_id: UUID,
+    amount_cents: int,
+    due_date: str,
+    payment_id: UUID,
+    organization_id: UUID | None = None,
+) -> Notification:
+    """Create notification for payment due."""
+    amount_formatted = f"R$ {amount_cents / 100:.2f}"
+    return await create_notification(
+        db,
+        NotificationCreate(
+            user_id=user_id,
+            notification_type=NotificationType.PAYMENT_DUE,
+            priority=NotificationPriority.HIGH,
+            title="Pagamento pendente",
+            body=f"Você tem um pagamento de {amount_formatted} com vencimento em {due_date}",
+            icon="credit-card",
+            action_type="navigate",
+            action_data=f'{{"route": "/billing/payments/{payment_id}"}}',
+            reference_type="payment",
+            reference_id=payment_id,
+            organization_id=organization_id,
+        ),
+    )
+
+
+async def notify_appointment_reminder(
+    db: AsyncSession,
+    user_id: UUID,
+    appointment_id: UUID,
+    trainer_name: str,
+    appointment_time: str,
+    organization_id: UUID | None = None,
+) -> Notification:
+    """Create notification for appointment reminder."""
+    return await create_notification(
+        db,
+        NotificationCreate(
+            user_id=user_id,
+            notification_type=NotificationType.APPOINTMENT_REMINDER,
+            priority=NotificationPriority.HIGH,
+            title="Lembrete de sessão",
+            body=f"Sua sessão com {trainer_name} está agendada para {appointment_time}",
+            icon="calendar",
+            action_type="navigate",
+            action_data=f'{{"route": "/schedule/appointments/{appointment_id}"}}',
+            reference_type="appointment",
+            reference_id=appointment_id,
+            organization_id=organization_id,
+        ),
+    )
+
+
+# Preference and Do Not Disturb checks
+
+
+def is_dnd_active(dnd_start: str | None, dnd_end: str | None) -> bool:
+    """Check if Do Not Disturb is currently active based on time.
+
+    Args:
+        dnd_start: Start time in HH:MM format (e.g., "22:00")
+        dnd_end: End time in HH:MM format (e.g., "07:00")
+
+    Returns:
+        True if DND is active, False otherwise
+    """
+    if not dnd_start or not dnd_end:
+        return False
+
+    from datetime import datetime as dt
+
+    try:
+        now = dt.now().time()
+        start = dt.strptime(dnd_start, "%H:%M").time()
+        end = dt.strptime(dnd_end, "%H:%M").time()
+
+        # Handle overnight DND (e.g., 22:00 to 07:00)
+        if start > end:
+            # DND is active if current time is after start OR before end
+            return now >= start or now < end
+        else:
+            # DND is active if current time is between start and end
+            return start <= now < end
+    except ValueError:
+        return False
+
+
+async def is_user_in_dnd(db: AsyncSession, user_id: UUID) -> bool:
+    """Check if user is currently in Do Not Disturb mode.
+
+    Args:
+        db: Database session
+        user_id: User ID to check
+
+    Returns:
+        True if user is in DND mode, False otherwise
+    """
+    from src.domains.users.models import UserSettings
+
+    query = select(UserSettings).where(UserSettings.user_id == user_id)
+    result = await db.execute(query)
+    settings = result.scalar_one_or_none()
+
+    if not settings or not settings.dnd_enabled:
+        return False
+
+    return is_dnd_active(settings.dnd_start_time, settings.dnd_end_time)
+
+
+async def should_send_notification(
+    db: AsyncSession,
+    user_id: UUID,
+    notification_type: NotificationType,
+    channel: str = "push",  # "push", "email", or "in_app"
+    respect_dnd: bool = True,
+) -> bool:
+    """Check if a notification should be sent based on user preferences and DND.
+
+    Args:
+        db: Database session
+        user_id: User ID to check preferences for
+        notification_type: Type of notification
+        channel: Notification channel ("push", "email", or "in_app")
+        respect_dnd: Whether to check DND status (set to False for critical notifications)
+
+    Returns:
+        True if notification should be sent, False otherwise
+    """
+    # Check DND for push notifications (in-app and email are not affected)
+    if respect_dnd and channel == "push":
+        if await is_user_in_dnd(db, user_id):
+            return False
+
+    # Check notification preferences
+    query = select(NotificationPreference).where(
+        and_(
+            NotificationPreference.user_id == user_id,
+            NotificationPreference.notification_type == notification_type,
+        )
+    )
+    result = await db.execute(query)
+    pref = result.scalar_one_or_none()
+
+    if not pref:
+        # Default: enabled for push and in-app, disabled for email
+        return channel != "email"
+
+    if not pref.enabled:
+        return False
+
+    if channel == "push":
+        return pref.push_enabled
+    elif channel == "email":
+        return pref.email_enabled
+    else:  # in_app
+        return True
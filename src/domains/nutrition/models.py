@@ -166,7 +166,6 @@ class DietPlan(Base, UUIDMixin, TimestampMixin):
     assignments: Mapped[list["DietAssignment"]] = relationship(
         "DietAssignment",
         back_populates="plan",
-        lazy="selectin",
     )
 
     def __repr__(self) -> str:
@@ -68,7 +68,6 @@ class Organization(Base, UUIDMixin, TimestampMixin):
     memberships: Mapped[list["OrganizationMembership"]] = relationship(
         "OrganizationMembership",
         back_populates="organization",
-        lazy="selectin",
     )
 
     @property
@@ -29,7 +29,7 @@ from src.domains.organizations.models import UserRole
 from src.domains.organizations.service import OrganizationService
 from src.domains.users.service import UserService
 from src.domains.notifications.push_service import send_push_notification
-from src.domains.notifications.router import create_notification
+from src.domains.notifications.service import create_notification
 from src.domains.subscriptions.service import SubscriptionService
 from src.domains.subscriptions.models import PlatformTier
 from src.domains.notifications.schemas import NotificationCreate
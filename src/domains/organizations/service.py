@@ -7,6 +7,8 @@ from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.loaders import LoaderProfile
+from src.domains.notifications.email_outbox import enqueue_email
 from src.domains.organizations.models import (
     Organization,
     OrganizationInvite,
@@ -17,6 +19,16 @@ from src.domains.organizations.models import (
 from src.domains.users.models import User
 from src.domains.workouts.models import WorkoutAssignment, WorkoutSession
 
+# Organization responses include member_count
+ORGANIZATION_WITH_MEMBERS = LoaderProfile(
+    "organization.members", selectinload(Organization.memberships)
+)
+MEMBERSHIP_WITH_ORGANIZATION = LoaderProfile(
+    "membership.organization",
+    selectinload(OrganizationMembership.organization).selectinload(Organization.memberships),
+    selectinload(OrganizationMembership.organization).selectinload(Organization.owner),
+)
+
 
 class OrganizationService:
     """Service for handling organization operations."""
@@ -24,6 +36,11 @@ class OrganizationService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    async def _refresh_with_members(self, org: Organization) -> None:
+        """Refresh an organization along with the memberships behind member_count."""
+        await self.db.refresh(org)
+        await self.db.refresh(org, ["memberships"])
+
     # Organization CRUD
 
     async def get_organization_by_id(
@@ -41,7 +58,7 @@ class OrganizationService:
         result = await self.db.execute(
             select(Organization)
             .where(Organization.id == org_id)
-            .options(selectinload(Organization.memberships))
+            .options(*ORGANIZATION_WITH_MEMBERS)
         )
         return result.scalar_one_or_none()
 
@@ -67,7 +84,7 @@ class OrganizationService:
                     Organization.is_active == True,
                 )
             )
-            .options(selectinload(Organization.memberships))
+            .options(*ORGANIZATION_WITH_MEMBERS)
         )
         return list(result.scalars().all())
 
@@ -91,12 +108,7 @@ class OrganizationService:
                     OrganizationMembership.is_active == True,
                 )
             )
-            .options(
-                selectinload(OrganizationMembership.organization)
-                .selectinload(Organization.memberships),
-                selectinload(OrganizationMembership.organization)
-                .selectinload(Organization.owner),
-            )
+            .options(*MEMBERSHIP_WITH_ORGANIZATION)
         )
         memberships = list(result.scalars().all())
         # Filter out memberships where organization is inactive
@@ -157,7 +169,7 @@ class OrganizationService:
         self.db.add(membership)
 
         await self.db.commit()
-        await self.db.refresh(org)
+        await self._refresh_with_members(org)
         return org
 
     async def create_autonomous_organization(
@@ -195,7 +207,7 @@ class OrganizationService:
         self.db.add(membership)
 
         await self.db.commit()
-        await self.db.refresh(org)
+        await self._refresh_with_members(org)
         return org
 
     async def update_organization(
@@ -236,7 +248,7 @@ class OrganizationService:
             org.website = website
 
         await self.db.commit()
-        await self.db.refresh(org)
+        await self._refresh_with_members(org)
         return org
 
     async def delete_organization(self, org: Organization) -> None:
@@ -536,6 +548,8 @@ class OrganizationService:
         invited_by_id: uuid.UUID,
         expires_in_days: int = 7,
         student_info: dict | None = None,
+        inviter_name: str | None = None,
+        org_name: str | None = None,
     ) -> OrganizationInvite:
         """Create an invitation to join an organization.
 
@@ -546,6 +560,9 @@ class OrganizationService:
             invited_by_id: ID of inviting user
             expires_in_days: Days until expiration
             student_info: Optional student info (name, phone, goal, notes)
+            inviter_name: When given, the invite email is queued in the
+                same transaction as the invite
+            org_name: Organization name shown in the invite email
 
         Returns:
             The created invite
@@ -565,6 +582,18 @@ class OrganizationService:
             student_info=student_info,
         )
         self.db.add(invite)
+        if inviter_name is not None:
+            await enqueue_email(
+                self.db,
+                "invite",
+                to_email=invite.email,
+                context={
+                    "trainer_name": inviter_name,
+                    "org_name": org_name or "MyFit",
+                    "invite_token": token,
+                },
+                dedup_key=f"invite:{token}",
+            )
         await self.db.commit()
         await self.db.refresh(invite)
         return invite
@@ -856,5 +885,5 @@ class OrganizationService:
         """
         org.archived_at = None
         await self.db.commit()
-        await self.db.refresh(org)
+        await self._refresh_with_members(org)
         return org
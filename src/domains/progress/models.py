@@ -3,7 +3,7 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, Float, ForeignKey, String, Text, func
+from sqlalchemy import DateTime, Enum, Float, ForeignKey, Index, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,6 +23,10 @@ class WeightLog(Base, UUIDMixin):
     """User weight tracking."""
 
     __tablename__ = "weight_logs"
+    __table_args__ = (
+        # Serves per-user range scans and first/last lookups for charts
+        Index("ix_weight_logs_user_logged_at", "user_id", "logged_at"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -50,6 +54,10 @@ class MeasurementLog(Base, UUIDMixin):
     """Body measurements tracking."""
 
     __tablename__ = "measurement_logs"
+    __table_args__ = (
+        # Serves per-user range scans and first/last lookups for charts
+        Index("ix_measurement_logs_user_logged_at", "user_id", "logged_at"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -15,6 +15,7 @@ from src.domains.progress.schemas import (
     MeasurementLogUpdate,
     ProgressPhotoCreate,
     ProgressPhotoResponse,
+    ProgressSeriesResponse,
     ProgressStatsResponse,
     WeightGoalCreate,
     WeightGoalResponse,
@@ -23,6 +24,7 @@ from src.domains.progress.schemas import (
     WeightLogUpdate,
 )
 from src.domains.progress.service import ProgressService
+from src.domains.progress.timeseries import MeasurementField, SeriesResolution
 
 router = APIRouter()
 
@@ -80,6 +82,31 @@ async def get_latest_weight(
     return None
 
 
+@router.get("/weight/series", response_model=ProgressSeriesResponse)
+async def get_weight_series(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    from_date: Annotated[date | None, Query()] = None,
+    to_date: Annotated[date | None, Query()] = None,
+    resolution: Annotated[SeriesResolution, Query()] = SeriesResolution.AUTO,
+    max_points: Annotated[int, Query(ge=3, le=500)] = 60,
+) -> ProgressSeriesResponse:
+    """Get the weight history as a chart series.
+
+    ``auto`` returns raw points when they fit in ``max_points`` and an LTTB
+    reduction otherwise; ``day``/``week``/``month`` average per calendar bucket.
+    """
+    service = ProgressService(db)
+    series = await service.get_weight_series(
+        user_id=current_user.id,
+        from_date=from_date,
+        to_date=to_date,
+        resolution=resolution,
+        max_points=max_points,
+    )
+    return ProgressSeriesResponse.model_validate(series)
+
+
 @router.get("/weight/{log_id}", response_model=WeightLogResponse)
 async def get_weight_log(
     log_id: UUID,
@@ -222,6 +249,29 @@ async def get_latest_measurements(
     return None
 
 
+@router.get("/measurements/series", response_model=ProgressSeriesResponse)
+async def get_measurement_series(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    field: Annotated[MeasurementField, Query()],
+    from_date: Annotated[date | None, Query()] = None,
+    to_date: Annotated[date | None, Query()] = None,
+    resolution: Annotated[SeriesResolution, Query()] = SeriesResolution.AUTO,
+    max_points: Annotated[int, Query(ge=3, le=500)] = 60,
+) -> ProgressSeriesResponse:
+    """Get one body measurement's history as a chart series."""
+    service = ProgressService(db)
+    series = await service.get_measurement_series(
+        user_id=current_user.id,
+        field=field,
+        from_date=from_date,
+        to_date=to_date,
+        resolution=resolution,
+        max_points=max_points,
+    )
+    return ProgressSeriesResponse.model_validate(series)
+
+
 @router.get("/measurements/{log_id}", response_model=MeasurementLogResponse)
 async def get_measurement_log(
     log_id: UUID,
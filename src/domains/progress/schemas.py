@@ -5,6 +5,7 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict, Field
 
 from src.domains.progress.models import PhotoAngle
+from src.domains.progress.timeseries import SeriesResolution
 
 
 # Weight log schemas
@@ -143,6 +144,45 @@ class WeightGoalResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Time-series schemas
+
+class SeriesPointResponse(BaseModel):
+    """One chart point. Bucketed points also carry min/max and sample count."""
+
+    at: datetime
+    value: float
+    min_value: float | None = None
+    max_value: float | None = None
+    count: int = 1
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SeriesSummaryResponse(BaseModel):
+    """Aggregates of a series over the requested range."""
+
+    count: int
+    first_value: float | None = None
+    last_value: float | None = None
+    min_value: float | None = None
+    max_value: float | None = None
+    first_at: datetime | None = None
+    last_at: datetime | None = None
+    change: float | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProgressSeriesResponse(BaseModel):
+    """Downsampled progress series for charts."""
+
+    resolution: SeriesResolution
+    summary: SeriesSummaryResponse
+    points: list[SeriesPointResponse]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # Stats schema
 
 class ProgressStatsResponse(BaseModel):
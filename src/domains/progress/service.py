@@ -12,6 +12,12 @@ from src.domains.progress.models import (
     WeightGoal,
     WeightLog,
 )
+from src.domains.progress.timeseries import (
+    MeasurementField,
+    ProgressSeries,
+    SeriesResolution,
+    logged_between,
+)
 
 
 class ProgressService:
@@ -43,14 +49,7 @@ class ProgressService:
         """List weight logs for a user."""
         query = select(WeightLog).where(WeightLog.user_id == user_id)
 
-        if from_date:
-            query = query.where(
-                func.date(WeightLog.logged_at) >= from_date
-            )
-        if to_date:
-            query = query.where(
-                func.date(WeightLog.logged_at) <= to_date
-            )
+        query = query.where(*logged_between(WeightLog.logged_at, from_date, to_date))
 
         query = query.order_by(WeightLog.logged_at.desc()).limit(limit).offset(offset)
         result = await self.db.execute(query)
@@ -132,14 +131,7 @@ class ProgressService:
         """List measurement logs for a user."""
         query = select(MeasurementLog).where(MeasurementLog.user_id == user_id)
 
-        if from_date:
-            query = query.where(
-                func.date(MeasurementLog.logged_at) >= from_date
-            )
-        if to_date:
-            query = query.where(
-                func.date(MeasurementLog.logged_at) <= to_date
-            )
+        query = query.where(*logged_between(MeasurementLog.logged_at, from_date, to_date))
 
         query = query.order_by(MeasurementLog.logged_at.desc()).limit(limit).offset(offset)
         result = await self.db.execute(query)
@@ -259,14 +251,7 @@ class ProgressService:
 
         if angle:
             query = query.where(ProgressPhoto.angle == angle)
-        if from_date:
-            query = query.where(
-                func.date(ProgressPhoto.logged_at) >= from_date
-            )
-        if to_date:
-            query = query.where(
-                func.date(ProgressPhoto.logged_at) <= to_date
-            )
+        query = query.where(*logged_between(ProgressPhoto.logged_at, from_date, to_date))
 
         query = query.order_by(ProgressPhoto.logged_at.desc()).limit(limit).offset(offset)
         result = await self.db.execute(query)
@@ -348,40 +333,83 @@ class ProgressService:
         await self.db.delete(goal)
         await self.db.commit()
 
-    # Stats operations
+    # Time-series operations
 
-    async def get_progress_stats(
+    async def get_weight_series(
         self,
         user_id: uuid.UUID,
-        days: int = 30,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        resolution: SeriesResolution = SeriesResolution.AUTO,
+        max_points: int = 60,
     ) -> dict:
-        """Get progress statistics for a user."""
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+        """Get a chart-ready weight series with its summary."""
+        return await self._get_series(
+            ProgressSeries.weight(self.db), user_id, from_date, to_date, resolution, max_points
+        )
 
-        # Get weight stats
-        weight_logs = await self.list_weight_logs(
-            user_id=user_id,
-            from_date=cutoff_date.date(),
-            limit=1000,
+    async def get_measurement_series(
+        self,
+        user_id: uuid.UUID,
+        field: MeasurementField,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        resolution: SeriesResolution = SeriesResolution.AUTO,
+        max_points: int = 60,
+    ) -> dict:
+        """Get a chart-ready series for one body measurement."""
+        return await self._get_series(
+            ProgressSeries.measurement(self.db, field),
+            user_id, from_date, to_date, resolution, max_points,
         )
 
-        # Get measurement stats
-        measurement_logs = await self.list_measurement_logs(
-            user_id=user_id,
-            from_date=cutoff_date.date(),
-            limit=1000,
+    async def _get_series(
+        self,
+        series: ProgressSeries,
+        user_id: uuid.UUID,
+        from_date: date | None,
+        to_date: date | None,
+        resolution: SeriesResolution,
+        max_points: int,
+    ) -> dict:
+        summary = await series.summary(user_id, from_date, to_date)
+        used, points = await series.points(
+            user_id,
+            from_date,
+            to_date,
+            resolution=resolution,
+            max_points=max_points,
+            total=summary.count,
         )
+        return {"resolution": used, "summary": summary, "points": points}
+
+    # Stats operations
+
+    async def get_progress_stats(
+        self,
+        user_id: uuid.UUID,
+        days: int = 30,
+    ) -> dict:
+        """Get progress statistics for a user."""
+        from_date = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+
+        # First/last/count straight from SQL instead of loading the logs
+        weight = await ProgressSeries.weight(self.db).summary(user_id, from_date=from_date)
+        measurement_logs_count = await self.db.scalar(
+            select(func.count())
+            .select_from(MeasurementLog)
+            .where(
+                MeasurementLog.user_id == user_id,
+                *logged_between(MeasurementLog.logged_at, from_date),
+            )
+        ) or 0
 
         # Get weight goal
         goal = await self.get_weight_goal(user_id)
 
-        # Calculate stats
-        weight_change = 0.0
-        if len(weight_logs) >= 2:
-            weight_change = weight_logs[0].weight_kg - weight_logs[-1].weight_kg
-
-        latest_weight = weight_logs[0].weight_kg if weight_logs else None
-        starting_weight = weight_logs[-1].weight_kg if weight_logs else None
+        latest_weight = weight.last_value
+        starting_weight = weight.first_value
+        weight_change = weight.change or 0.0
 
         # Calculate goal progress
         goal_progress = None
@@ -393,8 +421,8 @@ class ProgressService:
 
         return {
             "period_days": days,
-            "weight_logs_count": len(weight_logs),
-            "measurement_logs_count": len(measurement_logs),
+            "weight_logs_count": weight.count,
+            "measurement_logs_count": measurement_logs_count,
             "latest_weight_kg": latest_weight,
             "starting_weight_kg": starting_weight,
             "weight_change_kg": weight_change,
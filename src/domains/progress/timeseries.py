@@ -0,0 +1,241 @@
+"""Time-series queries over weight and measurement logs.
+
+Every query filters with half-open ``logged_at`` ranges, so it can be served
+by the ``(user_id, logged_at)`` indexes, and only the timestamp and value
+columns leave the database. Summaries (first/last/min/max) are computed in a
+single SQL statement. Chart series are either grouped into calendar buckets in
+SQL or reduced to a fixed number of points with Largest-Triangle-Three-Buckets
+(LTTB), which keeps the visual shape of long histories.
+"""
+import enum
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import ColumnElement, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.time_buckets import bucket_start
+from src.domains.progress.models import MeasurementLog, WeightLog
+
+
+class SeriesResolution(str, enum.Enum):
+    """How a progress series is reduced before being returned."""
+
+    AUTO = "auto"  # raw points if they fit, LTTB otherwise
+    RAW = "raw"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    LTTB = "lttb"
+
+
+class MeasurementField(str, enum.Enum):
+    """Measurement columns that can be charted."""
+
+    CHEST = "chest_cm"
+    WAIST = "waist_cm"
+    HIPS = "hips_cm"
+    BICEPS = "biceps_cm"
+    THIGH = "thigh_cm"
+    CALF = "calf_cm"
+    NECK = "neck_cm"
+    FOREARM = "forearm_cm"
+
+
+def logged_between(
+    column: ColumnElement,
+    from_date: date | None = None,
+    to_date: date | None = None,
+) -> list[ColumnElement[bool]]:
+    """Sargable predicates for ``from_date <= day(column) <= to_date`` (UTC days)."""
+    conditions = []
+    if from_date:
+        conditions.append(column >= datetime.combine(from_date, time.min, tzinfo=timezone.utc))
+    if to_date:
+        end = datetime.combine(to_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        conditions.append(column < end)
+    return conditions
+
+
+def lttb(xs: list[float], ys: list[float], threshold: int) -> list[int]:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    anchor = 0
+    for i in range(threshold - 2):
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        best, best_area = -1, -1.0
+        for j in range(int(i * every) + 1, next_start):
+            area = abs(
+                (xs[anchor] - avg_x) * (ys[j] - ys[anchor])
+                - (xs[anchor] - xs[j]) * (avg_y - ys[anchor])
+            )
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        anchor = best
+    selected.append(n - 1)
+    return selected
+
+
+@dataclass
+class SeriesSummary:
+    """Aggregates of a series over a date range."""
+
+    count: int
+    first_value: float | None = None
+    last_value: float | None = None
+    min_value: float | None = None
+    max_value: float | None = None
+    first_at: datetime | None = None
+    last_at: datetime | None = None
+
+    @property
+    def change(self) -> float | None:
+        if self.count < 2:
+            return None
+        return self.last_value - self.first_value
+
+
+@dataclass
+class SeriesPoint:
+    """One chart point; bucketed points also carry the bucket's range."""
+
+    at: datetime
+    value: float
+    min_value: float | None = None
+    max_value: float | None = None
+    count: int = 1
+
+
+class ProgressSeries:
+    """Queries one value column of a user's progress logs as a time series."""
+
+    def __init__(self, db: AsyncSession, model, value_column: ColumnElement):
+        self.db = db
+        self.model = model
+        self.value = value_column
+        self.logged_at = model.logged_at
+
+    @classmethod
+    def weight(cls, db: AsyncSession) -> "ProgressSeries":
+        return cls(db, WeightLog, WeightLog.weight_kg)
+
+    @classmethod
+    def measurement(cls, db: AsyncSession, field: MeasurementField) -> "ProgressSeries":
+        return cls(db, MeasurementLog, getattr(MeasurementLog, field.value))
+
+    def _where(self, user_id: uuid.UUID, from_date: date | None, to_date: date | None):
+        return [
+            self.model.user_id == user_id,
+            self.value.is_not(None),
+            *logged_between(self.logged_at, from_date, to_date),
+        ]
+
+    async def summary(
+        self,
+        user_id: uuid.UUID,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> SeriesSummary:
+        """Count, first/last and min/max values in one statement."""
+        where = self._where(user_id, from_date, to_date)
+
+        def edge(order):
+            # Index-backed top-1 lookups; correlate(None) keeps them standalone
+            return (
+                select(self.value)
+                .where(*where)
+                .order_by(order)
+                .limit(1)
+                .correlate(None)
+                .scalar_subquery()
+            )
+
+        row = (
+            await self.db.execute(
+                select(
+                    func.count(),
+                    edge(self.logged_at.asc()),
+                    edge(self.logged_at.desc()),
+                    func.min(self.value),
+                    func.max(self.value),
+                    func.min(self.logged_at),
+                    func.max(self.logged_at),
+                ).where(*where)
+            )
+        ).one()
+        return SeriesSummary(*row)
+
+    async def points(
+        self,
+        user_id: uuid.UUID,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        resolution: SeriesResolution = SeriesResolution.AUTO,
+        max_points: int = 60,
+        total: int | None = None,
+    ) -> tuple[SeriesResolution, list[SeriesPoint]]:
+        """Chart points, oldest first, plus the resolution actually used.
+
+        ``total`` (the summary count, when the caller already has it) lets
+        AUTO decide between raw points and LTTB without another query.
+        """
+        where = self._where(user_id, from_date, to_date)
+
+        if resolution in (SeriesResolution.DAY, SeriesResolution.WEEK, SeriesResolution.MONTH):
+            return resolution, await self._bucketed(where, resolution.value)
+
+        if resolution == SeriesResolution.AUTO:
+            if total is None:
+                total = await self.db.scalar(select(func.count()).where(*where))
+            resolution = SeriesResolution.RAW if total <= max_points else SeriesResolution.LTTB
+
+        result = await self.db.execute(
+            select(self.logged_at, self.value).where(*where).order_by(self.logged_at)
+        )
+        rows = result.all()
+        if resolution == SeriesResolution.LTTB:
+            keep = lttb([r[0].timestamp() for r in rows], [r[1] for r in rows], max_points)
+            rows = [rows[i] for i in keep]
+        return resolution, [SeriesPoint(at=r[0], value=r[1]) for r in rows]
+
+    async def _bucketed(self, where, unit: str) -> list[SeriesPoint]:
+        bucket = bucket_start(self.logged_at, unit, self.db.get_bind().dialect.name)
+        result = await self.db.execute(
+            select(
+                bucket,
+                func.avg(self.value),
+                func.min(self.value),
+                func.max(self.value),
+                func.count(),
+            )
+            .where(*where)
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        return [
+            SeriesPoint(
+                at=datetime.combine(day, time.min, tzinfo=timezone.utc),
+                value=avg,
+                min_value=low,
+                max_value=high,
+                count=count,
+            )
+            for day, avg, low, high, count in result.all()
+        ]
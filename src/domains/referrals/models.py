@@ -78,7 +78,7 @@ class ReferralCode(Base, UUIDMixin, TimestampMixin):
 
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
-    referrals = relationship("Referral", back_populates="referral_code", lazy="selectin")
+    referrals = relationship("Referral", back_populates="referral_code")
 
     def __repr__(self) -> str:
         return f"<ReferralCode {self.code} user={self.user_id}>"
@@ -121,7 +121,7 @@ class Referral(Base, UUIDMixin, TimestampMixin):
     referral_code = relationship("ReferralCode", back_populates="referrals")
     referrer = relationship("User", foreign_keys=[referrer_id])
     referred = relationship("User", foreign_keys=[referred_id])
-    rewards = relationship("ReferralReward", back_populates="referral", lazy="selectin")
+    rewards = relationship("ReferralReward", back_populates="referral")
 
     def __repr__(self) -> str:
         return f"<Referral referrer={self.referrer_id} referred={self.referred_id}>"
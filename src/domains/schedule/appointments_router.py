@@ -5,8 +5,8 @@ from datetime import date, datetime, timedelta
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,6 +15,8 @@ from src.domains.auth.dependencies import CurrentUser
 from src.domains.notifications.push_service import send_push_notification
 from src.domains.users.models import User
 
+from . import calendar_feed
+from .calendar import CalendarEngine, Candidate
 from .models import (
     Appointment,
     AppointmentParticipant,
@@ -27,6 +29,7 @@ from .models import (
     SessionType,
     TrainerAvailability,
 )
+from .recurrence import RecurrenceEngine, expand_pattern
 from .schemas import (
     AddParticipantsRequest,
     AppointmentCancel,
@@ -36,6 +39,7 @@ from .schemas import (
     AppointmentResponse,
     AppointmentUpdate,
     AttendanceUpdate,
+    CalendarFeedResponse,
     DayOfWeekAnalytics,
     GroupSessionCreate,
     HourAnalytics,
@@ -460,36 +464,31 @@ async def create_recurring_appointments(
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
 
-    if request.recurrence_pattern.value == "daily":
-        interval = timedelta(days=1)
-    elif request.recurrence_pattern.value == "weekly":
-        interval = timedelta(weeks=1)
-    elif request.recurrence_pattern.value == "biweekly":
-        interval = timedelta(weeks=2)
-    else:
-        interval = timedelta(days=30)
-
-    appointments = []
-    current_date = request.start_date
-
-    for _ in range(request.occurrences):
-        appointment = Appointment(
-            trainer_id=current_user.id,
-            student_id=request.student_id,
-            organization_id=request.organization_id,
-            date_time=current_date,
-            duration_minutes=request.duration_minutes,
-            workout_type=request.workout_type,
-            notes=request.notes,
-            status=AppointmentStatus.PENDING,
+    dates = expand_pattern(request.start_date, request.recurrence_pattern, request.occurrences)
+    if request.check_conflicts:
+        engine = await CalendarEngine(db).load(
+            [current_user.id], dates[0].date(), dates[-1].date(), student_ids=[request.student_id],
         )
-        db.add(appointment)
-        appointments.append(appointment)
-        current_date = current_date + interval
-
+        reports = engine.check_batch(
+            current_user.id,
+            [Candidate(d, request.duration_minutes, request.student_id) for d in dates],
+        )
+        dates = [d for d, report in zip(dates, reports, strict=True) if not report.has_conflicts]
+
+    appointments = await RecurrenceEngine(db).insert_new([
+        {
+            "trainer_id": current_user.id,
+            "student_id": request.student_id,
+            "organization_id": request.organization_id,
+            "date_time": current_date,
+            "duration_minutes": request.duration_minutes,
+            "workout_type": request.workout_type,
+            "notes": request.notes,
+            "status": AppointmentStatus.PENDING,
+        }
+        for current_date in dates
+    ])
     await db.commit()
-    for appointment in appointments:
-        await db.refresh(appointment)
 
     return [
         _appointment_to_response(a, trainer_name=current_user.name, student_name=student.name)
@@ -729,8 +728,8 @@ async def update_attendance(
 ) -> AppointmentResponse:
     """Trainer marks attendance for a session."""
     from src.domains.notifications.models import NotificationPriority, NotificationType
-    from src.domains.notifications.router import create_notification
     from src.domains.notifications.schemas import NotificationCreate
+    from src.domains.notifications.service import create_notification
 
     appointment = await db.get(Appointment, appointment_id)
     if not appointment:
@@ -1234,47 +1233,38 @@ async def list_evaluations(
 
 # ==================== Calendar Export (.ics) ====================
 
-def _generate_ics(appointments: list) -> str:
-    """Generate iCalendar (.ics) content from a list of appointments."""
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//MyFit//Schedule//PT",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH",
-    ]
-    for apt in appointments:
-        dt_start = apt.date_time.strftime("%Y%m%dT%H%M%S")
-        dt_end = (apt.date_time + timedelta(minutes=apt.duration_minutes)).strftime("%Y%m%dT%H%M%S")
-
-        is_group = getattr(apt, "is_group", False) or False
-        if is_group and hasattr(apt, "participants") and apt.participants:
-            names = ", ".join(
-                p.student.name if p.student else "Aluno"
-                for p in apt.participants[:3]
-            )
-            if len(apt.participants) > 3:
-                names += f" +{len(apt.participants) - 3}"
-            summary = f"Grupo ({len(apt.participants)}) - {apt.workout_type.value if apt.workout_type else 'Treino'}"
-        else:
-            summary = f"{apt.student.name if apt.student else 'Sessão'} - {apt.workout_type.value if apt.workout_type else 'Treino'}"
-
-        location = apt.organization.name if apt.organization else ""
-        description = (apt.notes or "").replace("\n", "\\n")
-
-        lines.extend([
-            "BEGIN:VEVENT",
-            f"UID:{apt.id}@myfit.app",
-            f"DTSTART:{dt_start}",
-            f"DTEND:{dt_end}",
-            f"SUMMARY:{summary}",
-            f"LOCATION:{location}",
-            f"DESCRIPTION:{description}",
-            f"STATUS:{'CANCELLED' if apt.status == AppointmentStatus.CANCELLED else 'CONFIRMED'}",
-            "END:VEVENT",
-        ])
-    lines.append("END:VCALENDAR")
-    return "\r\n".join(lines)
+def _ics_range(from_date: date, to_date: date) -> None:
+    if to_date < from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A data final deve ser posterior à data inicial",
+        )
+    if (to_date - from_date).days >= calendar_feed.MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Período máximo de {calendar_feed.MAX_RANGE_DAYS} dias",
+        )
+
+
+async def _calendar_response(
+    request: Request, trainer_id: UUID, from_date: date, to_date: date, filename: str | None = None,
+) -> Response:
+    """Streamed .ics of a trainer's range, or 304 if the client's copy is current."""
+    etag, last_modified = await calendar_feed.feed_validators(trainer_id, from_date, to_date)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": "private, max-age=0, must-revalidate",
+    }
+    if calendar_feed.not_modified(request.headers, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(
+        calendar_feed.stream_ics(*calendar_feed.range_filter(trainer_id, from_date, to_date)),
+        media_type="text/calendar",
+        headers=headers,
+    )
 
 
 @appointments_router.get("/appointments/{appointment_id}/calendar")
@@ -1284,17 +1274,20 @@ async def export_appointment_calendar(
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> Response:
     """Export a single appointment as .ics calendar file."""
-    appointment = await db.get(Appointment, appointment_id)
-    if not appointment:
+    result = await db.execute(
+        calendar_feed.event_query()
+        .add_columns(Appointment.trainer_id, Appointment.student_id)
+        .where(Appointment.id == appointment_id)
+    )
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sessão não encontrada")
 
-    if appointment.trainer_id != current_user.id and appointment.student_id != current_user.id:
+    if row.trainer_id != current_user.id and row.student_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso negado")
 
-    ics_content = _generate_ics([appointment])
-
     return Response(
-        content=ics_content,
+        content=calendar_feed.render_ics([row]),
         media_type="text/calendar",
         headers={"Content-Disposition": f'attachment; filename="sessao-{appointment_id}.ics"'},
     )
@@ -1302,32 +1295,71 @@ async def export_appointment_calendar(
 
 @appointments_router.get("/export")
 async def export_schedule_calendar(
+    request: Request,
     current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
     from_date: Annotated[date, Query()],
     to_date: Annotated[date, Query()],
 ) -> Response:
-    """Export all appointments in a date range as .ics calendar file."""
-    start_dt = datetime.combine(from_date, datetime.min.time())
-    end_dt = datetime.combine(to_date, datetime.max.time())
-
-    query = (
-        select(Appointment)
-        .where(and_(
-            Appointment.trainer_id == current_user.id,
-            Appointment.date_time >= start_dt,
-            Appointment.date_time <= end_dt,
-        ))
-        .order_by(Appointment.date_time)
+    """Export all appointments in a date range as .ics calendar file.
+
+    The range is limited to ``MAX_RANGE_DAYS``; the file is streamed and
+    supports conditional requests (ETag / Last-Modified).
+    """
+    _ics_range(from_date, to_date)
+    return await _calendar_response(
+        request, current_user.id, from_date, to_date, filename=f"agenda-{from_date}-{to_date}.ics",
     )
 
-    result = await db.execute(query)
-    appointments = list(result.scalars().all())
 
-    ics_content = _generate_ics(appointments)
+@appointments_router.post("/calendar-feed", response_model=CalendarFeedResponse)
+async def create_calendar_feed(
+    request: Request,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> CalendarFeedResponse:
+    """Create the trainer's calendar subscription URL, replacing any previous one."""
+    settings = await _get_or_create_trainer_settings(db, current_user.id)
+    previous = settings.calendar_feed_token
+    settings.calendar_feed_token = calendar_feed.new_feed_token()
+    await db.commit()
+    await calendar_feed.forget_feed_token(previous)
 
-    return Response(
-        content=ics_content,
-        media_type="text/calendar",
-        headers={"Content-Disposition": f'attachment; filename="agenda-{from_date}-{to_date}.ics"'},
+    url = str(request.url_for("get_calendar_feed", token=settings.calendar_feed_token))
+    return CalendarFeedResponse(
+        url=url,
+        webcal_url="webcal://" + url.split("://", 1)[1],
     )
+
+
+@appointments_router.delete("/calendar-feed", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_calendar_feed(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> None:
+    """Revoke the trainer's calendar subscription URL."""
+    settings = await _get_or_create_trainer_settings(db, current_user.id)
+    previous = settings.calendar_feed_token
+    settings.calendar_feed_token = None
+    await db.commit()
+    await calendar_feed.forget_feed_token(previous)
+
+
+@appointments_router.get("/calendar-feed/{token}.ics", name="get_calendar_feed")
+async def get_calendar_feed(
+    token: str,
+    request: Request,
+    from_date: Annotated[date | None, Query()] = None,
+    to_date: Annotated[date | None, Query()] = None,
+) -> Response:
+    """Subscribable calendar of a trainer's schedule, authenticated by its token.
+
+    Defaults to ``FEED_PAST_DAYS`` back and ``FEED_FUTURE_DAYS`` ahead.
+    """
+    trainer_id = await calendar_feed.resolve_feed_token(token)
+    if trainer_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agenda não encontrada")
+
+    default_from, default_to = calendar_feed.default_range()
+    from_date, to_date = from_date or default_from, to_date or default_to
+    _ics_range(from_date, to_date)
+    return await _calendar_response(request, trainer_id, from_date, to_date)
@@ -1,7 +1,7 @@
 """Availability management, conflict detection, booking, and trainer settings endpoints."""
 import json
 import logging
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, timedelta
 from typing import Annotated
 from uuid import UUID
 
@@ -13,6 +13,7 @@ from src.config.database import get_db
 from src.domains.auth.dependencies import CurrentUser
 from src.domains.notifications.push_service import send_push_notification
 
+from .calendar import CalendarEngine, Candidate
 from .models import (
     Appointment,
     AppointmentStatus,
@@ -22,10 +23,9 @@ from .models import (
 )
 from .schemas import (
     AppointmentResponse,
-    AvailableSlotResponse,
     AvailableSlotsResponse,
+    BatchConflictCheckRequest,
     ConflictCheckResponse,
-    ConflictDetail,
     StudentBookSessionRequest,
     TrainerAvailabilityCreate,
     TrainerAvailabilityResponse,
@@ -128,117 +128,33 @@ async def check_conflicts(
     student_id: Annotated[UUID | None, Query()] = None,
 ) -> ConflictCheckResponse:
     """Check for scheduling conflicts before creating an appointment."""
-    conflicts: list[ConflictDetail] = []
-    warnings: list[ConflictDetail] = []
-
-    end_time = date_time + timedelta(minutes=duration)
-    buffer_minutes = 15
-
-    # 1. Check trainer's existing appointments for overlap
-    trainer_appointments_query = (
-        select(Appointment)
-        .where(
-            and_(
-                Appointment.trainer_id == current_user.id,
-                Appointment.status.in_([AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED]),
-                Appointment.date_time.between(
-                    date_time - timedelta(minutes=240),  # Max session is 240min
-                    end_time,
-                ),
-            )
-        )
-    )
-    result = await db.execute(trainer_appointments_query)
-    trainer_appointments = list(result.scalars().all())
-
-    for apt in trainer_appointments:
-        apt_end = apt.date_time + timedelta(minutes=apt.duration_minutes)
-        # Check overlap
-        if apt.date_time < end_time and apt_end > date_time:
-            conflicts.append(ConflictDetail(
-                type="trainer_overlap",
-                message=f"Você já tem sessão com {apt.student.name if apt.student else 'aluno'} das {apt.date_time.strftime('%H:%M')} às {apt_end.strftime('%H:%M')}",
-                conflicting_appointment_id=apt.id,
-                conflicting_student_name=apt.student.name if apt.student else None,
-                conflicting_time=apt.date_time,
-            ))
-        # Check buffer
-        elif (apt.date_time - end_time).total_seconds() < buffer_minutes * 60 and apt.date_time > date_time:
-            warnings.append(ConflictDetail(
-                type="buffer_too_short",
-                message=f"Menos de {buffer_minutes}min entre esta sessão e a próxima ({apt.student.name if apt.student else 'aluno'} às {apt.date_time.strftime('%H:%M')})",
-                conflicting_appointment_id=apt.id,
-                conflicting_time=apt.date_time,
-            ))
-        elif (date_time - apt_end).total_seconds() < buffer_minutes * 60 and apt_end < end_time:
-            warnings.append(ConflictDetail(
-                type="buffer_too_short",
-                message=f"Menos de {buffer_minutes}min entre a sessão anterior ({apt.student.name if apt.student else 'aluno'}) e esta",
-                conflicting_appointment_id=apt.id,
-                conflicting_time=apt.date_time,
-            ))
-
-    # 2. Check student's existing appointments for overlap
-    if student_id:
-        student_appointments_query = (
-            select(Appointment)
-            .where(
-                and_(
-                    Appointment.student_id == student_id,
-                    Appointment.status.in_([AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED]),
-                    Appointment.date_time.between(
-                        date_time - timedelta(minutes=240),
-                        end_time,
-                    ),
-                )
-            )
-        )
-        result = await db.execute(student_appointments_query)
-        student_appointments = list(result.scalars().all())
-
-        for apt in student_appointments:
-            apt_end = apt.date_time + timedelta(minutes=apt.duration_minutes)
-            if apt.date_time < end_time and apt_end > date_time:
-                conflicts.append(ConflictDetail(
-                    type="student_overlap",
-                    message=f"O aluno já tem sessão das {apt.date_time.strftime('%H:%M')} às {apt_end.strftime('%H:%M')}",
-                    conflicting_appointment_id=apt.id,
-                    conflicting_time=apt.date_time,
-                ))
-
-    # 3. Check trainer availability
-    target_day = date_time.weekday()  # 0=Monday
-    availability_query = (
-        select(TrainerAvailability)
-        .where(
-            and_(
-                TrainerAvailability.trainer_id == current_user.id,
-                TrainerAvailability.day_of_week == target_day,
-            )
-        )
+    engine = await CalendarEngine(db).load(
+        [current_user.id], date_time.date(), date_time.date(), student_ids=[student_id] if student_id else [],
     )
-    result = await db.execute(availability_query)
-    availability_slots = list(result.scalars().all())
+    return engine.check(current_user.id, Candidate(date_time, duration, student_id))
 
-    if availability_slots:
-        # Check if the appointment falls within any availability slot
-        appointment_start = date_time.strftime("%H:%M")
-        appointment_end = end_time.strftime("%H:%M")
-        in_availability = any(
-            slot.start_time <= appointment_start and slot.end_time >= appointment_end
-            for slot in availability_slots
-        )
-        if not in_availability:
-            warnings.append(ConflictDetail(
-                type="outside_availability",
-                message="Este horário está fora da sua disponibilidade configurada",
-            ))
-
-    return ConflictCheckResponse(
-        has_conflicts=len(conflicts) > 0,
-        conflicts=conflicts,
-        warnings=warnings,
+
+@availability_router.post("/conflicts/batch", response_model=list[ConflictCheckResponse])
+async def check_conflicts_batch(
+    request: BatchConflictCheckRequest,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> list[ConflictCheckResponse]:
+    """Check many candidate sessions at once, one result per candidate.
+
+    Candidates are checked in order and also against the earlier candidates
+    without conflicts, as if those had been booked.
+    """
+    candidates = [
+        Candidate(c.date_time, c.duration_minutes, c.student_id) for c in request.candidates
+    ]
+    engine = await CalendarEngine(db).load(
+        [current_user.id],
+        min(c.start for c in candidates).date(),
+        max(c.end for c in candidates).date(),
+        student_ids=[c.student_id for c in candidates],
     )
+    return engine.check_batch(current_user.id, candidates)
 
 
 # ==================== Available Slots ====================
@@ -259,90 +175,41 @@ async def get_available_slots(
             detail="Invalid date format. Use YYYY-MM-DD",
         )
 
-    # 1. Get trainer settings
-    settings = await _get_or_create_trainer_settings(db, trainer_id)
-
-    # 2. Generate all possible slots
-    interval = timedelta(minutes=settings.slot_interval_minutes)
-    slot_start = datetime.combine(target_date, settings.default_start_time)
-    day_end = datetime.combine(target_date, settings.default_end_time)
-
-    all_slots: list[datetime] = []
-    current = slot_start
-    while current + timedelta(minutes=settings.session_duration_minutes) <= day_end:
-        all_slots.append(current)
-        current += interval
-
-    # 3. Get blocked slots (recurring for this day_of_week + specific date)
-    day_of_week = target_date.weekday()
-    blocked_query = select(TrainerBlockedSlot).where(
-        and_(
-            TrainerBlockedSlot.trainer_id == trainer_id,
-        )
-    ).where(
-        (
-            (TrainerBlockedSlot.is_recurring == True) & (TrainerBlockedSlot.day_of_week == day_of_week)  # noqa: E712
-        ) | (
-            (TrainerBlockedSlot.is_recurring == False) & (TrainerBlockedSlot.specific_date == target_date)  # noqa: E712
-        )
-    )
-    result = await db.execute(blocked_query)
-    blocked_slots = list(result.scalars().all())
-
-    # 4. Get existing appointments for that day
-    start_of_day = datetime.combine(target_date, time(0, 0))
-    end_of_day = datetime.combine(target_date, time(23, 59, 59))
-    apt_query = select(Appointment).where(
-        and_(
-            Appointment.trainer_id == trainer_id,
-            Appointment.date_time >= start_of_day,
-            Appointment.date_time <= end_of_day,
-            Appointment.status.in_([AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED]),
-        )
-    )
-    result = await db.execute(apt_query)
-    existing_appointments = list(result.scalars().all())
-
-    # 5. Build response
-    now = datetime.now()
-    response_slots: list[AvailableSlotResponse] = []
-
-    for slot_dt in all_slots:
-        slot_time = slot_dt.time()
-        slot_end_dt = slot_dt + timedelta(minutes=settings.session_duration_minutes)
-        available = True
-
-        # Skip past slots
-        if slot_dt <= now:
-            available = False
-
-        # Check blocked slots
-        if available:
-            for blocked in blocked_slots:
-                if slot_time < blocked.end_time and slot_end_dt.time() > blocked.start_time:
-                    available = False
-                    break
-
-        # Check existing appointments
-        if available:
-            for apt in existing_appointments:
-                apt_end = apt.date_time + timedelta(minutes=apt.duration_minutes)
-                if slot_dt < apt_end and slot_end_dt > apt.date_time:
-                    available = False
-                    break
-
-        response_slots.append(AvailableSlotResponse(
-            time=slot_time.strftime("%H:%M"),
-            available=available,
-        ))
-
+    engine = await CalendarEngine(db).load([trainer_id], target_date, target_date)
     return AvailableSlotsResponse(
         date=target_date,
         trainer_id=trainer_id,
-        slots=response_slots,
+        slots=engine.available_slots(trainer_id, target_date),
     )
 
 
+@availability_router.get("/available-slots/range", response_model=list[AvailableSlotsResponse])
+async def get_available_slots_range(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    trainer_ids: Annotated[list[UUID], Query(min_length=1, max_length=20)],
+    start_date: Annotated[date, Query()],
+    days: Annotated[int, Query(ge=1, le=31)] = 7,
+) -> list[AvailableSlotsResponse]:
+    """Get available time slots for several trainers over several days.
+
+    Returns one entry per (trainer, day), trainers in request order, days
+    ascending, e.g. a whole week for booking screens.
+    """
+    end_date = start_date + timedelta(days=days - 1)
+    engine = await CalendarEngine(db).load(trainer_ids, start_date, end_date)
+    now = datetime.now()
+    return [
+        AvailableSlotsResponse(
+            date=day,
+            trainer_id=trainer_id,
+            slots=engine.available_slots(trainer_id, day, now),
+        )
+        for trainer_id in dict.fromkeys(trainer_ids)
+        for day in (start_date + timedelta(days=i) for i in range(days))
+    ]
+
+
 # ==================== Self-service Booking ====================
 
 @availability_router.post("/book", response_model=AppointmentResponse, status_code=status.HTTP_201_CREATED)
@@ -354,8 +221,8 @@ async def student_book_session(
     """Student books a session with their trainer (self-service)."""
     from src.domains.billing.models import ServicePlan, ServicePlanType
     from src.domains.notifications.models import NotificationPriority, NotificationType
-    from src.domains.notifications.router import create_notification
     from src.domains.notifications.schemas import NotificationCreate
+    from src.domains.notifications.service import create_notification
 
     # Validate service plan exists and belongs to this student
     plan = await db.get(ServicePlan, request.service_plan_id)
@@ -0,0 +1,377 @@
+"""Trainer calendar engine: free slots and conflicts from sorted interval sets.
+
+``CalendarEngine.load`` reads the settings, weekly availability, blocked
+slots and active appointments of any number of trainers (and students) for a
+date range with one query per table. Every question after that is answered
+in memory:
+
+- free slots come from one sweep of a day's slot grid against its merged
+  busy intervals, O(slots + intervals);
+- conflict checks bisect the appointments sorted by start, so checking a
+  batch of candidates (a duplicated week, bulk creation) costs no further
+  queries. Accepted candidates can be added back so later candidates in the
+  same batch see them.
+
+Datetimes are compared as wall-clock times, like the ``HH:MM`` availability
+and blocked slot times, so timezone info is dropped.
+"""
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domains.users.models import User
+
+from .models import (
+    Appointment,
+    AppointmentStatus,
+    TrainerAvailability,
+    TrainerBlockedSlot,
+    TrainerSettings,
+)
+from .schemas import AvailableSlotResponse, ConflictCheckResponse, ConflictDetail
+from .shared import DEFAULT_TRAINER_SETTINGS
+
+ACTIVE_STATUSES = (AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED)
+MAX_SESSION_MINUTES = 240
+BUFFER_MINUTES = 15
+
+
+def _wall_clock(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=None)
+
+
+@dataclass(frozen=True, order=True)
+class Interval:
+    """Half-open time interval ``[start, end)``."""
+
+    start: datetime
+    end: datetime
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Sorted, disjoint union of ``intervals`` (touching intervals are joined)."""
+    merged: list[Interval] = []
+    for interval in sorted(intervals):
+        if merged and interval.start <= merged[-1].end:
+            if interval.end > merged[-1].end:
+                merged[-1] = Interval(merged[-1].start, interval.end)
+        else:
+            merged.append(interval)
+    return merged
+
+
+@dataclass(frozen=True, order=True)
+class BusyAppointment:
+    """An active appointment as seen by conflict checks."""
+
+    start: datetime
+    end: datetime
+    id: uuid.UUID | None = field(default=None, compare=False)
+    trainer_id: uuid.UUID | None = field(default=None, compare=False)
+    student_id: uuid.UUID | None = field(default=None, compare=False)
+    student_name: str | None = field(default=None, compare=False)
+
+
+@dataclass
+class Candidate:
+    """A session someone wants to schedule."""
+
+    start: datetime
+    duration_minutes: int
+    student_id: uuid.UUID | None = None
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(minutes=self.duration_minutes)
+
+
+class AppointmentIndex:
+    """Appointments sorted by start for range lookups by bisection."""
+
+    def __init__(self) -> None:
+        self._items: list[BusyAppointment] = []
+        self._starts: list[datetime] = []
+        self._max_minutes = MAX_SESSION_MINUTES
+
+    def add(self, appointment: BusyAppointment) -> None:
+        i = bisect_left(self._starts, appointment.start)
+        self._starts.insert(i, appointment.start)
+        self._items.insert(i, appointment)
+        minutes = (appointment.end - appointment.start).total_seconds() / 60
+        self._max_minutes = max(self._max_minutes, int(minutes) + 1)
+
+    def starting_between(self, start: datetime, end: datetime) -> list[BusyAppointment]:
+        """Appointments starting in ``[start, end)``."""
+        lo = bisect_left(self._starts, start)
+        hi = bisect_left(self._starts, end, lo)
+        return self._items[lo:hi]
+
+    def overlapping(self, start: datetime, end: datetime) -> list[BusyAppointment]:
+        """Appointments overlapping ``[start, end)``, by start."""
+        window = self.starting_between(start - timedelta(minutes=self._max_minutes), end)
+        return [a for a in window if a.end > start]
+
+
+@dataclass
+class TrainerCalendar:
+    """A trainer's scheduling rules and booked time over the loaded range."""
+
+    trainer_id: uuid.UUID
+    day_start: time
+    day_end: time
+    session_minutes: int
+    slot_interval_minutes: int
+    availability: dict[int, list[tuple[str, str]]] = field(default_factory=lambda: defaultdict(list))
+    recurring_blocks: dict[int, list[tuple[time, time]]] = field(default_factory=lambda: defaultdict(list))
+    date_blocks: dict[date, list[tuple[time, time]]] = field(default_factory=lambda: defaultdict(list))
+    appointments: AppointmentIndex = field(default_factory=AppointmentIndex)
+
+    def busy(self, day: date) -> list[Interval]:
+        """Merged blocked and booked intervals touching ``day``."""
+        intervals = [
+            Interval(datetime.combine(day, start), datetime.combine(day, end))
+            for start, end in (*self.recurring_blocks.get(day.weekday(), ()), *self.date_blocks.get(day, ()))
+        ]
+        midnight = datetime.combine(day, time.min)
+        intervals.extend(
+            Interval(a.start, a.end)
+            for a in self.appointments.overlapping(midnight, midnight + timedelta(days=1))
+        )
+        return merge_intervals(intervals)
+
+    def slots(self, day: date, now: datetime) -> list[AvailableSlotResponse]:
+        """The day's slot grid, each marked available or not."""
+        session = timedelta(minutes=self.session_minutes)
+        step = timedelta(minutes=self.slot_interval_minutes)
+        day_end = datetime.combine(day, self.day_end)
+        busy = self.busy(day)
+
+        slots: list[AvailableSlotResponse] = []
+        i = 0
+        current = datetime.combine(day, self.day_start)
+        while current + session <= day_end:
+            slot_end = current + session
+            # Busy intervals are disjoint and sorted, so their ends increase too
+            while i < len(busy) and busy[i].end <= current:
+                i += 1
+            free = current > now and (i == len(busy) or busy[i].start >= slot_end)
+            slots.append(AvailableSlotResponse(time=current.strftime("%H:%M"), available=free))
+            current += step
+        return slots
+
+    def within_availability(self, start: datetime, end: datetime) -> bool:
+        """Whether ``[start, end)`` fits a configured availability window.
+
+        Trainers without windows for that weekday are always available.
+        """
+        windows = self.availability.get(start.weekday())
+        if not windows:
+            return True
+        start_hm, end_hm = start.strftime("%H:%M"), end.strftime("%H:%M")
+        return any(w_start <= start_hm and w_end >= end_hm for w_start, w_end in windows)
+
+
+class CalendarEngine:
+    """Availability and conflict checks over preloaded trainer calendars."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.trainers: dict[uuid.UUID, TrainerCalendar] = {}
+        self.students: dict[uuid.UUID, AppointmentIndex] = {}
+
+    async def load(
+        self,
+        trainer_ids: Iterable[uuid.UUID],
+        start: date,
+        end: date,
+        student_ids: Iterable[uuid.UUID] = (),
+    ) -> "CalendarEngine":
+        """Load calendars for the days ``start``..``end`` (inclusive)."""
+        trainer_ids = list(dict.fromkeys(trainer_ids))
+        student_ids = [s for s in dict.fromkeys(student_ids) if s]
+        for student_id in student_ids:
+            self.students.setdefault(student_id, AppointmentIndex())
+
+        result = await self.db.execute(
+            select(TrainerSettings).where(TrainerSettings.trainer_id.in_(trainer_ids))
+        )
+        settings = {s.trainer_id: s for s in result.scalars().all()}
+        for trainer_id in trainer_ids:
+            s = settings.get(trainer_id)
+            self.trainers[trainer_id] = TrainerCalendar(
+                trainer_id=trainer_id,
+                day_start=s.default_start_time if s else DEFAULT_TRAINER_SETTINGS["default_start_time"],
+                day_end=s.default_end_time if s else DEFAULT_TRAINER_SETTINGS["default_end_time"],
+                session_minutes=s.session_duration_minutes if s else DEFAULT_TRAINER_SETTINGS["session_duration_minutes"],
+                slot_interval_minutes=s.slot_interval_minutes if s else DEFAULT_TRAINER_SETTINGS["slot_interval_minutes"],
+            )
+
+        result = await self.db.execute(
+            select(
+                TrainerAvailability.trainer_id,
+                TrainerAvailability.day_of_week,
+                TrainerAvailability.start_time,
+                TrainerAvailability.end_time,
+            ).where(TrainerAvailability.trainer_id.in_(trainer_ids))
+        )
+        for row in result:
+            self.trainers[row.trainer_id].availability[row.day_of_week].append((row.start_time, row.end_time))
+
+        result = await self.db.execute(
+            select(
+                TrainerBlockedSlot.trainer_id,
+                TrainerBlockedSlot.is_recurring,
+                TrainerBlockedSlot.day_of_week,
+                TrainerBlockedSlot.specific_date,
+                TrainerBlockedSlot.start_time,
+                TrainerBlockedSlot.end_time,
+            ).where(
+                TrainerBlockedSlot.trainer_id.in_(trainer_ids),
+                or_(
+                    TrainerBlockedSlot.is_recurring == True,  # noqa: E712
+                    TrainerBlockedSlot.specific_date.between(start, end),
+                ),
+            )
+        )
+        for row in result:
+            calendar = self.trainers[row.trainer_id]
+            if row.is_recurring:
+                calendar.recurring_blocks[row.day_of_week].append((row.start_time, row.end_time))
+            else:
+                calendar.date_blocks[row.specific_date].append((row.start_time, row.end_time))
+
+        # Pad the range so sessions spilling over its edges and buffer
+        # neighbours are seen too
+        pad = timedelta(minutes=MAX_SESSION_MINUTES + BUFFER_MINUTES)
+        range_start = datetime.combine(start, time.min) - pad
+        range_end = datetime.combine(end + timedelta(days=1), time.min) + pad
+        owners = [Appointment.trainer_id.in_(trainer_ids)]
+        if student_ids:
+            owners.append(Appointment.student_id.in_(student_ids))
+        result = await self.db.execute(
+            select(
+                Appointment.id,
+                Appointment.trainer_id,
+                Appointment.student_id,
+                Appointment.date_time,
+                Appointment.duration_minutes,
+                User.name.label("student_name"),
+            )
+            .outerjoin(User, User.id == Appointment.student_id)
+            .where(
+                and_(
+                    or_(*owners),
+                    Appointment.status.in_(ACTIVE_STATUSES),
+                    Appointment.date_time >= range_start,
+                    Appointment.date_time < range_end,
+                )
+            )
+        )
+        for row in result:
+            self._index(BusyAppointment(
+                start=_wall_clock(row.date_time),
+                end=_wall_clock(row.date_time) + timedelta(minutes=row.duration_minutes),
+                id=row.id,
+                trainer_id=row.trainer_id,
+                student_id=row.student_id,
+                student_name=row.student_name,
+            ))
+        return self
+
+    def _index(self, appointment: BusyAppointment) -> None:
+        if appointment.trainer_id in self.trainers:
+            self.trainers[appointment.trainer_id].appointments.add(appointment)
+        if appointment.student_id in self.students:
+            self.students[appointment.student_id].add(appointment)
+
+    def available_slots(self, trainer_id: uuid.UUID, day: date, now: datetime | None = None) -> list[AvailableSlotResponse]:
+        """Slot grid of ``trainer_id`` on ``day``; past slots are unavailable."""
+        return self.trainers[trainer_id].slots(day, _wall_clock(now or datetime.now()))
+
+    def check(self, trainer_id: uuid.UUID, candidate: Candidate) -> ConflictCheckResponse:
+        """Conflicts (overlaps) and warnings (short buffers, outside availability)."""
+        calendar = self.trainers[trainer_id]
+        start, end = _wall_clock(candidate.start), _wall_clock(candidate.end)
+        buffer = timedelta(minutes=BUFFER_MINUTES)
+        conflicts: list[ConflictDetail] = []
+        warnings: list[ConflictDetail] = []
+
+        for apt in calendar.appointments.overlapping(start - buffer, end + buffer):
+            student = apt.student_name or "aluno"
+            if apt.start < end and apt.end > start:
+                conflicts.append(ConflictDetail(
+                    type="trainer_overlap",
+                    message=f"Você já tem sessão com {student} das {apt.start.strftime('%H:%M')} às {apt.end.strftime('%H:%M')}",
+                    conflicting_appointment_id=apt.id,
+                    conflicting_student_name=apt.student_name,
+                    conflicting_time=apt.start,
+                ))
+            elif apt.start >= end:
+                warnings.append(ConflictDetail(
+                    type="buffer_too_short",
+                    message=f"Menos de {BUFFER_MINUTES}min entre esta sessão e a próxima ({student} às {apt.start.strftime('%H:%M')})",
+                    conflicting_appointment_id=apt.id,
+                    conflicting_time=apt.start,
+                ))
+            else:
+                warnings.append(ConflictDetail(
+                    type="buffer_too_short",
+                    message=f"Menos de {BUFFER_MINUTES}min entre a sessão anterior ({student}) e esta",
+                    conflicting_appointment_id=apt.id,
+                    conflicting_time=apt.start,
+                ))
+
+        if candidate.student_id in self.students:
+            for apt in self.students[candidate.student_id].overlapping(start, end):
+                if apt.trainer_id == trainer_id:
+                    continue  # already reported as a trainer overlap
+                conflicts.append(ConflictDetail(
+                    type="student_overlap",
+                    message=f"O aluno já tem sessão das {apt.start.strftime('%H:%M')} às {apt.end.strftime('%H:%M')}",
+                    conflicting_appointment_id=apt.id,
+                    conflicting_time=apt.start,
+                ))
+
+        if not calendar.within_availability(start, end):
+            warnings.append(ConflictDetail(
+                type="outside_availability",
+                message="Este horário está fora da sua disponibilidade configurada",
+            ))
+
+        return ConflictCheckResponse(has_conflicts=bool(conflicts), conflicts=conflicts, warnings=warnings)
+
+    def check_batch(
+        self,
+        trainer_id: uuid.UUID,
+        candidates: Sequence[Candidate],
+        book_accepted: bool = True,
+    ) -> list[ConflictCheckResponse]:
+        """Check candidates in order, one result per candidate.
+
+        With ``book_accepted``, candidates without conflicts are added to the
+        calendar so later candidates in the batch conflict with them.
+        """
+        results = []
+        for candidate in candidates:
+            report = self.check(trainer_id, candidate)
+            if book_accepted and not report.has_conflicts:
+                self.book(trainer_id, candidate)
+            results.append(report)
+        return results
+
+    def book(self, trainer_id: uuid.UUID, candidate: Candidate, appointment_id: uuid.UUID | None = None) -> None:
+        """Add a (new) session to the loaded calendars."""
+        start = _wall_clock(candidate.start)
+        self._index(BusyAppointment(
+            start=start,
+            end=start + timedelta(minutes=candidate.duration_minutes),
+            id=appointment_id,
+            trainer_id=trainer_id,
+            student_id=candidate.student_id,
+        ))
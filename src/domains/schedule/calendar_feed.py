@@ -0,0 +1,293 @@
+"""Subscribable iCalendar feed of a trainer's schedule.
+
+Calendar apps poll the feed URL every few minutes with only a token in it.
+To keep those polls cheap:
+
+- each trainer has a schedule change counter in the cache, rotated after
+  any commit touching one of their appointments, with the time of the
+  change. The feed's ETag and ``Last-Modified`` come from it, so unchanged
+  feeds are answered with 304 without touching the database;
+- feed tokens are resolved through the cache as well;
+- the body is built from a single joined query, streamed from the database
+  and sent in chunks instead of being assembled in memory.
+
+The counter only sees ORM flushes; code writing appointments with bulk
+statements calls ``mark_schedule_changed``. Changes it can't see (a
+student's name, an organization's name) show up when the ETag rolls over
+every ``FEED_MAX_AGE_SECONDS``.
+"""
+import asyncio
+import hashlib
+import secrets
+import time
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Iterable
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+import orjson
+from sqlalchemy import and_, event, func, select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session, aliased
+
+from src.config.database import AsyncSessionLocal
+from src.core.redis import cache_delete, cache_get, cache_set
+from src.domains.organizations.models import Organization
+from src.domains.users.models import User
+
+from .models import Appointment, AppointmentParticipant, AppointmentStatus, TrainerSettings
+
+VERSION_PREFIX = "schedule:version:"
+TOKEN_PREFIX = "schedule:feed_token:"
+VERSION_TTL_SECONDS = 86400
+TOKEN_TTL_SECONDS = 3600
+FEED_MAX_AGE_SECONDS = 3600
+# Default feed window around today and the widest one a request may ask for
+FEED_PAST_DAYS = 30
+FEED_FUTURE_DAYS = 180
+MAX_RANGE_DAYS = 366
+EVENTS_PER_CHUNK = 200
+
+_stale_trainers: set[uuid.UUID] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+# --- Schedule change counter -----------------------------------------------
+
+
+async def schedule_version(trainer_id: uuid.UUID) -> tuple[str, datetime]:
+    """Current version token of a trainer's schedule and when it last changed."""
+    key = f"{VERSION_PREFIX}{trainer_id}"
+    if trainer_id in _stale_trainers:
+        _stale_trainers.discard(trainer_id)
+    else:
+        cached = await cache_get(key)
+        if cached:
+            data = orjson.loads(cached)
+            return data["version"], datetime.fromtimestamp(data["changed_at"], timezone.utc)
+
+    # Unknown or just changed: whole seconds, as HTTP dates have no fractions
+    changed_at = datetime.now(timezone.utc).replace(microsecond=0)
+    version = uuid.uuid4().hex
+    payload = {"version": version, "changed_at": changed_at.timestamp()}
+    await cache_set(key, orjson.dumps(payload).decode(), VERSION_TTL_SECONDS)
+    return version, changed_at
+
+
+def _spawn(coro: Awaitable[Any]) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _rotate(trainer_ids: set[uuid.UUID]) -> None:
+    _stale_trainers.update(trainer_ids)
+    for trainer_id in trainer_ids:
+        try:
+            _spawn(schedule_version(trainer_id))  # publish to other processes right away
+        except RuntimeError:
+            pass  # no running loop: the next read rotates it
+
+
+_CHANGED_TRAINERS = "schedule_changed_trainers"
+
+
+def mark_schedule_changed(session: Session, trainer_ids: Iterable[uuid.UUID]) -> None:
+    """Rotate these trainers' schedule versions when ``session`` commits.
+
+    For appointment writes that bypass the ORM flush (bulk statements).
+    """
+    session.info.setdefault(_CHANGED_TRAINERS, set()).update(t for t in trainer_ids if t)
+
+
+def _trainer_ids(session: Session, obj: object) -> set[uuid.UUID]:
+    if isinstance(obj, Appointment):
+        history = sa_inspect(obj).attrs.trainer_id.history
+        return {obj.trainer_id, *history.deleted}
+    if isinstance(obj, AppointmentParticipant):
+        # Only known when the appointment is loaded; otherwise caught on rollover
+        key = sa_inspect(Appointment).identity_key_from_primary_key((obj.appointment_id,))
+        appointment = session.identity_map.get(key)
+        return {appointment.trainer_id} if appointment is not None else set()
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_trainers(session: Session, flush_context) -> None:
+    changed = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        changed |= _trainer_ids(session, obj)
+    changed.discard(None)
+    if changed:
+        mark_schedule_changed(session, changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _rotate_changed(session: Session) -> None:
+    changed = session.info.pop(_CHANGED_TRAINERS, None)
+    if changed:
+        _rotate(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed(session: Session) -> None:
+    session.info.pop(_CHANGED_TRAINERS, None)
+
+
+# --- Feed tokens -------------------------------------------------------------
+
+
+def new_feed_token() -> str:
+    return secrets.token_urlsafe(32)
+
+
+async def forget_feed_token(token: str | None) -> None:
+    """Drop a revoked or rotated token from the cache."""
+    if token:
+        await cache_delete(f"{TOKEN_PREFIX}{token}")
+
+
+async def resolve_feed_token(token: str) -> uuid.UUID | None:
+    """Trainer owning the feed token, or None if it isn't valid."""
+    key = f"{TOKEN_PREFIX}{token}"
+    cached = await cache_get(key)
+    if cached:
+        return uuid.UUID(cached)
+
+    async with AsyncSessionLocal() as db:
+        trainer_id = await db.scalar(
+            select(TrainerSettings.trainer_id).where(TrainerSettings.calendar_feed_token == token)
+        )
+    if trainer_id is not None:
+        await cache_set(key, str(trainer_id), TOKEN_TTL_SECONDS)
+    return trainer_id
+
+
+# --- Conditional requests ----------------------------------------------------
+
+
+def default_range() -> tuple[date, date]:
+    today = date.today()
+    return today - timedelta(days=FEED_PAST_DAYS), today + timedelta(days=FEED_FUTURE_DAYS)
+
+
+async def feed_validators(trainer_id: uuid.UUID, from_date: date, to_date: date) -> tuple[str, str]:
+    """ETag and Last-Modified header values of a feed."""
+    version, changed_at = await schedule_version(trainer_id)
+    parts = [str(trainer_id), version, from_date.isoformat(), to_date.isoformat(),
+             str(int(time.time() // FEED_MAX_AGE_SECONDS))]
+    etag = f'"{hashlib.sha1(chr(10).join(parts).encode()).hexdigest()}"'
+    return etag, format_datetime(changed_at, usegmt=True)
+
+
+def not_modified(headers, etag: str, last_modified: str) -> bool:
+    """Whether the request's validators show the client's copy is current."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match:
+        return any(
+            candidate.strip().removeprefix("W/") in (etag, "*")
+            for candidate in if_none_match.split(",")
+        )
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+# --- ICS rendering -----------------------------------------------------------
+
+ICS_HEADER = "\r\n".join([
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//MyFit//Schedule//PT",
+    "CALSCALE:GREGORIAN",
+    "METHOD:PUBLISH",
+]) + "\r\n"
+ICS_FOOTER = "END:VCALENDAR"
+
+
+def event_query():
+    """Columns of each VEVENT: appointment, student, organization, participant count."""
+    student = aliased(User)
+    participant_count = (
+        select(func.count(AppointmentParticipant.id))
+        .where(AppointmentParticipant.appointment_id == Appointment.id)
+        .correlate(Appointment)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            Appointment.id,
+            Appointment.date_time,
+            Appointment.duration_minutes,
+            Appointment.workout_type,
+            Appointment.notes,
+            Appointment.status,
+            Appointment.is_group,
+            student.name.label("student_name"),
+            Organization.name.label("organization_name"),
+            participant_count.label("participant_count"),
+        )
+        .outerjoin(student, student.id == Appointment.student_id)
+        .outerjoin(Organization, Organization.id == Appointment.organization_id)
+    )
+
+
+def render_event(row) -> str:
+    """VEVENT of one row of the event query."""
+    dt_start = row.date_time.strftime("%Y%m%dT%H%M%S")
+    dt_end = (row.date_time + timedelta(minutes=row.duration_minutes)).strftime("%Y%m%dT%H%M%S")
+    workout = row.workout_type.value if row.workout_type else "Treino"
+    if row.is_group and row.participant_count:
+        summary = f"Grupo ({row.participant_count}) - {workout}"
+    else:
+        summary = f"{row.student_name or 'Sessão'} - {workout}"
+    description = (row.notes or "").replace("\n", "\\n")
+
+    return "\r\n".join([
+        "BEGIN:VEVENT",
+        f"UID:{row.id}@myfit.app",
+        f"DTSTART:{dt_start}",
+        f"DTEND:{dt_end}",
+        f"SUMMARY:{summary}",
+        f"LOCATION:{row.organization_name or ''}",
+        f"DESCRIPTION:{description}",
+        f"STATUS:{'CANCELLED' if row.status == AppointmentStatus.CANCELLED else 'CONFIRMED'}",
+        "END:VEVENT",
+    ]) + "\r\n"
+
+
+def render_ics(rows) -> str:
+    """Whole calendar of a few rows of the event query."""
+    return ICS_HEADER + "".join(render_event(row) for row in rows) + ICS_FOOTER
+
+
+async def stream_ics(*where) -> AsyncGenerator[str, None]:
+    """Stream the calendar of the appointments matching ``where``, by start.
+
+    Uses its own database session, which lives as long as the stream.
+    """
+    yield ICS_HEADER
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            event_query()
+            .where(and_(*where))
+            .order_by(Appointment.date_time, Appointment.id)
+            .execution_options(yield_per=EVENTS_PER_CHUNK)
+        )
+        async for rows in result.partitions(EVENTS_PER_CHUNK):
+            yield "".join(render_event(row) for row in rows)
+    yield ICS_FOOTER
+
+
+def range_filter(trainer_id: uuid.UUID, from_date: date, to_date: date) -> list:
+    """Filter for a trainer's appointments on ``from_date``..``to_date``."""
+    return [
+        Appointment.trainer_id == trainer_id,
+        Appointment.date_time >= datetime.combine(from_date, datetime.min.time()),
+        Appointment.date_time <= datetime.combine(to_date, datetime.max.time()),
+    ]
@@ -9,6 +9,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -164,12 +165,12 @@ class Appointment(Base, UUIDMixin, TimestampMixin):
         Integer, nullable=True,
     )
 
-    # Relationships
+    # Relationships (eager ones are rendered by every appointment response)
     trainer = relationship("User", foreign_keys=[trainer_id], lazy="selectin")
     student = relationship("User", foreign_keys=[student_id], lazy="selectin")
-    organization = relationship("Organization", lazy="selectin")
+    organization = relationship("Organization")
     service_plan = relationship("ServicePlan", lazy="selectin")
-    payment = relationship("Payment", lazy="selectin")
+    payment = relationship("Payment")
     participants = relationship("AppointmentParticipant", lazy="selectin", cascade="all, delete-orphan")
     evaluations = relationship("SessionEvaluation", lazy="selectin", cascade="all, delete-orphan")
 
@@ -238,6 +239,9 @@ class TrainerSettings(Base, UUIDMixin, TimestampMixin):
     """Per-trainer scheduling settings."""
 
     __tablename__ = "trainer_settings"
+    __table_args__ = (
+        Index("uq_trainer_settings_calendar_feed_token", "calendar_feed_token", unique=True),
+    )
 
     trainer_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -264,6 +268,10 @@ class TrainerSettings(Base, UUIDMixin, TimestampMixin):
     late_cancel_policy: Mapped[str] = mapped_column(
         String(10), default="warn", nullable=False, server_default="warn",
     )
+    # Secret of the subscribable calendar feed URL; NULL when not shared
+    calendar_feed_token: Mapped[str | None] = mapped_column(
+        String(64), nullable=True,
+    )
 
     # Relationships
     trainer = relationship("User", lazy="selectin")
@@ -342,7 +350,7 @@ class SessionEvaluation(Base, UUIDMixin, TimestampMixin):
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Relationships
-    appointment = relationship("Appointment", lazy="selectin", overlaps="evaluations")
+    appointment = relationship("Appointment", overlaps="evaluations")
     evaluator = relationship("User", lazy="selectin")
 
 
@@ -401,7 +409,7 @@ class WaitlistEntry(Base, UUIDMixin, TimestampMixin):
     # Relationships
     student = relationship("User", foreign_keys=[student_id], lazy="selectin")
     trainer = relationship("User", foreign_keys=[trainer_id], lazy="selectin")
-    offered_appointment = relationship("Appointment", lazy="selectin")
+    offered_appointment = relationship("Appointment")
     organization = relationship("Organization", lazy="selectin")
 
 
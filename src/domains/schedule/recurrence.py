@@ -0,0 +1,124 @@
+"""Recurrence expansion and bulk insertion of generated appointments.
+
+Recurring appointments, service plan ``schedule_config`` and session
+templates are expanded into candidate appointments in memory, then
+``RecurrenceEngine.insert_new`` writes them with a fixed number of
+statements however many there are:
+
+1. one range query finds which candidates already exist (same trainer,
+   student and start, not cancelled);
+2. one multi-row ``INSERT ... RETURNING`` inserts the rest;
+3. one ``SELECT`` reloads them with relationships for the response.
+"""
+import calendar
+import uuid
+from collections.abc import Iterable
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.response_cache import mark_tables_changed
+
+from .calendar_feed import mark_schedule_changed
+from .models import Appointment, AppointmentStatus
+from .schemas import RecurrencePattern
+
+# Weekly slot: (day_of_week 0=Monday, start time, duration in minutes)
+WeeklySlot = tuple[int, time, int]
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """Same day ``months`` later, clamped to the end of shorter months."""
+    month_index = dt.month - 1 + months
+    year, month = dt.year + month_index // 12, month_index % 12 + 1
+    return dt.replace(year=year, month=month, day=min(dt.day, calendar.monthrange(year, month)[1]))
+
+
+def expand_pattern(start: datetime, pattern: RecurrencePattern, count: int) -> list[datetime]:
+    """The first ``count`` occurrences of ``pattern`` from ``start``."""
+    if pattern == RecurrencePattern.MONTHLY:
+        return [add_months(start, i) for i in range(count)]
+    step = {
+        RecurrencePattern.DAILY: timedelta(days=1),
+        RecurrencePattern.WEEKLY: timedelta(weeks=1),
+        RecurrencePattern.BIWEEKLY: timedelta(weeks=2),
+    }[pattern]
+    return [start + step * i for i in range(count)]
+
+
+def expand_weekly(slots: Iterable[WeeklySlot], start: date, end: date) -> list[tuple[datetime, int]]:
+    """(start, duration) of every weekly slot falling on ``start``..``end``, by time."""
+    occurrences = []
+    monday = start - timedelta(days=start.weekday())
+    slots = list(slots)
+    while monday <= end:
+        for day_of_week, start_time, duration in slots:
+            day = monday + timedelta(days=day_of_week)
+            if start <= day <= end:
+                occurrences.append((datetime.combine(day, start_time), duration))
+        monday += timedelta(weeks=1)
+    return sorted(occurrences)
+
+
+def schedule_config_slots(schedule_config: list[dict[str, Any]]) -> list[WeeklySlot]:
+    """Weekly slots of a service plan ``schedule_config``."""
+    slots = []
+    for slot in schedule_config:
+        hour, minute = map(int, slot.get("time", "09:00").split(":"))
+        slots.append((slot.get("day_of_week", 0), time(hour, minute), slot.get("duration_minutes", 60)))
+    return slots
+
+
+def _key_time(dt: datetime) -> datetime:
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _key(values: dict[str, Any]) -> tuple:
+    return values["trainer_id"], values["student_id"], _key_time(values["date_time"])
+
+
+class RecurrenceEngine:
+    """Inserts generated appointments, skipping ones that already exist."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def insert_new(self, rows: list[dict[str, Any]]) -> list[Appointment]:
+        """Insert appointment ``rows`` (column values) that don't exist yet.
+
+        Duplicates within ``rows`` and of existing non-cancelled appointments
+        are skipped. Returns the created appointments ordered by start;
+        doesn't commit.
+        """
+        unique: dict[tuple, dict[str, Any]] = {}
+        for row in rows:
+            unique.setdefault(_key(row), row)
+        if not unique:
+            return []
+
+        starts = [row["date_time"] for row in unique.values()]
+        result = await self.db.execute(
+            select(Appointment.trainer_id, Appointment.student_id, Appointment.date_time).where(
+                Appointment.trainer_id.in_({row["trainer_id"] for row in unique.values()}),
+                Appointment.date_time >= min(starts),
+                Appointment.date_time <= max(starts),
+                Appointment.status != AppointmentStatus.CANCELLED,
+            )
+        )
+        for trainer_id, student_id, date_time in result:
+            unique.pop((trainer_id, student_id, _key_time(date_time)), None)
+        if not unique:
+            return []
+
+        new_rows = [{"id": uuid.uuid4(), **row} for row in unique.values()]
+        result = await self.db.execute(insert(Appointment).returning(Appointment.id), new_rows)
+        created_ids = list(result.scalars().all())
+        mark_schedule_changed(self.db.sync_session, {row["trainer_id"] for row in new_rows})
+        mark_tables_changed(self.db.sync_session, Appointment.__tablename__)
+
+        result = await self.db.execute(
+            select(Appointment).where(Appointment.id.in_(created_ids)).order_by(Appointment.date_time)
+        )
+        return list(result.scalars().all())
@@ -13,6 +13,7 @@ from src.domains.auth.dependencies import CurrentUser
 from src.domains.notifications.push_service import send_push_notification
 from src.domains.users.models import User
 
+from .calendar import CalendarEngine, Candidate
 from .models import (
     Appointment,
     AppointmentStatus,
@@ -26,6 +27,7 @@ from .schemas import (
     AppointmentResponse,
     ApplyTemplateRequest,
     AutoGenerateScheduleRequest,
+    BulkAutoGenerateScheduleRequest,
     DuplicateWeekRequest,
     SessionTemplateCreate,
     SessionTemplateResponse,
@@ -34,6 +36,7 @@ from .schemas import (
     WaitlistEntryResponse,
     WaitlistOfferRequest,
 )
+from .recurrence import RecurrenceEngine, expand_weekly, schedule_config_slots
 from .shared import _appointment_to_response
 
 schedule_logger = logging.getLogger(__name__)
@@ -72,73 +75,73 @@ async def auto_generate_schedule(
             detail="Service plan has no schedule configuration",
         )
 
-    # Generate appointments for the next N weeks
-    today = date.today()
-    appointments_created = []
-
-    for week_offset in range(request.weeks_ahead):
-        week_start = today + timedelta(weeks=week_offset)
-        # Adjust to Monday of that week
-        monday = week_start - timedelta(days=week_start.weekday())
-
-        for slot in plan.schedule_config:
-            slot_day = slot.get("day_of_week", 0)
-            slot_time = slot.get("time", "09:00")
-            slot_duration = slot.get("duration_minutes", 60)
-
-            # Calculate the actual date for this slot
-            appointment_date = monday + timedelta(days=slot_day)
-
-            # Skip dates in the past
-            if appointment_date < today:
-                continue
-
-            # Parse time
-            hour, minute = map(int, slot_time.split(":"))
-            appointment_datetime = datetime.combine(
-                appointment_date,
-                datetime.min.time().replace(hour=hour, minute=minute),
-            )
+    created = await RecurrenceEngine(db).insert_new(
+        _plan_appointment_rows(plan, request.weeks_ahead, request.auto_confirm)
+    )
+    await db.commit()
+
+    return [_appointment_to_response(a) for a in created]
 
-            # Check if appointment already exists for this slot
-            existing_query = (
-                select(Appointment)
-                .where(
-                    and_(
-                        Appointment.trainer_id == current_user.id,
-                        Appointment.student_id == plan.student_id,
-                        Appointment.date_time == appointment_datetime,
-                        Appointment.status != AppointmentStatus.CANCELLED,
-                    )
-                )
+
+@recurring_router.post(
+    "/auto-generate/bulk", response_model=list[AppointmentResponse], status_code=status.HTTP_201_CREATED,
+)
+async def auto_generate_schedule_bulk(
+    request: BulkAutoGenerateScheduleRequest,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> list[AppointmentResponse]:
+    """Auto-generate appointments for many service plans at once (e.g. a whole roster).
+
+    Plans without a schedule configuration are skipped.
+    """
+    from src.domains.billing.models import ServicePlan
+
+    result = await db.execute(select(ServicePlan).where(ServicePlan.id.in_(request.service_plan_ids)))
+    plans = {plan.id: plan for plan in result.scalars().all()}
+
+    for plan_id in request.service_plan_ids:
+        plan = plans.get(plan_id)
+        if not plan:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Service plan not found: {plan_id}",
             )
-            result = await db.execute(existing_query)
-            if result.scalar():
-                continue  # Skip -- already exists
-
-            apt = Appointment(
-                trainer_id=current_user.id,
-                student_id=plan.student_id,
-                organization_id=plan.organization_id,
-                date_time=appointment_datetime,
-                duration_minutes=slot_duration,
-                status=AppointmentStatus.CONFIRMED if request.auto_confirm else AppointmentStatus.PENDING,
-                service_plan_id=plan.id,
-                is_complimentary=plan.plan_type.value == "free_trial",
+        if plan.trainer_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only the plan's trainer can generate schedule",
             )
-            db.add(apt)
-            appointments_created.append(apt)
 
+    rows = [
+        row
+        for plan in plans.values()
+        if plan.schedule_config
+        for row in _plan_appointment_rows(plan, request.weeks_ahead, request.auto_confirm)
+    ]
+    created = await RecurrenceEngine(db).insert_new(rows)
     await db.commit()
 
-    # Reload all with relationships
-    created_ids = [a.id for a in appointments_created]
-    if created_ids:
-        reload_query = select(Appointment).where(Appointment.id.in_(created_ids)).order_by(Appointment.date_time)
-        result = await db.execute(reload_query)
-        appointments_created = list(result.scalars().all())
+    return [_appointment_to_response(a) for a in created]
 
-    return [_appointment_to_response(a) for a in appointments_created]
+
+def _plan_appointment_rows(plan, weeks_ahead: int, auto_confirm: bool) -> list[dict]:
+    """Appointment rows of a plan's schedule config for the next ``weeks_ahead`` weeks."""
+    today = date.today()
+    last_day = today - timedelta(days=today.weekday()) + timedelta(weeks=weeks_ahead, days=-1)
+    return [
+        {
+            "trainer_id": plan.trainer_id,
+            "student_id": plan.student_id,
+            "organization_id": plan.organization_id,
+            "date_time": start,
+            "duration_minutes": duration,
+            "status": AppointmentStatus.CONFIRMED if auto_confirm else AppointmentStatus.PENDING,
+            "service_plan_id": plan.id,
+            "is_complimentary": plan.plan_type.value == "free_trial",
+        }
+        for start, duration in expand_weekly(schedule_config_slots(plan.schedule_config), today, last_day)
+    ]
 
 
 # ==================== Duplicate Week ====================
@@ -175,39 +178,24 @@ async def duplicate_week(
     created = 0
     skipped = 0
 
-    for apt in source_appointments:
-        target_datetime = apt.date_time + timedelta(days=day_offset)
-
-        # Conflict check (unless skip_conflicts is True)
-        if not request.skip_conflicts:
-            target_end = target_datetime + timedelta(minutes=apt.duration_minutes)
-            # Check trainer overlap in target slot
-            conflict_query = (
-                select(Appointment)
-                .where(
-                    and_(
-                        Appointment.trainer_id == current_user.id,
-                        Appointment.status.in_([AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED]),
-                        Appointment.date_time.between(
-                            target_datetime - timedelta(minutes=240),
-                            target_end,
-                        ),
-                    )
-                )
-            )
-            conflict_result = await db.execute(conflict_query)
-            existing = list(conflict_result.scalars().all())
-
-            has_conflict = False
-            for ex in existing:
-                ex_end = ex.date_time + timedelta(minutes=ex.duration_minutes)
-                if ex.date_time < target_end and ex_end > target_datetime:
-                    has_conflict = True
-                    break
+    candidates = [
+        Candidate(apt.date_time + timedelta(days=day_offset), apt.duration_minutes)
+        for apt in source_appointments
+    ]
+    if request.skip_conflicts:
+        reports = [None] * len(candidates)
+    else:
+        # One load for the whole target week; copies also conflict with each other
+        engine = await CalendarEngine(db).load(
+            [current_user.id], request.target_week_start, request.target_week_start + timedelta(days=6),
+        )
+        reports = engine.check_batch(current_user.id, candidates)
 
-            if has_conflict:
-                skipped += 1
-                continue
+    for apt, candidate, report in zip(source_appointments, candidates, reports, strict=True):
+        target_datetime = candidate.start
+        if report is not None and report.has_conflicts:
+            skipped += 1
+            continue
 
         new_apt = Appointment(
             trainer_id=current_user.id,
@@ -688,11 +676,16 @@ async def apply_templates(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> list[AppointmentResponse]:
-    """Apply templates to a specific week, creating appointments in bulk."""
-    created_appointments = []
+    """Apply templates to a specific week, creating appointments in bulk.
+
+    Templates already applied to that week (same start) are skipped.
+    """
+    result = await db.execute(select(SessionTemplate).where(SessionTemplate.id.in_(request.template_ids)))
+    templates = {t.id: t for t in result.scalars().all()}
 
+    rows = []
     for template_id in request.template_ids:
-        template = await db.get(SessionTemplate, template_id)
+        template = templates.get(template_id)
         if not template:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -708,35 +701,23 @@ async def apply_templates(
         if not template.is_active:
             continue  # Skip inactive templates
 
-        # Calculate the date_time from week_start_date + day_of_week offset + start_time
+        # Since templates don't have a student, the trainer is used as a
+        # placeholder student - the trainer can assign students later
         target_date = request.week_start_date + timedelta(days=template.day_of_week)
-        target_datetime = datetime.combine(target_date, template.start_time)
-
-        # For the apply templates endpoint, we need at least a student
-        # Since templates don't have a student, we create the appointment with
-        # trainer as both trainer and student (placeholder) - the trainer can assign students later
-        appointment = Appointment(
-            trainer_id=current_user.id,
-            student_id=current_user.id,  # Placeholder - trainer assigns student later
-            organization_id=template.organization_id,
-            date_time=target_datetime,
-            duration_minutes=template.duration_minutes,
-            workout_type=template.workout_type,
-            status=AppointmentStatus.CONFIRMED if request.auto_confirm else AppointmentStatus.PENDING,
-            notes=f"Criado do template: {template.name}",
-            is_group=template.is_group,
-            max_participants=template.max_participants,
-        )
-        db.add(appointment)
-        await db.flush()
-        created_appointments.append(appointment)
-
+        rows.append({
+            "trainer_id": current_user.id,
+            "student_id": current_user.id,
+            "organization_id": template.organization_id,
+            "date_time": datetime.combine(target_date, template.start_time),
+            "duration_minutes": template.duration_minutes,
+            "workout_type": template.workout_type,
+            "status": AppointmentStatus.CONFIRMED if request.auto_confirm else AppointmentStatus.PENDING,
+            "notes": f"Criado do template: {template.name}",
+            "is_group": template.is_group,
+            "max_participants": template.max_participants,
+        })
+
+    created = await RecurrenceEngine(db).insert_new(rows)
     await db.commit()
 
-    # Refresh all appointments to load relationships
-    responses = []
-    for apt in created_appointments:
-        await db.refresh(apt)
-        responses.append(_appointment_to_response(apt, trainer_name=current_user.name))
-
-    return responses
+    return [_appointment_to_response(apt, trainer_name=current_user.name) for apt in created]
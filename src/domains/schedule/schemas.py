@@ -99,6 +99,7 @@ class RecurringAppointmentCreate(BaseModel):
     organization_id: UUID | None = None
     recurrence_pattern: RecurrencePattern
     occurrences: int = Field(ge=1, le=52)  # Max 1 year of weekly appointments
+    check_conflicts: bool = False  # If True, occurrences overlapping existing sessions are not created
 
 
 class AppointmentReschedule(BaseModel):
@@ -161,6 +162,20 @@ class ConflictCheckResponse(BaseModel):
     warnings: list[ConflictDetail] = []
 
 
+class ConflictCandidate(BaseModel):
+    """A session to check for conflicts."""
+
+    date_time: datetime
+    duration_minutes: int = Field(default=60, ge=15, le=240)
+    student_id: UUID | None = None
+
+
+class BatchConflictCheckRequest(BaseModel):
+    """Sessions to check for conflicts in one call."""
+
+    candidates: list[ConflictCandidate] = Field(min_length=1, max_length=200)
+
+
 class AutoGenerateScheduleRequest(BaseModel):
     """Request to auto-generate appointments from a service plan."""
 
@@ -169,6 +184,14 @@ class AutoGenerateScheduleRequest(BaseModel):
     auto_confirm: bool = False  # If True, appointments are created as CONFIRMED
 
 
+class BulkAutoGenerateScheduleRequest(BaseModel):
+    """Request to auto-generate appointments from many service plans."""
+
+    service_plan_ids: list[UUID] = Field(min_length=1, max_length=200)
+    weeks_ahead: int = Field(default=4, ge=1, le=26)
+    auto_confirm: bool = False
+
+
 # --- Self-service booking schemas ---
 
 
@@ -256,6 +279,13 @@ class TrainerFullAvailabilityResponse(BaseModel):
     blocked_slots: list[TrainerBlockedSlotResponse]
 
 
+class CalendarFeedResponse(BaseModel):
+    """Calendar subscription URL of a trainer's schedule."""
+
+    url: str
+    webcal_url: str
+
+
 class AttendanceUpdate(BaseModel):
     """Update attendance status for an appointment."""
 
@@ -15,6 +15,16 @@ from .schemas import (
     ParticipantResponse,
 )
 
+# Scheduling settings of trainers who never saved their own
+DEFAULT_TRAINER_SETTINGS = {
+    "default_start_time": time(6, 0),
+    "default_end_time": time(21, 0),
+    "session_duration_minutes": 60,
+    "slot_interval_minutes": 30,
+    "late_cancel_window_hours": 24,
+    "late_cancel_policy": "warn",
+}
+
 
 def _appointment_to_response(
     appointment: Appointment,
@@ -90,15 +100,7 @@ async def _get_or_create_trainer_settings(
     )
     settings = result.scalar_one_or_none()
     if not settings:
-        settings = TrainerSettings(
-            trainer_id=trainer_id,
-            default_start_time=time(6, 0),
-            default_end_time=time(21, 0),
-            session_duration_minutes=60,
-            slot_interval_minutes=30,
-            late_cancel_window_hours=24,
-            late_cancel_policy="warn",
-        )
+        settings = TrainerSettings(trainer_id=trainer_id, **DEFAULT_TRAINER_SETTINGS)
         db.add(settings)
         await db.commit()
         await db.refresh(settings)
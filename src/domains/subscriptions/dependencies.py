@@ -1,6 +1,7 @@
 """Subscription tier enforcement dependencies for FastAPI.
 
-Use these as route dependencies to gate features by tier.
+Use these as route dependencies to gate features by tier. Checks run against
+the cached entitlement snapshot, so a warm cache costs no database queries.
 
 Example usage:
     @router.post("/some-pro-feature", dependencies=[Depends(require_pro)])
@@ -28,8 +29,8 @@ async def require_pro(
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> None:
     """Require the current user to have Pro tier."""
-    service = SubscriptionService(db)
-    if not await service.is_pro(current_user.id):
+    entitlements = await SubscriptionService(db).get_entitlements(current_user.id)
+    if not entitlements.is_pro:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail={
@@ -46,8 +47,8 @@ async def require_can_add_student(
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> None:
     """Require the professional to be under their student limit."""
-    service = SubscriptionService(db)
-    can_add, current_count, limit = await service.can_add_student(current_user.id)
+    entitlements = await SubscriptionService(db).get_entitlements(current_user.id)
+    can_add, current_count, limit = entitlements.can_add_student()
 
     if not can_add:
         raise HTTPException(
@@ -63,7 +64,7 @@ async def require_can_add_student(
         )
 
 
-async def require_feature(feature_key: str):
+def require_feature(feature_key: str):
     """Create a dependency that requires a specific feature.
 
     Usage:
@@ -73,8 +74,8 @@ async def require_feature(feature_key: str):
         current_user: CurrentUser,
         db: Annotated[AsyncSession, Depends(get_db)],
     ) -> None:
-        service = SubscriptionService(db)
-        check = await service.check_feature_access(current_user.id, feature_key)
+        entitlements = await SubscriptionService(db).get_entitlements(current_user.id)
+        check = entitlements.check_feature(feature_key)
 
         if not check.has_access:
             raise HTTPException(
@@ -0,0 +1,395 @@
+"""Entitlement snapshots for subscription gating.
+
+A snapshot holds everything a tier check needs for one user: the subscribed
+tier and when it lapses, the founder flag and the active-student usage
+counter, plus the enabled feature rules. Snapshots are cached in process and
+in Redis so gating a request costs one small Redis read; only a cache miss
+touches the database.
+
+Caches are invalidated from session events: a commit that touched a user's
+``PlatformSubscription`` drops that user's snapshot, and a commit that touched
+an ``OrganizationMembership`` drops the snapshots of the member and of every
+professional in the affected organizations (their student counters changed).
+Changes that bypass the ORM (e.g. database-level cascades) are picked up when
+the cached entries expire.
+
+Invalidation also replaces the user's generation token in Redis. Every cached
+snapshot carries the token it was built under and is only served while that
+token is current, so other processes drop their local copies on their next
+read, and a snapshot built from rows read before the commit is never served.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import orjson
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core.redis import cache_delete, cache_get, cache_set
+from src.domains.organizations.models import OrganizationMembership, UserRole
+
+from .models import FeatureDefinition, PlatformSubscription, PlatformTier, SubscriptionStatus
+from .schemas import FeatureCheckResponse
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TTL_SECONDS = 30
+REDIS_TTL_SECONDS = 300
+FEATURES_TTL_SECONDS = 300
+LOCAL_MAX_ENTRIES = 10_000
+GENERATION_TTL_SECONDS = 86_400
+REDIS_KEY_PREFIX = "entitlements:"
+
+STUDENT_LIMIT_FEATURE = "max_active_students"
+DEFAULT_STUDENT_LIMIT = 5
+PROFESSIONAL_ROLES = (UserRole.TRAINER, UserRole.COACH, UserRole.NUTRITIONIST)
+
+
+@dataclass(frozen=True)
+class FeatureRule:
+    """Tier requirement and limits of an enabled feature."""
+
+    key: str
+    required_tier: PlatformTier
+    free_tier_limit: int | None = None
+    pro_tier_limit: int | None = None
+
+
+@dataclass(frozen=True)
+class EntitlementSnapshot:
+    """What a user is entitled to, as of the last cache fill."""
+
+    user_id: uuid.UUID
+    subscribed_tier: PlatformTier
+    pro_until: datetime | None
+    is_founder: bool
+    active_students: int
+    features: Mapping[str, FeatureRule] = field(default_factory=dict, compare=False)
+    generation: str = ""
+
+    @property
+    def tier(self) -> PlatformTier:
+        """Effective tier; expiry is checked on every read, not at cache time."""
+        if self.subscribed_tier == PlatformTier.PRO and (
+            self.pro_until is None or datetime.now(timezone.utc) < self.pro_until
+        ):
+            return PlatformTier.PRO
+        return PlatformTier.FREE
+
+    @property
+    def is_pro(self) -> bool:
+        return self.tier == PlatformTier.PRO
+
+    @property
+    def student_limit(self) -> int | None:
+        """Maximum active students. None = unlimited."""
+        if self.is_pro:
+            return None
+        rule = self.features.get(STUDENT_LIMIT_FEATURE)
+        if rule:
+            return rule.free_tier_limit
+        return DEFAULT_STUDENT_LIMIT
+
+    def can_add_student(self) -> tuple[bool, int, int | None]:
+        """Returns (can_add, current_count, limit)."""
+        limit = self.student_limit
+        if limit is None:
+            return True, self.active_students, None
+        return self.active_students < limit, self.active_students, limit
+
+    def check_feature(self, feature_key: str) -> FeatureCheckResponse:
+        """Check access to a feature without touching the database."""
+        tier = self.tier
+        rule = self.features.get(feature_key)
+
+        if not rule:
+            # Feature not defined — allow by default
+            return FeatureCheckResponse(
+                feature_key=feature_key,
+                has_access=True,
+                current_tier=tier,
+                required_tier=PlatformTier.FREE,
+            )
+
+        has_access = rule.required_tier == PlatformTier.FREE or tier == PlatformTier.PRO
+
+        current_usage = None
+        limit = None
+        if feature_key == STUDENT_LIMIT_FEATURE:
+            current_usage = self.active_students
+            limit = rule.free_tier_limit if tier == PlatformTier.FREE else rule.pro_tier_limit
+            if limit is not None:
+                has_access = current_usage < limit
+
+        return FeatureCheckResponse(
+            feature_key=feature_key,
+            has_access=has_access,
+            current_tier=tier,
+            required_tier=rule.required_tier,
+            current_usage=current_usage,
+            limit=limit,
+            upgrade_required=not has_access,
+        )
+
+    def to_json(self) -> bytes:
+        """Serialize the per-user part; feature rules are cached separately."""
+        return orjson.dumps({
+            "user_id": str(self.user_id),
+            "subscribed_tier": self.subscribed_tier.value,
+            "pro_until": self.pro_until.isoformat() if self.pro_until else None,
+            "is_founder": self.is_founder,
+            "active_students": self.active_students,
+            "generation": self.generation,
+        })
+
+    @classmethod
+    def from_json(
+        cls, raw: str | bytes, features: Mapping[str, FeatureRule]
+    ) -> "EntitlementSnapshot":
+        data = orjson.loads(raw)
+        return cls(
+            user_id=uuid.UUID(data["user_id"]),
+            subscribed_tier=PlatformTier(data["subscribed_tier"]),
+            pro_until=datetime.fromisoformat(data["pro_until"]) if data["pro_until"] else None,
+            is_founder=data["is_founder"],
+            active_students=data["active_students"],
+            features=features,
+            generation=data.get("generation", ""),
+        )
+
+
+# Process-local caches. ``_generation`` is bumped on every invalidation so a
+# snapshot built from rows read before a concurrent commit in this process is
+# never stored; per-user generations in Redis cover the other processes.
+_local: dict[uuid.UUID, tuple[float, EntitlementSnapshot]] = {}
+_features: tuple[float, dict[str, FeatureRule]] | None = None
+_generation = 0
+_pending_deletes: set[uuid.UUID] = set()
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _redis_key(user_id: uuid.UUID) -> str:
+    return f"{REDIS_KEY_PREFIX}{user_id}"
+
+
+def _generation_key(user_id: uuid.UUID) -> str:
+    return f"{REDIS_KEY_PREFIX}generation:{user_id}"
+
+
+async def _user_generation(user_id: uuid.UUID) -> str | None:
+    """Token of the user's last invalidation ("" if none), None if unreadable."""
+    try:
+        return await cache_get(_generation_key(user_id)) or ""
+    except Exception as e:
+        logger.warning(f"Entitlement generation read failed for {user_id}: {e}")
+        return None
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def active_student_count_query(professional_id: uuid.UUID):
+    """Distinct active students across the professional's organizations."""
+    org_ids = select(OrganizationMembership.organization_id).where(
+        OrganizationMembership.user_id == professional_id,
+        OrganizationMembership.is_active == True,  # noqa: E712
+        OrganizationMembership.role.in_(PROFESSIONAL_ROLES),
+    )
+    return select(func.count(func.distinct(OrganizationMembership.user_id))).where(
+        OrganizationMembership.organization_id.in_(org_ids),
+        OrganizationMembership.role == UserRole.STUDENT,
+        OrganizationMembership.is_active == True,  # noqa: E712
+    )
+
+
+async def _load_features(db: AsyncSession) -> dict[str, FeatureRule]:
+    global _features
+    now = time.monotonic()
+    if _features and _features[0] > now:
+        return _features[1]
+
+    result = await db.execute(
+        select(
+            FeatureDefinition.key,
+            FeatureDefinition.required_tier,
+            FeatureDefinition.free_tier_limit,
+            FeatureDefinition.pro_tier_limit,
+        ).where(FeatureDefinition.is_enabled == True)  # noqa: E712
+    )
+    rules = {row.key: FeatureRule(*row) for row in result.all()}
+    _features = (now + FEATURES_TTL_SECONDS, rules)
+    return rules
+
+
+async def _build(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    features: Mapping[str, FeatureRule],
+    generation: str,
+) -> EntitlementSnapshot:
+    result = await db.execute(
+        select(PlatformSubscription)
+        .where(
+            PlatformSubscription.user_id == user_id,
+            PlatformSubscription.status.in_([
+                SubscriptionStatus.ACTIVE,
+                SubscriptionStatus.TRIAL,
+            ]),
+        )
+        .order_by(PlatformSubscription.created_at.desc())
+        .limit(1)
+    )
+    sub = result.scalar_one_or_none()
+    active_students = (await db.execute(active_student_count_query(user_id))).scalar() or 0
+
+    return EntitlementSnapshot(
+        user_id=user_id,
+        subscribed_tier=sub.tier if sub else PlatformTier.FREE,
+        pro_until=_as_utc(sub.expires_at) if sub else None,
+        is_founder=sub.is_founder if sub else False,
+        active_students=active_students,
+        features=features,
+        generation=generation,
+    )
+
+
+def _remember(user_id: uuid.UUID, snapshot: EntitlementSnapshot) -> None:
+    if len(_local) >= LOCAL_MAX_ENTRIES:
+        _local.pop(next(iter(_local)))
+    _local[user_id] = (time.monotonic() + LOCAL_TTL_SECONDS, snapshot)
+
+
+async def load_snapshot(db: AsyncSession, user_id: uuid.UUID) -> EntitlementSnapshot:
+    """Get a user's entitlements: process cache, then Redis, then the database.
+
+    Cached snapshots are only served under the user's current generation; if
+    it can't be read, the snapshot is built from the database and not cached.
+    """
+    if _pending_deletes:
+        await flush_invalidations()
+    user_generation = await _user_generation(user_id)
+
+    cached = _local.get(user_id)
+    if cached and cached[0] > time.monotonic() and cached[1].generation == user_generation:
+        return cached[1]
+
+    generation = _generation
+    features = await _load_features(db)
+    if user_generation is None:
+        return await _build(db, user_id, features, "")
+
+    snapshot = None
+    try:
+        raw = await cache_get(_redis_key(user_id))
+        if raw:
+            snapshot = EntitlementSnapshot.from_json(raw, features)
+            if snapshot.generation != user_generation:
+                snapshot = None  # written by a load that raced an invalidation
+    except Exception as e:
+        logger.warning(f"Entitlement cache read failed for {user_id}: {e}")
+
+    if snapshot is None:
+        snapshot = await _build(db, user_id, features, user_generation)
+        if generation == _generation and await _user_generation(user_id) == user_generation:
+            try:
+                await cache_set(_redis_key(user_id), snapshot.to_json().decode(), REDIS_TTL_SECONDS)
+            except Exception as e:
+                logger.warning(f"Entitlement cache write failed for {user_id}: {e}")
+
+    if generation == _generation:
+        _remember(user_id, snapshot)
+    return snapshot
+
+
+async def flush_invalidations() -> None:
+    """Rotate the generation and delete the Redis entry of every user invalidated here."""
+    while _pending_deletes:
+        user_id = _pending_deletes.pop()
+        try:
+            await cache_set(_generation_key(user_id), uuid.uuid4().hex, GENERATION_TTL_SECONDS)
+            await cache_delete(_redis_key(user_id))
+        except Exception as e:
+            logger.warning(f"Entitlement cache delete failed for {user_id}: {e}")
+
+
+def invalidate(user_ids: Iterable[uuid.UUID]) -> None:
+    """Drop cached snapshots now; Redis entries are invalidated asynchronously."""
+    global _generation
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    _generation += 1
+    for user_id in user_ids:
+        _local.pop(user_id, None)
+    _pending_deletes.update(user_ids)
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # no loop: the next load_snapshot flushes them
+    task = loop.create_task(flush_invalidations())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def clear_cache() -> None:
+    """Forget every process-local snapshot and the feature rules."""
+    global _features, _generation
+    _generation += 1
+    _local.clear()
+    _features = None
+
+
+# --- Session events -------------------------------------------------------
+
+_DIRTY_USERS = "entitlements_dirty_users"
+_DIRTY_FEATURES = "entitlements_dirty_features"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context) -> None:
+    user_ids: set[uuid.UUID] = set()
+    org_ids: set[uuid.UUID] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, PlatformSubscription):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, OrganizationMembership):
+            user_ids.add(obj.user_id)
+            org_ids.add(obj.organization_id)
+        elif isinstance(obj, FeatureDefinition):
+            session.info[_DIRTY_FEATURES] = True
+
+    if org_ids:
+        professionals = session.connection().execute(
+            select(OrganizationMembership.user_id).where(
+                OrganizationMembership.organization_id.in_(org_ids),
+                OrganizationMembership.role.in_(PROFESSIONAL_ROLES),
+            )
+        )
+        user_ids.update(row[0] for row in professionals)
+
+    if user_ids:
+        session.info.setdefault(_DIRTY_USERS, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    if session.info.pop(_DIRTY_FEATURES, False):
+        clear_cache()
+    invalidate(session.info.pop(_DIRTY_USERS, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_DIRTY_FEATURES, None)
+    session.info.pop(_DIRTY_USERS, None)
+
@@ -2,12 +2,13 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domains.organizations.models import OrganizationMembership, OrganizationType, UserRole
+from src.domains.organizations.models import OrganizationType
 from src.domains.users.models import User
 
+from .entitlements import EntitlementSnapshot, active_student_count_query, load_snapshot
 from .models import (
     DEFAULT_FEATURES,
     FeatureDefinition,
@@ -42,119 +43,45 @@ class SubscriptionService:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_entitlements(self, user_id: uuid.UUID) -> EntitlementSnapshot:
+        """Get the cached entitlement snapshot for a user."""
+        return await load_snapshot(self.db, user_id)
+
     async def get_user_tier(self, user_id: uuid.UUID) -> PlatformTier:
         """Get the current tier for a user."""
-        sub = await self.get_user_subscription(user_id)
-        if sub and sub.is_pro:
-            return PlatformTier.PRO
-        return PlatformTier.FREE
+        return (await self.get_entitlements(user_id)).tier
 
     async def is_pro(self, user_id: uuid.UUID) -> bool:
         """Check if user has Pro tier."""
-        return await self.get_user_tier(user_id) == PlatformTier.PRO
+        return (await self.get_entitlements(user_id)).is_pro
 
     async def get_active_student_count(self, professional_id: uuid.UUID) -> int:
         """Count active students across all organizations owned by this professional."""
-        # Find organizations where user is trainer/nutritionist
-        org_query = select(OrganizationMembership.organization_id).where(
-            OrganizationMembership.user_id == professional_id,
-            OrganizationMembership.is_active == True,  # noqa: E712
-            OrganizationMembership.role.in_([
-                UserRole.TRAINER,
-                UserRole.COACH,
-                UserRole.NUTRITIONIST,
-            ]),
-        )
-        org_result = await self.db.execute(org_query)
-        org_ids = [row[0] for row in org_result.fetchall()]
-
-        if not org_ids:
-            return 0
-
-        # Count active students in those organizations
-        student_query = select(func.count(func.distinct(OrganizationMembership.user_id))).where(
-            OrganizationMembership.organization_id.in_(org_ids),
-            OrganizationMembership.role == UserRole.STUDENT,
-            OrganizationMembership.is_active == True,  # noqa: E712
-        )
-        result = await self.db.execute(student_query)
+        result = await self.db.execute(active_student_count_query(professional_id))
         return result.scalar() or 0
 
     async def get_student_limit(self, user_id: uuid.UUID) -> int | None:
         """Get student limit for a professional. None = unlimited."""
-        tier = await self.get_user_tier(user_id)
-        if tier == PlatformTier.PRO:
-            return None  # Unlimited
-
-        # Check feature definition
-        feature = await self._get_feature("max_active_students")
-        if feature:
-            return feature.free_tier_limit
-        return 5  # Default fallback
+        return (await self.get_entitlements(user_id)).student_limit
 
     async def can_add_student(self, professional_id: uuid.UUID) -> tuple[bool, int, int | None]:
         """Check if a professional can add another student.
 
         Returns (can_add, current_count, limit).
         """
-        current = await self.get_active_student_count(professional_id)
-        limit = await self.get_student_limit(professional_id)
-
-        if limit is None:
-            return True, current, None
-
-        return current < limit, current, limit
+        return (await self.get_entitlements(professional_id)).can_add_student()
 
     async def check_feature_access(
         self, user_id: uuid.UUID, feature_key: str
     ) -> FeatureCheckResponse:
         """Check if a user has access to a specific feature."""
-        tier = await self.get_user_tier(user_id)
-        feature = await self._get_feature(feature_key)
-
-        if not feature:
-            # Feature not defined — allow by default
-            return FeatureCheckResponse(
-                feature_key=feature_key,
-                has_access=True,
-                current_tier=tier,
-                required_tier=PlatformTier.FREE,
-            )
-
-        has_access = tier.value >= feature.required_tier.value if feature.required_tier == PlatformTier.FREE else tier == PlatformTier.PRO
-
-        # Check limits for free tier
-        current_usage = None
-        limit = None
-        if feature_key == "max_active_students":
-            current_usage = await self.get_active_student_count(user_id)
-            limit = feature.free_tier_limit if tier == PlatformTier.FREE else feature.pro_tier_limit
-            if limit is not None:
-                has_access = current_usage < limit
-
-        return FeatureCheckResponse(
-            feature_key=feature_key,
-            has_access=has_access,
-            current_tier=tier,
-            required_tier=feature.required_tier,
-            current_usage=current_usage,
-            limit=limit,
-            upgrade_required=not has_access,
-        )
+        return (await self.get_entitlements(user_id)).check_feature(feature_key)
 
     async def get_tier_info(self, user_id: uuid.UUID) -> TierInfoResponse:
         """Get full tier info for a user."""
         sub = await self.get_user_subscription(user_id)
-        tier = PlatformTier.PRO if (sub and sub.is_pro) else PlatformTier.FREE
-        student_count = await self.get_active_student_count(user_id)
-        student_limit = await self.get_student_limit(user_id)
-
-        # Check all features
-        features = await self._get_all_features()
-        feature_checks = []
-        for feature in features:
-            check = await self.check_feature_access(user_id, feature.key)
-            feature_checks.append(check)
+        entitlements = await self.get_entitlements(user_id)
+        feature_checks = [entitlements.check_feature(key) for key in entitlements.features]
 
         sub_response = None
         if sub:
@@ -178,12 +105,12 @@ class SubscriptionService:
 
         return TierInfoResponse(
             user_id=user_id,
-            current_tier=tier,
+            current_tier=entitlements.tier,
             is_founder=sub.is_founder if sub else False,
             subscription=sub_response,
             features=feature_checks,
-            active_students_count=student_count,
-            max_students=student_limit,
+            active_students_count=entitlements.active_students,
+            max_students=entitlements.student_limit,
         )
 
     async def upgrade_to_pro(
@@ -5,16 +5,14 @@ from datetime import datetime, timedelta, timezone
 from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.database import get_db
-from src.core.email import send_invite_email as send_invite_email_task
 from src.domains.auth.dependencies import CurrentUser
-
-logger = logging.getLogger(__name__)
+from src.domains.gamification.service import GamificationService
 from src.domains.organizations.models import OrganizationMembership, UserRole
 from src.domains.organizations.schemas import InviteResponse
 from src.domains.organizations.service import OrganizationService
@@ -29,10 +27,13 @@ from src.domains.trainers.schemas import (
     StudentResponse,
     StudentStatsResponse,
 )
-from src.domains.gamification.service import GamificationService
 from src.domains.users.models import User
 from src.domains.users.service import UserService
 from src.domains.workouts.models import WorkoutSession
+from src.domains.workouts.schemas import StrengthProgressResponse
+from src.domains.workouts.strength_analytics import StrengthAnalytics
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -115,20 +116,37 @@ async def list_students(
     """Get list of trainer's students."""
     org_id = await _get_trainer_organization(current_user, db)
     org_service = OrganizationService(db)
-    user_service = UserService(db)
 
     # Get students (members with student role)
     members = await org_service.get_organization_members(org_id, role="student")
+    # Apply status filter
+    if status_filter == "active":
+        members = [m for m in members if m.is_active]
+    elif status_filter == "inactive":
+        members = [m for m in members if not m.is_active]
+
+    # Users and workout stats of the whole roster, one query each
+    user_ids = [m.user_id for m in members]
+    users = {
+        user.id: user
+        for user in (await db.scalars(select(User).where(User.id.in_(user_ids)))).all()
+    }
+    stats = {
+        row.user_id: row
+        for row in await db.execute(
+            select(
+                WorkoutSession.user_id,
+                func.count(WorkoutSession.id).label("workouts_count"),
+                func.max(WorkoutSession.started_at).label("last_workout_at"),
+            )
+            .where(WorkoutSession.user_id.in_(user_ids))
+            .group_by(WorkoutSession.user_id)
+        )
+    }
 
     result = []
     for m in members:
-        # Apply status filter
-        if status_filter == "active" and not m.is_active:
-            continue
-        if status_filter == "inactive" and m.is_active:
-            continue
-
-        user = await user_service.get_user_by_id(m.user_id)
+        user = users.get(m.user_id)
         if not user:
             continue
 
@@ -138,17 +156,7 @@ async def list_students(
             if query_lower not in user.name.lower() and query_lower not in user.email.lower():
                 continue
 
-        # Get workout stats
-        workouts_count = await db.scalar(
-            select(func.count(WorkoutSession.id))
-            .where(WorkoutSession.user_id == m.user_id)
-        ) or 0
-
-        last_workout = await db.scalar(
-            select(func.max(WorkoutSession.started_at))
-            .where(WorkoutSession.user_id == m.user_id)
-        )
-
+        user_stats = stats.get(m.user_id)
         result.append(
             StudentResponse(
                 id=m.id,
@@ -161,8 +169,8 @@ async def list_students(
                 is_active=m.is_active,
                 goal=None,  # Could be stored in member metadata
                 notes=None,
-                workouts_count=workouts_count,
-                last_workout_at=last_workout,
+                workouts_count=user_stats.workouts_count if user_stats else 0,
+                last_workout_at=user_stats.last_workout_at if user_stats else None,
             )
         )
 
@@ -320,7 +328,7 @@ async def get_student_stats(
         workouts_this_week=workouts_this_week,
         workouts_this_month=workouts_this_month,
         average_duration_minutes=int(avg_duration),
-        total_exercises=0,  # Would require joining with workout exercises
+        total_exercises=await StrengthAnalytics(db).exercise_count(member.user_id),
         streak_days=streak_days,
         last_workout_at=last_workout,
     )
@@ -395,10 +403,23 @@ async def get_student_progress(
         .where(WorkoutSession.user_id == member.user_id)
     ) or 0
 
+    analytics = StrengthAnalytics(db)
+    personal_records = await analytics.personal_records(member.user_id, limit=5)
+
     return {
         "user_id": str(member.user_id),
         "total_sessions": total_sessions,
-        "total_volume": 0,
+        "total_volume": await analytics.total_volume(member.user_id),
+        "personal_records": [
+            {
+                "exercise_id": str(pr.exercise_id),
+                "exercise_name": pr.exercise_name,
+                "estimated_1rm": pr.estimated_1rm,
+                "best_weight_kg": pr.best_weight_kg,
+                "achieved_week": pr.achieved_week.isoformat() if pr.achieved_week else None,
+            }
+            for pr in personal_records
+        ],
         "streak_days": streak_days,
         "achievements": [],
         "notes": [
@@ -413,6 +434,27 @@ async def get_student_progress(
     }
 
 
+@router.get("/students/{student_id}/strength", response_model=StrengthProgressResponse)
+async def get_student_strength(
+    student_id: UUID,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    weeks: Annotated[int, Query(ge=1, le=104)] = 12,
+    exercise_id: Annotated[UUID | None, Query()] = None,
+) -> StrengthProgressResponse:
+    """Get student's training volume, estimated 1RM and personal records."""
+    org_id = await _get_trainer_organization(current_user, db)
+
+    # Find member by ID or user_id
+    member = await _find_student_member(student_id, org_id, db)
+
+    return await StrengthAnalytics(db).progress(
+        user_id=member.user_id,
+        weeks=weeks,
+        exercise_id=exercise_id,
+    )
+
+
 @router.post("/students/{student_id}/progress/notes", response_model=ProgressNoteResponse, status_code=status.HTTP_201_CREATED)
 async def add_progress_note(
     student_id: UUID,
@@ -541,7 +583,6 @@ async def register_student(
     request: StudentRegisterRequest,
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
-    background_tasks: BackgroundTasks,
 ) -> InviteResponse:
     """Invite a student to join the trainer's organization.
 
@@ -618,6 +659,8 @@ async def register_student(
             role=UserRole.STUDENT,
             invited_by_id=current_user.id,
             student_info=student_info,
+            inviter_name=current_user.name,
+            org_name=org.name,
         )
     except IntegrityError:
         # Race condition: another request created the invite first
@@ -626,14 +669,6 @@ async def register_student(
             detail="Já existe um convite pendente para este email",
         )
 
-    # Send invite email in background
-    background_tasks.add_task(
-        send_invite_email_task,
-        to_email=request.email,
-        trainer_name=current_user.name,
-        org_name=org.name,
-        invite_token=invite.token,
-    )
     logger.info(f"Invite email queued for {request.email}")
 
     return InviteResponse(
@@ -656,7 +691,6 @@ async def reinvite_former_student(
     user_id: UUID,
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
-    background_tasks: BackgroundTasks,
 ) -> InviteResponse:
     """Reinvite a former student who left the organization.
 
@@ -710,13 +744,15 @@ async def reinvite_former_student(
             detail="Organização não encontrada",
         )
 
-    # Create reinvite
+    # Create reinvite (the invite email is queued with it)
     try:
         invite = await org_service.create_invite(
             org_id=org_id,
             email=student.email,
             role=UserRole.STUDENT,
             invited_by_id=current_user.id,
+            inviter_name=current_user.name,
+            org_name=org.name,
         )
     except IntegrityError:
         raise HTTPException(
@@ -740,14 +776,6 @@ async def reinvite_former_student(
     except (ConnectionError, OSError, RuntimeError) as e:
         logger.warning(f"Failed to send push notification for reinvite: {e}")
 
-    # Send invite email in background
-    background_tasks.add_task(
-        send_invite_email_task,
-        to_email=student.email,
-        trainer_name=current_user.name,
-        org_name=org.name,
-        invite_token=invite.token,
-    )
     logger.info(f"Reinvite sent to former student {student.email}")
 
     return InviteResponse(
@@ -934,7 +962,6 @@ async def send_invite_email_endpoint(
     request: SendInviteRequest,
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
-    background_tasks: BackgroundTasks,
 ) -> dict:
     """Send invite email to a potential student."""
     org_id = await _get_trainer_organization(current_user, db)
@@ -944,21 +971,14 @@ async def send_invite_email_endpoint(
     org = await org_service.get_organization_by_id(org_id)
     org_name = org.name if org else "MyFit"
 
-    # Create an invitation
+    # Create an invitation (the invite email is queued with it)
     invite = await org_service.create_invite(
         org_id=org_id,
         email=request.email,
         role=UserRole.STUDENT,
         invited_by_id=current_user.id,
-    )
-
-    # Send invite email in background
-    background_tasks.add_task(
-        send_invite_email_task,
-        to_email=request.email,
-        trainer_name=current_user.name,
+        inviter_name=current_user.name,
         org_name=org_name,
-        invite_token=invite.token,
     )
     logger.info(f"Invite email queued for {request.email}")
 
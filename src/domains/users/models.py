@@ -110,19 +110,16 @@ class User(Base, UUIDMixin, TimestampMixin):
         "UserSettings",
         back_populates="user",
         uselist=False,
-        lazy="joined",
     )
     memberships: Mapped[list["OrganizationMembership"]] = relationship(
         "OrganizationMembership",
         back_populates="user",
         foreign_keys="OrganizationMembership.user_id",
-        lazy="selectin",
     )
     owned_organizations: Mapped[list["Organization"]] = relationship(
         "Organization",
         back_populates="owner",
         foreign_keys="Organization.owner_id",
-        lazy="selectin",
     )
 
     def __repr__(self) -> str:
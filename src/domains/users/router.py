@@ -39,14 +39,15 @@ from src.domains.workouts.models import (
     AssignmentStatus,
     PlanAssignment,
     PlanWorkout,
-    PrescriptionNote,
     TrainingPlan,
     Workout,
     WorkoutExercise,
     WorkoutSession,
 )
+from src.domains.workouts.service import WorkoutService
 from src.domains.gamification.service import GamificationService
 from src.domains.progress.models import WeightLog
+from src.domains.progress.timeseries import ProgressSeries
 
 router = APIRouter()
 
@@ -179,14 +180,11 @@ async def upload_avatar(
         storage_service,
     )
 
-    # Read file content
-    content = await file.read()
-
     try:
-        # Upload to storage (validation happens inside)
+        # Stream to storage (validation happens inside, chunk by chunk)
         avatar_url = await storage_service.upload_avatar(
             user_id=str(current_user.id),
-            file_content=content,
+            source=file,
             content_type=file.content_type or "application/octet-stream",
         )
     except InvalidContentTypeError:
@@ -205,9 +203,10 @@ async def upload_avatar(
             detail=f"Failed to upload file: {str(e)}",
         )
 
-    # Delete old avatar if it exists
+    # Delete old avatar if it exists (re-uploading the same image maps to
+    # the same content-addressed URL, which must be kept)
     user_service = UserService(db)
-    if current_user.avatar_url:
+    if current_user.avatar_url and current_user.avatar_url != avatar_url:
         await storage_service.delete_file(current_user.avatar_url)
 
     # Update user with new avatar URL
@@ -495,26 +494,11 @@ async def get_student_dashboard(
     expected_workouts = max(1, int((days_in_month / 7) * weekly_target))
     adherence_percent = min(100, int((workouts_this_month / expected_workouts) * 100))
 
-    # Weight change (latest vs oldest measurement)
-    weight_change_kg = None
-    latest_weight = await db.execute(
-        select(WeightLog)
-        .where(WeightLog.user_id == current_user.id)
-        .order_by(WeightLog.logged_at.desc())
-        .limit(1)
+    # Weight change (latest vs oldest measurement), first/last read in one query
+    weight_summary = await ProgressSeries.weight(db).summary(current_user.id)
+    weight_change_kg = (
+        round(weight_summary.change, 1) if weight_summary.change is not None else None
     )
-    latest = latest_weight.scalar_one_or_none()
-
-    oldest_weight = await db.execute(
-        select(WeightLog)
-        .where(WeightLog.user_id == current_user.id)
-        .order_by(WeightLog.logged_at.asc())
-        .limit(1)
-    )
-    oldest = oldest_weight.scalar_one_or_none()
-
-    if latest and oldest and latest.id != oldest.id:
-        weight_change_kg = round(latest.weight_kg - oldest.weight_kg, 1)
 
     # Current streak
     gamification_service = GamificationService(db)
@@ -787,14 +771,8 @@ async def get_student_dashboard(
                 )
 
     # ==================== Unread Notes Count ====================
-    unread_notes_count = await db.scalar(
-        select(func.count(PrescriptionNote.id))
-        .where(
-            # Notes where current user is the student (via plan assignment or direct)
-            PrescriptionNote.read_at.is_(None),
-            PrescriptionNote.author_id != current_user.id,
-        )
-    ) or 0
+    # Trainer notes on the student's plans, workouts and sessions (audience index)
+    unread_notes_count = await WorkoutService(db).count_unread_notes_for_student(current_user.id)
 
     # ==================== Active Goals ====================
     active_goals: list[ActiveGoalResponse] = []
@@ -803,10 +781,10 @@ async def get_student_dashboard(
     user_settings = await user_service.get_settings(current_user.id)
 
     # Weight goal
-    if user_settings and user_settings.goal_weight and latest:
-        current_weight = latest.weight_kg
+    if user_settings and user_settings.goal_weight and weight_summary.count:
+        current_weight = weight_summary.last_value
         goal_weight = user_settings.goal_weight
-        total_diff = abs(goal_weight - (oldest.weight_kg if oldest else current_weight))
+        total_diff = abs(goal_weight - weight_summary.first_value)
         current_diff = abs(goal_weight - current_weight)
         progress = max(0, min(100, int(((total_diff - current_diff) / max(total_diff, 0.1)) * 100)))
         active_goals.append(ActiveGoalResponse(
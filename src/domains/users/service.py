@@ -29,6 +29,22 @@ class UserService:
         )
         return result.scalar_one_or_none()
 
+    async def get_user_names(self, user_ids: set[uuid.UUID]) -> dict[uuid.UUID, str]:
+        """Get the names of several users in one query.
+
+        Args:
+            user_ids: The users' UUIDs
+
+        Returns:
+            Names by user ID; unknown IDs are left out
+        """
+        if not user_ids:
+            return {}
+        result = await self.db.execute(
+            select(User.id, User.name).where(User.id.in_(user_ids))
+        )
+        return dict(result.all())
+
     async def get_user_by_email(self, email: str) -> User | None:
         """Get a user by email.
 
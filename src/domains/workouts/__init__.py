@@ -6,6 +6,7 @@ from src.domains.workouts.models import (
     NoteAuthorRole,
     NoteContextType,
     PrescriptionNote,
+    PrescriptionNoteAudience,
     Workout,
     WorkoutAssignment,
     WorkoutExercise,
@@ -23,6 +24,7 @@ __all__ = [
     "NoteAuthorRole",
     "NoteContextType",
     "PrescriptionNote",
+    "PrescriptionNoteAudience",
     "Workout",
     "WorkoutAssignment",
     "WorkoutExercise",
@@ -5,9 +5,9 @@ import uuid
 from typing import Any
 
 import structlog
-from openai import AsyncOpenAI, OpenAIError
 
 from src.config.settings import settings
+from src.core.sdk import get_openai_client, openai_error
 from src.domains.workouts.models import Difficulty, WorkoutGoal
 
 logger = structlog.get_logger(__name__)
@@ -39,7 +39,7 @@ class AIExerciseService:
     """Service for AI-powered exercise suggestions."""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
+        self.client = get_openai_client()
 
     async def suggest_exercises(
         self,
@@ -84,7 +84,7 @@ class AIExerciseService:
                     allow_advanced_techniques=allow_advanced_techniques,
                     allowed_techniques=allowed_techniques,
                 )
-            except (OpenAIError, json.JSONDecodeError, KeyError, ValueError) as e:
+            except (openai_error(), json.JSONDecodeError, KeyError, ValueError) as e:
                 logger.warning("ai_suggestion_fallback", error=str(e), type=type(e).__name__)
 
         # Fallback to rule-based selection
@@ -1509,7 +1509,7 @@ Responda APENAS com um JSON valido no formato:
                 preferences=preferences,
                 duration_weeks=duration_weeks,
             )
-        except (OpenAIError, json.JSONDecodeError, KeyError, ValueError) as e:
+        except (openai_error(), json.JSONDecodeError, KeyError, ValueError) as e:
             logger.warning("ai_plan_generation_failed", error=str(e), type=type(e).__name__)
             return None
 
@@ -134,6 +134,24 @@ class ExerciseServiceMixin:
         await self.db.refresh(exercise)
         return exercise
 
+    async def is_media_url_shared(self, url: str, exercise_id: uuid.UUID) -> bool:
+        """Whether another exercise points at the same media file.
+
+        Exercise media is stored content-addressed per user, so custom
+        exercises with identical uploads share one object.
+        """
+        from sqlalchemy import or_
+
+        result = await self.db.execute(
+            select(Exercise.id)
+            .where(
+                or_(Exercise.image_url == url, Exercise.video_url == url),
+                Exercise.id != exercise_id,
+            )
+            .limit(1)
+        )
+        return result.first() is not None
+
     # Exercise Feedback operations
 
     async def get_workout_exercise_by_id(
@@ -184,14 +184,12 @@ async def upload_exercise_media(
             detail="You can only upload media for your own exercises",
         )
 
-    # Read file content
-    content = await file.read()
     content_type = file.content_type or "application/octet-stream"
 
     try:
-        # Upload to storage
+        # Stream to storage (validated chunk by chunk)
         url = await storage_service.upload_exercise_media(
-            file_content=content,
+            source=file,
             content_type=content_type,
             user_id=str(current_user.id),
         )
@@ -213,17 +211,27 @@ async def upload_exercise_media(
 
     # Optionally auto-update the exercise with the new URL
     if media_type == "image":
-        # Delete old image if exists
-        if exercise.image_url:
-            await storage_service.delete_file(exercise.image_url)
+        # Delete old image if exists and no other exercise shares its file
+        old_url = exercise.image_url
+        if (
+            old_url
+            and old_url != url
+            and not await workout_service.is_media_url_shared(old_url, exercise.id)
+        ):
+            await storage_service.delete_file(old_url)
         await workout_service.update_exercise(
             exercise=exercise,
             image_url=url,
         )
     elif media_type == "video":
-        # Delete old video if exists
-        if exercise.video_url:
-            await storage_service.delete_file(exercise.video_url)
+        # Delete old video if exists and no other exercise shares its file
+        old_url = exercise.video_url
+        if (
+            old_url
+            and old_url != url
+            and not await workout_service.is_media_url_shared(old_url, exercise.id)
+        ):
+            await storage_service.delete_file(old_url)
         await workout_service.update_exercise(
             exercise=exercise,
             video_url=url,
@@ -10,7 +10,9 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     func,
@@ -171,6 +173,10 @@ class Workout(Base, UUIDMixin, TimestampMixin):
     """Workout model representing a complete workout plan."""
 
     __tablename__ = "workouts"
+    __table_args__ = (
+        # Copy-name lookups ("Name (N)") scan an owner's names by prefix
+        Index("ix_workouts_created_by_name", "created_by_id", "name"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -212,7 +218,6 @@ class Workout(Base, UUIDMixin, TimestampMixin):
     assignments: Mapped[list["WorkoutAssignment"]] = relationship(
         "WorkoutAssignment",
         back_populates="workout",
-        lazy="selectin",
         passive_deletes=True,  # Let DB handle CASCADE DELETE
     )
 
@@ -387,7 +392,6 @@ class WorkoutAssignment(Base, UUIDMixin, TimestampMixin):
     sessions: Mapped[list["WorkoutSession"]] = relationship(
         "WorkoutSession",
         back_populates="assignment",
-        lazy="selectin",
     )
 
     def __repr__(self) -> str:
@@ -463,7 +467,6 @@ class WorkoutSession(Base, UUIDMixin):
     messages: Mapped[list["SessionMessage"]] = relationship(
         "SessionMessage",
         back_populates="session",
-        lazy="selectin",
         order_by="SessionMessage.sent_at",
     )
 
@@ -483,6 +486,10 @@ class WorkoutSessionSet(Base, UUIDMixin):
     """Individual set performed during a workout session."""
 
     __tablename__ = "workout_session_sets"
+    __table_args__ = (
+        # Makes batched set sync idempotent; NULL for sets logged one by one
+        Index("uq_workout_session_sets_client_op", "session_id", "client_op_id", unique=True),
+    )
 
     session_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -506,6 +513,7 @@ class WorkoutSessionSet(Base, UUIDMixin):
         server_default=func.now(),
         nullable=False,
     )
+    client_op_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     # Relationships
     session: Mapped["WorkoutSession"] = relationship(
@@ -518,6 +526,73 @@ class WorkoutSessionSet(Base, UUIDMixin):
         return f"<WorkoutSessionSet session={self.session_id} set={self.set_number}>"
 
 
+class ExerciseStrengthRollup(Base):
+    """Lifetime training totals and bests per (user, exercise).
+
+    Folded from completed sessions' sets by
+    ``src.domains.workouts.strength_analytics`` so progress screens never
+    scan raw sets.
+    """
+
+    __tablename__ = "exercise_strength_rollups"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    exercise_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("exercises.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    total_sets: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_reps: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_volume_kg: Mapped[float] = mapped_column(Float, default=0, nullable=False)
+    best_weight_kg: Mapped[float | None] = mapped_column(Float, nullable=True)
+    best_estimated_1rm: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_performed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    exercise: Mapped["Exercise"] = relationship("Exercise")
+
+    def __repr__(self) -> str:
+        return f"<ExerciseStrengthRollup user={self.user_id} exercise={self.exercise_id}>"
+
+
+class WeeklyTrainingVolume(Base):
+    """Weekly tonnage, reps and best estimated 1RM per (user, exercise).
+
+    ``week_start`` is the Monday of the week the session started in.
+    """
+
+    __tablename__ = "weekly_training_volume"
+    __table_args__ = (
+        Index("ix_weekly_training_volume_user_week", "user_id", "week_start"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    exercise_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("exercises.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    sets: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    reps: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    volume_kg: Mapped[float] = mapped_column(Float, default=0, nullable=False)
+    best_estimated_1rm: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<WeeklyTrainingVolume user={self.user_id} week={self.week_start}>"
+
+
 class SessionMessage(Base, UUIDMixin):
     """Quick messages exchanged during a shared workout session (co-training)."""
 
@@ -595,6 +670,9 @@ class TrainingPlan(Base, UUIDMixin, TimestampMixin):
     """Training Plan - a structured collection of workouts (e.g., ABC split)."""
 
     __tablename__ = "training_plans"
+    __table_args__ = (
+        Index("ix_training_plans_created_by_name", "created_by_id", "name"),
+    )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -752,8 +830,17 @@ class PlanAssignment(Base, UUIDMixin, TimestampMixin):
     acknowledged_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Independent copy: stores complete plan data at assignment time
-    # This ensures student's prescription is isolated from later changes to the original plan
-    plan_snapshot: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # This ensures student's prescription is isolated from later changes to the original plan.
+    # Snapshots live in the content-addressed plan_snapshot_blobs table; the inline
+    # JSON column only holds rows written before the snapshot store existed.
+    snapshot_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        ForeignKey("plan_snapshot_blobs.content_hash"),
+        nullable=True,
+        index=True,
+    )
+    legacy_plan_snapshot: Mapped[dict | None] = mapped_column("plan_snapshot", JSON, nullable=True)
+    snapshot_created_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Version tracking for plan updates
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
@@ -767,8 +854,18 @@ class PlanAssignment(Base, UUIDMixin, TimestampMixin):
         "PlanVersion",
         back_populates="assignment",
         order_by="PlanVersion.version.desc()",
-        lazy="selectin",
     )
+    # Not loaded implicitly: queries that read the snapshot load it explicitly
+    snapshot_blob: Mapped["PlanSnapshotBlob | None"] = relationship("PlanSnapshotBlob", lazy="raise_on_sql")
+
+    @property
+    def plan_snapshot(self) -> dict | None:
+        """Plan data at assignment time (read-only; use PlanSnapshotStore to change)."""
+        if self.snapshot_blob is not None:
+            from src.domains.workouts.snapshot_store import decode_snapshot, with_created_at
+
+            return with_created_at(decode_snapshot(self.snapshot_blob), self.snapshot_created_at)
+        return self.legacy_plan_snapshot
 
     def __repr__(self) -> str:
         return f"<PlanAssignment plan={self.plan_id} student={self.student_id} status={self.status}>"
@@ -789,7 +886,15 @@ class PlanVersion(Base, UUIDMixin):
         nullable=False,
     )
     version: Mapped[int] = mapped_column(Integer, nullable=False)
-    snapshot: Mapped[dict] = mapped_column(JSON, nullable=False)  # Complete plan data at this version
+    # Complete plan data at this version (see PlanAssignment.snapshot_hash)
+    snapshot_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        ForeignKey("plan_snapshot_blobs.content_hash"),
+        nullable=True,
+        index=True,
+    )
+    legacy_snapshot: Mapped[dict | None] = mapped_column("snapshot", JSON, nullable=True)
+    snapshot_created_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     changed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -808,11 +913,44 @@ class PlanVersion(Base, UUIDMixin):
         back_populates="versions",
     )
     changed_by: Mapped["User | None"] = relationship("User")
+    # Not loaded implicitly: queries that read the snapshot load it explicitly
+    snapshot_blob: Mapped["PlanSnapshotBlob | None"] = relationship("PlanSnapshotBlob", lazy="raise_on_sql")
+
+    @property
+    def snapshot(self) -> dict | None:
+        """Plan data at this version (read-only)."""
+        if self.snapshot_blob is not None:
+            from src.domains.workouts.snapshot_store import decode_snapshot, with_created_at
+
+            return with_created_at(decode_snapshot(self.snapshot_blob), self.snapshot_created_at)
+        return self.legacy_snapshot
 
     def __repr__(self) -> str:
         return f"<PlanVersion assignment={self.assignment_id} v{self.version}>"
 
 
+class PlanSnapshotBlob(Base):
+    """Content-addressed, compressed plan snapshot.
+
+    Identical snapshots (same template assigned to many students, versions
+    that didn't change) share a single row keyed by their canonical hash.
+    """
+
+    __tablename__ = "plan_snapshot_blobs"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)  # zlib-compressed canonical JSON
+    raw_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<PlanSnapshotBlob {self.content_hash[:12]} {self.raw_size}B>"
+
+
 class NoteContextType(str, enum.Enum):
     """Context types for prescription notes."""
 
@@ -893,6 +1031,40 @@ class PrescriptionNote(Base, UUIDMixin, TimestampMixin):
         return f"<PrescriptionNote context={self.context_type.value}:{self.context_id}>"
 
 
+class PrescriptionNoteAudience(Base):
+    """Fan-out of trainer notes to the students who can see them.
+
+    One row per (note, student), written when a note is created and when a
+    student's assignments change, so listing a student's notes and counting
+    unread ones are range scans on ``(student_id, read_at)`` instead of
+    resolving sessions, assignments and plans on every read. Maintained by
+    ``src.domains.workouts.note_audience``.
+    """
+
+    __tablename__ = "prescription_note_audience"
+    __table_args__ = (
+        Index("ix_prescription_note_audience_student_read", "student_id", "read_at"),
+    )
+
+    note_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("prescription_notes.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    student_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    read_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<PrescriptionNoteAudience note={self.note_id} student={self.student_id}>"
+
+
 class ExerciseFeedbackType(str, enum.Enum):
     """Types of feedback a student can give on an exercise."""
 
@@ -0,0 +1,202 @@
+"""Maintenance of the prescription note audience index.
+
+A trainer note is attached to a plan, workout, exercise or session. The
+students who can see it are whoever is assigned to that context:
+
+- SESSION: the session's owner
+- WORKOUT: students with a workout assignment for it, or with a plan
+  assignment whose plan contains it
+- EXERCISE: same as the exercise's workout
+- PLAN: students with an assignment of the plan
+
+``PrescriptionNoteAudience`` stores that resolution as rows so reads don't
+repeat it. Every function here is set-based (INSERT ... SELECT / DELETE with a
+subquery) and accepts either an ``AsyncSession`` or an ``AsyncConnection``,
+so the same code serves request handlers, the backfill migration and the
+consistency checker.
+"""
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from sqlalchemy import Select, and_, delete, exists, func, insert, select, tuple_, union
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from src.domains.workouts.models import (
+    NoteAuthorRole,
+    NoteContextType,
+    PlanAssignment,
+    PlanWorkout,
+    PrescriptionNote,
+    PrescriptionNoteAudience,
+    WorkoutAssignment,
+    WorkoutExercise,
+    WorkoutSession,
+)
+
+Executor = AsyncSession | AsyncConnection
+
+
+def _audience_parts() -> list[tuple[Select, object]]:
+    """One SELECT (note_id, student_id) per way a student can reach a note.
+
+    Each part comes with its student column so callers can filter on it.
+    """
+    note = PrescriptionNote
+    is_trainer_note = note.author_role == NoteAuthorRole.TRAINER
+
+    def on(context_type: NoteContextType, column):
+        return and_(note.context_type == context_type, note.context_id == column)
+
+    def pair(student_column):
+        return select(note.id.label("note_id"), student_column.label("student_id"))
+
+    return [
+        (
+            pair(WorkoutSession.user_id)
+            .join(WorkoutSession, on(NoteContextType.SESSION, WorkoutSession.id))
+            .where(is_trainer_note),
+            WorkoutSession.user_id,
+        ),
+        (
+            pair(WorkoutAssignment.student_id)
+            .join(WorkoutAssignment, on(NoteContextType.WORKOUT, WorkoutAssignment.workout_id))
+            .where(is_trainer_note),
+            WorkoutAssignment.student_id,
+        ),
+        (
+            pair(PlanAssignment.student_id)
+            .join(PlanWorkout, on(NoteContextType.WORKOUT, PlanWorkout.workout_id))
+            .join(PlanAssignment, PlanAssignment.plan_id == PlanWorkout.plan_id)
+            .where(is_trainer_note),
+            PlanAssignment.student_id,
+        ),
+        (
+            pair(WorkoutAssignment.student_id)
+            .join(WorkoutExercise, on(NoteContextType.EXERCISE, WorkoutExercise.id))
+            .join(WorkoutAssignment, WorkoutAssignment.workout_id == WorkoutExercise.workout_id)
+            .where(is_trainer_note),
+            WorkoutAssignment.student_id,
+        ),
+        (
+            pair(PlanAssignment.student_id)
+            .join(WorkoutExercise, on(NoteContextType.EXERCISE, WorkoutExercise.id))
+            .join(PlanWorkout, PlanWorkout.workout_id == WorkoutExercise.workout_id)
+            .join(PlanAssignment, PlanAssignment.plan_id == PlanWorkout.plan_id)
+            .where(is_trainer_note),
+            PlanAssignment.student_id,
+        ),
+        (
+            pair(PlanAssignment.student_id)
+            .join(PlanAssignment, on(NoteContextType.PLAN, PlanAssignment.plan_id))
+            .where(is_trainer_note),
+            PlanAssignment.student_id,
+        ),
+    ]
+
+
+def expected_audience(
+    note_ids: Iterable[uuid.UUID] | None = None,
+    student_id: uuid.UUID | None = None,
+):
+    """Subquery of the (note_id, student_id) pairs the index should contain."""
+    parts = []
+    for part, student_column in _audience_parts():
+        if note_ids is not None:
+            part = part.where(PrescriptionNote.id.in_(list(note_ids)))
+        if student_id is not None:
+            part = part.where(student_column == student_id)
+        parts.append(part)
+    return union(*parts).subquery("expected_audience")
+
+
+async def _insert_missing(db: Executor, expected, copy_note_read_at: bool = False) -> int:
+    audience = PrescriptionNoteAudience
+    columns = [expected.c.note_id, expected.c.student_id]
+    target = [audience.note_id, audience.student_id]
+    source = select(*columns)
+    if copy_note_read_at:
+        # Backfill: keep what legacy per-note read tracking already recorded
+        source = select(*columns, PrescriptionNote.read_at).join(
+            PrescriptionNote, PrescriptionNote.id == expected.c.note_id
+        )
+        target.append(audience.read_at)
+    source = source.where(
+        ~exists().where(
+            audience.note_id == expected.c.note_id,
+            audience.student_id == expected.c.student_id,
+        )
+    )
+    result = await db.execute(insert(audience).from_select(target, source))
+    return result.rowcount
+
+
+async def fan_out_note(db: Executor, note_id: uuid.UUID) -> int:
+    """Index a newly created note for every student who can see it."""
+    return await _insert_missing(db, expected_audience(note_ids=[note_id]))
+
+
+async def refresh_student_audience(db: Executor, student_id: uuid.UUID) -> None:
+    """Re-sync one student's rows after their assignments changed.
+
+    Rows that are still valid keep their ``read_at``.
+    """
+    await _insert_missing(db, expected_audience(student_id=student_id))
+    still_visible = select(*expected_audience(student_id=student_id).c)
+    await db.execute(
+        delete(PrescriptionNoteAudience).where(
+            PrescriptionNoteAudience.student_id == student_id,
+            tuple_(PrescriptionNoteAudience.note_id, PrescriptionNoteAudience.student_id).not_in(
+                still_visible
+            ),
+        )
+    )
+
+
+@dataclass
+class AudienceCheckResult:
+    """Outcome of ``check_note_audience``."""
+
+    missing: int
+    stale: int
+    repaired: bool
+
+    @property
+    def consistent(self) -> bool:
+        return self.missing == 0 and self.stale == 0
+
+
+async def check_note_audience(db: Executor, repair: bool = False) -> AudienceCheckResult:
+    """Compare the index against a full recomputation.
+
+    Args:
+        repair: Insert missing rows and delete stale ones
+
+    Returns:
+        Counts of missing and stale (no longer visible) rows
+    """
+    audience = PrescriptionNoteAudience
+    expected = expected_audience()
+    missing = await db.scalar(
+        select(func.count()).select_from(expected).where(
+            ~exists().where(
+                audience.note_id == expected.c.note_id,
+                audience.student_id == expected.c.student_id,
+            )
+        )
+    )
+
+    expected = expected_audience()
+    stale_condition = tuple_(audience.note_id, audience.student_id).not_in(select(*expected.c))
+    stale = await db.scalar(select(func.count()).select_from(audience).where(stale_condition))
+
+    if repair and (missing or stale):
+        await _insert_missing(db, expected_audience())
+        await db.execute(delete(audience).where(stale_condition))
+
+    return AudienceCheckResult(missing=missing or 0, stale=stale or 0, repaired=repair)
+
+
+async def backfill_note_audience(db: Executor) -> int:
+    """Populate the index from existing notes and assignments."""
+    return await _insert_missing(db, expected_audience(), copy_note_read_at=True)
@@ -3,10 +3,11 @@ import re
 import uuid
 from datetime import date, datetime, timezone
 
-from sqlalchemy import and_, delete, or_, select
+from sqlalchemy import and_, delete, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.deep_copy import copy_rows, id_map, new_uuid, remap
 from src.domains.workouts.models import (
     AssignmentStatus,
     Difficulty,
@@ -16,9 +17,11 @@ from src.domains.workouts.models import (
     NoteAuthorRole,
     NoteContextType,
     PlanAssignment,
+    PlanStatus,
     PlanVersion,
     PlanWorkout,
     PrescriptionNote,
+    PrescriptionNoteAudience,
     SplitType,
     TechniqueType,
     TrainingPlan,
@@ -26,8 +29,20 @@ from src.domains.workouts.models import (
     WorkoutAssignment,
     WorkoutExercise,
     WorkoutGoal,
-    WorkoutSession,
 )
+from src.domains.workouts.note_audience import fan_out_note, refresh_student_audience
+from src.domains.workouts.snapshot_store import PlanSnapshotStore, snapshot_created_at, workout_hash
+
+
+def _plan_workout_count():
+    """Correlated subquery counting a plan's workouts, for list projections."""
+    return (
+        select(func.count(PlanWorkout.id))
+        .where(PlanWorkout.plan_id == TrainingPlan.id)
+        .correlate(TrainingPlan)
+        .scalar_subquery()
+        .label("workout_count")
+    )
 
 
 class PlanServiceMixin:
@@ -36,8 +51,8 @@ class PlanServiceMixin:
     db: AsyncSession
 
     # These methods are defined on the main WorkoutService and needed here:
-    # _strip_copy_prefixes, _get_next_copy_name, list_workouts, list_exercises, get_workout_by_id,
-    # get_plan_by_id, get_session_by_id, list_plans, duplicate_workout
+    # _strip_copy_prefixes, _get_next_copy_name, _get_next_copy_name_for_owner, _copy_workouts,
+    # list_workouts, list_exercises, get_workout_by_id, get_plan_by_id, get_session_by_id, list_plans
 
     # Plan operations
 
@@ -63,10 +78,21 @@ class PlanServiceMixin:
         search: str | None = None,
         limit: int = 50,
         offset: int = 0,
-    ) -> list[TrainingPlan]:
-        """List plans for a user."""
-        query = select(TrainingPlan).options(
-            selectinload(TrainingPlan.plan_workouts)
+    ) -> list[dict]:
+        """List plans for a user, with their workout count computed in SQL."""
+        query = select(
+            TrainingPlan.id,
+            TrainingPlan.name,
+            TrainingPlan.goal,
+            TrainingPlan.difficulty,
+            TrainingPlan.split_type,
+            TrainingPlan.duration_weeks,
+            TrainingPlan.is_template,
+            TrainingPlan.is_public,
+            TrainingPlan.created_by_id,
+            TrainingPlan.source_template_id,
+            TrainingPlan.created_at,
+            _plan_workout_count(),
         )
 
         if templates_only:
@@ -112,7 +138,7 @@ class PlanServiceMixin:
 
         query = query.order_by(TrainingPlan.created_at.desc()).limit(limit).offset(offset)
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return [dict(row) for row in result.mappings()]
 
     async def get_catalog_templates(
         self,
@@ -128,9 +154,19 @@ class PlanServiceMixin:
         from src.domains.users.models import User
 
         query = (
-            select(TrainingPlan, User.name.label("creator_name"))
+            select(
+                TrainingPlan.id,
+                TrainingPlan.name,
+                TrainingPlan.goal,
+                TrainingPlan.difficulty,
+                TrainingPlan.split_type,
+                TrainingPlan.duration_weeks,
+                _plan_workout_count(),
+                User.name.label("creator_name"),
+                TrainingPlan.created_by_id,
+                TrainingPlan.created_at,
+            )
             .join(User, TrainingPlan.created_by_id == User.id, isouter=True)
-            .options(selectinload(TrainingPlan.plan_workouts))
             .where(
                 TrainingPlan.is_template == True,  # noqa: E712
                 TrainingPlan.is_public == True,  # noqa: E712
@@ -153,23 +189,7 @@ class PlanServiceMixin:
         query = query.order_by(TrainingPlan.created_at.desc()).limit(limit).offset(offset)
         result = await self.db.execute(query)
 
-        templates = []
-        for row in result.all():
-            plan = row[0]
-            creator_name = row[1]
-            templates.append({
-                "id": plan.id,
-                "name": plan.name,
-                "goal": plan.goal,
-                "difficulty": plan.difficulty,
-                "split_type": plan.split_type,
-                "duration_weeks": plan.duration_weeks,
-                "workout_count": len(plan.plan_workouts),
-                "creator_name": creator_name,
-                "created_by_id": plan.created_by_id,
-                "created_at": plan.created_at,
-            })
-        return templates
+        return [dict(row) for row in result.mappings()]
 
     async def generate_plan_with_ai(
         self,
@@ -648,66 +668,49 @@ class PlanServiceMixin:
         """
         # Generate a numbered name if no custom name provided
         if not new_name:
-            existing_plans = await self.list_plans(
-                user_id=new_owner_id,
-                limit=500,
+            new_name = await self._get_next_copy_name_for_owner(
+                TrainingPlan, new_owner_id, plan.name
             )
-            existing_names = [p.name for p in existing_plans]
-            new_name = self._get_next_copy_name(plan.name, existing_names)
-
-        new_plan = TrainingPlan(
-            name=new_name,
-            description=plan.description,
-            goal=plan.goal,
-            difficulty=plan.difficulty,
-            split_type=plan.split_type,
-            duration_weeks=plan.duration_weeks,
-            # Copy diet configuration
-            include_diet=plan.include_diet,
-            diet_type=plan.diet_type,
-            daily_calories=plan.daily_calories,
-            protein_grams=plan.protein_grams,
-            carbs_grams=plan.carbs_grams,
-            fat_grams=plan.fat_grams,
-            meals_per_day=plan.meals_per_day,
-            diet_notes=plan.diet_notes,
-            # Flags
-            is_template=False,
-            is_public=False,
-            created_by_id=new_owner_id,
-            organization_id=organization_id,
-            source_template_id=source_template_id,
+
+        # The whole plan tree is cloned set-based (INSERT ... SELECT per level)
+        plan_ids = id_map([plan.id])
+        await copy_rows(
+            self.db,
+            TrainingPlan.__table__,
+            TrainingPlan.id == plan.id,
+            {
+                "id": remap(TrainingPlan.id, plan_ids),
+                "name": new_name,
+                "status": PlanStatus.PUBLISHED,
+                "is_template": False,
+                "is_public": False,
+                "created_by_id": new_owner_id,
+                "organization_id": organization_id,
+                "source_template_id": source_template_id,
+            },
         )
-        self.db.add(new_plan)
-        await self.db.flush()
 
-        # Copy plan workouts (and optionally duplicate workouts)
-        for pw in plan.plan_workouts:
-            if duplicate_workouts:
-                # Duplicate the workout itself (keeping the original name)
-                new_workout = await self.duplicate_workout(
-                    pw.workout,
-                    new_owner_id,
-                    new_name=pw.workout.name,
-                    organization_id=organization_id,
-                )
-                workout_id = new_workout.id
-            else:
-                # Reference the same workout
-                workout_id = pw.workout_id
-
-            new_pw = PlanWorkout(
-                plan_id=new_plan.id,
-                workout_id=workout_id,
-                label=pw.label,
-                order=pw.order,
-                day_of_week=pw.day_of_week,
-            )
-            self.db.add(new_pw)
+        workout_ids: dict[uuid.UUID, uuid.UUID] = {}
+        if duplicate_workouts:
+            # Duplicate the workouts themselves (keeping the original names)
+            workout_ids = id_map({pw.workout_id for pw in plan.plan_workouts})
+            if workout_ids:
+                await self._copy_workouts(workout_ids, new_owner_id, organization_id=organization_id)
+
+        # Copy plan workouts (pointing at the copies, or at the same workouts)
+        await copy_rows(
+            self.db,
+            PlanWorkout.__table__,
+            PlanWorkout.plan_id == plan.id,
+            {
+                "id": new_uuid(self.db),
+                "plan_id": remap(PlanWorkout.plan_id, plan_ids),
+                "workout_id": remap(PlanWorkout.workout_id, workout_ids),
+            },
+        )
 
         await self.db.commit()
-        await self.db.refresh(new_plan)
-        return new_plan
+        return await self.db.get(TrainingPlan, plan_ids[plan.id])
 
     # Plan assignment operations
 
@@ -719,10 +722,15 @@ class PlanServiceMixin:
         result = await self.db.execute(
             select(PlanAssignment)
             .where(PlanAssignment.id == assignment_id)
-            .options(selectinload(PlanAssignment.plan))
+            .options(selectinload(PlanAssignment.plan), selectinload(PlanAssignment.snapshot_blob))
         )
         return result.scalar_one_or_none()
 
+    async def refresh_plan_assignment(self, assignment: PlanAssignment) -> None:
+        """Refresh an assignment after a commit, keeping its snapshot readable."""
+        await self.db.refresh(assignment)
+        await self.db.refresh(assignment, ["snapshot_blob"])
+
     async def list_student_plan_assignments(
         self,
         student_id: uuid.UUID,
@@ -737,7 +745,8 @@ class PlanServiceMixin:
             selectinload(PlanAssignment.plan)
             .selectinload(TrainingPlan.plan_workouts)
             .selectinload(PlanWorkout.workout)
-            .selectinload(Workout.exercises)
+            .selectinload(Workout.exercises),
+            selectinload(PlanAssignment.snapshot_blob),
         )
 
         if prescribed_only:
@@ -769,7 +778,8 @@ class PlanServiceMixin:
             selectinload(PlanAssignment.plan)
             .selectinload(TrainingPlan.plan_workouts)
             .selectinload(PlanWorkout.workout)
-            .selectinload(Workout.exercises)
+            .selectinload(Workout.exercises),
+            selectinload(PlanAssignment.snapshot_blob),
         )
 
         if student_id:
@@ -784,6 +794,68 @@ class PlanServiceMixin:
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def list_plan_assignment_summaries(
+        self,
+        trainer_id: uuid.UUID | None = None,
+        student_id: uuid.UUID | None = None,
+        active_only: bool = True,
+        prescribed_only: bool = False,
+        organization_id: uuid.UUID | None = None,
+    ) -> list[dict]:
+        """List plan assignments with student name and plan header in one query.
+
+        Filters like ``list_trainer_plan_assignments`` (given ``trainer_id``)
+        or ``list_student_plan_assignments`` (``student_id`` only), without
+        loading plan trees or snapshots. Rows are newest first.
+        """
+        from src.domains.users.models import User
+
+        query = (
+            select(
+                PlanAssignment.id,
+                PlanAssignment.plan_id,
+                PlanAssignment.student_id,
+                PlanAssignment.trainer_id,
+                PlanAssignment.organization_id,
+                PlanAssignment.start_date,
+                PlanAssignment.end_date,
+                PlanAssignment.is_active,
+                PlanAssignment.notes,
+                PlanAssignment.status,
+                PlanAssignment.accepted_at,
+                PlanAssignment.acknowledged_at,
+                PlanAssignment.declined_reason,
+                PlanAssignment.created_at,
+                PlanAssignment.version,
+                PlanAssignment.last_version_viewed,
+                func.coalesce(TrainingPlan.name, "").label("plan_name"),
+                TrainingPlan.duration_weeks.label("plan_duration_weeks"),
+                func.coalesce(User.name, "").label("student_name"),
+            )
+            .outerjoin(TrainingPlan, TrainingPlan.id == PlanAssignment.plan_id)
+            .outerjoin(User, User.id == PlanAssignment.student_id)
+            .order_by(PlanAssignment.created_at.desc())
+        )
+
+        if trainer_id:
+            query = query.where(PlanAssignment.trainer_id == trainer_id)
+        if student_id:
+            query = query.where(PlanAssignment.student_id == student_id)
+        if prescribed_only and student_id:
+            query = query.where(PlanAssignment.trainer_id != student_id)
+        if organization_id:
+            query = query.where(PlanAssignment.organization_id == organization_id)
+        if active_only:
+            query = query.where(PlanAssignment.is_active == True)  # noqa: E712
+            if not trainer_id:
+                # Students don't see assignments they declined
+                query = query.where(
+                    PlanAssignment.status.in_([AssignmentStatus.PENDING, AssignmentStatus.ACCEPTED]),
+                )
+
+        result = await self.db.execute(query)
+        return [dict(row) for row in result.mappings()]
+
     def _create_plan_snapshot(self, plan: TrainingPlan) -> dict:
         """Create a complete snapshot of a plan for independent prescription."""
         snapshot = {
@@ -804,8 +876,6 @@ class PlanServiceMixin:
             "fat_grams": plan.fat_grams,
             "meals_per_day": plan.meals_per_day,
             "diet_notes": plan.diet_notes,
-            # Snapshot metadata
-            "snapshot_created_at": datetime.now(timezone.utc).isoformat(),
             # Workouts with exercises
             "workouts": [],
         }
@@ -886,9 +956,10 @@ class PlanServiceMixin:
         if not plan:
             raise ValueError(f"Plan {plan_id} not found")
 
-        # Create independent snapshot
-        plan_snapshot = self._create_plan_snapshot(plan)
+        # Create independent snapshot (deduplicated across assignments of the same plan)
+        snapshot_blob = await PlanSnapshotStore(self.db).put(self._create_plan_snapshot(plan))
 
+        now = datetime.now(timezone.utc)
         assignment = PlanAssignment(
             plan_id=plan_id,
             student_id=student_id,
@@ -898,12 +969,16 @@ class PlanServiceMixin:
             notes=notes,
             organization_id=organization_id,
             status=AssignmentStatus.ACCEPTED,
-            accepted_at=datetime.now(timezone.utc),
-            plan_snapshot=plan_snapshot,
+            accepted_at=now,
+            snapshot_blob=snapshot_blob,
+            snapshot_created_at=now,
         )
         self.db.add(assignment)
+        await self.db.flush()
+        # Existing trainer notes on the plan and its workouts become visible
+        await refresh_student_audience(self.db, student_id)
         await self.db.commit()
-        await self.db.refresh(assignment)
+        await self.refresh_plan_assignment(assignment)
         return assignment
 
     async def acknowledge_plan_assignment(
@@ -913,7 +988,7 @@ class PlanServiceMixin:
         """Mark a plan assignment as acknowledged by the student."""
         assignment.acknowledged_at = datetime.now(timezone.utc)
         await self.db.commit()
-        await self.db.refresh(assignment)
+        await self.refresh_plan_assignment(assignment)
         return assignment
 
     async def update_plan_assignment(
@@ -935,7 +1010,7 @@ class PlanServiceMixin:
             assignment.notes = notes
 
         await self.db.commit()
-        await self.db.refresh(assignment)
+        await self.refresh_plan_assignment(assignment)
         return assignment
 
     # Prescription Note operations
@@ -961,6 +1036,9 @@ class PlanServiceMixin:
             organization_id=organization_id,
         )
         self.db.add(note)
+        if author_role == NoteAuthorRole.TRAINER:
+            await self.db.flush()
+            await fan_out_note(self.db, note.id)
         await self.db.commit()
         await self.db.refresh(note)
         return note
@@ -1010,56 +1088,15 @@ class PlanServiceMixin:
         unread_only: bool = False,
         limit: int = 50,
     ) -> list[PrescriptionNote]:
-        """List notes relevant to a student (notes from trainers on their assignments)."""
-        # Build subqueries to find context_ids the student has access to
-        session_ids_subquery = (
-            select(WorkoutSession.id)
-            .where(WorkoutSession.user_id == student_id)
-        ).scalar_subquery()
-
-        workout_assignment_ids_subquery = (
-            select(WorkoutAssignment.workout_id)
-            .where(WorkoutAssignment.student_id == student_id)
-        ).scalar_subquery()
-
-        plan_ids_subquery = (
-            select(TrainingPlan.id)
-            .join(WorkoutAssignment, WorkoutAssignment.plan_id == TrainingPlan.id)
-            .where(WorkoutAssignment.student_id == student_id)
-        ).scalar_subquery()
-
-        exercise_ids_subquery = (
-            select(WorkoutExercise.id)
-            .join(Workout, WorkoutExercise.workout_id == Workout.id)
-            .join(WorkoutAssignment, WorkoutAssignment.workout_id == Workout.id)
-            .where(WorkoutAssignment.student_id == student_id)
-        ).scalar_subquery()
-
-        access_conditions = or_(
-            and_(
-                PrescriptionNote.context_type == NoteContextType.SESSION,
-                PrescriptionNote.context_id.in_(session_ids_subquery),
-            ),
-            and_(
-                PrescriptionNote.context_type == NoteContextType.WORKOUT,
-                PrescriptionNote.context_id.in_(workout_assignment_ids_subquery),
-            ),
-            and_(
-                PrescriptionNote.context_type == NoteContextType.PLAN,
-                PrescriptionNote.context_id.in_(plan_ids_subquery),
-            ),
-            and_(
-                PrescriptionNote.context_type == NoteContextType.EXERCISE,
-                PrescriptionNote.context_id.in_(exercise_ids_subquery),
-            ),
-        )
+        """List notes relevant to a student (notes from trainers on their assignments).
 
+        Reads the note audience index, so this is a range scan on the
+        student's rows regardless of how many sessions and assignments they have.
+        """
         query = (
             select(PrescriptionNote)
-            .where(
-                PrescriptionNote.author_role == NoteAuthorRole.TRAINER,
-                access_conditions,
-            )
+            .join(PrescriptionNoteAudience, PrescriptionNoteAudience.note_id == PrescriptionNote.id)
+            .where(PrescriptionNoteAudience.student_id == student_id)
             .options(selectinload(PrescriptionNote.author))
             .order_by(PrescriptionNote.is_pinned.desc(), PrescriptionNote.created_at.desc())
             .limit(limit)
@@ -1069,11 +1106,22 @@ class PlanServiceMixin:
             query = query.where(PrescriptionNote.context_type == context_type)
 
         if unread_only:
-            query = query.where(PrescriptionNote.read_at.is_(None))
+            query = query.where(PrescriptionNoteAudience.read_at.is_(None))
 
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def count_unread_notes_for_student(self, student_id: uuid.UUID) -> int:
+        """Count trainer notes the student hasn't read yet."""
+        return await self.db.scalar(
+            select(func.count())
+            .select_from(PrescriptionNoteAudience)
+            .where(
+                PrescriptionNoteAudience.student_id == student_id,
+                PrescriptionNoteAudience.read_at.is_(None),
+            )
+        ) or 0
+
     async def update_prescription_note(
         self,
         note: PrescriptionNote,
@@ -1096,8 +1144,18 @@ class PlanServiceMixin:
         user_id: uuid.UUID,
     ) -> PrescriptionNote:
         """Mark a note as read by a user."""
-        note.read_at = datetime.now(timezone.utc)
+        now = datetime.now(timezone.utc)
+        note.read_at = now
         note.read_by_id = user_id
+        await self.db.execute(
+            update(PrescriptionNoteAudience)
+            .where(
+                PrescriptionNoteAudience.note_id == note.id,
+                PrescriptionNoteAudience.student_id == user_id,
+                PrescriptionNoteAudience.read_at.is_(None),
+            )
+            .values(read_at=now)
+        )
         await self.db.commit()
         await self.db.refresh(note)
         return note
@@ -1107,6 +1165,9 @@ class PlanServiceMixin:
         note: PrescriptionNote,
     ) -> None:
         """Delete a prescription note."""
+        await self.db.execute(
+            delete(PrescriptionNoteAudience).where(PrescriptionNoteAudience.note_id == note.id)
+        )
         await self.db.delete(note)
         await self.db.commit()
 
@@ -1121,7 +1182,7 @@ class PlanServiceMixin:
             NoteAuthorRole.TRAINER if for_role == NoteAuthorRole.STUDENT else NoteAuthorRole.STUDENT
         )
 
-        query = select(PrescriptionNote).where(
+        query = select(func.count()).select_from(PrescriptionNote).where(
             and_(
                 PrescriptionNote.context_type == context_type,
                 PrescriptionNote.context_id == context_id,
@@ -1130,8 +1191,7 @@ class PlanServiceMixin:
             )
         )
 
-        result = await self.db.execute(query)
-        return len(result.scalars().all())
+        return await self.db.scalar(query) or 0
 
     async def validate_context_access(
         self,
@@ -1200,10 +1260,18 @@ class PlanServiceMixin:
         if not assignment.plan_snapshot:
             return None
 
+        # Versions reference the assignment's blob instead of copying it
+        snapshot_blob = assignment.snapshot_blob
+        created_at = assignment.snapshot_created_at
+        if snapshot_blob is None:
+            snapshot_blob = await PlanSnapshotStore(self.db).put(assignment.plan_snapshot)
+            created_at = snapshot_created_at(assignment.plan_snapshot)
+
         version = PlanVersion(
             assignment_id=assignment.id,
             version=assignment.version,
-            snapshot=assignment.plan_snapshot,
+            snapshot_blob=snapshot_blob,
+            snapshot_created_at=created_at,
             changed_by_id=changed_by_id,
             change_description=change_description,
         )
@@ -1224,7 +1292,7 @@ class PlanServiceMixin:
         result = await self.db.execute(
             select(PlanVersion)
             .where(PlanVersion.assignment_id == assignment_id)
-            .options(selectinload(PlanVersion.changed_by))
+            .options(selectinload(PlanVersion.changed_by), selectinload(PlanVersion.snapshot_blob))
             .order_by(PlanVersion.version.desc())
         )
         return list(result.scalars().all())
@@ -1241,7 +1309,7 @@ class PlanServiceMixin:
                 PlanVersion.assignment_id == assignment_id,
                 PlanVersion.version == version,
             )
-            .options(selectinload(PlanVersion.changed_by))
+            .options(selectinload(PlanVersion.changed_by), selectinload(PlanVersion.snapshot_blob))
         )
         return result.scalar_one_or_none()
 
@@ -1253,7 +1321,7 @@ class PlanServiceMixin:
         """Mark that the student has viewed a specific version."""
         assignment.last_version_viewed = version
         await self.db.commit()
-        await self.db.refresh(assignment)
+        await self.refresh_plan_assignment(assignment)
         return assignment
 
     async def update_plan_snapshot(
@@ -1271,10 +1339,12 @@ class PlanServiceMixin:
                 change_description=change_description,
             )
 
-        assignment.plan_snapshot = new_snapshot
+        assignment.snapshot_blob = await PlanSnapshotStore(self.db).put(new_snapshot)
+        assignment.snapshot_created_at = datetime.now(timezone.utc)
+        assignment.legacy_plan_snapshot = None
 
         await self.db.commit()
-        await self.db.refresh(assignment)
+        await self.refresh_plan_assignment(assignment)
         return assignment
 
     def compute_snapshot_diff(
@@ -1292,6 +1362,10 @@ class PlanServiceMixin:
         if not old_snapshot or not new_snapshot:
             return diff
 
+        old_hash = old_snapshot.get("content_hash")
+        if old_hash and old_hash == new_snapshot.get("content_hash"):
+            return diff
+
         # Compare plan-level fields
         plan_fields = ["name", "description", "goal", "difficulty", "split_type"]
         for field in plan_fields:
@@ -1333,6 +1407,10 @@ class PlanServiceMixin:
             old_w = old_workouts[workout_id]
             new_w = new_workouts[workout_id]
 
+            # Unchanged sub-trees are skipped without walking their exercises
+            if workout_hash(old_w) == workout_hash(new_w):
+                continue
+
             old_exercises = {e.get("id"): e for e in old_w.get("exercises", [])}
             new_exercises = {e.get("id"): e for e in new_w.get("exercises", [])}
 
@@ -12,6 +12,7 @@ from src.core.redis import RateLimiter
 from src.domains.auth.dependencies import CurrentUser
 from src.domains.users.service import UserService
 from src.domains.workouts.models import Difficulty, SplitType, WorkoutGoal
+from src.domains.workouts.note_audience import refresh_student_audience
 from src.domains.workouts.schemas import (
     AIGeneratePlanRequest,
     AIGeneratePlanResponse,
@@ -35,7 +36,7 @@ from src.domains.workouts.schemas import (
 )
 from src.domains.workouts.service import WorkoutService
 from src.domains.notifications.push_service import send_push_notification
-from src.domains.notifications.router import create_notification
+from src.domains.notifications.service import create_notification
 from src.domains.notifications.schemas import NotificationCreate
 from src.domains.notifications.models import NotificationType
 
@@ -90,20 +91,7 @@ async def list_plans(
     )
 
     return [
-        PlanListResponse(
-            id=p.id,
-            name=p.name,
-            goal=p.goal,
-            difficulty=p.difficulty,
-            split_type=p.split_type,
-            duration_weeks=p.duration_weeks,
-            is_template=p.is_template,
-            is_public=p.is_public,
-            workout_count=len(p.plan_workouts),
-            created_by_id=p.created_by_id,
-            source_template_id=_str_to_uuid(p.source_template_id),
-            created_at=p.created_at,
-        )
+        PlanListResponse(**{**p, "source_template_id": _str_to_uuid(p["source_template_id"])})
         for p in plans
     ]
 
@@ -188,6 +176,38 @@ async def generate_plan_with_ai(
     return AIGeneratePlanResponse(**result)
 
 
+def _full_assignment_response(assignment, plan, student_name: str) -> PlanAssignmentResponse:
+    """Assignment with its plan tree (workouts loaded) and snapshot."""
+    version = assignment.version or 1
+    return PlanAssignmentResponse(
+        id=assignment.id,
+        plan_id=assignment.plan_id,
+        student_id=assignment.student_id,
+        trainer_id=assignment.trainer_id,
+        organization_id=assignment.organization_id,
+        start_date=assignment.start_date,
+        end_date=assignment.end_date,
+        is_active=assignment.is_active,
+        notes=assignment.notes,
+        status=assignment.status,
+        accepted_at=assignment.accepted_at,
+        acknowledged_at=assignment.acknowledged_at,
+        declined_reason=assignment.declined_reason,
+        created_at=assignment.created_at,
+        plan_name=plan.name if plan else "",
+        student_name=student_name,
+        plan_duration_weeks=plan.duration_weeks if plan else None,
+        # Include all plan_workouts, even if their workout is gone
+        plan=PlanResponse.model_validate(plan) if plan else None,
+        plan_snapshot=assignment.plan_snapshot,
+        version=version,
+        last_version_viewed=assignment.last_version_viewed,
+        has_unviewed_updates=(
+            assignment.last_version_viewed is None or version > assignment.last_version_viewed
+        ),
+    )
+
+
 # Plan assignment endpoints
 
 @plans_router.get("/plans/assignments", response_model=list[PlanAssignmentResponse])
@@ -197,6 +217,7 @@ async def list_plan_assignments(
     as_trainer: Annotated[bool, Query()] = False,
     active_only: Annotated[bool, Query()] = True,
     student_id: Annotated[UUID | None, Query()] = None,
+    include_plan: Annotated[bool, Query()] = False,
     x_organization_id: Annotated[str | None, Header(alias="X-Organization-ID")] = None,
 ) -> list[PlanAssignmentResponse]:
     """List plan assignments (as student or trainer).
@@ -207,29 +228,49 @@ async def list_plan_assignments(
 
     When X-Organization-ID header is provided, filters assignments by organization context.
     This is important for students with multiple trainers.
+
+    Items carry the plan header (name, duration) and version state, read in a
+    single query; ``plan`` and ``plan_snapshot`` are left empty unless
+    include_plan=True. Screens that poll this list should open one
+    assignment's tree with GET /plans/assignments/{assignment_id}.
     """
     workout_service = WorkoutService(db)
-    user_service = UserService(db)
 
     # Parse organization_id from header if provided
     organization_id = UUID(x_organization_id) if x_organization_id else None
 
-    if as_trainer:
-        if student_id:
-            # Filter by specific student
-            assignments = await workout_service.list_trainer_plan_assignments(
+    if not include_plan:
+        if as_trainer:
+            rows = await workout_service.list_plan_assignment_summaries(
                 trainer_id=current_user.id,
                 student_id=student_id,
                 active_only=active_only,
                 organization_id=organization_id,
             )
         else:
-            # All trainer's assignments
-            assignments = await workout_service.list_trainer_plan_assignments(
-                trainer_id=current_user.id,
+            rows = await workout_service.list_plan_assignment_summaries(
+                student_id=current_user.id,
                 active_only=active_only,
+                prescribed_only=False,  # Allow trainers to follow their own plans
                 organization_id=organization_id,
             )
+        return [
+            PlanAssignmentResponse(
+                **row,
+                has_unviewed_updates=(
+                    row["last_version_viewed"] is None or row["version"] > row["last_version_viewed"]
+                ),
+            )
+            for row in rows
+        ]
+
+    if as_trainer:
+        assignments = await workout_service.list_trainer_plan_assignments(
+            trainer_id=current_user.id,
+            student_id=student_id,
+            active_only=active_only,
+            organization_id=organization_id,
+        )
     else:
         assignments = await workout_service.list_student_plan_assignments(
             student_id=current_user.id,
@@ -238,88 +279,35 @@ async def list_plan_assignments(
             organization_id=organization_id,
         )
 
-    result = []
-    for a in assignments:
-        student = await user_service.get_user_by_id(a.student_id)
-
-        # Build full plan response if plan exists
-        plan_response = None
-        if a.plan:
-            plan_response = PlanResponse(
-                id=a.plan.id,
-                name=a.plan.name,
-                description=a.plan.description,
-                goal=a.plan.goal,
-                difficulty=a.plan.difficulty,
-                split_type=a.plan.split_type,
-                duration_weeks=a.plan.duration_weeks,
-                target_workout_minutes=a.plan.target_workout_minutes,
-                include_diet=a.plan.include_diet,
-                diet_type=a.plan.diet_type,
-                daily_calories=a.plan.daily_calories,
-                protein_grams=a.plan.protein_grams,
-                carbs_grams=a.plan.carbs_grams,
-                fat_grams=a.plan.fat_grams,
-                meals_per_day=a.plan.meals_per_day,
-                diet_notes=a.plan.diet_notes,
-                is_template=a.plan.is_template,
-                is_public=a.plan.is_public,
-                created_by_id=a.plan.created_by_id,
-                organization_id=a.plan.organization_id,
-                source_template_id=a.plan.source_template_id,
-                created_at=a.plan.created_at,
-                plan_workouts=[],  # Will be populated if plan_workouts loaded
-            )
-            # Include plan workouts if loaded
-            if hasattr(a.plan, 'plan_workouts') and a.plan.plan_workouts:
-                from src.domains.workouts.schemas import PlanWorkoutResponse, WorkoutResponse
-                plan_response.plan_workouts = [
-                    PlanWorkoutResponse(
-                        id=pw.id,
-                        workout_id=pw.workout_id,
-                        order=pw.order,
-                        label=pw.label,
-                        day_of_week=pw.day_of_week,
-                        workout=WorkoutResponse.model_validate(pw.workout) if pw.workout else None,
-                    )
-                    for pw in a.plan.plan_workouts
-                    # Don't filter - include all plan_workouts even if workout is None
-                ]
-
-        # Get version info
-        version = getattr(a, 'version', 1)
-        last_version_viewed = getattr(a, 'last_version_viewed', None)
-
-        result.append(
-            PlanAssignmentResponse(
-                id=a.id,
-                plan_id=a.plan_id,
-                student_id=a.student_id,
-                trainer_id=a.trainer_id,
-                organization_id=a.organization_id,
-                start_date=a.start_date,
-                end_date=a.end_date,
-                is_active=a.is_active,
-                notes=a.notes,
-                status=a.status,
-                accepted_at=a.accepted_at,
-                acknowledged_at=a.acknowledged_at,
-                declined_reason=a.declined_reason,
-                created_at=a.created_at,
-                plan_name=a.plan.name if a.plan else "",
-                student_name=student.name if student else "",
-                plan_duration_weeks=a.plan.duration_weeks if a.plan else None,
-                plan=plan_response,
-                plan_snapshot=a.plan_snapshot,
-                version=version,
-                last_version_viewed=last_version_viewed,
-                has_unviewed_updates=(
-                    last_version_viewed is None or version > last_version_viewed
-                ),
-            )
+    student_names = await UserService(db).get_user_names({a.student_id for a in assignments})
+    return [_full_assignment_response(a, a.plan, student_names.get(a.student_id, "")) for a in assignments]
+
+
+@plans_router.get("/plans/assignments/{assignment_id}", response_model=PlanAssignmentResponse)
+async def get_plan_assignment(
+    assignment_id: UUID,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> PlanAssignmentResponse:
+    """Get a plan assignment with its full plan tree and snapshot."""
+    workout_service = WorkoutService(db)
+    assignment = await workout_service.get_plan_assignment_by_id(assignment_id)
+
+    if not assignment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assignment not found",
+        )
+
+    if current_user.id not in (assignment.student_id, assignment.trainer_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
         )
 
-    return result
+    plan = await workout_service.get_plan_by_id(assignment.plan_id)
+    student_names = await UserService(db).get_user_names({assignment.student_id})
+    return _full_assignment_response(assignment, plan, student_names.get(assignment.student_id, ""))
 
 
 @plans_router.post("/plans/assignments", response_model=PlanAssignmentResponse, status_code=status.HTTP_201_CREATED)
@@ -662,7 +650,7 @@ async def respond_to_plan_assignment(
         assignment.is_active = False
 
     await db.commit()
-    await db.refresh(assignment)
+    await workout_service.refresh_plan_assignment(assignment)
 
     # Get student and plan info for response
     student = await user_service.get_user_by_id(assignment.student_id)
@@ -934,7 +922,10 @@ async def delete_plan_assignment(
             detail="Apenas atribuições pendentes podem ser canceladas",
         )
 
+    student_id = assignment.student_id
     await db.delete(assignment)
+    await db.flush()
+    await refresh_student_audience(db, student_id)
     await db.commit()
 
 
@@ -1087,6 +1078,7 @@ async def update_plan_assignment_with_version(
     """
     from datetime import datetime, timezone
     from src.domains.workouts.models import PlanVersion
+    from src.domains.workouts.snapshot_store import PlanSnapshotStore, snapshot_created_at
 
     # Get assignment
     workout_service = WorkoutService(db)
@@ -1105,12 +1097,20 @@ async def update_plan_assignment_with_version(
             detail="Apenas o personal pode atualizar a prescrição",
         )
 
-    # Save current version before updating
+    snapshot_store = PlanSnapshotStore(db)
+
+    # Save current version before updating (the version references the current blob)
     if assignment.plan_snapshot:
+        version_blob = assignment.snapshot_blob
+        version_created_at = assignment.snapshot_created_at
+        if version_blob is None:
+            version_blob = await snapshot_store.put(assignment.plan_snapshot)
+            version_created_at = snapshot_created_at(assignment.plan_snapshot)
         version_record = PlanVersion(
             assignment_id=assignment_id,
             version=assignment.version,
-            snapshot=assignment.plan_snapshot,
+            snapshot_blob=version_blob,
+            snapshot_created_at=version_created_at,
             changed_at=datetime.now(timezone.utc),
             changed_by_id=current_user.id,
             change_description=request.change_description or f"Versão {assignment.version}",
@@ -1118,12 +1118,14 @@ async def update_plan_assignment_with_version(
         db.add(version_record)
 
     # Update assignment with new snapshot
-    assignment.plan_snapshot = request.plan_snapshot
+    assignment.snapshot_blob = await snapshot_store.put(request.plan_snapshot)
+    assignment.snapshot_created_at = datetime.now(timezone.utc)
+    assignment.legacy_plan_snapshot = None
     assignment.version += 1
     assignment.updated_at = datetime.now(timezone.utc)
 
     await db.commit()
-    await db.refresh(assignment)
+    await workout_service.refresh_plan_assignment(assignment)
 
     # Get related data for response
     plan = await workout_service.get_plan_by_id(assignment.plan_id)
@@ -1209,7 +1211,7 @@ async def mark_version_viewed(
     assignment.updated_at = datetime.now(timezone.utc)
 
     await db.commit()
-    await db.refresh(assignment)
+    await workout_service.refresh_plan_assignment(assignment)
 
     # Get related data for response
     plan = await workout_service.get_plan_by_id(assignment.plan_id)
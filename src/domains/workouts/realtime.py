@@ -12,6 +12,7 @@ from typing import AsyncGenerator, Any
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.sse import HEARTBEAT, HEARTBEAT_FRAME, Connection
 from src.domains.workouts.models import (
     SessionMessage,
     SessionStatus,
@@ -41,6 +42,7 @@ class SessionEventType:
 
     # Exercise events
     SET_COMPLETED = "set_completed"
+    SETS_SYNCED = "sets_synced"
     EXERCISE_CHANGED = "exercise_changed"
 
     # Communication
@@ -89,12 +91,13 @@ class SessionManager:
         # Map of session_id -> last known state
         self._session_states: dict[uuid.UUID, dict] = {}
 
-    async def subscribe(self, session_id: uuid.UUID) -> asyncio.Queue:
-        """Subscribe to session updates."""
+    async def subscribe(self, session_id: uuid.UUID, queue: asyncio.Queue | None = None) -> asyncio.Queue:
+        """Subscribe to session updates, on ``queue`` if given."""
         if session_id not in self._subscribers:
             self._subscribers[session_id] = []
 
-        queue: asyncio.Queue = asyncio.Queue()
+        if queue is None:
+            queue = asyncio.Queue()
         self._subscribers[session_id].append(queue)
         return queue
 
@@ -160,19 +163,21 @@ async def broadcast_session_event(
 
 
 async def stream_session_events(
+    connection: Connection,
     session_id: uuid.UUID,
-    user_id: uuid.UUID,
 ) -> AsyncGenerator[str, None]:
     """Stream session events as Server-Sent Events.
 
     Args:
+        connection: Hub connection of the subscriber, which also delivers
+            its heartbeats
         session_id: Session to subscribe to
-        user_id: User subscribing to events
 
     Yields:
         SSE formatted strings
     """
-    queue = await session_manager.subscribe(session_id)
+    user_id = connection.user_id
+    queue = await session_manager.subscribe(session_id, connection.queue)
 
     try:
         # Send initial sync event
@@ -193,12 +198,8 @@ async def stream_session_events(
 
         # Stream events
         while True:
-            try:
-                event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                yield event.to_sse()
-            except asyncio.TimeoutError:
-                # Send heartbeat to keep connection alive
-                yield ": heartbeat\n\n"
+            event = await connection.receive()
+            yield HEARTBEAT_FRAME if event is HEARTBEAT else event.to_sse()
     finally:
         await session_manager.unsubscribe(session_id, queue)
 
@@ -255,6 +256,21 @@ async def notify_set_completed(
     )
 
 
+async def notify_sets_synced(
+    session_id: uuid.UUID,
+    user_id: uuid.UUID,
+    sets: list[dict[str, Any]],
+    deleted_op_ids: list[str],
+) -> None:
+    """Notify once for a batch of sets synced from the client."""
+    await broadcast_session_event(
+        session_id=session_id,
+        event_type=SessionEventType.SETS_SYNCED,
+        data={"sets": sets, "deleted_op_ids": deleted_op_ids},
+        sender_id=user_id,
+    )
+
+
 async def notify_trainer_adjustment(
     session_id: uuid.UUID,
     trainer_id: uuid.UUID,
@@ -73,11 +73,6 @@ async def list_workouts(
             except ValueError:
                 pass
 
-    logger.warning(
-        "[DEBUG] list_workouts: user=%s, query_org=%s, header_org=%s, resolved_org=%s",
-        current_user.id, organization_id, request.headers.get("x-organization-id"), org_id,
-    )
-
     workout_service = WorkoutService(db)
     workouts = await workout_service.list_workouts(
         user_id=current_user.id,
@@ -88,23 +83,7 @@ async def list_workouts(
         offset=offset,
     )
 
-    logger.warning(
-        "[DEBUG] list_workouts: returning %d workouts: %s",
-        len(workouts),
-        [(str(w.id)[:8], w.name, str(w.organization_id)[:8] if w.organization_id else None) for w in workouts],
-    )
-
-    return [
-        WorkoutListResponse(
-            id=w.id,
-            name=w.name,
-            difficulty=w.difficulty,
-            estimated_duration_min=w.estimated_duration_min,
-            is_template=w.is_template,
-            exercise_count=len(w.exercises),
-        )
-        for w in workouts
-    ]
+    return [WorkoutListResponse(**w) for w in workouts]
 
 
 # ==================== Prescription Notes ====================
@@ -212,7 +191,7 @@ async def mark_note_as_read_endpoint(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Nota não encontrada",
         )
-    updated = await workout_service.mark_note_as_read(note)
+    updated = await workout_service.mark_note_as_read(note, current_user.id)
     return PrescriptionNoteResponse.model_validate(updated)
 
 
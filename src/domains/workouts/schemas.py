@@ -1,8 +1,9 @@
 """Workout schemas for request/response validation."""
 from datetime import date, datetime
+from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from src.domains.workouts.models import AssignmentStatus, Difficulty, ExerciseFeedbackType, ExerciseMode, MuscleGroup, NoteAuthorRole, NoteContextType, PlanStatus, PlanVersion, SessionStatus, SplitType, TechniqueType, WorkoutGoal
 
@@ -259,10 +260,53 @@ class SessionSetResponse(BaseModel):
     duration_seconds: int | None = None
     notes: str | None = None
     performed_at: datetime
+    client_op_id: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class SessionSetOperation(BaseModel):
+    """One client-side set change, identified by a client-generated op id.
+
+    ``upsert`` records the set (or replaces the one recorded by an earlier
+    op with the same id); ``delete`` removes the set recorded under ``op_id``.
+    """
+
+    op_id: str = Field(min_length=1, max_length=64)
+    action: Literal["upsert", "delete"] = "upsert"
+    exercise_id: UUID | None = None
+    set_number: int | None = Field(None, ge=1)
+    reps_completed: int | None = Field(None, ge=0)
+    weight_kg: float | None = Field(None, ge=0)
+    duration_seconds: int | None = Field(None, ge=0)
+    notes: str | None = Field(None, max_length=500)
+    performed_at: datetime | None = None
+
+    @model_validator(mode="after")
+    def upsert_fields_required(self) -> "SessionSetOperation":
+        if self.action == "upsert" and None in (self.exercise_id, self.set_number, self.reps_completed):
+            raise ValueError("upsert requires exercise_id, set_number and reps_completed")
+        return self
+
+
+class SessionSetSyncRequest(BaseModel):
+    """Ordered batch of set operations recorded while (possibly) offline."""
+
+    operations: list[SessionSetOperation] = Field(min_length=1, max_length=200)
+
+
+class SessionSetSyncResponse(BaseModel):
+    """Server state of a session's sets after a sync.
+
+    ``state_vector`` maps each exercise to the highest set number recorded,
+    so clients can spot sets they are missing or still have to send.
+    """
+
+    applied_op_ids: list[str]
+    sets: list[SessionSetResponse]
+    state_vector: dict[UUID, int]
+
+
 class SessionStart(BaseModel):
     """Start session request."""
 
@@ -327,6 +371,54 @@ class SessionListResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Strength analytics schemas
+
+class ExerciseStrengthResponse(BaseModel):
+    """Lifetime volume and bests for one exercise."""
+
+    exercise_id: UUID
+    exercise_name: str
+    total_sets: int
+    total_reps: int
+    total_volume_kg: float
+    best_weight_kg: float | None = None
+    best_estimated_1rm: float | None = None
+    last_performed_at: datetime | None = None
+
+
+class WeeklyVolumeResponse(BaseModel):
+    """Training volume for one week."""
+
+    week_start: date
+    sets: int
+    reps: int
+    volume_kg: float
+    best_estimated_1rm: float | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PersonalRecordResponse(BaseModel):
+    """Best estimated 1RM for an exercise."""
+
+    exercise_id: UUID
+    exercise_name: str
+    estimated_1rm: float
+    best_weight_kg: float | None = None
+    achieved_week: date | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StrengthProgressResponse(BaseModel):
+    """Strength progress overview read from the precomputed rollups."""
+
+    total_volume_kg: float
+    exercises: list[ExerciseStrengthResponse]
+    weekly_volume: list[WeeklyVolumeResponse]
+    personal_records: list[PersonalRecordResponse]
+
+
 # Co-Training schemas
 
 class SessionJoinRequest(BaseModel):
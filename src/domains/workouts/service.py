@@ -9,10 +9,11 @@ import re
 import uuid
 from datetime import date, datetime, timezone
 
-from sqlalchemy import and_, delete, or_, select
+from sqlalchemy import and_, delete, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.deep_copy import copy_rows, id_map, new_uuid, remap
 from src.domains.workouts.exercise_service import ExerciseServiceMixin
 from src.domains.workouts.models import (
     AssignmentStatus,
@@ -41,10 +42,15 @@ from src.domains.workouts.models import (
     WorkoutSession,
     WorkoutSessionSet,
 )
+from src.domains.workouts.note_audience import refresh_student_audience
 from src.domains.workouts.plan_service import PlanServiceMixin
 from src.domains.workouts.schemas import ActiveSessionResponse
 from src.domains.workouts.session_service import SessionServiceMixin
 
+# Matches "Name" / "Name (3)" and captures the base name and the counter
+COPY_NAME_PATTERN = r'^(.*?)(?:\s*\((\d+)\))?$'
+COPY_PREFIXES = ('copy of ', 'copia de ', 'cópia de ')
+
 
 class WorkoutService(ExerciseServiceMixin, PlanServiceMixin, SessionServiceMixin):
     """Service for handling workout operations.
@@ -58,26 +64,27 @@ class WorkoutService(ExerciseServiceMixin, PlanServiceMixin, SessionServiceMixin
 
     def _strip_copy_prefixes(self, name: str) -> str:
         """Recursively strip 'Copy of', 'Copia de', 'Copia de' prefixes from a name."""
-        copy_prefixes = ['copy of ', 'copia de ', 'cópia de ']
         lower_name = name.lower()
 
-        for prefix in copy_prefixes:
+        for prefix in COPY_PREFIXES:
             if lower_name.startswith(prefix):
                 # Recursively strip in case of "Copy of Copy of ..."
                 return self._strip_copy_prefixes(name[len(prefix):].strip())
 
         return name
 
-    def _get_next_copy_name(self, original_name: str, existing_names: list[str]) -> str:
-        """Generate next copy name like 'Name (2)', 'Name (3)', etc."""
-        pattern = r'^(.*?)(?:\s*\((\d+)\))?$'
-        match = re.match(pattern, original_name.strip())
+    def _get_copy_base_name(self, name: str) -> str:
+        """Strip copy prefixes and a trailing ' (N)' counter from a name."""
+        match = re.match(COPY_NAME_PATTERN, name.strip())
 
         if match:
-            base_name = match.group(1).strip()
-            base_name = self._strip_copy_prefixes(base_name)
-        else:
-            base_name = self._strip_copy_prefixes(original_name)
+            return self._strip_copy_prefixes(match.group(1).strip())
+        return self._strip_copy_prefixes(name)
+
+    def _get_next_copy_name(self, original_name: str, existing_names: list[str]) -> str:
+        """Generate next copy name like 'Name (2)', 'Name (3)', etc."""
+        pattern = COPY_NAME_PATTERN
+        base_name = self._get_copy_base_name(original_name)
 
         # Find highest existing number for this base name
         max_num = 1
@@ -93,6 +100,66 @@ class WorkoutService(ExerciseServiceMixin, PlanServiceMixin, SessionServiceMixin
 
         return f"{base_name} ({max_num + 1})"
 
+    async def _get_next_copy_name_for_owner(
+        self,
+        model: type[Workout] | type[TrainingPlan],
+        owner_id: uuid.UUID,
+        original_name: str,
+    ) -> str:
+        """Generate the next copy name from one prefix query on the owner's names.
+
+        Only names starting with the base name (optionally behind a legacy
+        copy prefix) are fetched, served by the (created_by_id, name) index.
+        """
+        base_name = self._get_copy_base_name(original_name)
+        escaped = re.sub(r"([\\%_])", r"\\\1", base_name)
+        prefix_conditions = [model.name.ilike(f"{escaped}%", escape="\\")]
+        prefix_conditions.extend(
+            model.name.ilike(f"{prefix}{escaped}%", escape="\\")
+            for prefix in COPY_PREFIXES
+        )
+        result = await self.db.execute(
+            select(model.name).where(
+                model.created_by_id == owner_id,
+                or_(*prefix_conditions),
+            )
+        )
+        return self._get_next_copy_name(original_name, list(result.scalars().all()))
+
+    async def _copy_workouts(
+        self,
+        workout_ids: dict[uuid.UUID, uuid.UUID],
+        new_owner_id: uuid.UUID,
+        organization_id: uuid.UUID | None = None,
+        new_name: str | None = None,
+    ) -> None:
+        """Clone workouts and all their exercises with two INSERT ... SELECT statements.
+
+        Args:
+            workout_ids: Mapping of source workout id -> id for the copy.
+            new_name: Name override (only meaningful for a single workout).
+        """
+        overrides = {
+            "id": remap(Workout.id, workout_ids),
+            "is_template": False,
+            "is_public": False,
+            "created_by_id": new_owner_id,
+            "organization_id": organization_id,
+        }
+        if new_name is not None:
+            overrides["name"] = new_name
+
+        await copy_rows(self.db, Workout.__table__, Workout.id.in_(list(workout_ids)), overrides)
+        await copy_rows(
+            self.db,
+            WorkoutExercise.__table__,
+            WorkoutExercise.workout_id.in_(list(workout_ids)),
+            {
+                "id": new_uuid(self.db),
+                "workout_id": remap(WorkoutExercise.workout_id, workout_ids),
+            },
+        )
+
     # Workout operations
 
     async def get_workout_by_id(self, workout_id: uuid.UUID) -> Workout | None:
@@ -112,10 +179,21 @@ class WorkoutService(ExerciseServiceMixin, PlanServiceMixin, SessionServiceMixin
         search: str | None = None,
         limit: int = 50,
         offset: int = 0,
-    ) -> list[Workout]:
-        """List workouts for a user."""
-        query = select(Workout).options(
-            selectinload(Workout.exercises)
+    ) -> list[dict]:
+        """List workouts for a user, with their exercise count computed in SQL."""
+        exercise_count = (
+            select(func.count(WorkoutExercise.id))
+            .where(WorkoutExercise.workout_id == Workout.id)
+            .correlate(Workout)
+            .scalar_subquery()
+        )
+        query = select(
+            Workout.id,
+            Workout.name,
+            Workout.difficulty,
+            Workout.estimated_duration_min,
+            Workout.is_template,
+            exercise_count.label("exercise_count"),
         )
 
         # Filter by user's workouts within the organization, or public templates
@@ -148,7 +226,7 @@ class WorkoutService(ExerciseServiceMixin, PlanServiceMixin, SessionServiceMixin
 
         query = query.order_by(Workout.created_at.desc()).limit(limit).offset(offset)
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return [dict(row) for row in result.mappings()]
 
     async def create_workout(
         self,
@@ -312,64 +390,19 @@ class WorkoutService(ExerciseServiceMixin, PlanServiceMixin, SessionServiceMixin
     ) -> Workout:
         """Duplicate a workout for another user."""
         if not new_name:
-            existing_workouts = await self.list_workouts(
-                user_id=new_owner_id,
-                organization_id=organization_id,
-                limit=500,
+            new_name = await self._get_next_copy_name_for_owner(
+                Workout, new_owner_id, workout.name
             )
-            existing_names = [w.name for w in existing_workouts]
-            new_name = self._get_next_copy_name(workout.name, existing_names)
-
-        new_workout = Workout(
-            name=new_name,
-            description=workout.description,
-            difficulty=workout.difficulty,
-            estimated_duration_min=workout.estimated_duration_min,
-            target_muscles=workout.target_muscles,
-            tags=workout.tags,
-            is_template=False,
-            is_public=False,
-            created_by_id=new_owner_id,
+
+        workout_ids = id_map([workout.id])
+        await self._copy_workouts(
+            workout_ids,
+            new_owner_id,
             organization_id=organization_id,
+            new_name=new_name,
         )
-        self.db.add(new_workout)
-        await self.db.flush()
-
-        # Copy exercises
-        for we in workout.exercises:
-            new_we = WorkoutExercise(
-                workout_id=new_workout.id,
-                exercise_id=we.exercise_id,
-                order=we.order,
-                sets=we.sets,
-                reps=we.reps,
-                rest_seconds=we.rest_seconds,
-                notes=we.notes,
-                superset_with=we.superset_with,
-                execution_instructions=we.execution_instructions,
-                group_instructions=we.group_instructions,
-                isometric_seconds=we.isometric_seconds,
-                technique_type=we.technique_type,
-                exercise_group_id=we.exercise_group_id,
-                exercise_group_order=we.exercise_group_order,
-                drop_count=we.drop_count,
-                rest_between_drops=we.rest_between_drops,
-                pause_duration=we.pause_duration,
-                mini_set_count=we.mini_set_count,
-                exercise_mode=we.exercise_mode,
-                duration_minutes=we.duration_minutes,
-                intensity=we.intensity,
-                work_seconds=we.work_seconds,
-                interval_rest_seconds=we.interval_rest_seconds,
-                rounds=we.rounds,
-                distance_km=we.distance_km,
-                target_pace_min_per_km=we.target_pace_min_per_km,
-            )
-            self.db.add(new_we)
-
         await self.db.commit()
-        await self.db.refresh(new_workout)
-        return new_workout
+        return await self.get_workout_by_id(workout_ids[workout.id])
 
     # Assignment operations
 
@@ -438,6 +471,8 @@ class WorkoutService(ExerciseServiceMixin, PlanServiceMixin, SessionServiceMixin
             organization_id=organization_id,
         )
         self.db.add(assignment)
+        await self.db.flush()
+        await refresh_student_audience(self.db, student_id)
         await self.db.commit()
         await self.db.refresh(assignment)
         return assignment
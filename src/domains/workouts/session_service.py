@@ -3,10 +3,11 @@ import logging
 import uuid
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import and_, delete, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.response_cache import mark_tables_changed
 from src.domains.workouts.models import (
     SessionMessage,
     SessionStatus,
@@ -16,7 +17,8 @@ from src.domains.workouts.models import (
     WorkoutSession,
     WorkoutSessionSet,
 )
-from src.domains.workouts.schemas import ActiveSessionResponse
+from src.domains.workouts.schemas import ActiveSessionResponse, SessionSetOperation
+from src.domains.workouts.strength_analytics import StrengthAnalytics
 
 
 class SessionServiceMixin:
@@ -92,6 +94,7 @@ class SessionServiceMixin:
         rating: int | None = None,
     ) -> WorkoutSession:
         """Complete a workout session."""
+        already_completed = session.status == SessionStatus.COMPLETED
         session.status = SessionStatus.COMPLETED
         session.completed_at = datetime.now(timezone.utc)
         if session.started_at:
@@ -105,6 +108,11 @@ class SessionServiceMixin:
         if rating is not None:
             session.rating = rating
 
+        if not already_completed:
+            # Fold the session's sets into the volume / 1RM rollups
+            await self.db.flush()
+            await StrengthAnalytics(self.db).apply_sessions([session.id])
+
         await self.db.commit()
         await self.db.refresh(session)
         return session
@@ -130,10 +138,98 @@ class SessionServiceMixin:
             notes=notes,
         )
         self.db.add(session_set)
+        # Sets of in-progress sessions are folded when the session completes;
+        # the session is normally already in the identity map here
+        session = await self.db.get(WorkoutSession, session_id)
+        if session is not None and session.status == SessionStatus.COMPLETED:
+            await self.db.flush()
+            await StrengthAnalytics(self.db).apply_set(session_set.id)
         await self.db.commit()
         await self.db.refresh(session_set)
         return session_set
 
+    async def sync_session_sets(
+        self,
+        session_id: uuid.UUID,
+        operations: list[SessionSetOperation],
+    ) -> tuple[list[WorkoutSessionSet], list[WorkoutSessionSet], list[str]]:
+        """Apply an ordered batch of client set operations in one transaction.
+
+        Operations are idempotent on ``(session_id, op_id)``: replaying a batch
+        rewrites the same rows. When a batch holds several operations with the
+        same id, the last one wins. Returns the sets written by this batch,
+        all sets of the session afterwards, and the op ids that were deleted.
+        """
+        latest: dict[str, SessionSetOperation] = {}
+        for op in operations:
+            latest.pop(op.op_id, None)
+            latest[op.op_id] = op
+
+        upserts = [op for op in latest.values() if op.action == "upsert"]
+        deleted = [op.op_id for op in latest.values() if op.action == "delete"]
+
+        if deleted:
+            await self.db.execute(
+                delete(WorkoutSessionSet)
+                .where(
+                    WorkoutSessionSet.session_id == session_id,
+                    WorkoutSessionSet.client_op_id.in_(deleted),
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        if upserts:
+            if self.db.get_bind().dialect.name == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            now = datetime.now(timezone.utc)
+            stmt = insert(WorkoutSessionSet).values([
+                {
+                    "id": uuid.uuid4(),
+                    "session_id": session_id,
+                    "client_op_id": op.op_id,
+                    "exercise_id": op.exercise_id,
+                    "set_number": op.set_number,
+                    "reps_completed": op.reps_completed,
+                    "weight_kg": op.weight_kg,
+                    "duration_seconds": op.duration_seconds,
+                    "notes": op.notes,
+                    "performed_at": op.performed_at or now,
+                }
+                for op in upserts
+            ])
+            new = stmt.excluded
+            await self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[WorkoutSessionSet.session_id, WorkoutSessionSet.client_op_id],
+                    set_={
+                        "exercise_id": new.exercise_id,
+                        "set_number": new.set_number,
+                        "reps_completed": new.reps_completed,
+                        "weight_kg": new.weight_kg,
+                        "duration_seconds": new.duration_seconds,
+                        "notes": new.notes,
+                        "performed_at": new.performed_at,
+                    },
+                )
+            )
+
+        if upserts or deleted:
+            mark_tables_changed(self.db.sync_session, WorkoutSessionSet.__tablename__)
+        await self.db.commit()
+
+        result = await self.db.execute(
+            select(WorkoutSessionSet)
+            .where(WorkoutSessionSet.session_id == session_id)
+            .order_by(WorkoutSessionSet.performed_at, WorkoutSessionSet.set_number)
+            .execution_options(populate_existing=True)
+        )
+        sets = list(result.scalars().all())
+        upserted_ids = {op.op_id for op in upserts}
+        written = [s for s in sets if s.client_op_id in upserted_ids]
+        return written, sets, deleted
+
     # Co-Training operations
 
     async def trainer_join_session(
@@ -172,6 +268,7 @@ class SessionServiceMixin:
         logger = logging.getLogger(__name__)
         logger.info(f"[SESSION] Updating session {session.id} from {session.status} to {status}")
 
+        was_completed = session.status == SessionStatus.COMPLETED
         session.status = status
 
         if status == SessionStatus.PAUSED:
@@ -185,6 +282,16 @@ class SessionServiceMixin:
                 delta = session.completed_at - session.started_at
                 session.duration_minutes = int(delta.total_seconds() / 60)
 
+        is_completed = status == SessionStatus.COMPLETED
+        if is_completed != was_completed:
+            await self.db.flush()
+            analytics = StrengthAnalytics(self.db)
+            if is_completed:
+                await analytics.apply_sessions([session.id])
+            else:
+                # Reopened: its sets must leave the rollups again
+                await analytics.rebuild(session.user_id)
+
         await self.db.commit()
         await self.db.refresh(session)
         logger.info(f"[SESSION] Session {session.id} now status={session.status}, completed_at={session.completed_at}")
@@ -443,6 +550,8 @@ class SessionServiceMixin:
             expired_count += 1
 
         if expired_count > 0:
+            await self.db.flush()
+            await StrengthAnalytics(self.db).apply_sessions(s.id for s in stale_sessions)
             await self.db.commit()
 
         return expired_count
@@ -471,6 +580,8 @@ class SessionServiceMixin:
             count += 1
 
         if count > 0:
+            await self.db.flush()
+            await StrengthAnalytics(self.db).apply_sessions(s.id for s in sessions)
             await self.db.commit()
 
         return count
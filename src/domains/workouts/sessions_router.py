@@ -5,15 +5,18 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.config.database import get_db
-from src.domains.auth.dependencies import CurrentUser
+from src.config.database import AsyncSessionLocal, get_db
+from src.core.sse import StreamLimitError, sse_hub
+from src.domains.auth.dependencies import CurrentUser, StreamUser
 from src.domains.notifications.models import NotificationType
 from src.domains.notifications.push_service import send_push_notification
-from src.domains.notifications.router import create_notification
 from src.domains.notifications.schemas import NotificationCreate
+from src.domains.notifications.service import create_notification
 from src.domains.users.service import UserService
+from src.domains.workouts.models import WorkoutSession
 from src.domains.workouts.schemas import (
     ActiveSessionResponse,
     ExerciseFeedbackCreate,
@@ -28,12 +31,16 @@ from src.domains.workouts.schemas import (
     SessionResponse,
     SessionSetInput,
     SessionSetResponse,
+    SessionSetSyncRequest,
+    SessionSetSyncResponse,
     SessionStart,
     SessionStatusUpdate,
+    StrengthProgressResponse,
     TrainerAdjustmentCreate,
     TrainerAdjustmentResponse,
 )
 from src.domains.workouts.service import WorkoutService
+from src.domains.workouts.strength_analytics import StrengthAnalytics
 
 logger = logging.getLogger(__name__)
 
@@ -430,6 +437,96 @@ async def add_set(
     return SessionSetResponse.model_validate(session_set)
 
 
+@sessions_router.post("/sessions/{session_id}/sets/sync", response_model=SessionSetSyncResponse)
+async def sync_sets(
+    session_id: UUID,
+    request: SessionSetSyncRequest,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> SessionSetSyncResponse:
+    """Apply a batch of set operations recorded offline, idempotently.
+
+    Operations are applied in order in one transaction; resending a batch
+    (e.g. after a timeout) doesn't duplicate sets. Returns the server's sets
+    so the client can reconcile.
+    """
+    workout_service = WorkoutService(db)
+    session = await db.get(WorkoutSession, session_id)
+
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found",
+        )
+
+    if session.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied",
+        )
+
+    if session.is_completed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot add sets to a completed session",
+        )
+
+    is_shared = session.is_shared
+    written, sets, deleted_op_ids = await workout_service.sync_session_sets(
+        session_id=session_id,
+        operations=request.operations,
+    )
+
+    # One broadcast for the whole batch
+    if is_shared and (written or deleted_op_ids):
+        from src.domains.workouts.realtime import notify_sets_synced
+        await notify_sets_synced(
+            session_id=session_id,
+            user_id=current_user.id,
+            sets=[
+                {
+                    "op_id": s.client_op_id,
+                    "exercise_id": str(s.exercise_id),
+                    "set_number": s.set_number,
+                    "reps": s.reps_completed,
+                    "weight_kg": s.weight_kg,
+                }
+                for s in written
+            ],
+            deleted_op_ids=deleted_op_ids,
+        )
+
+    state_vector: dict[UUID, int] = {}
+    for s in sets:
+        state_vector[s.exercise_id] = max(state_vector.get(s.exercise_id, 0), s.set_number)
+
+    return SessionSetSyncResponse(
+        applied_op_ids=list(dict.fromkeys(op.op_id for op in request.operations)),
+        sets=[SessionSetResponse.model_validate(s) for s in sets],
+        state_vector=state_vector,
+    )
+
+
+# Strength analytics endpoints
+
+@sessions_router.get("/analytics/strength", response_model=StrengthProgressResponse)
+async def get_my_strength_progress(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    weeks: Annotated[int, Query(ge=1, le=104)] = 12,
+    exercise_id: Annotated[UUID | None, Query()] = None,
+) -> StrengthProgressResponse:
+    """Get volume, estimated 1RM and personal records for the current user.
+
+    ``exercise_id`` narrows the weekly volume series to one exercise.
+    """
+    return await StrengthAnalytics(db).progress(
+        user_id=current_user.id,
+        weeks=weeks,
+        exercise_id=exercise_id,
+    )
+
+
 # Exercise Feedback endpoints
 
 @sessions_router.post(
@@ -1005,14 +1102,21 @@ async def list_session_messages(
 @sessions_router.get("/sessions/{session_id}/stream")
 async def stream_session_events(
     session_id: UUID,
-    current_user: CurrentUser,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: StreamUser,
 ) -> StreamingResponse:
-    """Stream real-time session events via Server-Sent Events (SSE)."""
+    """Stream real-time session events via Server-Sent Events (SSE).
+
+    Authorizes with a short-lived database session; the stream itself holds
+    no database connection.
+    """
     from src.domains.workouts.realtime import stream_session_events as stream_events
 
-    workout_service = WorkoutService(db)
-    session = await workout_service.get_session_by_id(session_id)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(WorkoutSession.user_id, WorkoutSession.trainer_id)
+            .where(WorkoutSession.id == session_id)
+        )
+        session = result.one_or_none()
 
     if not session:
         raise HTTPException(
@@ -1027,12 +1131,9 @@ async def stream_session_events(
             detail="Access denied",
         )
 
-    return StreamingResponse(
-        stream_events(session_id, current_user.id),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    try:
+        connection = sse_hub.connect(current_user.id, "workout_session")
+    except StreamLimitError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e)) from e
+
+    return sse_hub.response(connection, stream_events(connection, session_id))
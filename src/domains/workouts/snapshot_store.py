@@ -0,0 +1,207 @@
+"""Content-addressed storage for plan snapshots.
+
+Plan assignments and plan versions used to carry a full JSON copy of the plan
+each. Assigning one template to many students (or versioning an assignment
+that did not change) therefore multiplied identical blobs in the database.
+
+Snapshots are now stored once per canonical content hash in
+``plan_snapshot_blobs`` (zlib-compressed canonical JSON) and referenced by
+``PlanAssignment.snapshot_hash`` / ``PlanVersion.snapshot_hash``. Decoded
+snapshots are kept in a small in-process LRU so hot assignments are not
+decompressed and parsed on every request.
+
+Every workout inside a stored snapshot carries its own ``content_hash`` so
+diffs can skip unchanged workouts without walking their exercises.
+
+A blob is shared by every row that references it, so *when* a snapshot was
+taken is not part of it: ``snapshot_created_at`` lives on the referencing row
+and is overlaid on the decoded snapshot when read.
+"""
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+if TYPE_CHECKING:
+    from src.domains.workouts.models import PlanSnapshotBlob
+
+# Keys that describe *when* a snapshot was taken or are derived from its
+# content; they never take part in the content hash nor in the stored blob.
+SNAPSHOT_VOLATILE_KEYS = frozenset({"snapshot_created_at", "content_hash"})
+WORKOUT_VOLATILE_KEYS = frozenset({"content_hash"})
+
+_COMPRESSION_LEVEL = 6
+_LRU_MAX_ENTRIES = 256
+
+
+def _canonical_bytes(data: Any) -> bytes:
+    """Serialize data as canonical JSON (sorted keys, compact separators)."""
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
+
+def _hash_without(data: dict, volatile_keys: frozenset[str]) -> str:
+    stable = {k: v for k, v in data.items() if k not in volatile_keys}
+    return hashlib.sha256(_canonical_bytes(stable)).hexdigest()
+
+
+def workout_hash(workout: dict) -> str:
+    """Return the content hash of a workout sub-tree.
+
+    Uses the embedded ``content_hash`` when present (stored snapshots are
+    always normalized), otherwise hashes the workout on the fly.
+    """
+    embedded = workout.get("content_hash")
+    if embedded:
+        return embedded
+    return _hash_without(workout, WORKOUT_VOLATILE_KEYS)
+
+
+def normalize_snapshot(snapshot: dict) -> dict:
+    """Return a copy of the snapshot with fresh per-workout and top-level hashes.
+
+    Hashes embedded by clients are never trusted: they are recomputed from
+    the content so a stale value can't hide a change from the diff. The
+    ``snapshot_created_at`` timestamp is dropped (see ``with_created_at``).
+    """
+    normalized = {k: v for k, v in snapshot.items() if k not in SNAPSHOT_VOLATILE_KEYS}
+    workouts = []
+    for workout in snapshot.get("workouts") or []:
+        if isinstance(workout, dict):
+            workout = {k: v for k, v in workout.items() if k != "content_hash"}
+            workout["content_hash"] = _hash_without(workout, WORKOUT_VOLATILE_KEYS)
+        workouts.append(workout)
+    if "workouts" in snapshot:
+        normalized["workouts"] = workouts
+    normalized["content_hash"] = _hash_without(normalized, SNAPSHOT_VOLATILE_KEYS)
+    return normalized
+
+
+def encode_snapshot(snapshot: dict) -> tuple[str, bytes, int]:
+    """Normalize and compress a snapshot.
+
+    Returns:
+        Tuple of (content_hash, compressed_bytes, raw_size)
+    """
+    normalized = normalize_snapshot(snapshot)
+    raw = _canonical_bytes(normalized)
+    return normalized["content_hash"], zlib.compress(raw, _COMPRESSION_LEVEL), len(raw)
+
+
+def snapshot_created_at(snapshot: dict) -> datetime | None:
+    """Timestamp embedded in a snapshot dict (inline legacy copies carry one)."""
+    value = snapshot.get("snapshot_created_at")
+    return datetime.fromisoformat(value) if value else None
+
+
+def with_created_at(snapshot: dict, created_at: datetime | None) -> dict:
+    """Overlay the referencing row's ``snapshot_created_at`` on a decoded snapshot.
+
+    Returns a new dict, leaving the shared cached one untouched.
+    """
+    if created_at is None:
+        return snapshot
+    return {**snapshot, "snapshot_created_at": created_at.isoformat()}
+
+
+class _SnapshotLRU:
+    """Thread-safe LRU of decoded snapshots keyed by content hash."""
+
+    def __init__(self, max_entries: int = _LRU_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, content_hash: str) -> dict | None:
+        with self._lock:
+            value = self._entries.get(content_hash)
+            if value is not None:
+                self._entries.move_to_end(content_hash)
+            return value
+
+    def put(self, content_hash: str, value: dict) -> None:
+        with self._lock:
+            self._entries[content_hash] = value
+            self._entries.move_to_end(content_hash)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+snapshot_cache = _SnapshotLRU()
+
+
+def decode_snapshot(blob: "PlanSnapshotBlob") -> dict:
+    """Decode a stored blob, going through the shared LRU.
+
+    The returned dict is shared between callers and must be treated as
+    read-only; copy it before mutating.
+    """
+    cached = snapshot_cache.get(blob.content_hash)
+    if cached is not None:
+        return cached
+    decoded = orjson.loads(zlib.decompress(blob.data))
+    snapshot_cache.put(blob.content_hash, decoded)
+    return decoded
+
+
+class PlanSnapshotStore:
+    """Get-or-create access to content-addressed plan snapshots."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def put(self, snapshot: dict) -> "PlanSnapshotBlob":
+        """Store a snapshot (deduplicated by content) and return its blob."""
+        from src.domains.workouts.models import PlanSnapshotBlob
+
+        content_hash, data, raw_size = encode_snapshot(snapshot)
+
+        blob = await self.db.get(PlanSnapshotBlob, content_hash)
+        if blob is not None:
+            return blob
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            # Concurrent assignments of the same template race on the same
+            # hash; whoever loses simply reuses the existing row.
+            await self.db.execute(
+                insert(PlanSnapshotBlob)
+                .values(content_hash=content_hash, data=data, raw_size=raw_size)
+                .on_conflict_do_nothing(index_elements=["content_hash"])
+            )
+            blob = await self.db.get(PlanSnapshotBlob, content_hash)
+        else:
+            blob = PlanSnapshotBlob(content_hash=content_hash, data=data, raw_size=raw_size)
+            self.db.add(blob)
+            await self.db.flush()
+        return blob
+
+    async def get(self, content_hash: str) -> dict | None:
+        """Load a snapshot by hash."""
+        cached = snapshot_cache.get(content_hash)
+        if cached is not None:
+            return cached
+
+        from src.domains.workouts.models import PlanSnapshotBlob
+
+        result = await self.db.execute(
+            select(PlanSnapshotBlob).where(PlanSnapshotBlob.content_hash == content_hash)
+        )
+        blob = result.scalar_one_or_none()
+        return decode_snapshot(blob) if blob else None
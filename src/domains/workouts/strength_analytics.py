@@ -0,0 +1,382 @@
+"""Strength analytics: training volume, estimated 1RM and personal records.
+
+Logged sets (``WorkoutSessionSet``) are folded into two rollup tables when
+their session is completed:
+
+- ``ExerciseStrengthRollup``: lifetime totals and bests per (user, exercise)
+- ``WeeklyTrainingVolume``: tonnage, reps and best e1RM per (user, exercise, week)
+
+A fold is one grouped ``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` per
+table, so a session costs two statements whatever its number of sets, and
+progress screens read the rollups instead of scanning raw sets.
+``rebuild`` recomputes everything from raw history (backfill and repair) with
+the same statements.
+
+Estimated 1RM uses the Epley formula and only considers sets of 1 to
+``MAX_E1RM_REPS`` reps, where the estimate is reasonably accurate.
+"""
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import and_, case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.core.time_buckets import bucket_start
+from src.domains.workouts.models import (
+    Exercise,
+    ExerciseStrengthRollup,
+    SessionStatus,
+    WeeklyTrainingVolume,
+    WorkoutSession,
+    WorkoutSessionSet,
+)
+from src.domains.workouts.schemas import (
+    ExerciseStrengthResponse,
+    PersonalRecordResponse,
+    StrengthProgressResponse,
+    WeeklyVolumeResponse,
+)
+
+MAX_E1RM_REPS = 12
+
+
+def estimate_1rm(weight_kg: float | None, reps: int) -> float | None:
+    """Epley estimated one-rep max, or None when the set can't support one."""
+    if not weight_kg or weight_kg <= 0 or reps < 1 or reps > MAX_E1RM_REPS:
+        return None
+    if reps == 1:
+        return weight_kg
+    return weight_kg * (1.0 + reps / 30.0)
+
+
+def _e1rm_expr():
+    """SQL counterpart of ``estimate_1rm`` over ``WorkoutSessionSet`` columns."""
+    s = WorkoutSessionSet
+    return case(
+        (and_(s.weight_kg > 0, s.reps_completed == 1), s.weight_kg),
+        (
+            and_(s.weight_kg > 0, s.reps_completed.between(2, MAX_E1RM_REPS)),
+            s.weight_kg * (1.0 + s.reps_completed / 30.0),
+        ),
+        else_=None,
+    )
+
+
+def week_start(day: date) -> date:
+    """Python counterpart of the week bucket used by the weekly rollup."""
+    return day - timedelta(days=day.weekday())
+
+
+def _greatest(dialect: str, current, incoming):
+    """Larger of two nullable values (NULL only when both are NULL)."""
+    greatest = func.greatest if dialect == "postgresql" else func.max
+    return greatest(func.coalesce(current, incoming), func.coalesce(incoming, current))
+
+
+@dataclass
+class WeeklyVolumePoint:
+    """One week of training volume (summed over exercises unless filtered)."""
+
+    week_start: date
+    sets: int
+    reps: int
+    volume_kg: float
+    best_estimated_1rm: float | None
+
+
+@dataclass
+class PersonalRecord:
+    """Best estimated 1RM for an exercise and the week it was first reached."""
+
+    exercise_id: uuid.UUID
+    exercise_name: str
+    estimated_1rm: float
+    best_weight_kg: float | None
+    achieved_week: date | None
+
+
+class StrengthAnalytics:
+    """Maintains and reads the per-exercise strength rollups of a user."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    def _insert(self, model):
+        if self.dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(model)
+
+    async def _fold(self, where) -> None:
+        """Add the sets matching ``where`` (joined with their session) to the rollups."""
+        s = WorkoutSessionSet
+        volume = func.coalesce(s.weight_kg, 0) * s.reps_completed
+        e1rm = _e1rm_expr()
+        week = bucket_start(WorkoutSession.started_at, "week", self.dialect)
+
+        rollup = ExerciseStrengthRollup
+        source = (
+            select(
+                WorkoutSession.user_id,
+                s.exercise_id,
+                func.count(s.id),
+                func.sum(s.reps_completed),
+                func.sum(volume),
+                func.max(s.weight_kg),
+                func.max(e1rm),
+                func.max(s.performed_at),
+            )
+            .join(WorkoutSession, WorkoutSession.id == s.session_id)
+            .where(where)
+            .group_by(WorkoutSession.user_id, s.exercise_id)
+        )
+        stmt = self._insert(rollup).from_select(
+            [
+                rollup.user_id,
+                rollup.exercise_id,
+                rollup.total_sets,
+                rollup.total_reps,
+                rollup.total_volume_kg,
+                rollup.best_weight_kg,
+                rollup.best_estimated_1rm,
+                rollup.last_performed_at,
+            ],
+            source,
+        )
+        new = stmt.excluded
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[rollup.user_id, rollup.exercise_id],
+                set_={
+                    "total_sets": rollup.total_sets + new.total_sets,
+                    "total_reps": rollup.total_reps + new.total_reps,
+                    "total_volume_kg": rollup.total_volume_kg + new.total_volume_kg,
+                    "best_weight_kg": _greatest(self.dialect, rollup.best_weight_kg, new.best_weight_kg),
+                    "best_estimated_1rm": _greatest(
+                        self.dialect, rollup.best_estimated_1rm, new.best_estimated_1rm
+                    ),
+                    "last_performed_at": _greatest(
+                        self.dialect, rollup.last_performed_at, new.last_performed_at
+                    ),
+                },
+            )
+        )
+
+        weekly = WeeklyTrainingVolume
+        source = (
+            select(
+                WorkoutSession.user_id,
+                s.exercise_id,
+                week,
+                func.count(s.id),
+                func.sum(s.reps_completed),
+                func.sum(volume),
+                func.max(e1rm),
+            )
+            .join(WorkoutSession, WorkoutSession.id == s.session_id)
+            .where(where)
+            .group_by(WorkoutSession.user_id, s.exercise_id, week)
+        )
+        stmt = self._insert(weekly).from_select(
+            [
+                weekly.user_id,
+                weekly.exercise_id,
+                weekly.week_start,
+                weekly.sets,
+                weekly.reps,
+                weekly.volume_kg,
+                weekly.best_estimated_1rm,
+            ],
+            source,
+        )
+        new = stmt.excluded
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[weekly.user_id, weekly.exercise_id, weekly.week_start],
+                set_={
+                    "sets": weekly.sets + new.sets,
+                    "reps": weekly.reps + new.reps,
+                    "volume_kg": weekly.volume_kg + new.volume_kg,
+                    "best_estimated_1rm": _greatest(
+                        self.dialect, weekly.best_estimated_1rm, new.best_estimated_1rm
+                    ),
+                },
+            )
+        )
+
+    async def apply_sessions(self, session_ids: Iterable[uuid.UUID]) -> None:
+        """Fold every set of sessions that were just completed."""
+        session_ids = list(session_ids)
+        if session_ids:
+            await self._fold(WorkoutSessionSet.session_id.in_(session_ids))
+
+    async def apply_set(self, set_id: uuid.UUID) -> None:
+        """Fold a single set logged after its session was completed."""
+        await self._fold(WorkoutSessionSet.id == set_id)
+
+    async def rebuild(self, user_id: uuid.UUID | None = None) -> None:
+        """Recompute rollups from raw set history (one user, or everyone)."""
+        rollup_delete = delete(ExerciseStrengthRollup)
+        weekly_delete = delete(WeeklyTrainingVolume)
+        where = WorkoutSession.status == SessionStatus.COMPLETED
+        if user_id is not None:
+            rollup_delete = rollup_delete.where(ExerciseStrengthRollup.user_id == user_id)
+            weekly_delete = weekly_delete.where(WeeklyTrainingVolume.user_id == user_id)
+            where = and_(where, WorkoutSession.user_id == user_id)
+        await self.db.execute(rollup_delete)
+        await self.db.execute(weekly_delete)
+        await self._fold(where)
+
+    # Reads
+
+    async def total_volume(self, user_id: uuid.UUID) -> float:
+        """Lifetime tonnage (kg x reps) across all exercises."""
+        return await self.db.scalar(
+            select(func.coalesce(func.sum(ExerciseStrengthRollup.total_volume_kg), 0))
+            .where(ExerciseStrengthRollup.user_id == user_id)
+        ) or 0.0
+
+    async def exercise_count(self, user_id: uuid.UUID) -> int:
+        """Number of distinct exercises the user has completed sets for."""
+        return await self.db.scalar(
+            select(func.count())
+            .select_from(ExerciseStrengthRollup)
+            .where(ExerciseStrengthRollup.user_id == user_id)
+        ) or 0
+
+    async def exercise_summaries(
+        self,
+        user_id: uuid.UUID,
+        limit: int = 50,
+    ) -> list[ExerciseStrengthRollup]:
+        """Per-exercise rollups, most trained first."""
+        result = await self.db.execute(
+            select(ExerciseStrengthRollup)
+            .options(selectinload(ExerciseStrengthRollup.exercise))
+            .join(Exercise, Exercise.id == ExerciseStrengthRollup.exercise_id)
+            .where(ExerciseStrengthRollup.user_id == user_id)
+            .order_by(ExerciseStrengthRollup.total_volume_kg.desc(), Exercise.name)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def weekly_volume(
+        self,
+        user_id: uuid.UUID,
+        weeks: int = 12,
+        exercise_id: uuid.UUID | None = None,
+    ) -> list[WeeklyVolumePoint]:
+        """Weekly series for the last ``weeks`` weeks, oldest first.
+
+        Weeks without training are omitted.
+        """
+        w = WeeklyTrainingVolume
+        since = week_start(datetime.now(timezone.utc).date()) - timedelta(weeks=weeks - 1)
+        query = (
+            select(
+                w.week_start,
+                func.sum(w.sets),
+                func.sum(w.reps),
+                func.sum(w.volume_kg),
+                func.max(w.best_estimated_1rm),
+            )
+            .where(w.user_id == user_id, w.week_start >= since)
+            .group_by(w.week_start)
+            .order_by(w.week_start)
+        )
+        if exercise_id is not None:
+            query = query.where(w.exercise_id == exercise_id)
+
+        result = await self.db.execute(query)
+        return [
+            WeeklyVolumePoint(
+                week_start=row[0],
+                sets=row[1],
+                reps=row[2],
+                volume_kg=row[3],
+                best_estimated_1rm=row[4],
+            )
+            for row in result.all()
+        ]
+
+    async def personal_records(
+        self,
+        user_id: uuid.UUID,
+        limit: int = 10,
+    ) -> list[PersonalRecord]:
+        """Best estimated 1RM per exercise, strongest first."""
+        rollup = ExerciseStrengthRollup
+        w = WeeklyTrainingVolume
+        # First week whose best matches the lifetime best (both come from the
+        # same expression, so equality is exact)
+        achieved_week = (
+            select(func.min(w.week_start))
+            .where(
+                w.user_id == rollup.user_id,
+                w.exercise_id == rollup.exercise_id,
+                w.best_estimated_1rm >= rollup.best_estimated_1rm,
+            )
+            .correlate(rollup)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            select(
+                rollup.exercise_id,
+                Exercise.name,
+                rollup.best_estimated_1rm,
+                rollup.best_weight_kg,
+                achieved_week.label("achieved_week"),
+            )
+            .join(Exercise, Exercise.id == rollup.exercise_id)
+            .where(rollup.user_id == user_id, rollup.best_estimated_1rm.is_not(None))
+            .order_by(rollup.best_estimated_1rm.desc())
+            .limit(limit)
+        )
+        return [
+            PersonalRecord(
+                exercise_id=row.exercise_id,
+                exercise_name=row.name,
+                estimated_1rm=row.best_estimated_1rm,
+                best_weight_kg=row.best_weight_kg,
+                achieved_week=row.achieved_week,
+            )
+            for row in result.all()
+        ]
+
+    async def progress(
+        self,
+        user_id: uuid.UUID,
+        weeks: int = 12,
+        exercise_id: uuid.UUID | None = None,
+    ) -> StrengthProgressResponse:
+        """Overview served to the student and trainer progress screens."""
+        summaries = await self.exercise_summaries(user_id)
+        return StrengthProgressResponse(
+            total_volume_kg=await self.total_volume(user_id),
+            exercises=[
+                ExerciseStrengthResponse(
+                    exercise_id=r.exercise_id,
+                    exercise_name=r.exercise.name,
+                    total_sets=r.total_sets,
+                    total_reps=r.total_reps,
+                    total_volume_kg=r.total_volume_kg,
+                    best_weight_kg=r.best_weight_kg,
+                    best_estimated_1rm=r.best_estimated_1rm,
+                    last_performed_at=r.last_performed_at,
+                )
+                for r in summaries
+            ],
+            weekly_volume=[
+                WeeklyVolumeResponse.model_validate(point)
+                for point in await self.weekly_volume(user_id, weeks, exercise_id)
+            ],
+            personal_records=[
+                PersonalRecordResponse.model_validate(record)
+                for record in await self.personal_records(user_id)
+            ],
+        )
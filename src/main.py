@@ -1,13 +1,19 @@
+import secrets
 import structlog
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from scalar_fastapi import get_scalar_api_reference
 
 from src.config.settings import settings
+from src.core.metrics import MetricsMiddleware, render_metrics
 from src.core.observability import init_observability
+from src.core.query_stats import QueryStatsMiddleware
+from src.core.response_cache import CachePolicy, ResponseCacheMiddleware
 from src.domains.auth.router import router as auth_router
 from src.domains.billing.router import router as billing_router
 from src.domains.chat.router import router as chat_router
@@ -29,71 +35,14 @@ from src.domains.workouts.router import router as workouts_router
 logger = structlog.get_logger(__name__)
 
 
-async def run_pending_migrations():
-    """Run any pending database migrations."""
-    import os
-
-    database_url = os.getenv("DATABASE_URL", "")
-    if not database_url:
-        logger.info("skipping_migrations", reason="no DATABASE_URL configured")
-        return
-
-    # Convert to asyncpg format
-    if database_url.startswith("postgres://"):
-        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
-    elif database_url.startswith("postgresql://"):
-        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-
-    # List of migrations to run in order
-    migrations = [
-        ("remove_user_type", "src.migrations.remove_user_type"),
-        ("add_archived_at", "src.migrations.add_archived_at"),
-        ("add_autonomous_org_type", "src.migrations.add_autonomous_org_type"),
-        ("backfill_workout_org_id", "src.migrations.backfill_workout_org_id"),
-        ("add_checkin_acceptance", "src.migrations.add_checkin_acceptance"),
-        ("add_checkin_training_mode", "src.migrations.add_checkin_training_mode"),
-        ("add_service_plans", "src.migrations.add_service_plans"),
-        ("add_appointment_reminders", "src.migrations.add_appointment_reminders"),
-        ("add_late_cancel_policy", "src.migrations.add_late_cancel_policy"),
-        ("add_group_sessions", "src.migrations.add_group_sessions"),
-        ("add_session_evaluations", "src.migrations.add_session_evaluations"),
-        ("add_waitlist_templates", "src.migrations.add_waitlist_templates"),
-        ("add_business_model", "src.migrations.add_business_model"),
-        ("fix_consultancy_listing_fk", "src.migrations.fix_consultancy_listing_fk"),
-    ]
-
-    for name, module_path in migrations:
-        try:
-            module = __import__(module_path, fromlist=["migrate"])
-            await module.migrate(database_url)
-            logger.info("migration_completed", name=name)
-        except Exception as e:
-            logger.warning("migration_error", name=name, error=str(e), type=type(e).__name__, note="may already be applied")
-
-
-async def seed_exercises_if_empty():
-    """Seed exercises if none exist in the database."""
-    from sqlalchemy import func, select
-
-    from src.config.database import AsyncSessionLocal
-    from src.domains.workouts.models import Exercise
-
+@asynccontextmanager
+async def startup_step(name: str) -> AsyncGenerator[None, None]:
+    """Log how long one startup step took."""
+    started = time.perf_counter()
     try:
-        async with AsyncSessionLocal() as session:
-            # Check if any exercises exist
-            result = await session.execute(select(func.count(Exercise.id)))
-            count = result.scalar()
-
-            if count == 0:
-                logger.info("seeding_exercises", reason="no exercises found in database")
-                # Import and run the seed script
-                from src.scripts.seed_exercises import seed_exercises
-                seeded_count = await seed_exercises(session, clear_existing=False)
-                logger.info("exercises_seeded", count=seeded_count)
-            else:
-                logger.info("exercises_seed_skipped", existing_count=count)
-    except Exception as e:
-        logger.warning("exercise_seed_error", error=str(e), type=type(e).__name__)
+        yield
+    finally:
+        logger.info("startup_step", step=name, duration_ms=round((time.perf_counter() - started) * 1000, 1))
 
 
 @asynccontextmanager
@@ -102,10 +51,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
     logger.info("app_starting", app_name=settings.APP_NAME, environment=settings.APP_ENV, database_configured=bool(settings.DATABASE_URL))
 
-    # Initialize database tables
+    started = time.perf_counter()
+
+    # Bring the schema up to date (a single ledger read when nothing is pending)
     try:
         from src.config.database import init_db
-        await init_db()
+        async with startup_step("database"):
+            await init_db()
         logger.info("database_initialized")
     except Exception as e:
         logger.error("database_init_failed", error=str(e), type=type(e).__name__)
@@ -113,26 +65,17 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         if settings.is_production:
             raise
 
-    # Run pending migrations
-    try:
-        await run_pending_migrations()
-    except Exception as e:
-        logger.warning("migrations_failed", error=str(e), type=type(e).__name__)
-
-    # Auto-seed exercises if database is empty
-    try:
-        await seed_exercises_if_empty()
-    except Exception as e:
-        logger.warning("exercise_seed_failed", error=str(e), type=type(e).__name__)
-
     # Start background scheduler
     from src.core.scheduler import scheduler
     try:
-        await scheduler.start()
+        async with startup_step("scheduler"):
+            await scheduler.start()
         logger.info("scheduler_started")
     except Exception as e:
         logger.warning("scheduler_start_failed", error=str(e), type=type(e).__name__)
 
+    logger.info("app_started", duration_ms=round((time.perf_counter() - started) * 1000, 1))
+
     yield
     # Shutdown
     logger.info("app_shutting_down", app_name=settings.APP_NAME)
@@ -142,6 +85,40 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.info("scheduler_stopped")
     except Exception as e:
         logger.warning("scheduler_stop_failed", error=str(e), type=type(e).__name__)
+    # Close the shared storage client
+    from src.core.storage import storage_service
+    try:
+        await storage_service.close()
+    except Exception as e:
+        logger.warning("storage_close_failed", error=str(e), type=type(e).__name__)
+
+
+def response_cache_policies() -> dict[str, CachePolicy]:
+    """Cache policies of the GET routes served through ResponseCacheMiddleware."""
+    api = settings.API_V1_PREFIX
+    return {
+        # Includes the caller's custom exercises
+        f"{api}/workouts/exercises": CachePolicy(tables=("exercises",), vary_user=True),
+        # Excludes the caller's own plans
+        f"{api}/workouts/plans/catalog": CachePolicy(
+            tables=("training_plans", "plan_workouts"), vary_user=True
+        ),
+        # Served from the catalog read model (see src.domains.marketplace.catalog)
+        f"{api}/marketplace/categories": CachePolicy(
+            tables=("marketplace_templates", "marketplace_catalog_facets")
+        ),
+        f"{api}/marketplace/templates": CachePolicy(
+            tables=("marketplace_templates", "marketplace_catalog_entries"),
+            replay_headers=("x-next-cursor",),
+        ),
+        f"{api}/consultancy/listings": CachePolicy(
+            tables=("consultancy_listings", "professional_profiles"), public=True
+        ),
+        # Defaults to the caller's own availability
+        f"{api}/schedule/availability": CachePolicy(
+            tables=("trainer_availability",), vary_user=True, max_age_seconds=60
+        ),
+    }
 
 
 def create_app() -> FastAPI:
@@ -160,6 +137,16 @@ def create_app() -> FastAPI:
         redirect_slashes=False,
     )
 
+    # Conditional GET / body cache for polled read endpoints (wrapped by CORS)
+    app.add_middleware(ResponseCacheMiddleware, policies=response_cache_policies())
+
+    # Per-request query count/time (Server-Timing header, per-route totals)
+    app.add_middleware(QueryStatsMiddleware)
+
+    # Per-route latency histograms, cached responses included
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -167,6 +154,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
         allow_headers=["Authorization", "Content-Type", "X-Organization-Id", "X-Request-Id"],
+        expose_headers=["X-Next-Cursor"],
     )
 
     # Include routers
@@ -201,6 +189,17 @@ def create_app() -> FastAPI:
             "environment": settings.APP_ENV,
         }
 
+    if settings.METRICS_ENABLED and not (settings.METRICS_TOKEN or settings.DEBUG):
+        logger.warning("metrics_endpoint_disabled", reason="METRICS_TOKEN is not set")
+    elif settings.METRICS_ENABLED:
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics(request: Request) -> PlainTextResponse:
+            if settings.METRICS_TOKEN:
+                scheme, _, token = request.headers.get("authorization", "").partition(" ")
+                if scheme.lower() != "bearer" or not secrets.compare_digest(token, settings.METRICS_TOKEN):
+                    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+            return PlainTextResponse(await render_metrics(), media_type="text/plain; version=0.0.4")
+
     # Scalar API Reference - Modern API documentation
     @app.get("/reference", include_in_schema=False)
     async def scalar_html():
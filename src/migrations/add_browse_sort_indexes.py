@@ -0,0 +1,84 @@
+"""Add keyset pagination indexes for marketplace and consultancy browsing.
+
+Each browse sort pages with a keyset over (sort key, id), so each gets a
+composite index ending in the tiebreaker. Ratings are sorted as
+``coalesce(rating_average, -1)`` so unrated listings have a comparable key.
+The single-column catalog price index is superseded by (price_cents,
+template_id).
+
+For new installations, these will be created automatically by create_all().
+For existing installations, run this script to add them.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+logger = logging.getLogger(__name__)
+
+INDEXES = [
+    ("ix_marketplace_catalog_listed_id", "marketplace_catalog_entries", "listed_at, template_id"),
+    ("ix_marketplace_catalog_price_id", "marketplace_catalog_entries", "price_cents, template_id"),
+    ("ix_marketplace_catalog_purchases_id", "marketplace_catalog_entries", "purchase_count, template_id"),
+    ("ix_marketplace_catalog_title_id", "marketplace_catalog_entries", "title, template_id"),
+    (
+        "ix_marketplace_catalog_rating_id",
+        "marketplace_catalog_entries",
+        "coalesce(rating_average, -1), template_id",
+    ),
+    ("ix_consultancy_listings_featured_id", "consultancy_listings", "is_featured, created_at, id"),
+    ("ix_consultancy_listings_created_id", "consultancy_listings", "created_at, id"),
+    ("ix_consultancy_listings_price_id", "consultancy_listings", "price_cents, id"),
+    ("ix_consultancy_listings_rating_id", "consultancy_listings", "coalesce(rating_average, -1), id"),
+]
+
+DROPPED_INDEXES = ["ix_marketplace_catalog_price"]
+
+
+async def migrate(database_url: str) -> None:
+    """Create browse sort indexes."""
+    engine = create_async_engine(database_url)
+
+    async with engine.begin() as conn:
+        for index_name, table_name, columns in INDEXES:
+            await conn.execute(
+                text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({columns})")
+            )
+            logger.info(f"Ensured index {index_name}")
+        for index_name in DROPPED_INDEXES:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+            logger.info(f"Dropped index {index_name}")
+
+    await engine.dispose()
+    logger.info("Migration add_browse_sort_indexes completed successfully")
+
+
+async def main():
+    """Run migration with default database URL."""
+    import os
+    from pathlib import Path
+
+    try:
+        from dotenv import load_dotenv
+        env_path = Path(__file__).parent.parent.parent / ".env"
+        load_dotenv(env_path)
+    except ImportError:
+        pass
+
+    database_url = os.getenv(
+        "DATABASE_URL",
+        "sqlite+aiosqlite:///./myfit.db"
+    )
+
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    await migrate(database_url)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""Add the unique index used to look up calendar feeds by token.
+
+Subscribed calendar apps fetch the feed with only its token in the URL, so
+every poll resolves the token to a trainer through this index. The
+``calendar_feed_token`` column itself is added by the column migrations.
+
+For new installations, this will be created automatically by create_all().
+For existing installations, run this script to add it.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(database_url: str) -> None:
+    """Create the calendar feed token index."""
+    engine = create_async_engine(database_url)
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_trainer_settings_calendar_feed_token "
+                "ON trainer_settings(calendar_feed_token)"
+            )
+        )
+        logger.info("Ensured index uq_trainer_settings_calendar_feed_token")
+
+    await engine.dispose()
+    logger.info("Migration add_calendar_feed_token_index completed successfully")
+
+
+async def main():
+    """Run migration with default database URL."""
+    import os
+    from pathlib import Path
+
+    try:
+        from dotenv import load_dotenv
+        env_path = Path(__file__).parent.parent.parent / ".env"
+        load_dotenv(env_path)
+    except ImportError:
+        pass
+
+    database_url = os.getenv(
+        "DATABASE_URL",
+        "sqlite+aiosqlite:///./myfit.db"
+    )
+
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    await migrate(database_url)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
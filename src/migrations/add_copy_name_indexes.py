@@ -0,0 +1,66 @@
+"""Add (created_by_id, name) indexes used by copy-name lookups.
+
+Duplicating a workout or plan computes the next "Name (N)" with a single
+prefix query over the owner's names. These composite indexes serve that
+query without scanning the owner's whole catalog.
+
+For new installations, these will be created automatically by create_all().
+For existing installations, run this script to add them.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+logger = logging.getLogger(__name__)
+
+INDEXES = [
+    ("ix_workouts_created_by_name", "workouts", "created_by_id, name"),
+    ("ix_training_plans_created_by_name", "training_plans", "created_by_id, name"),
+]
+
+
+async def migrate(database_url: str) -> None:
+    """Create copy-name indexes."""
+    engine = create_async_engine(database_url)
+
+    async with engine.begin() as conn:
+        for index_name, table_name, columns in INDEXES:
+            await conn.execute(
+                text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name}({columns})")
+            )
+            logger.info(f"Ensured index {index_name}")
+
+    await engine.dispose()
+    logger.info("Migration add_copy_name_indexes completed successfully")
+
+
+async def main():
+    """Run migration with default database URL."""
+    import os
+    from pathlib import Path
+
+    try:
+        from dotenv import load_dotenv
+        env_path = Path(__file__).parent.parent.parent / ".env"
+        load_dotenv(env_path)
+    except ImportError:
+        pass
+
+    database_url = os.getenv(
+        "DATABASE_URL",
+        "sqlite+aiosqlite:///./myfit.db"
+    )
+
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    await migrate(database_url)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
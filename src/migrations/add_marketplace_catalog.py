@@ -0,0 +1,69 @@
+"""Backfill the marketplace catalog read model.
+
+``marketplace_catalog_entries`` and ``marketplace_catalog_facets`` hold the
+denormalized template cards and facet counts that catalog browsing reads.
+The tables are created by create_all() and kept current by session events;
+this script fills them from existing templates the first time it runs (it
+skips once any entry exists).
+
+Run with ``--rebuild`` to recompute the whole catalog.
+"""
+import asyncio
+import logging
+import sys
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.domains.marketplace.catalog import rebuild_catalog
+from src.domains.marketplace.models import MarketplaceCatalogEntry
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(database_url: str, force: bool = False) -> None:
+    """Populate the catalog read model if it is empty."""
+    engine = create_async_engine(database_url)
+
+    async with engine.begin() as conn:
+        existing = await conn.scalar(
+            select(func.count()).select_from(MarketplaceCatalogEntry)
+        )
+        if existing and not force:
+            logger.info("Marketplace catalog already populated, skipping backfill")
+        else:
+            await conn.run_sync(rebuild_catalog)
+            logger.info("Rebuilt marketplace catalog from templates")
+
+    await engine.dispose()
+    logger.info("Migration add_marketplace_catalog completed successfully")
+
+
+async def main():
+    """Run migration with default database URL."""
+    import os
+    from pathlib import Path
+
+    try:
+        from dotenv import load_dotenv
+        env_path = Path(__file__).parent.parent.parent / ".env"
+        load_dotenv(env_path)
+    except ImportError:
+        pass
+
+    database_url = os.getenv(
+        "DATABASE_URL",
+        "sqlite+aiosqlite:///./myfit.db"
+    )
+
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    await migrate(database_url, force="--rebuild" in sys.argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
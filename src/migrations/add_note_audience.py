@@ -0,0 +1,89 @@
+"""Backfill the prescription note audience index.
+
+``prescription_note_audience`` maps each trainer note to the students who can
+see it, with per-student read state. The table itself is created by
+create_all(); this script fills it from existing notes and assignments, copying
+the legacy per-note ``read_at`` so nothing already read shows up as unread.
+
+The backfill only runs while the table is empty, so it is safe at every
+startup. Run with ``--check`` to compare the index against a full
+recomputation, or ``--repair`` to also fix any drift.
+"""
+import asyncio
+import logging
+import sys
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.domains.workouts.models import PrescriptionNoteAudience
+from src.domains.workouts.note_audience import backfill_note_audience, check_note_audience
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(database_url: str) -> None:
+    """Populate the audience index if it is empty."""
+    engine = create_async_engine(database_url)
+
+    async with engine.begin() as conn:
+        existing = await conn.scalar(
+            select(func.count()).select_from(PrescriptionNoteAudience)
+        )
+        if existing:
+            logger.info("Note audience index already populated, skipping backfill")
+        else:
+            inserted = await backfill_note_audience(conn)
+            logger.info(f"Backfilled {inserted} note audience rows")
+
+    await engine.dispose()
+    logger.info("Migration add_note_audience completed successfully")
+
+
+async def check(database_url: str, repair: bool = False) -> bool:
+    """Report (and optionally repair) drift between the index and assignments."""
+    engine = create_async_engine(database_url)
+
+    async with engine.begin() as conn:
+        result = await check_note_audience(conn, repair=repair)
+
+    await engine.dispose()
+    logger.info(
+        f"Note audience check: {result.missing} missing, {result.stale} stale"
+        + (" (repaired)" if result.repaired and not result.consistent else "")
+    )
+    return result.consistent or result.repaired
+
+
+async def main():
+    """Run migration with default database URL."""
+    import os
+    from pathlib import Path
+
+    try:
+        from dotenv import load_dotenv
+        env_path = Path(__file__).parent.parent.parent / ".env"
+        load_dotenv(env_path)
+    except ImportError:
+        pass
+
+    database_url = os.getenv(
+        "DATABASE_URL",
+        "sqlite+aiosqlite:///./myfit.db"
+    )
+
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    if "--check" in sys.argv or "--repair" in sys.argv:
+        ok = await check(database_url, repair="--repair" in sys.argv)
+        sys.exit(0 if ok else 1)
+
+    await migrate(database_url)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,186 @@
+"""Move inline plan snapshots into the content-addressed snapshot store.
+
+This migration:
+1. Creates the plan_snapshot_blobs table (if create_all() didn't already)
+2. Adds snapshot_hash and snapshot_created_at columns to plan_assignments
+   and plan_versions
+3. Drops the NOT NULL constraint on plan_versions.snapshot
+4. Backfills: every inline JSON snapshot is encoded, stored once per content
+   hash, referenced by snapshot_hash (its timestamp kept on the row in
+   snapshot_created_at), and the inline copy is cleared
+
+The backfill is idempotent and processes rows in batches so it can be re-run
+safely on large tables.
+"""
+import asyncio
+import json
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.domains.workouts.snapshot_store import encode_snapshot, snapshot_created_at
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+async def _column_exists(conn, table_name: str, column_name: str, is_postgres: bool) -> bool:
+    if is_postgres:
+        result = await conn.execute(
+            text("""
+                SELECT EXISTS (
+                    SELECT FROM information_schema.columns
+                    WHERE table_name = :table_name AND column_name = :column_name
+                )
+            """),
+            {"table_name": table_name, "column_name": column_name},
+        )
+        return bool(result.scalar())
+    result = await conn.execute(text(f"PRAGMA table_info({table_name})"))
+    return any(row[1] == column_name for row in result.fetchall())
+
+
+async def _ensure_schema(conn, is_postgres: bool) -> None:
+    if is_postgres:
+        await conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS plan_snapshot_blobs (
+                content_hash VARCHAR(64) PRIMARY KEY,
+                data BYTEA NOT NULL,
+                raw_size INTEGER NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+            )
+        """))
+    else:
+        await conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS plan_snapshot_blobs (
+                content_hash VARCHAR(64) PRIMARY KEY,
+                data BLOB NOT NULL,
+                raw_size INTEGER NOT NULL,
+                created_at TEXT DEFAULT (datetime('now')) NOT NULL
+            )
+        """))
+
+    for table_name in ("plan_assignments", "plan_versions"):
+        if not await _column_exists(conn, table_name, "snapshot_hash", is_postgres):
+            if is_postgres:
+                await conn.execute(text(
+                    f"ALTER TABLE {table_name} ADD COLUMN snapshot_hash VARCHAR(64) "
+                    "REFERENCES plan_snapshot_blobs(content_hash)"
+                ))
+            else:
+                await conn.execute(text(
+                    f"ALTER TABLE {table_name} ADD COLUMN snapshot_hash VARCHAR(64)"
+                ))
+            await conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{table_name}_snapshot_hash "
+                f"ON {table_name}(snapshot_hash)"
+            ))
+            logger.info(f"Added snapshot_hash column to {table_name}")
+        if not await _column_exists(conn, table_name, "snapshot_created_at", is_postgres):
+            column_type = "TIMESTAMP WITH TIME ZONE" if is_postgres else "DATETIME"
+            await conn.execute(text(
+                f"ALTER TABLE {table_name} ADD COLUMN snapshot_created_at {column_type}"
+            ))
+            logger.info(f"Added snapshot_created_at column to {table_name}")
+
+    if is_postgres:
+        await conn.execute(text("ALTER TABLE plan_versions ALTER COLUMN snapshot DROP NOT NULL"))
+
+
+async def _backfill_table(conn, table_name: str, json_column: str) -> int:
+    """Move inline snapshots of one table into the blob store, batch by batch."""
+    insert_blob = (
+        "INSERT INTO plan_snapshot_blobs (content_hash, data, raw_size) "
+        "VALUES (:content_hash, :data, :raw_size) "
+        "ON CONFLICT (content_hash) DO NOTHING"
+    )
+    moved = 0
+    while True:
+        result = await conn.execute(
+            text(f"""
+                SELECT id, {json_column} FROM {table_name}
+                WHERE snapshot_hash IS NULL AND {json_column} IS NOT NULL
+                LIMIT :limit
+            """),
+            {"limit": BATCH_SIZE},
+        )
+        rows = result.fetchall()
+        if not rows:
+            break
+
+        blobs: dict[str, dict] = {}
+        updates = []
+        for row_id, raw in rows:
+            snapshot = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+            content_hash, data, raw_size = encode_snapshot(snapshot)
+            blobs[content_hash] = {"content_hash": content_hash, "data": data, "raw_size": raw_size}
+            updates.append({
+                "row_id": row_id,
+                "content_hash": content_hash,
+                "created_at": snapshot_created_at(snapshot),
+            })
+
+        await conn.execute(text(insert_blob), list(blobs.values()))
+        await conn.execute(
+            text(f"""
+                UPDATE {table_name}
+                SET snapshot_hash = :content_hash, snapshot_created_at = :created_at,
+                    {json_column} = NULL
+                WHERE id = :row_id
+            """),
+            updates,
+        )
+        moved += len(updates)
+        logger.info(f"Moved {moved} {table_name} snapshots into plan_snapshot_blobs")
+    return moved
+
+
+async def migrate(database_url: str) -> None:
+    """Create the snapshot store and backfill existing snapshots."""
+    engine = create_async_engine(database_url)
+    is_postgres = "postgresql" in database_url or "postgres" in database_url
+
+    async with engine.begin() as conn:
+        await _ensure_schema(conn, is_postgres)
+
+    async with engine.begin() as conn:
+        assignments = await _backfill_table(conn, "plan_assignments", "plan_snapshot")
+        versions = await _backfill_table(conn, "plan_versions", "snapshot")
+
+    await engine.dispose()
+    logger.info(
+        "Migration add_plan_snapshot_store completed successfully "
+        f"({assignments} assignments, {versions} versions moved)"
+    )
+
+
+async def main():
+    """Run migration with default database URL."""
+    import os
+    from pathlib import Path
+
+    try:
+        from dotenv import load_dotenv
+        env_path = Path(__file__).parent.parent.parent / ".env"
+        load_dotenv(env_path)
+    except ImportError:
+        pass
+
+    database_url = os.getenv(
+        "DATABASE_URL",
+        "sqlite+aiosqlite:///./myfit.db"
+    )
+
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    await migrate(database_url)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
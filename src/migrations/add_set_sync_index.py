@@ -0,0 +1,64 @@
+"""Add the unique (session_id, client_op_id) index used by batch set sync.
+
+Sets synced in batches carry a client-generated op id; upserting on this
+index makes resent batches rewrite the same rows instead of duplicating
+them. Sets logged one by one have a NULL op id and are not constrained.
+The ``client_op_id`` column itself is added by the column migrations.
+
+For new installations, this will be created automatically by create_all().
+For existing installations, run this script to add it.
+"""
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(database_url: str) -> None:
+    """Create the set sync index."""
+    engine = create_async_engine(database_url)
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_workout_session_sets_client_op "
+                "ON workout_session_sets(session_id, client_op_id)"
+            )
+        )
+        logger.info("Ensured index uq_workout_session_sets_client_op")
+
+    await engine.dispose()
+    logger.info("Migration add_set_sync_index completed successfully")
+
+
+async def main():
+    """Run migration with default database URL."""
+    import os
+    from pathlib import Path
+
+    try:
+        from dotenv import load_dotenv
+        env_path = Path(__file__).parent.parent.parent / ".env"
+        load_dotenv(env_path)
+    except ImportError:
+        pass
+
+    database_url = os.getenv(
+        "DATABASE_URL",
+        "sqlite+aiosqlite:///./myfit.db"
+    )
+
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    await migrate(database_url)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
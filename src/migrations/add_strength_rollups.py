@@ -0,0 +1,69 @@
+"""Backfill the strength analytics rollups.
+
+``exercise_strength_rollups`` and ``weekly_training_volume`` hold per-exercise
+volume, estimated 1RM and weekly tonnage folded from completed sessions. The
+tables are created by create_all(); this script fills them from existing set
+history the first time it runs (it skips once any rollup exists).
+
+Run with ``--rebuild`` to recompute every rollup from raw sets.
+"""
+import asyncio
+import logging
+import sys
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.domains.workouts.models import ExerciseStrengthRollup
+from src.domains.workouts.strength_analytics import StrengthAnalytics
+
+logger = logging.getLogger(__name__)
+
+
+async def migrate(database_url: str, force: bool = False) -> None:
+    """Populate the strength rollups if they are empty."""
+    engine = create_async_engine(database_url)
+
+    async with AsyncSession(engine) as session:
+        existing = await session.scalar(
+            select(func.count()).select_from(ExerciseStrengthRollup)
+        )
+        if existing and not force:
+            logger.info("Strength rollups already populated, skipping backfill")
+        else:
+            await StrengthAnalytics(session).rebuild()
+            await session.commit()
+            logger.info("Rebuilt strength rollups from set history")
+
+    await engine.dispose()
+    logger.info("Migration add_strength_rollups completed successfully")
+
+
+async def main():
+    """Run migration with default database URL."""
+    import os
+    from pathlib import Path
+
+    try:
+        from dotenv import load_dotenv
+        env_path = Path(__file__).parent.parent.parent / ".env"
+        load_dotenv(env_path)
+    except ImportError:
+        pass
+
+    database_url = os.getenv(
+        "DATABASE_URL",
+        "sqlite+aiosqlite:///./myfit.db"
+    )
+
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif database_url.startswith("postgresql://"):
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    await migrate(database_url, force="--rebuild" in sys.argv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,305 @@
+"""Versioned migration ledger.
+
+Every schema setup step (create_all, enum sync, legacy column additions, the
+data migrations in this package and the exercise seed) has an id and a
+checksum of its definition. ``schema_migrations`` records which steps were
+applied with which checksum, so booting against an up-to-date database costs
+a single ledger read.
+
+When something is pending (a new step, or a step whose definition changed),
+the worker takes a PostgreSQL advisory lock, re-reads the ledger and applies
+what is still pending through the lock's connection; workers booting at the
+same time wait on the lock and then find nothing left to do.
+
+Run as a release command, or with ``--check`` to exit non-zero when any step
+is pending:
+
+    python -m src.migrations.ledger [--check]
+
+Steps are applied in order and the run stops at the first failure: the
+failed step stays pending and the error propagates, so a later step never
+runs against a partially migrated schema.
+"""
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import logging
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import structlog
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    delete,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+logger = structlog.get_logger(__name__)
+
+# Arbitrary application-wide key for pg_advisory_lock
+LOCK_KEY = 7_370_114_205
+
+ledger_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    ledger_metadata,
+    Column("id", String(200), primary_key=True),
+    Column("checksum", String(64), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+    Column("duration_ms", Integer, nullable=False),
+)
+
+# Data migrations in this package, in the order they run
+MODULE_MIGRATIONS = [
+    "remove_user_type",
+    "add_archived_at",
+    "add_autonomous_org_type",
+    "backfill_workout_org_id",
+    "add_checkin_acceptance",
+    "add_checkin_training_mode",
+    "add_service_plans",
+    "add_appointment_reminders",
+    "add_late_cancel_policy",
+    "add_group_sessions",
+    "add_session_evaluations",
+    "add_waitlist_templates",
+    "add_business_model",
+    "fix_consultancy_listing_fk",
+    "add_plan_snapshot_store",
+    "add_copy_name_indexes",
+    "add_note_audience",
+    "add_strength_rollups",
+    "add_progress_series_indexes",
+    "add_marketplace_catalog",
+    "add_browse_sort_indexes",
+    "add_set_sync_index",
+    "add_calendar_feed_token_index",
+]
+
+# Data migrations written against PostgreSQL catalogs (pg_tables, native types)
+POSTGRES_ONLY_MIGRATIONS = {"add_waitlist_templates"}
+
+
+@dataclass(frozen=True)
+class MigrationStep:
+    """One ledger entry: re-applied whenever its checksum changes."""
+
+    id: str
+    checksum: str
+    apply: Callable[[AsyncConnection], Awaitable[None]]
+    postgres_only: bool = False
+
+
+def _checksum(*parts: str | bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else part.encode())
+    return digest.hexdigest()
+
+
+def _file_checksum(module_path: str) -> str:
+    spec = importlib.util.find_spec(module_path)
+    return _checksum(Path(spec.origin).read_bytes())
+
+
+def _metadata_checksum() -> str:
+    from src.config.database import Base
+    from src.domains import models  # noqa: F401
+
+    parts = []
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(table.name)
+        parts.extend(f"{column.name}:{column.type!r}" for column in table.columns)
+        parts.extend(sorted(index.name or "" for index in table.indexes))
+    return _checksum("\n".join(parts))
+
+
+async def _create_all(conn: AsyncConnection) -> None:
+    from src.config.database import Base
+
+    await conn.run_sync(Base.metadata.create_all)
+
+
+async def _sync_enums(conn: AsyncConnection) -> None:
+    from src.config.database import _sync_enum_values
+
+    await _sync_enum_values(conn)
+
+
+async def _add_columns(conn: AsyncConnection) -> None:
+    from src.config.database import _run_pending_migrations
+
+    await _run_pending_migrations(conn)
+
+
+def _module_step(name: str) -> MigrationStep:
+    module_path = f"{__package__}.{name}"
+
+    async def apply(conn: AsyncConnection) -> None:
+        # Data migrations manage their own engine; commit first so they never
+        # wait on locks held by this connection.
+        await conn.commit()
+        module = importlib.import_module(module_path)
+        await module.migrate(conn.engine.url.render_as_string(hide_password=False))
+
+    return MigrationStep(
+        name, _file_checksum(module_path), apply, postgres_only=name in POSTGRES_ONLY_MIGRATIONS
+    )
+
+
+async def _seed_exercises(conn: AsyncConnection) -> None:
+    from sqlalchemy import func
+
+    from src.domains.workouts.models import Exercise
+    from src.scripts.seed_exercises import seed_exercises
+
+    count = await conn.scalar(select(func.count(Exercise.id)))
+    if count:
+        logger.info("exercise_seed_skipped", exercises=count)
+        return
+    async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+        seeded = await seed_exercises(session, clear_existing=False)
+    logger.info("exercises_seeded", exercises=seeded)
+
+
+def migration_steps() -> list[MigrationStep]:
+    """All ledger steps, in the order they are applied."""
+    from src.config import database
+
+    return [
+        MigrationStep("schema:create_all", _metadata_checksum(), _create_all),
+        MigrationStep(
+            "schema:enum_values", _checksum(repr(database.ENUM_VALUES)), _sync_enums, postgres_only=True
+        ),
+        MigrationStep(
+            "schema:columns",
+            _checksum(repr((database.COLUMN_MIGRATIONS, database.SCHEMA_FIXES, database.DATA_FIXES))),
+            _add_columns,
+        ),
+        *(_module_step(name) for name in MODULE_MIGRATIONS),
+        MigrationStep(
+            "seed:exercises", _file_checksum("src.scripts.seed_exercises"), _seed_exercises
+        ),
+    ]
+
+
+async def _applied(conn: AsyncConnection) -> dict[str, str]:
+    """Applied step ids and their checksums; empty if the ledger doesn't exist yet."""
+    try:
+        result = await conn.execute(select(schema_migrations.c.id, schema_migrations.c.checksum))
+        return dict(result.all())
+    except (OperationalError, ProgrammingError):
+        await conn.rollback()
+        return {}
+
+
+async def pending_steps(
+    conn: AsyncConnection, steps: list[MigrationStep] | None = None
+) -> list[MigrationStep]:
+    """Steps not recorded in the ledger with their current checksum."""
+    steps = migration_steps() if steps is None else steps
+    is_postgres = conn.dialect.name == "postgresql"
+    applied = await _applied(conn)
+    return [
+        step
+        for step in steps
+        if applied.get(step.id) != step.checksum and (is_postgres or not step.postgres_only)
+    ]
+
+
+async def _record(conn: AsyncConnection, step: MigrationStep, duration_ms: int) -> None:
+    await conn.execute(delete(schema_migrations).where(schema_migrations.c.id == step.id))
+    await conn.execute(
+        insert(schema_migrations).values(
+            id=step.id,
+            checksum=step.checksum,
+            applied_at=datetime.now(timezone.utc),
+            duration_ms=duration_ms,
+        )
+    )
+
+
+async def run_migrations(
+    engine: AsyncEngine, steps: list[MigrationStep] | None = None
+) -> list[str]:
+    """Apply pending steps under the migration lock; returns the ids applied.
+
+    Raises the error of the first step that fails, after rolling it back.
+    """
+    steps = migration_steps() if steps is None else steps
+    applied: list[str] = []
+
+    async with engine.connect() as conn:
+        if not await pending_steps(conn, steps):
+            await conn.rollback()
+            logger.info("migrations_up_to_date")
+            return applied
+
+        is_postgres = conn.dialect.name == "postgresql"
+        if is_postgres:
+            await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": LOCK_KEY})
+            await conn.commit()
+        try:
+            await conn.run_sync(ledger_metadata.create_all)
+            await conn.commit()
+
+            # Re-read under the lock: another worker may have just applied them
+            for step in await pending_steps(conn, steps):
+                started = time.perf_counter()
+                try:
+                    await step.apply(conn)
+                except Exception as e:
+                    await conn.rollback()
+                    logger.error("migration_step_failed", step=step.id, error=str(e), type=type(e).__name__)
+                    raise
+                duration_ms = int((time.perf_counter() - started) * 1000)
+                await _record(conn, step, duration_ms)
+                await conn.commit()
+                applied.append(step.id)
+                logger.info("migration_step_applied", step=step.id, duration_ms=duration_ms)
+        finally:
+            if is_postgres:
+                await conn.rollback()
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": LOCK_KEY})
+                await conn.commit()
+
+    return applied
+
+
+async def main():
+    """Apply pending steps, or report them with --check."""
+    from src.config.database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        if "--check" in sys.argv:
+            async with engine.connect() as conn:
+                pending = [step.id for step in await pending_steps(conn)]
+            if pending:
+                print(f"{len(pending)} pending migration step(s): {', '.join(pending)}")
+                sys.exit(1)
+            print("Migration ledger up to date")
+        else:
+            applied = await run_migrations(engine)
+            print(f"Applied {len(applied)} migration step(s)")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,564 @@
+"""
+Synthetic dataset generator for load tests and query-plan analysis.
+
+Generates a production-shaped dataset: trainers with their organization,
+gym and availability, students spread over trainers, workout history with
+sets, gym check-ins, monthly payments, notifications and a chat with the
+trainer per student.
+
+The output depends only on the configuration: every trainer draws from its
+own random generator seeded with ``--seed`` and its index, so a dataset is
+reproducible and growing ``--trainers`` keeps the existing trainers as
+they were. Rows are produced lazily and written in chunks of
+``--chunk-rows`` (COPY on PostgreSQL, ``executemany`` elsewhere), each
+committed on its own, so memory stays bounded at any scale.
+
+Run with:
+    DATABASE_URL="postgresql+asyncpg://..." python -m src.scripts.generate_dataset \\
+        --trainers 1000 --students-per-trainer 100 --history-days 180
+
+IMPORTANT: Writes into the configured database. Use an empty local database.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, fields
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+
+import structlog
+from sqlalchemy import JSON, Enum, Table
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.config.database import Base, engine
+from src.core.security.jwt import hash_password
+from src.domains.billing.models import Payment, PaymentMethod, PaymentStatus, PaymentType
+from src.domains.chat.models import Conversation, ConversationParticipant, ConversationType, Message
+from src.domains.checkin.models import CheckIn, CheckInMethod, CheckInStatus, Gym
+from src.domains.notifications.models import Notification, NotificationType
+from src.domains.organizations.models import (
+    Organization,
+    OrganizationMembership,
+    OrganizationType,
+    UserRole,
+)
+from src.domains.schedule.models import TrainerAvailability
+from src.domains.users.models import User
+from src.domains.workouts.models import (
+    Exercise,
+    MuscleGroup,
+    SessionStatus,
+    Workout,
+    WorkoutExercise,
+    WorkoutSession,
+    WorkoutSessionSet,
+)
+
+logger = structlog.get_logger(__name__)
+
+PASSWORD = "Dataset123!"
+
+# Hour of day sessions start at, weighted towards mornings and evenings
+SESSION_HOURS = [6, 7, 8, 9, 10, 12, 16, 17, 18, 19, 20, 21]
+SESSION_HOUR_WEIGHTS = [8, 10, 7, 4, 3, 4, 3, 6, 10, 10, 7, 3]
+MONTHLY_FEES_CENTS = [12_000, 15_000, 18_000, 22_000, 25_000, 30_000, 40_000]
+CHECKIN_METHODS = [CheckInMethod.QR, CheckInMethod.CODE, CheckInMethod.LOCATION, CheckInMethod.MANUAL]
+CHECKIN_METHOD_WEIGHTS = [50, 20, 20, 10]
+NOTIFICATION_TYPES = [
+    NotificationType.WORKOUT_REMINDER,
+    NotificationType.WORKOUT_ASSIGNED,
+    NotificationType.PLAN_UPDATED,
+    NotificationType.CHECKIN_STREAK,
+    NotificationType.NEW_MESSAGE,
+    NotificationType.PAYMENT_DUE,
+    NotificationType.APPOINTMENT_REMINDER,
+]
+WORKOUTS_PER_TRAINER = 4
+EXERCISES_PER_WORKOUT = 6
+MAX_MESSAGES_PER_CONVERSATION = 500
+
+
+@dataclass
+class DatasetConfig:
+    """Size and shape of the generated dataset.
+
+    Per-entity counts are means: students per trainer follow a log-normal
+    distribution (a few trainers with large rosters, many small ones),
+    notifications and messages an exponential one.
+    """
+
+    seed: int = 42
+    trainers: int = 1_000
+    students_per_trainer: float = 100.0
+    history_days: int = 180
+    active_ratio: float = 0.8  # students still training at the end of the history
+    sessions_per_week: float = 3.0
+    min_sets_per_session: int = 8
+    max_sets_per_session: int = 20
+    checkin_ratio: float = 0.6  # sessions with a gym check-in
+    overdue_ratio: float = 0.1  # current month payments left overdue
+    notifications_per_student: float = 40.0
+    chat_ratio: float = 0.7  # students with a conversation with their trainer
+    messages_per_conversation: float = 20.0
+    exercises: int = 300
+    chunk_rows: int = 20_000
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _roster_size(rng: random.Random, mean: float) -> int:
+    sigma = 0.8
+    return max(1, round(rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)))
+
+
+def _exponential(rng: random.Random, mean: float, cap: int) -> int:
+    return min(cap, int(rng.expovariate(1 / mean))) if mean > 0 else 0
+
+
+# =============================================================================
+# Row generation
+# =============================================================================
+
+
+def generate_catalog(config: DatasetConfig) -> Iterator[tuple[Table, dict]]:
+    """Public exercise catalog shared by all trainers."""
+    rng = random.Random(f"{config.seed}:catalog")
+    muscle_groups = list(MuscleGroup)
+    for i in range(config.exercises):
+        yield Exercise.__table__, {
+            "id": _uuid(rng),
+            "name": f"Exercício {i + 1}",
+            "muscle_group": muscle_groups[i % len(muscle_groups)],
+            "is_custom": False,
+            "is_public": True,
+        }
+
+
+def catalog_ids(config: DatasetConfig) -> list[uuid.UUID]:
+    """Ids given to the catalog by ``generate_catalog``."""
+    return [row["id"] for _, row in generate_catalog(config)]
+
+
+def generate_trainer(
+    config: DatasetConfig,
+    index: int,
+    exercise_ids: list[uuid.UUID],
+    password_hash: str,
+    now: datetime,
+) -> Iterator[tuple[Table, dict]]:
+    """Rows of one trainer and everything their students generated."""
+    rng = random.Random(f"{config.seed}:trainer:{index}")
+    trainer_id, org_id, gym_id = _uuid(rng), _uuid(rng), _uuid(rng)
+    history_start = now - timedelta(days=config.history_days)
+
+    yield User.__table__, {
+        "id": trainer_id,
+        "email": f"trainer{index}@dataset.example.com",
+        "password_hash": password_hash,
+        "name": f"Personal {index}",
+        "is_verified": True,
+        "onboarding_completed": True,
+        "weight_kg": None,
+        "height_cm": None,
+        "created_at": history_start,
+    }
+    yield Organization.__table__, {
+        "id": org_id,
+        "name": f"Studio {index}",
+        "type": OrganizationType.PERSONAL,
+        "owner_id": trainer_id,
+    }
+    yield OrganizationMembership.__table__, {
+        "id": _uuid(rng),
+        "organization_id": org_id,
+        "user_id": trainer_id,
+        "role": UserRole.TRAINER,
+        "invited_by_id": None,
+        "joined_at": history_start,
+    }
+    yield Gym.__table__, {
+        "id": gym_id,
+        "name": f"Academia {index}",
+        "address": f"Rua Sintética, {index}",
+        "latitude": -23.5 + rng.uniform(-0.2, 0.2),
+        "longitude": -46.6 + rng.uniform(-0.2, 0.2),
+        "organization_id": org_id,
+    }
+    for day in range(6):
+        yield TrainerAvailability.__table__, {
+            "id": _uuid(rng),
+            "trainer_id": trainer_id,
+            "day_of_week": day,
+            "start_time": "06:00",
+            "end_time": "21:00" if day < 5 else "13:00",
+        }
+
+    workouts = []
+    for w in range(WORKOUTS_PER_TRAINER):
+        workout_id = _uuid(rng)
+        workout_exercises = rng.sample(exercise_ids, EXERCISES_PER_WORKOUT)
+        workouts.append((workout_id, workout_exercises))
+        yield Workout.__table__, {
+            "id": workout_id,
+            "name": f"Treino {'ABCD'[w]}",
+            "created_by_id": trainer_id,
+            "organization_id": org_id,
+        }
+        for order, exercise_id in enumerate(workout_exercises):
+            yield WorkoutExercise.__table__, {
+                "id": _uuid(rng),
+                "workout_id": workout_id,
+                "exercise_id": exercise_id,
+                "order": order,
+            }
+
+    fee = rng.choice(MONTHLY_FEES_CENTS)
+    for s in range(_roster_size(rng, config.students_per_trainer)):
+        yield from _generate_student(config, rng, index, s, trainer_id, org_id, gym_id, workouts, fee, password_hash, now)
+
+
+def _generate_student(
+    config: DatasetConfig,
+    rng: random.Random,
+    trainer_index: int,
+    index: int,
+    trainer_id: uuid.UUID,
+    org_id: uuid.UUID,
+    gym_id: uuid.UUID,
+    workouts: list[tuple[uuid.UUID, list[uuid.UUID]]],
+    fee: int,
+    password_hash: str,
+    now: datetime,
+) -> Iterator[tuple[Table, dict]]:
+    student_id = _uuid(rng)
+    joined = now - timedelta(days=rng.uniform(1, config.history_days))
+    # Students who stopped training leave at some point after joining
+    left = now if rng.random() < config.active_ratio else joined + (now - joined) * rng.random()
+
+    yield User.__table__, {
+        "id": student_id,
+        "email": f"student{trainer_index}_{index}@dataset.example.com",
+        "password_hash": password_hash,
+        "name": f"Aluno {trainer_index}.{index}",
+        "is_verified": True,
+        "onboarding_completed": True,
+        "weight_kg": round(rng.gauss(75, 12), 1),
+        "height_cm": round(rng.gauss(170, 9), 1),
+        "created_at": joined,
+    }
+    yield OrganizationMembership.__table__, {
+        "id": _uuid(rng),
+        "organization_id": org_id,
+        "user_id": student_id,
+        "role": UserRole.STUDENT,
+        "invited_by_id": trainer_id,
+        "joined_at": joined,
+    }
+
+    # Workout history: each day is a training day with probability weekly frequency / 7
+    frequency = min(7.0, max(1.0, rng.gauss(config.sessions_per_week, 1.0)))
+    # Starting loads per exercise, progressing slowly over time
+    loads: dict[uuid.UUID, float] = {}
+    day = joined.date() + timedelta(days=1)
+    sessions = 0
+    while day < left.date():
+        if rng.random() < frequency / 7:
+            workout_id, exercise_ids = workouts[sessions % len(workouts)]
+            sessions += 1
+            yield from _generate_session(config, rng, student_id, gym_id, day, workout_id, exercise_ids, loads)
+        day += timedelta(days=1)
+
+    # One monthly fee per month of enrollment, up to the next one for active students
+    active = left == now
+    last_due = left.date() + timedelta(days=30) if active else left.date()
+    due = date(joined.year, joined.month, 10)
+    while due <= last_due:
+        if due > now.date():
+            status = PaymentStatus.PENDING
+        elif due > now.date() - timedelta(days=30) and rng.random() < config.overdue_ratio:
+            status = PaymentStatus.OVERDUE
+        else:
+            status = PaymentStatus.PAID
+        paid_at = datetime.combine(due, time(12), timezone.utc) - timedelta(days=rng.randrange(0, 8))
+        yield Payment.__table__, {
+            "id": _uuid(rng),
+            "payer_id": student_id,
+            "payee_id": trainer_id,
+            "organization_id": org_id,
+            "payment_type": PaymentType.MONTHLY_FEE,
+            "description": f"Mensalidade {due:%m/%Y}",
+            "amount_cents": fee,
+            "status": status,
+            "due_date": due,
+            "paid_at": paid_at if status == PaymentStatus.PAID else None,
+            "payment_method": rng.choice([PaymentMethod.PIX, PaymentMethod.CREDIT_CARD])
+            if status == PaymentStatus.PAID
+            else None,
+        }
+        due = date(due.year + due.month // 12, due.month % 12 + 1, 10)
+
+    tenure = (left - joined).total_seconds()
+    for _ in range(_exponential(rng, config.notifications_per_student, cap=1_000)):
+        created = joined + timedelta(seconds=rng.uniform(0, tenure))
+        is_read = rng.random() < 0.7
+        yield Notification.__table__, {
+            "id": _uuid(rng),
+            "user_id": student_id,
+            "notification_type": rng.choice(NOTIFICATION_TYPES),
+            "title": "Notificação",
+            "body": "Mensagem gerada para testes de carga.",
+            "organization_id": org_id,
+            "is_read": is_read,
+            "read_at": created + timedelta(hours=rng.uniform(0, 48)) if is_read else None,
+            "created_at": created,
+        }
+
+    if rng.random() < config.chat_ratio:
+        yield from _generate_conversation(config, rng, student_id, trainer_id, org_id, joined, tenure)
+
+
+def _generate_session(
+    config: DatasetConfig,
+    rng: random.Random,
+    student_id: uuid.UUID,
+    gym_id: uuid.UUID,
+    day: date,
+    workout_id: uuid.UUID,
+    exercise_ids: list[uuid.UUID],
+    loads: dict[uuid.UUID, float],
+) -> Iterator[tuple[Table, dict]]:
+    session_id = _uuid(rng)
+    hour = rng.choices(SESSION_HOURS, SESSION_HOUR_WEIGHTS)[0]
+    started = datetime.combine(day, time(hour, rng.randrange(60)), timezone.utc)
+    duration = rng.randint(35, 80)
+    completed = started + timedelta(minutes=duration)
+
+    yield WorkoutSession.__table__, {
+        "id": session_id,
+        "workout_id": workout_id,
+        "user_id": student_id,
+        "status": SessionStatus.COMPLETED,
+        "started_at": started,
+        "completed_at": completed,
+        "duration_minutes": duration,
+        "rating": rng.choice([None, 3, 4, 4, 5, 5]),
+    }
+
+    sets = rng.randint(config.min_sets_per_session, config.max_sets_per_session)
+    per_exercise = max(1, sets // len(exercise_ids))
+    for n in range(sets):
+        exercise_id = exercise_ids[min(n // per_exercise, len(exercise_ids) - 1)]
+        load = loads.setdefault(exercise_id, rng.uniform(5, 60))
+        loads[exercise_id] = load * 1.002
+        yield WorkoutSessionSet.__table__, {
+            "id": _uuid(rng),
+            "session_id": session_id,
+            "exercise_id": exercise_id,
+            "set_number": n % per_exercise + 1,
+            "reps_completed": rng.randint(6, 15),
+            "weight_kg": round(load / 2.5) * 2.5,
+            "performed_at": started + timedelta(minutes=duration * n / sets),
+        }
+
+    if rng.random() < config.checkin_ratio:
+        yield CheckIn.__table__, {
+            "id": _uuid(rng),
+            "user_id": student_id,
+            "gym_id": gym_id,
+            "method": rng.choices(CHECKIN_METHODS, CHECKIN_METHOD_WEIGHTS)[0],
+            "status": CheckInStatus.CONFIRMED,
+            "checked_in_at": started - timedelta(minutes=rng.randrange(2, 15)),
+            "checked_out_at": completed,
+        }
+
+
+def _generate_conversation(
+    config: DatasetConfig,
+    rng: random.Random,
+    student_id: uuid.UUID,
+    trainer_id: uuid.UUID,
+    org_id: uuid.UUID,
+    joined: datetime,
+    tenure: float,
+) -> Iterator[tuple[Table, dict]]:
+    conversation_id = _uuid(rng)
+    count = max(1, _exponential(rng, config.messages_per_conversation, cap=MAX_MESSAGES_PER_CONVERSATION))
+    sent_at = sorted(joined + timedelta(seconds=rng.uniform(0, tenure)) for _ in range(count))
+    content = "Mensagem gerada para testes de carga."
+
+    yield Conversation.__table__, {
+        "id": conversation_id,
+        "conversation_type": ConversationType.DIRECT,
+        "organization_id": org_id,
+        "last_message_at": sent_at[-1],
+        "last_message_preview": content,
+        "created_at": sent_at[0],
+    }
+    for user_id in (student_id, trainer_id):
+        yield ConversationParticipant.__table__, {
+            "id": _uuid(rng),
+            "conversation_id": conversation_id,
+            "user_id": user_id,
+            "joined_at": sent_at[0],
+            "last_read_at": sent_at[-1] if user_id == trainer_id or rng.random() < 0.8 else sent_at[0],
+        }
+    for created in sent_at:
+        yield Message.__table__, {
+            "id": _uuid(rng),
+            "conversation_id": conversation_id,
+            "sender_id": student_id if rng.random() < 0.5 else trainer_id,
+            "content": content,
+            "created_at": created,
+        }
+
+
+def generate(config: DatasetConfig, now: datetime | None = None) -> Iterator[tuple[Table, dict]]:
+    """All rows of the dataset as ``(table, row)`` pairs, produced lazily."""
+    now = now or datetime.now(timezone.utc)
+    password_hash = hash_password(PASSWORD)  # hashing is slow: shared by all users
+    yield from generate_catalog(config)
+    exercise_ids = catalog_ids(config)
+    for index in range(config.trainers):
+        yield from generate_trainer(config, index, exercise_ids, password_hash, now)
+
+
+# =============================================================================
+# Writing
+# =============================================================================
+
+
+def _defaults(table: Table, row: dict) -> dict[str, Any]:
+    """Python-side column defaults missing from ``row`` (COPY doesn't apply them)."""
+    defaults = {}
+    for column in table.columns:
+        if column.name in row or column.default is None:
+            continue
+        if column.default.is_scalar:
+            defaults[column.name] = column.default.arg
+        elif column.default.is_callable:
+            defaults[column.name] = column.default.arg(None)
+    return defaults
+
+
+def _copy_value(column, value: Any) -> Any:
+    """``value`` as the PostgreSQL driver expects it for ``column`` in COPY."""
+    if value is None:
+        return None
+    if isinstance(column.type, Enum) and column.type.enum_class is not None:
+        # Persisted as the member name, or the value with values_callable
+        return dict(zip(column.type.enum_class, column.type.enums, strict=True))[value]
+    if isinstance(column.type, JSON):
+        return json.dumps(value)
+    return value
+
+
+class ChunkWriter:
+    """Buffers generated rows and writes them in chunks.
+
+    A flush writes every buffered table in foreign key order and commits,
+    so a child row never reaches the database before its parent.
+    """
+
+    def __init__(self, conn: AsyncConnection, chunk_rows: int):
+        self.conn = conn
+        self.chunk_rows = chunk_rows
+        self.use_copy = conn.dialect.name == "postgresql"
+        self.counts: Counter[str] = Counter()
+        self._buffers: dict[Table, list[dict]] = {}
+        self._buffered = 0
+
+    def add(self, table: Table, row: dict) -> bool:
+        """Buffer a row; returns True when the buffer is due for a flush."""
+        self._buffers.setdefault(table, []).append(row)
+        self._buffered += 1
+        return self._buffered >= self.chunk_rows
+
+    async def flush(self) -> None:
+        for table in Base.metadata.sorted_tables:
+            rows = self._buffers.pop(table, None)
+            if rows:
+                await self._write(table, rows)
+                self.counts[table.name] += len(rows)
+        await self.conn.commit()
+        self._buffered = 0
+
+    async def _write(self, table: Table, rows: list[dict]) -> None:
+        # Rows of a table may set different columns; each shape is written
+        # on its own so an omitted column keeps its server default
+        shapes: dict[frozenset[str], list[dict]] = {}
+        for row in rows:
+            row = {**_defaults(table, row), **row}
+            shapes.setdefault(frozenset(row), []).append(row)
+
+        for shape, shaped_rows in shapes.items():
+            if not self.use_copy:
+                await self.conn.execute(table.insert(), shaped_rows)
+                continue
+
+            columns = [column for column in table.columns if column.name in shape]
+            raw = await self.conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                table.name,
+                columns=[column.name for column in columns],
+                records=[
+                    tuple(_copy_value(column, row[column.name]) for column in columns)
+                    for row in shaped_rows
+                ],
+            )
+
+
+async def write_dataset(config: DatasetConfig, target: AsyncEngine = engine) -> Counter[str]:
+    """Generate the dataset into ``target``; returns rows written per table."""
+    async with target.connect() as conn:
+        writer = ChunkWriter(conn, config.chunk_rows)
+        for table, row in generate(config):
+            if writer.add(table, row):
+                await writer.flush()
+                logger.info("dataset_chunk_written", rows=sum(writer.counts.values()))
+        await writer.flush()
+    return writer.counts
+
+
+async def prepare_schema() -> None:
+    """Bring the schema of the configured database up to date."""
+    from src.config.database import _is_sqlite, init_db
+
+    if _is_sqlite:
+        # Models use PostgreSQL JSONB; store it as JSON on SQLite (as in tests)
+        from sqlalchemy.dialects.sqlite.base import SQLiteTypeCompiler
+
+        SQLiteTypeCompiler.visit_JSONB = SQLiteTypeCompiler.visit_JSON
+    await init_db()
+
+
+def parse_config(argv: list[str] | None = None) -> DatasetConfig:
+    """``DatasetConfig`` from command line flags (``--students-per-trainer`` ...)."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset")
+    defaults = DatasetConfig()
+    for f in fields(DatasetConfig):
+        default = getattr(defaults, f.name)
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=type(default), default=default)
+    return DatasetConfig(**vars(parser.parse_args(argv)))
+
+
+async def main():
+    """Main function to run the generator."""
+    config = parse_config()
+    logger.info("dataset_generation_started", **vars(config))
+
+    await prepare_schema()
+    counts = await write_dataset(config)
+
+    logger.info("dataset_generated", total=sum(counts.values()), **counts)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -50,7 +50,7 @@ async def _check_inactive_students_async(inactivity_days: int = 5):
     from src.domains.users.models import User
     from src.domains.notifications.models import NotificationType
     from src.domains.notifications.schemas import NotificationCreate
-    from src.domains.notifications.router import create_notification, should_send_notification
+    from src.domains.notifications.service import create_notification, should_send_notification
     from src.domains.notifications.push_service import send_push_notification
 
     database_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./myfit.db")
@@ -214,9 +214,9 @@ async def _send_invite_reminders_async():
     from src.domains.users.models import User
     from src.domains.notifications.models import NotificationType
     from src.domains.notifications.schemas import NotificationCreate
-    from src.domains.notifications.router import create_notification
+    from src.domains.notifications.service import create_notification
     from src.domains.notifications.push_service import send_push_notification
-    from src.core.email import send_invite_reminder_email
+    from src.domains.notifications.email_outbox import enqueue_email
 
     database_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./myfit.db")
     if database_url.startswith("postgres://"):
@@ -275,17 +275,19 @@ async def _send_invite_reminders_async():
                                 },
                             )
 
-                        # Always send email reminder
-                        try:
-                            await send_invite_reminder_email(
-                                to_email=invite.email,
-                                inviter_name=inviter_name,
-                                org_name=invite.organization.name if invite.organization else "MyFit",
-                                invite_token=invite.token,
-                                is_final=False,
-                            )
-                        except Exception as email_error:
-                            logger.warning(f"Failed to send reminder email to {invite.email}: {email_error}")
+                        # Always queue email reminder (the dedup key keeps task re-runs from queuing it twice)
+                        await enqueue_email(
+                            db,
+                            "invite_reminder",
+                            to_email=invite.email,
+                            context={
+                                "inviter_name": inviter_name,
+                                "org_name": invite.organization.name if invite.organization else "MyFit",
+                                "invite_token": invite.token,
+                                "is_final": False,
+                            },
+                            dedup_key=f"invite_reminder:{invite.id}:3d",
+                        )
 
                         sent_count += 1
 
@@ -337,17 +339,19 @@ async def _send_invite_reminders_async():
                             )
                             sent_count += 1
 
-                        # Also send email reminder
-                        try:
-                            await send_invite_reminder_email(
-                                to_email=invite.email,
-                                inviter_name=inviter_name,
-                                org_name=invite.organization.name if invite.organization else "MyFit",
-                                invite_token=invite.token,
-                                is_final=True,
-                            )
-                        except Exception as email_error:
-                            logger.warning(f"Failed to send reminder email to {invite.email}: {email_error}")
+                        # Also queue email reminder
+                        await enqueue_email(
+                            db,
+                            "invite_reminder",
+                            to_email=invite.email,
+                            context={
+                                "inviter_name": inviter_name,
+                                "org_name": invite.organization.name if invite.organization else "MyFit",
+                                "invite_token": invite.token,
+                                "is_final": True,
+                            },
+                            dedup_key=f"invite_reminder:{invite.id}:14d",
+                        )
 
                 except Exception as e:
                     logger.error(f"Error processing invite {invite.id}: {e}")
@@ -421,7 +425,7 @@ async def _check_expiring_plans_async():
     from src.domains.users.models import User
     from src.domains.notifications.models import NotificationType
     from src.domains.notifications.schemas import NotificationCreate
-    from src.domains.notifications.router import create_notification, should_send_notification
+    from src.domains.notifications.service import create_notification, should_send_notification
     from src.domains.notifications.push_service import send_push_notification
 
     database_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./myfit.db")
@@ -613,7 +617,7 @@ async def _send_notification_async_impl(user_id: str, notification_type: str, ti
 
     from src.domains.notifications.models import NotificationType
     from src.domains.notifications.schemas import NotificationCreate
-    from src.domains.notifications.router import create_notification, should_send_notification
+    from src.domains.notifications.service import create_notification, should_send_notification
     from src.domains.notifications.push_service import send_push_notification
 
     database_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./myfit.db")
@@ -701,7 +705,7 @@ async def _send_appointment_reminders_async():
     from src.domains.users.models import User
     from src.domains.notifications.models import NotificationType
     from src.domains.notifications.schemas import NotificationCreate
-    from src.domains.notifications.router import (
+    from src.domains.notifications.service import (
         create_notification,
         should_send_notification,
         notify_appointment_reminder,
@@ -985,7 +989,7 @@ async def _mark_missed_appointments_async():
     )
     from src.domains.notifications.models import NotificationType
     from src.domains.notifications.schemas import NotificationCreate
-    from src.domains.notifications.router import create_notification, should_send_notification
+    from src.domains.notifications.service import create_notification, should_send_notification
     from src.domains.notifications.push_service import send_push_notification
 
     database_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./myfit.db")
@@ -1093,3 +1097,50 @@ async def _mark_missed_appointments_async():
             raise
 
     return {"marked": marked_count, "trainers_notified": len(trainer_missed) if 'trainer_missed' in dir() else 0}
+
+
+@celery_app.task(bind=True, max_retries=0)
+def deliver_email_outbox(self, max_batches: int = 20):
+    """Drain the transactional email outbox in batches.
+
+    Each batch goes out through Resend's batch API; failed batches are
+    rescheduled with exponential backoff by the outbox itself, so this task
+    never retries on its own.
+
+    Runs every 30 seconds.
+    """
+    return run_async(_deliver_email_outbox_async(max_batches))
+
+
+async def _deliver_email_outbox_async(max_batches: int):
+    """Async implementation of outbox delivery."""
+    import os
+
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from src.domains.notifications.email_outbox import EMAIL_BATCH_SIZE, deliver_pending_emails
+
+    database_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./myfit.db")
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif database_url.startswith("postgresql://") and "+asyncpg" not in database_url:
+        database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    engine = create_async_engine(database_url)
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    delivered = 0
+    try:
+        async with async_session() as db:
+            for _ in range(max_batches):
+                sent = await deliver_pending_emails(db, EMAIL_BATCH_SIZE)
+                delivered += sent
+                if sent < EMAIL_BATCH_SIZE:
+                    break
+    finally:
+        await engine.dispose()
+
+    if delivered:
+        logger.info(f"Email outbox: delivered={delivered}")
+    return {"delivered": delivered}
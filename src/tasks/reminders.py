@@ -83,7 +83,7 @@ async def _send_workout_reminders_async():
     from src.domains.workouts.models import PlanAssignment, WorkoutSession, AssignmentStatus
     from src.domains.users.models import User, UserSettings
     from src.domains.notifications.models import NotificationType
-    from src.domains.notifications.router import should_send_notification
+    from src.domains.notifications.service import should_send_notification
     from src.domains.notifications.push_service import send_push_notification
 
     database_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./myfit.db")
@@ -255,7 +255,7 @@ async def _send_streak_reminder_async(user_id: str):
 
     from src.domains.users.models import User
     from src.domains.notifications.models import NotificationType
-    from src.domains.notifications.router import should_send_notification
+    from src.domains.notifications.service import should_send_notification
     from src.domains.notifications.push_service import send_push_notification
 
     database_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./myfit.db")
@@ -2,6 +2,7 @@
 
 import uuid
 from collections.abc import AsyncGenerator
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -196,11 +197,49 @@ async def sample_workout_program(
     }
 
 
+@pytest.fixture
+def query_budget(db_session: AsyncSession):
+    """Fail the test when the wrapped block issues more than ``max_queries`` statements.
+
+    Usage:
+        with query_budget(3):
+            await client.get(...)
+    """
+    engine = db_session.bind.sync_engine
+
+    @contextmanager
+    def budget(max_queries: int):
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} queries (budget {max_queries}):\n" + "\n".join(statements)
+        )
+
+    return budget
+
+
 # =============================================================================
 # Mock Fixtures for External Services
 # =============================================================================
 
 
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    """Keep the in-memory Redis fallback from leaking cached data between tests."""
+    from src.core import redis
+
+    redis._memory_store.clear()
+    yield
+
+
 @pytest.fixture
 def mock_redis():
     """Mock Redis client for token blacklisting."""
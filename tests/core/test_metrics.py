@@ -0,0 +1,91 @@
+"""Tests for in-process metrics and their text rendering."""
+
+from src.config.settings import settings
+from src.core.metrics import Counter, Gauge, Histogram, render_metrics, timed
+from src.main import create_app
+
+
+class TestRendering:
+    """Tests for the Prometheus text format."""
+
+    async def test_histogram_buckets_are_cumulative(self):
+        registry = []
+        latency = Histogram("test_seconds", "Test latency.", labels=("route",), buckets=(0.1, 1.0), registry=registry)
+
+        latency.observe(0.05, route="/a")
+        latency.observe(0.1, route="/a")
+        latency.observe(3, route="/a")
+
+        assert (await render_metrics(registry)).splitlines() == [
+            "# HELP test_seconds Test latency.",
+            "# TYPE test_seconds histogram",
+            'test_seconds_bucket{route="/a",le="0.1"} 2',
+            'test_seconds_bucket{route="/a",le="1"} 2',
+            'test_seconds_bucket{route="/a",le="+Inf"} 3',
+            'test_seconds_sum{route="/a"} 3.15',
+            'test_seconds_count{route="/a"} 3',
+        ]
+
+    async def test_counters_gauges_and_collectors(self):
+        registry = []
+        requests = Counter("test_total", "Requests.", labels=("status",), registry=registry)
+        Gauge("test_open", "Open.", collect=lambda: {(): 4}, registry=registry)
+
+        async def collect():
+            return {('a"b',): 1.5}
+
+        Gauge("test_async", "Async.", labels=("name",), collect=collect, registry=registry)
+        requests.inc(status="2xx")
+        requests.inc(2, status="2xx")
+
+        text = await render_metrics(registry)
+
+        assert 'test_total{status="2xx"} 3' in text
+        assert "test_open 4" in text
+        assert 'test_async{name="a\\"b"} 1.5' in text
+
+    async def test_broken_collector_is_skipped(self):
+        registry = []
+        Gauge("test_broken", "Broken.", collect=lambda: 1 / 0, registry=registry)
+        Counter("test_ok_total", "Ok.", collect=lambda: {(): 1}, registry=registry)
+
+        text = await render_metrics(registry)
+
+        assert "test_broken" not in text
+        assert "test_ok_total 1" in text
+
+
+class TestTimed:
+    """Tests for the timing decorator."""
+
+    async def test_observes_each_call_even_on_error(self):
+        registry = []
+        seconds = Histogram("test_call_seconds", "Calls.", registry=registry)
+
+        @timed(seconds)
+        async def fail():
+            raise ValueError
+
+        try:
+            await fail()
+        except ValueError:
+            pass
+
+        assert "test_call_seconds_count 1" in await render_metrics(registry)
+
+
+class TestEndpoint:
+    """Tests for mounting /metrics."""
+
+    def _has_metrics_route(self) -> bool:
+        return any(getattr(route, "path", None) == "/metrics" for route in create_app().routes)
+
+    def test_not_mounted_without_token_outside_debug(self, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+        monkeypatch.setattr(settings, "DEBUG", False)
+
+        assert not self._has_metrics_route()
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "secret")
+        assert self._has_metrics_route()
@@ -0,0 +1,57 @@
+"""Tests for keyset cursors and cached counts."""
+
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.pagination import InvalidCursorError, KeysetOrder, SortKey, cached_count, count_key
+from src.domains.marketplace.models import MarketplaceCatalogEntry as Entry
+from src.domains.workouts.models import Exercise, MuscleGroup
+
+ORDER = KeysetOrder(
+    "test:rating",
+    SortKey(func.coalesce(Entry.rating_average, -1), descending=True),
+    SortKey(Entry.listed_at, descending=True),
+    SortKey(Entry.template_id, descending=True),
+)
+
+
+class TestCursors:
+    """Tests for cursor encoding."""
+
+    def test_round_trip_keeps_types(self):
+        values = [Decimal("4.50"), datetime(2026, 5, 1, 12, 30, tzinfo=timezone.utc), uuid.uuid4()]
+
+        assert ORDER.decode(ORDER.encode(values)) == values
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "e30", ORDER.encode(["4.5", None])])
+    def test_rejects_foreign_or_malformed_cursors(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            ORDER.decode(cursor)
+
+    def test_rejects_cursor_of_other_order(self):
+        other = KeysetOrder("test:other", *ORDER.keys)
+
+        with pytest.raises(InvalidCursorError):
+            ORDER.decode(other.encode(["4.5", None, str(uuid.uuid4())]))
+
+
+class TestCachedCount:
+    """Tests for cached totals."""
+
+    async def test_served_from_cache(self, db_session: AsyncSession):
+        query = select(func.count(Exercise.id))
+        key = count_key("exercises", {"muscle_group": None})
+
+        assert await cached_count(db_session, key, query) == 0
+
+        db_session.add(Exercise(name="Supino", muscle_group=MuscleGroup.CHEST, is_public=True))
+        await db_session.commit()
+
+        # Still fresh: the earlier count is returned
+        assert await cached_count(db_session, key, query) == 0
+        assert await cached_count(db_session, count_key("exercises", {"muscle_group": "chest"}), query) == 1
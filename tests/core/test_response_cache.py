@@ -0,0 +1,148 @@
+"""Tests for the conditional GET / response body cache middleware."""
+
+import uuid
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.deep_copy import copy_rows, new_uuid
+from src.core.response_cache import _etag_matches
+from src.core.security import create_access_token
+from src.domains.workouts.models import Exercise, MuscleGroup
+
+EXERCISES_URL = "/api/v1/workouts/exercises"
+
+
+@pytest.fixture
+def auth_headers(sample_user: dict[str, Any]) -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token(user_id=str(sample_user['id']))}"}
+
+
+@pytest.fixture
+async def exercise(db_session: AsyncSession) -> Exercise:
+    exercise = Exercise(name="Supino reto", muscle_group=MuscleGroup.CHEST, is_public=True)
+    db_session.add(exercise)
+    await db_session.commit()
+    return exercise
+
+
+class TestEtagMatching:
+    """Tests for If-None-Match parsing."""
+
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            ('"abc"', True),
+            ('W/"abc"', True),
+            ('"x", "abc"', True),
+            ("*", True),
+            ('"abcd"', False),
+        ],
+    )
+    def test_matches(self, header, expected):
+        assert _etag_matches(header, '"abc"') is expected
+
+
+class TestResponseCacheMiddleware:
+    """Tests for cached GET routes."""
+
+    async def test_if_none_match_returns_304(
+        self, client: AsyncClient, auth_headers: dict, exercise: Exercise
+    ):
+        first = await client.get(EXERCISES_URL, headers=auth_headers)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        second = await client.get(EXERCISES_URL, headers={**auth_headers, "If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert second.content == b""
+
+    async def test_cached_body_skips_database(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        exercise: Exercise,
+        db_session: AsyncSession,
+    ):
+        first = await client.get(EXERCISES_URL, headers=auth_headers)
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            second = await client.get(EXERCISES_URL, headers=auth_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert statements == []
+        assert second.status_code == 200
+        assert second.json() == first.json()
+
+    async def test_change_rotates_etag(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        exercise: Exercise,
+        db_session: AsyncSession,
+    ):
+        first = await client.get(EXERCISES_URL, headers=auth_headers)
+
+        db_session.add(Exercise(name="Agachamento", muscle_group=MuscleGroup.QUADRICEPS, is_public=True))
+        await db_session.commit()
+
+        second = await client.get(
+            EXERCISES_URL, headers={**auth_headers, "If-None-Match": first.headers["etag"]}
+        )
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+        assert {e["name"] for e in second.json()} == {"Supino reto", "Agachamento"}
+
+    async def test_bulk_write_rotates_etag(
+        self,
+        client: AsyncClient,
+        auth_headers: dict,
+        exercise: Exercise,
+        db_session: AsyncSession,
+    ):
+        first = await client.get(EXERCISES_URL, headers=auth_headers)
+
+        await copy_rows(
+            db_session,
+            Exercise.__table__,
+            Exercise.id == exercise.id,
+            overrides={"id": new_uuid(db_session), "name": "Supino inclinado"},
+        )
+        await db_session.commit()
+
+        second = await client.get(
+            EXERCISES_URL, headers={**auth_headers, "If-None-Match": first.headers["etag"]}
+        )
+        assert second.status_code == 200
+        assert {e["name"] for e in second.json()} == {"Supino reto", "Supino inclinado"}
+
+    async def test_etag_varies_by_user(
+        self, client: AsyncClient, auth_headers: dict, exercise: Exercise
+    ):
+        other = {"Authorization": f"Bearer {create_access_token(user_id=str(uuid.uuid4()))}"}
+
+        mine = await client.get(EXERCISES_URL, headers=auth_headers)
+        theirs = await client.get(
+            EXERCISES_URL, headers={**other, "If-None-Match": mine.headers["etag"]}
+        )
+
+        # Unknown user: the route runs and rejects the token
+        assert theirs.status_code == 401
+
+    async def test_requires_valid_token(self, client: AsyncClient, exercise: Exercise):
+        response = await client.get(EXERCISES_URL, headers={"If-None-Match": "*"})
+
+        assert response.status_code == 401
@@ -0,0 +1,68 @@
+"""Tests for the SSE connection hub."""
+
+import uuid
+
+import pytest
+
+from src.core.sse import HEARTBEAT, HEARTBEAT_FRAME, ConnectionHub, StreamLimitError
+
+
+class TestLimits:
+    """Tests for per-user and per-node stream limits."""
+
+    async def test_rejects_over_limits_and_frees_on_disconnect(self):
+        hub = ConnectionHub(heartbeat_seconds=3, max_streams_per_user=2, max_streams_per_node=3)
+        alice, bob = uuid.uuid4(), uuid.uuid4()
+
+        first = hub.connect(alice, "board")
+        hub.connect(alice, "session")
+        with pytest.raises(StreamLimitError):
+            hub.connect(alice, "board")
+        hub.connect(bob, "board")
+        with pytest.raises(StreamLimitError):
+            hub.connect(uuid.uuid4(), "board")
+
+        hub.disconnect(first)
+        hub.disconnect(first)
+        hub.connect(alice, "board")
+
+        assert hub.stats() == {
+            "open_streams": 3,
+            "users": 2,
+            "by_channel": {"board": 2, "session": 1},
+            "rejected": 2,
+        }
+
+
+class TestHeartbeats:
+    """Tests for the timer wheel."""
+
+    async def test_heartbeat_only_for_idle_streams(self):
+        hub = ConnectionHub(heartbeat_seconds=2, max_streams_per_user=5, max_streams_per_node=10)
+        idle = hub.connect(uuid.uuid4(), "board")  # slot 0
+        busy = hub.connect(uuid.uuid4(), "board")  # slot 1
+
+        # First round only clears the "just connected" activity
+        assert [hub.tick(), hub.tick()] == [0, 0]
+        busy.queue.put_nowait("event")
+        assert await busy.receive() == "event"
+
+        assert hub.tick() == 0  # slot 1: busy sent something this round
+        assert hub.tick() == 1  # slot 0: idle
+        assert await idle.receive() is HEARTBEAT
+        assert hub.tick() == 1  # slot 1: idle by now
+        assert busy.queue.get_nowait() is HEARTBEAT
+        assert hub.tick() == 1  # slot 0: a heartbeat does not count as activity
+
+    async def test_response_unregisters_when_body_ends(self):
+        hub = ConnectionHub(heartbeat_seconds=2, max_streams_per_user=5, max_streams_per_node=10)
+        connection = hub.connect(uuid.uuid4(), "board")
+
+        async def body():
+            yield HEARTBEAT_FRAME
+
+        response = hub.response(connection, body())
+        chunks = [chunk async for chunk in response.body_iterator]
+
+        assert chunks == [HEARTBEAT_FRAME]
+        assert hub.open_streams == 0
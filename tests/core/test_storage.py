@@ -0,0 +1,198 @@
+"""Tests for the streaming storage service."""
+import os
+from unittest.mock import patch
+
+import pytest
+
+from src.core.storage import (
+    MAX_AVATAR_SIZE,
+    S3_PART_SIZE,
+    FileTooLargeError,
+    InvalidContentTypeError,
+    StorageService,
+    StreamedUpload,
+    sniff_content_type,
+)
+
+JPEG_HEADER = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01"
+MP4_HEADER = b"\x00\x00\x00\x18ftypmp42"
+
+
+class ChunkedSource:
+    """Async reader producing ``total`` bytes without holding them all."""
+
+    def __init__(self, header: bytes, total: int, fill: bytes = b"\x00"):
+        self.header = header
+        self.remaining = total
+        self.fill = fill
+        self.max_read = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        size = min(size, self.remaining)
+        self.max_read = max(self.max_read, size)
+        if size <= 0:
+            return b""
+        chunk = (self.header + self.fill * size)[:size]
+        self.header = b""
+        self.remaining -= size
+        return chunk
+
+
+class FakeS3:
+    """In-memory stand-in for the subset of the S3 API the service uses."""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.multipart: dict[str, dict[int, bytes]] = {}
+        self.aborted: list[str] = []
+        self.largest_part = 0
+
+    async def head_object(self, Bucket, Key):
+        from botocore.exceptions import ClientError
+
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ContentLength": len(self.objects[Key])}
+
+    async def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = bytes(Body)
+
+    async def create_multipart_upload(self, Bucket, Key, **kwargs):
+        upload_id = f"upload-{len(self.multipart)}"
+        self.multipart[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    async def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.largest_part = max(self.largest_part, len(Body))
+        self.multipart[UploadId][PartNumber] = bytes(Body)
+        return {"ETag": f"etag-{PartNumber}"}
+
+    async def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.multipart.pop(UploadId)
+        numbers = [p["PartNumber"] for p in MultipartUpload["Parts"]]
+        self.objects[Key] = b"".join(parts[n] for n in numbers)
+
+    async def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.multipart.pop(UploadId, None)
+        self.aborted.append(UploadId)
+
+    async def copy_object(self, Bucket, Key, CopySource, **kwargs):
+        self.objects[Key] = self.objects[CopySource["Key"]]
+
+    async def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+
+class TestSniffContentType:
+    """Tests for magic-byte content detection."""
+
+    @pytest.mark.parametrize(
+        "head,expected",
+        [
+            (JPEG_HEADER, "image/jpeg"),
+            (b"\x89PNG\r\n\x1a\n\x00\x00", "image/png"),
+            (b"GIF89a\x01\x00", "image/gif"),
+            (b"RIFF\x00\x00\x00\x00WEBPVP8 ", "image/webp"),
+            (b"\x1a\x45\xdf\xa3\x01\x00", "video/webm"),
+            (MP4_HEADER, "video/mp4"),
+            (b"\x00\x00\x00\x14ftypqt  ", "video/quicktime"),
+            (b"xxxxxxxxxxxx", None),
+        ],
+    )
+    def test_detects_signatures(self, head, expected):
+        assert sniff_content_type(head) == expected
+
+
+class TestStreamedUpload:
+    """Tests for incremental validation."""
+
+    async def test_rejects_mismatched_signature(self):
+        upload = StreamedUpload(b"not really a jpeg", "image/jpeg", MAX_AVATAR_SIZE)
+        with pytest.raises(InvalidContentTypeError):
+            async for _ in upload.chunks():
+                pass
+
+    async def test_rejects_oversized_stream_without_reading_it_all(self):
+        source = ChunkedSource(JPEG_HEADER, total=MAX_AVATAR_SIZE * 4)
+        upload = StreamedUpload(source, "image/jpeg", MAX_AVATAR_SIZE)
+        with pytest.raises(FileTooLargeError):
+            async for _ in upload.chunks():
+                pass
+        assert source.remaining > MAX_AVATAR_SIZE * 2
+
+    async def test_mp4_accepted_as_quicktime(self):
+        upload = StreamedUpload(MP4_HEADER + b"\x00" * 64, "video/quicktime", MAX_AVATAR_SIZE)
+        chunks = [chunk async for chunk in upload.chunks()]
+        assert upload.size == len(MP4_HEADER) + 64
+        assert len(chunks) == 1
+
+
+class TestLocalUpload:
+    """Tests for streaming uploads to the local filesystem."""
+
+    async def test_identical_uploads_share_one_file(self, tmp_path):
+        service = StorageService()
+        content = JPEG_HEADER + os.urandom(2048)
+        with patch("src.core.storage.settings.LOCAL_STORAGE_PATH", str(tmp_path)):
+            first = await service.upload_avatar("user-1", content, "image/jpeg")
+            second = await service.upload_avatar("user-1", content, "image/jpeg")
+
+        assert first == second
+        assert first.startswith("/uploads/avatars/user-1/")
+        stored = tmp_path / first.removeprefix("/uploads/")
+        assert stored.read_bytes() == content
+        assert list((tmp_path / ".incoming").iterdir()) == []
+
+    async def test_failed_upload_leaves_no_partial_file(self, tmp_path):
+        service = StorageService()
+        source = ChunkedSource(JPEG_HEADER, total=MAX_AVATAR_SIZE + 1)
+        with patch("src.core.storage.settings.LOCAL_STORAGE_PATH", str(tmp_path)):
+            with pytest.raises(FileTooLargeError):
+                await service.upload_avatar("user-1", source, "image/jpeg")
+
+        assert not (tmp_path / "avatars").exists()
+        assert list((tmp_path / ".incoming").iterdir()) == []
+
+
+class TestS3Upload:
+    """Tests for streaming uploads to S3 through the shared client."""
+
+    async def test_small_file_uses_single_put(self):
+        s3 = FakeS3()
+        service = StorageService(s3_client=s3)
+        url = await service.upload_avatar("user-1", JPEG_HEADER + b"\x00" * 100, "image/jpeg")
+
+        assert not s3.multipart
+        [key] = s3.objects
+        assert url.endswith(key)
+
+    async def test_large_file_goes_multipart_and_deduplicates(self):
+        s3 = FakeS3()
+        service = StorageService(s3_client=s3)
+        total = S3_PART_SIZE * 2 + 1234
+
+        first = await service.upload_exercise_media(
+            ChunkedSource(MP4_HEADER, total), "video/mp4", user_id="user-1"
+        )
+        second = await service.upload_exercise_media(
+            ChunkedSource(MP4_HEADER, total), "video/mp4", user_id="user-1"
+        )
+
+        assert first == second
+        [(key, stored)] = s3.objects.items()
+        assert first.endswith(key)
+        assert len(stored) == total
+        assert s3.largest_part <= S3_PART_SIZE + 1024 * 1024
+        assert not s3.multipart
+
+    async def test_oversized_multipart_upload_is_aborted(self):
+        s3 = FakeS3()
+        service = StorageService(s3_client=s3)
+        source = ChunkedSource(MP4_HEADER, total=60 * 1024 * 1024)
+
+        with pytest.raises(FileTooLargeError):
+            await service.upload_exercise_media(source, "video/mp4")
+
+        assert s3.aborted
+        assert not s3.multipart
+        assert not s3.objects
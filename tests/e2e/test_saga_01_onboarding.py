@@ -15,6 +15,8 @@ from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.domains.notifications.models import EmailOutbox
+
 
 class TestSaga01OnboardingCompleto:
     """
@@ -152,7 +154,7 @@ class TestSaga01OnboardingCompleto:
         self,
         personal_client: AsyncClient,
         personal_trainer_setup: dict,
-        mock_email_service,
+        db_session: AsyncSession,
     ):
         """Personal Trainer envia convite para novo aluno."""
         org_id = str(personal_trainer_setup["organization"]["id"])
@@ -173,8 +175,11 @@ class TestSaga01OnboardingCompleto:
         # Então o convite deve ser enviado com sucesso
         assert response.status_code in [200, 201]
 
-        # E o serviço de email deve ter sido chamado
-        mock_email_service.assert_called()
+        # E o email de convite deve estar na fila de envio
+        queued = await db_session.scalar(
+            select(EmailOutbox).where(EmailOutbox.to_email == "maria.nova@example.com")
+        )
+        assert queued is not None
 
     @pytest.mark.asyncio
     async def test_fase_03_personal_ve_convites_pendentes(
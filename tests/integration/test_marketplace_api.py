@@ -272,6 +272,22 @@ class TestListTemplates:
         data = response.json()
         assert len(data) <= 1
 
+    @pytest.mark.asyncio
+    async def test_next_cursor_exposed_to_browsers(
+        self, authenticated_client: AsyncClient, sample_template: MarketplaceTemplate
+    ):
+        """Cross-origin clients can read the X-Next-Cursor header."""
+        response = await authenticated_client.get(
+            "/api/v1/marketplace/templates",
+            params={"limit": 1},
+            headers={"Origin": "http://localhost:3000"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["x-next-cursor"]
+        exposed = response.headers["access-control-expose-headers"].lower()
+        assert "x-next-cursor" in exposed
+
 
 class TestListFeaturedTemplates:
     """Tests for GET /api/v1/marketplace/templates/featured."""
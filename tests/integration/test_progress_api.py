@@ -210,6 +210,35 @@ class TestListWeightLogs:
         assert len(data) == 2
 
 
+class TestWeightSeries:
+    """Tests for GET /api/v1/progress/weight/series."""
+
+    async def test_weight_series_weekly(
+        self, authenticated_client: AsyncClient, multiple_weight_logs: list[WeightLog]
+    ):
+        """Returns summary and bucketed points."""
+        response = await authenticated_client.get(
+            "/api/v1/progress/weight/series", params={"resolution": "week"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["resolution"] == "week"
+        assert data["summary"]["count"] == len(multiple_weight_logs)
+        assert sum(p["count"] for p in data["points"]) == len(multiple_weight_logs)
+
+    async def test_measurement_series_requires_field(self, authenticated_client: AsyncClient):
+        """Measurement series needs a valid field."""
+        response = await authenticated_client.get("/api/v1/progress/measurements/series")
+        assert response.status_code == 422
+
+        response = await authenticated_client.get(
+            "/api/v1/progress/measurements/series", params={"field": "waist_cm"}
+        )
+        assert response.status_code == 200
+        assert response.json()["points"] == []
+
+
 class TestCreateWeightLog:
     """Tests for POST /api/v1/progress/weight."""
 
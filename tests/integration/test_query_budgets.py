@@ -0,0 +1,83 @@
+"""Per-endpoint query budgets.
+
+Budgets don't depend on the number of rows returned, so an N+1 regression
+(or a new eager relationship fanning out) fails here.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.security import create_access_token
+from src.domains.schedule.models import Appointment, AppointmentStatus
+from src.domains.users.models import User
+
+API = "/api/v1"
+
+
+@pytest.fixture
+def auth_headers(sample_user: dict[str, Any]) -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token(user_id=str(sample_user['id']))}"}
+
+
+@pytest.fixture
+async def appointments(db_session: AsyncSession, sample_user: dict[str, Any]) -> None:
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    for i in range(5):
+        student = User(
+            email=f"student-{uuid.uuid4()}@example.com",
+            name=f"Aluno {i}",
+            password_hash="$2b$12$test.hash.password",
+        )
+        db_session.add(student)
+        await db_session.flush()
+        db_session.add(Appointment(
+            trainer_id=sample_user["id"],
+            student_id=student.id,
+            organization_id=sample_user["organization_id"],
+            date_time=start + timedelta(hours=i),
+            duration_minutes=60,
+            status=AppointmentStatus.CONFIRMED,
+        ))
+    await db_session.commit()
+    db_session.expunge_all()
+
+
+class TestQueryBudgets:
+    """Each endpoint stays within a fixed number of queries."""
+
+    @pytest.mark.parametrize(
+        "path,budget",
+        [
+            ("/users/profile", 1),
+            ("/users/me/memberships", 4),
+            ("/organizations", 3),
+            ("/notifications/notifications", 4),
+        ],
+    )
+    async def test_endpoint_budget(
+        self, client: AsyncClient, auth_headers: dict, query_budget, path: str, budget: int
+    ):
+        with query_budget(budget):
+            response = await client.get(f"{API}{path}", headers=auth_headers)
+        assert response.status_code == 200
+
+    async def test_appointment_list_budget(
+        self, client: AsyncClient, auth_headers: dict, query_budget, appointments
+    ):
+        with query_budget(6):
+            response = await client.get(
+                f"{API}/schedule/appointments", params={"as_trainer": True}, headers=auth_headers
+            )
+        assert response.status_code == 200
+        assert len(response.json()) == 5
+
+    async def test_reports_server_timing(self, client: AsyncClient, auth_headers: dict):
+        response = await client.get(f"{API}/users/profile", headers=auth_headers)
+
+        assert response.headers["server-timing"].startswith("db;dur=")
+        assert 'queries"' in response.headers["server-timing"]
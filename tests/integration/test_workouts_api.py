@@ -1035,6 +1035,65 @@ class TestListPlanAssignments:
         ]
         assert len(self_assigned_ids) == 0, "Self-assigned plans should not be visible to student"
 
+    async def test_list_plan_assignments_is_compact_by_default(
+        self,
+        authenticated_client: AsyncClient,
+        sample_plan_assignment: "PlanAssignment",
+        student_user: dict[str, Any],
+    ):
+        """Listing carries plan header and student name but no plan tree."""
+        response = await authenticated_client.get(
+            "/api/v1/workouts/plans/assignments",
+            params={"as_trainer": True},
+        )
+
+        assert response.status_code == 200
+        [item] = [a for a in response.json() if a["id"] == str(sample_plan_assignment.id)]
+        assert item["student_name"] == student_user["name"]
+        assert item["plan_name"]
+        assert item["plan"] is None
+        assert item["has_unviewed_updates"] is True
+
+    async def test_list_plan_assignments_with_plan_tree(
+        self,
+        authenticated_client: AsyncClient,
+        sample_plan_assignment: "PlanAssignment",
+        student_user: dict[str, Any],
+    ):
+        """include_plan=true returns the full plan of each assignment."""
+        response = await authenticated_client.get(
+            "/api/v1/workouts/plans/assignments",
+            params={"as_trainer": True, "include_plan": True},
+        )
+
+        assert response.status_code == 200
+        [item] = [a for a in response.json() if a["id"] == str(sample_plan_assignment.id)]
+        assert item["student_name"] == student_user["name"]
+        assert item["plan"]["id"] == str(sample_plan_assignment.plan_id)
+
+
+class TestGetPlanAssignment:
+    """Tests for GET /api/v1/workouts/plans/assignments/{assignment_id}."""
+
+    async def test_get_plan_assignment_includes_plan(
+        self, authenticated_client: AsyncClient, sample_plan_assignment: "PlanAssignment"
+    ):
+        """Trainer gets one assignment with its plan tree."""
+        response = await authenticated_client.get(
+            f"/api/v1/workouts/plans/assignments/{sample_plan_assignment.id}",
+        )
+
+        assert response.status_code == 200
+        assert response.json()["plan"]["id"] == str(sample_plan_assignment.plan_id)
+
+    async def test_get_plan_assignment_not_found(self, authenticated_client: AsyncClient):
+        """Unknown assignment returns 404."""
+        response = await authenticated_client.get(
+            f"/api/v1/workouts/plans/assignments/{uuid.uuid4()}",
+        )
+
+        assert response.status_code == 404
+
 
 class TestCreatePlanAssignment:
     """Tests for POST /api/v1/workouts/plans/assignments."""
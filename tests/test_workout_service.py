@@ -6,7 +6,14 @@ from typing import Any
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domains.workouts.models import TrainingPlan
+from src.domains.workouts.models import (
+    Exercise,
+    MuscleGroup,
+    PlanWorkout,
+    TrainingPlan,
+    Workout,
+    WorkoutExercise,
+)
 from src.domains.workouts.service import WorkoutService
 
 
@@ -200,6 +207,115 @@ class TestDuplicatePlan:
         assert new_plan.id is not None
 
 
+class TestDeepCopy:
+    """Tests for the set-based plan/workout deep copy."""
+
+    @pytest.fixture
+    async def workout_service(self, db_session: AsyncSession) -> WorkoutService:
+        """Create a workout service instance."""
+        return WorkoutService(db_session)
+
+    @pytest.fixture
+    async def plan_with_workouts(
+        self,
+        db_session: AsyncSession,
+        sample_user: dict[str, Any],
+    ) -> TrainingPlan:
+        """Create a plan with two workouts, each with exercises."""
+        exercise = Exercise(name="Supino Reto", muscle_group=MuscleGroup.CHEST)
+        db_session.add(exercise)
+        await db_session.flush()
+
+        plan = TrainingPlan(name="Plano AB", created_by_id=sample_user["id"], target_workout_minutes=50)
+        db_session.add(plan)
+        await db_session.flush()
+
+        for order, label in enumerate(["A", "B"]):
+            workout = Workout(name=f"Treino {label}", created_by_id=sample_user["id"])
+            db_session.add(workout)
+            await db_session.flush()
+            for ex_order in range(3):
+                db_session.add(WorkoutExercise(
+                    workout_id=workout.id,
+                    exercise_id=exercise.id,
+                    order=ex_order,
+                    sets=4,
+                    reps="8-10",
+                ))
+            db_session.add(PlanWorkout(plan_id=plan.id, workout_id=workout.id, label=label, order=order))
+
+        await db_session.commit()
+        return await WorkoutService(db_session).get_plan_by_id(plan.id)
+
+    async def test_duplicate_plan_clones_workouts_and_exercises(
+        self,
+        workout_service: WorkoutService,
+        plan_with_workouts: TrainingPlan,
+        sample_user: dict[str, Any],
+    ):
+        """Duplicating a plan clones its workouts and their exercises."""
+        new_plan = await workout_service.duplicate_plan(
+            plan=plan_with_workouts,
+            new_owner_id=sample_user["id"],
+        )
+        new_plan = await workout_service.get_plan_by_id(new_plan.id)
+
+        assert new_plan.target_workout_minutes == 50
+        assert [pw.label for pw in new_plan.plan_workouts] == ["A", "B"]
+        original_ids = {pw.workout_id for pw in plan_with_workouts.plan_workouts}
+        for pw in new_plan.plan_workouts:
+            assert pw.workout_id not in original_ids
+            assert pw.workout.name in ("Treino A", "Treino B")
+            assert len(pw.workout.exercises) == 3
+            assert all(we.reps == "8-10" and we.sets == 4 for we in pw.workout.exercises)
+
+    async def test_duplicate_plan_without_workouts_reuses_them(
+        self,
+        workout_service: WorkoutService,
+        plan_with_workouts: TrainingPlan,
+        sample_user: dict[str, Any],
+    ):
+        """With duplicate_workouts=False the copy references the same workouts."""
+        new_plan = await workout_service.duplicate_plan(
+            plan=plan_with_workouts,
+            new_owner_id=sample_user["id"],
+            duplicate_workouts=False,
+        )
+        new_plan = await workout_service.get_plan_by_id(new_plan.id)
+
+        assert {pw.workout_id for pw in new_plan.plan_workouts} == {
+            pw.workout_id for pw in plan_with_workouts.plan_workouts
+        }
+
+    async def test_repeated_duplicates_increment_copy_number(
+        self,
+        workout_service: WorkoutService,
+        plan_with_workouts: TrainingPlan,
+        sample_user: dict[str, Any],
+    ):
+        """The next copy name is derived from the owner's existing copies."""
+        first = await workout_service.duplicate_plan(plan_with_workouts, sample_user["id"])
+        second = await workout_service.duplicate_plan(plan_with_workouts, sample_user["id"])
+
+        assert first.name == "Plano AB (2)"
+        assert second.name == "Plano AB (3)"
+
+    async def test_duplicate_workout_clones_exercises(
+        self,
+        workout_service: WorkoutService,
+        plan_with_workouts: TrainingPlan,
+        sample_user: dict[str, Any],
+    ):
+        """Duplicating a workout clones its exercises under a numbered name."""
+        source = plan_with_workouts.plan_workouts[0].workout
+        copy = await workout_service.duplicate_workout(source, sample_user["id"])
+
+        assert copy.id != source.id
+        assert copy.name == "Treino A (2)"
+        assert len(copy.exercises) == 3
+        assert {we.id for we in copy.exercises}.isdisjoint({we.id for we in source.exercises})
+
+
 class TestDuplicateNaming:
     """Tests for the numbered naming scheme when duplicating workouts/programs."""
 
@@ -449,6 +565,42 @@ class TestListExercises:
         assert custom_exercise.id in exercise_ids
 
 
+class TestExerciseMediaSharing:
+    """Tests for is_media_url_shared."""
+
+    @pytest.mark.asyncio
+    async def test_media_shared_with_another_exercise(
+        self,
+        db_session: AsyncSession,
+        sample_user: dict[str, Any],
+    ):
+        """Identical uploads share one file, so it must survive a replacement."""
+        url = "/uploads/exercises/user/0123456789abcdef.png"
+        first = Exercise(
+            name="Supino",
+            muscle_group=MuscleGroup.CHEST,
+            is_custom=True,
+            created_by_id=sample_user["id"],
+            image_url=url,
+        )
+        second = Exercise(
+            name="Supino Inclinado",
+            muscle_group=MuscleGroup.CHEST,
+            is_custom=True,
+            created_by_id=sample_user["id"],
+            video_url=url,
+        )
+        db_session.add_all([first, second])
+        await db_session.commit()
+
+        service = WorkoutService(db_session)
+        assert await service.is_media_url_shared(url, first.id)
+
+        second.video_url = None
+        await db_session.commit()
+        assert not await service.is_media_url_shared(url, first.id)
+
+
 class TestSessionOperations:
     """Tests for workout session operations."""
 
@@ -616,6 +768,43 @@ class TestSessionOperations:
         assert session_set.weight_kg == 80.0
         assert session_set.set_number == 1
 
+    @pytest.mark.asyncio
+    async def test_sync_session_sets_is_idempotent(
+        self,
+        workout_service: WorkoutService,
+        sample_user: dict[str, Any],
+        sample_workout,
+    ):
+        """Resending a batch rewrites the same sets; the last op per id wins."""
+        from src.domains.workouts.models import Exercise, MuscleGroup
+        from src.domains.workouts.schemas import SessionSetOperation
+
+        exercise = Exercise(name="Squat", muscle_group=MuscleGroup.QUADRICEPS, is_public=True)
+        workout_service.db.add(exercise)
+        await workout_service.db.commit()
+
+        session = await workout_service.start_session(
+            user_id=sample_user["id"],
+            workout_id=sample_workout.id,
+        )
+        batch = [
+            SessionSetOperation(op_id="a", exercise_id=exercise.id, set_number=1, reps_completed=8, weight_kg=100),
+            SessionSetOperation(op_id="b", exercise_id=exercise.id, set_number=2, reps_completed=8, weight_kg=100),
+            SessionSetOperation(op_id="c", exercise_id=exercise.id, set_number=3, reps_completed=5),
+            SessionSetOperation(op_id="b", exercise_id=exercise.id, set_number=2, reps_completed=6, weight_kg=105),
+            SessionSetOperation(op_id="c", action="delete"),
+        ]
+
+        for _ in range(2):
+            written, sets, deleted = await workout_service.sync_session_sets(session.id, batch)
+
+        assert deleted == ["c"]
+        assert [s.client_op_id for s in written] == ["a", "b"]
+        assert [(s.client_op_id, s.reps_completed, s.weight_kg) for s in sets] == [
+            ("a", 8, 100),
+            ("b", 6, 105),
+        ]
+
 
 class TestDuplicateWorkout:
     """Tests for the duplicate_workout method."""
@@ -2723,3 +2912,61 @@ class TestValidateContextAccess:
         )
 
         assert has_access is False
+
+
+class TestListProjections:
+    """Tests for list queries counting children in SQL."""
+
+    @pytest.fixture
+    async def workout_service(self, db_session: AsyncSession) -> WorkoutService:
+        """Create a workout service instance."""
+        return WorkoutService(db_session)
+
+    @pytest.fixture
+    async def plan_with_workouts(
+        self,
+        db_session: AsyncSession,
+        sample_user: dict[str, Any],
+    ) -> TrainingPlan:
+        """Create a plan with two workouts of three exercises and an empty workout."""
+        exercise = Exercise(name="Agachamento", muscle_group=MuscleGroup.QUADRICEPS)
+        plan = TrainingPlan(name="Plano AB", created_by_id=sample_user["id"], is_template=True, is_public=True)
+        empty = Workout(name="Treino Vazio", created_by_id=sample_user["id"])
+        db_session.add_all([exercise, plan, empty])
+        await db_session.flush()
+
+        for order, label in enumerate(["A", "B"]):
+            workout = Workout(name=f"Treino {label}", created_by_id=sample_user["id"])
+            db_session.add(workout)
+            await db_session.flush()
+            for ex_order in range(3):
+                db_session.add(WorkoutExercise(workout_id=workout.id, exercise_id=exercise.id, order=ex_order))
+            db_session.add(PlanWorkout(plan_id=plan.id, workout_id=workout.id, label=label, order=order))
+
+        await db_session.commit()
+        return plan
+
+    async def test_list_workouts_counts_exercises(
+        self,
+        workout_service: WorkoutService,
+        plan_with_workouts: TrainingPlan,
+        sample_user: dict[str, Any],
+    ):
+        """Each workout row carries its exercise count."""
+        workouts = await workout_service.list_workouts(user_id=sample_user["id"])
+
+        counts = {w["name"]: w["exercise_count"] for w in workouts}
+        assert counts == {"Treino A": 3, "Treino B": 3, "Treino Vazio": 0}
+
+    async def test_list_plans_counts_workouts(
+        self,
+        workout_service: WorkoutService,
+        plan_with_workouts: TrainingPlan,
+        sample_user: dict[str, Any],
+    ):
+        """Plan rows and catalog rows carry their workout count."""
+        [plan] = await workout_service.list_plans(user_id=sample_user["id"])
+        catalog = await workout_service.get_catalog_templates(exclude_user_id=uuid.uuid4())
+
+        assert plan["workout_count"] == 2
+        assert [t["workout_count"] for t in catalog if t["id"] == plan_with_workouts.id] == [2]
@@ -3,10 +3,13 @@
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.domains.checkin import live_board
 from src.domains.checkin.models import (
     CheckIn,
     CheckInCode,
@@ -637,3 +640,201 @@ class TestCheckinStats:
 
         assert stats["total_checkins"] == 0
         assert stats["avg_duration_minutes"] == 0
+
+    async def test_get_user_checkin_stats_durations(
+        self, db_session: AsyncSession, sample_user: dict[str, Any]
+    ):
+        """Durations are summed from acceptance (or check-in) to checkout."""
+        service = CheckInService(db_session)
+
+        gym = await service.create_gym(
+            organization_id=sample_user["organization_id"],
+            name="Duration Gym",
+            address="Address",
+            latitude=-23.5505,
+            longitude=-46.6333,
+        )
+
+        start = datetime.now(timezone.utc) - timedelta(hours=3)
+        db_session.add_all([
+            CheckIn(
+                user_id=sample_user["id"], gym_id=gym.id, method=CheckInMethod.CODE,
+                checked_in_at=start, checked_out_at=start + timedelta(minutes=45),
+            ),
+            CheckIn(
+                user_id=sample_user["id"], gym_id=gym.id, method=CheckInMethod.CODE,
+                checked_in_at=start, accepted_at=start + timedelta(minutes=10),
+                checked_out_at=start + timedelta(minutes=70, seconds=30),
+            ),
+            # Still checked in: counted, no duration
+            CheckIn(user_id=sample_user["id"], gym_id=gym.id, method=CheckInMethod.CODE),
+        ])
+        await db_session.commit()
+
+        stats = await service.get_user_checkin_stats(user_id=sample_user["id"], days=30)
+
+        assert stats["total_checkins"] == 3
+        assert stats["total_duration_minutes"] == 105
+        assert stats["avg_duration_minutes"] == 35
+
+
+class TestExpireStaleCheckins:
+    """Tests for the set-based check-in expiry."""
+
+    async def test_expires_only_stale_confirmed_checkins(
+        self, db_session: AsyncSession, sample_user: dict[str, Any]
+    ):
+        """Confirmed check-ins past expiry are checked out; others are untouched."""
+        service = CheckInService(db_session)
+
+        gym = await service.create_gym(
+            organization_id=sample_user["organization_id"],
+            name="Expiry Gym",
+            address="Address",
+            latitude=-23.5505,
+            longitude=-46.6333,
+        )
+        past = datetime.now(timezone.utc) - timedelta(minutes=5)
+        stale = CheckIn(
+            user_id=sample_user["id"], gym_id=gym.id, method=CheckInMethod.CODE,
+            expires_at=past, notes="manhã",
+        )
+        fresh = CheckIn(
+            user_id=sample_user["id"], gym_id=gym.id, method=CheckInMethod.CODE,
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=15),
+        )
+        pending = CheckIn(
+            user_id=sample_user["id"], gym_id=gym.id, method=CheckInMethod.CODE,
+            status=CheckInStatus.PENDING_ACCEPTANCE, expires_at=past,
+        )
+        db_session.add_all([stale, fresh, pending])
+        await db_session.commit()
+
+        assert await service.expire_stale_checkins() == 1
+
+        for checkin in (stale, fresh, pending):
+            await db_session.refresh(checkin)
+        assert stale.checked_out_at is not None
+        assert stale.notes == "manhã [auto-expirado 20min]"
+        assert fresh.checked_out_at is None
+        assert pending.checked_out_at is None
+
+
+class TestLiveBoard:
+    """Tests for the trainer live board behind get_active_session."""
+
+    @pytest.fixture
+    async def board_setup(
+        self, db_session: AsyncSession, sample_user: dict[str, Any]
+    ) -> tuple[CheckInService, list[CheckIn]]:
+        service = CheckInService(db_session)
+        gym = await service.create_gym(
+            organization_id=sample_user["organization_id"],
+            name="Board Gym",
+            address="Address",
+            latitude=-23.5505,
+            longitude=-46.6333,
+        )
+        await service.start_training_session(sample_user["id"], gym.latitude, gym.longitude)
+        checkins = [
+            await service.create_checkin(
+                user_id=sample_user["id"],
+                gym_id=gym.id,
+                method=CheckInMethod.MANUAL,
+                approved_by_id=sample_user["id"],
+            )
+            for _ in range(2)
+        ]
+        return service, checkins
+
+    async def test_no_active_session(
+        self, db_session: AsyncSession, sample_user: dict[str, Any]
+    ):
+        """A trainer without an active session has no board."""
+        service = CheckInService(db_session)
+
+        assert await service.get_active_session(sample_user["id"]) is None
+
+    async def test_lists_todays_checkins(self, board_setup):
+        """The board lists the session's check-ins as active."""
+        service, checkins = board_setup
+
+        board = await service.get_active_session(checkins[0].approved_by_id)
+
+        assert {c["id"] for c in board["checkins"]} == {str(c.id) for c in checkins}
+        assert {c["status"] for c in board["checkins"]} == {"active"}
+        assert board["checkins"][0]["student_name"] == "Test User"
+
+    async def test_read_is_cached_and_writes_nothing(
+        self, board_setup, db_session: AsyncSession
+    ):
+        """A fresh board is served without queries and without touching the session."""
+        service, checkins = board_setup
+        trainer_id = checkins[0].approved_by_id
+        await service.get_active_session(trainer_id)
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            board = await service.get_active_session(trainer_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert statements == []
+        assert len(board["checkins"]) == 2
+        assert not db_session.dirty
+
+    async def test_commit_refreshes_board(self, board_setup):
+        """Checking a student out shows on the next read."""
+        service, checkins = board_setup
+        trainer_id = checkins[0].approved_by_id
+        await service.get_active_session(trainer_id)
+
+        await service.checkout(checkins[0])
+        board = await service.get_active_session(trainer_id)
+
+        statuses = {c["id"]: c["status"] for c in board["checkins"]}
+        assert statuses == {str(checkins[0].id): "completed", str(checkins[1].id): "active"}
+
+    async def test_expiry_refreshes_board(self, board_setup, db_session: AsyncSession):
+        """Check-ins closed by the bulk expiry show on the next read."""
+        service, checkins = board_setup
+        trainer_id = checkins[0].approved_by_id
+        await service.get_active_session(trainer_id)
+
+        checkins[0].expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+        await db_session.commit()
+        await service.get_active_session(trainer_id)
+        await service.expire_stale_checkins()
+        board = await service.get_active_session(trainer_id)
+
+        statuses = {c["id"]: c["status"] for c in board["checkins"]}
+        assert statuses[str(checkins[0].id)] == "completed"
+
+    async def test_version_follows_content(self, board_setup, db_session: AsyncSession):
+        """Rebuilding an unchanged board keeps its version."""
+        service, checkins = board_setup
+        trainer_id = checkins[0].approved_by_id
+
+        first = await live_board.build_board(db_session, trainer_id)
+        again = await live_board.build_board(db_session, trainer_id)
+        await service.checkout(checkins[0])
+        changed = await live_board.build_board(db_session, trainer_id)
+
+        assert first["version"] == again["version"]
+        assert changed["version"] != first["version"]
+
+    async def test_cache_outage_falls_back_to_database(self, board_setup):
+        """The board is still served when the cache is down."""
+        service, checkins = board_setup
+        down = AsyncMock(side_effect=ConnectionError("redis down"))
+
+        with patch.object(live_board, "cache_get", down), patch.object(live_board, "cache_set", down):
+            board = await service.get_active_session(checkins[0].approved_by_id)
+
+        assert len(board["checkins"]) == 2
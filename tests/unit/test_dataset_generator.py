@@ -0,0 +1,63 @@
+"""Tests for the synthetic dataset generator."""
+
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select
+
+from src.domains.workouts.models import Exercise, MuscleGroup, WorkoutSession, WorkoutSessionSet
+from src.scripts.generate_dataset import ChunkWriter, DatasetConfig, generate, write_dataset
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+SMALL = DatasetConfig(trainers=3, students_per_trainer=4, history_days=30, exercises=20, chunk_rows=50)
+
+
+class TestGenerate:
+    """Tests for row generation."""
+
+    def test_same_seed_same_rows(self):
+        first = [(table.name, row["id"]) for table, row in generate(SMALL, NOW)]
+        second = [(table.name, row["id"]) for table, row in generate(SMALL, NOW)]
+        reseeded = DatasetConfig(**{**vars(SMALL), "seed": 7})
+        other_seed = [(table.name, row["id"]) for table, row in generate(reseeded, NOW)]
+
+        assert first == second
+        assert first != other_seed
+
+    def test_more_trainers_keep_existing_ones(self):
+        bigger = DatasetConfig(**{**vars(SMALL), "trainers": 4})
+
+        smaller_ids = [row["id"] for _, row in generate(SMALL, NOW)]
+        bigger_ids = [row["id"] for _, row in generate(bigger, NOW)]
+
+        assert bigger_ids[: len(smaller_ids)] == smaller_ids
+
+
+class TestWriteDataset:
+    """Tests for chunked writing."""
+
+    async def test_writes_every_row_in_chunks(self, test_engine, db_session):
+        expected = Counter(table.name for table, _ in generate(SMALL))
+
+        counts = await write_dataset(SMALL, test_engine)
+
+        assert counts == expected
+        sessions = await db_session.scalar(select(func.count()).select_from(WorkoutSession))
+        sets = await db_session.scalar(select(func.count()).select_from(WorkoutSessionSet))
+        assert sessions == expected["workout_sessions"] > 0
+        assert sets == expected["workout_session_sets"]
+
+    async def test_rows_of_different_shapes(self, test_engine, db_session):
+        async with test_engine.connect() as conn:
+            writer = ChunkWriter(conn, chunk_rows=10)
+            writer.add(Exercise.__table__, {"name": "Supino", "muscle_group": MuscleGroup.CHEST})
+            writer.add(Exercise.__table__, {
+                "name": "Remada", "muscle_group": MuscleGroup.BACK, "description": "Com barra", "is_custom": True,
+            })
+            await writer.flush()
+
+        exercises = {e.name: e for e in (await db_session.scalars(select(Exercise))).all()}
+        assert exercises["Supino"].id != exercises["Remada"].id
+        assert exercises["Supino"].is_custom is False
+        assert exercises["Remada"].description == "Com barra"
+        assert exercises["Remada"].is_custom is True
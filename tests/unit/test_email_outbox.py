@@ -0,0 +1,143 @@
+"""Tests for the transactional email outbox."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+import resend
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.email import render_email
+from src.domains.notifications.email_outbox import (
+    EMAIL_MAX_ATTEMPTS,
+    deliver_pending_emails,
+    enqueue_email,
+)
+from src.domains.notifications.models import EmailOutbox, EmailOutboxStatus
+
+INVITE_CONTEXT = {"trainer_name": "Ana", "org_name": "Studio", "invite_token": "tok"}
+
+
+@pytest.fixture
+def email_enabled():
+    with patch("src.domains.notifications.email_outbox.settings.RESEND_API_KEY", "re_test"):
+        yield
+
+
+async def _outbox(db_session: AsyncSession) -> list[EmailOutbox]:
+    result = await db_session.execute(select(EmailOutbox).order_by(EmailOutbox.created_at))
+    return list(result.scalars().all())
+
+
+class TestEnqueueEmail:
+    """Tests for enqueue_email."""
+
+    async def test_dedup_key_enqueues_once(self, db_session: AsyncSession):
+        for _ in range(2):
+            await enqueue_email(
+                db_session, "invite", "aluno@example.com", INVITE_CONTEXT, dedup_key="invite:tok"
+            )
+        await db_session.commit()
+
+        count = await db_session.scalar(select(func.count()).select_from(EmailOutbox))
+        assert count == 1
+
+    async def test_rollback_drops_queued_email(self, db_session: AsyncSession):
+        await enqueue_email(db_session, "invite", "aluno@example.com", INVITE_CONTEXT)
+        await db_session.rollback()
+
+        assert await _outbox(db_session) == []
+
+    async def test_unknown_template_rejected(self, db_session: AsyncSession):
+        with pytest.raises(ValueError):
+            await enqueue_email(db_session, "nope", "aluno@example.com", {})
+
+
+class TestDeliverPendingEmails:
+    """Tests for batched outbox delivery."""
+
+    async def test_disabled_email_leaves_outbox_untouched(self, db_session: AsyncSession):
+        await enqueue_email(db_session, "invite", "aluno@example.com", INVITE_CONTEXT)
+        await db_session.commit()
+
+        with patch("src.domains.notifications.email_outbox.settings.RESEND_API_KEY", ""):
+            assert await deliver_pending_emails(db_session) == 0
+        [message] = await _outbox(db_session)
+        assert message.status == EmailOutboxStatus.PENDING
+
+    async def test_batch_send_marks_rows_sent(self, db_session: AsyncSession, email_enabled):
+        for i in range(3):
+            await enqueue_email(db_session, "invite", f"aluno{i}@example.com", INVITE_CONTEXT)
+        await db_session.commit()
+
+        with patch("resend.Batch.send") as batch_send:
+            batch_send.return_value = {"data": [{"id": f"msg-{i}"} for i in range(3)]}
+            assert await deliver_pending_emails(db_session) == 3
+
+        params, options = batch_send.call_args.args
+        assert len(params) == 3
+        assert options["idempotency_key"].startswith("outbox-")
+        messages = await _outbox(db_session)
+        assert {m.status for m in messages} == {EmailOutboxStatus.SENT}
+        assert all(m.context is None for m in messages)
+        assert sorted(m.provider_message_id for m in messages) == ["msg-0", "msg-1", "msg-2"]
+
+    async def test_provider_failure_backs_off(self, db_session: AsyncSession, email_enabled):
+        await enqueue_email(db_session, "invite", "aluno@example.com", INVITE_CONTEXT)
+        await db_session.commit()
+
+        with patch("resend.Batch.send", side_effect=ConnectionError("down")):
+            assert await deliver_pending_emails(db_session) == 0
+
+        [message] = await _outbox(db_session)
+        assert message.status == EmailOutboxStatus.PENDING
+        assert message.attempts == 1
+        assert message.last_error == "down"
+        next_attempt = message.next_attempt_at.replace(tzinfo=message.next_attempt_at.tzinfo or timezone.utc)
+        assert next_attempt > datetime.now(timezone.utc) + timedelta(seconds=20)
+
+        # Not due yet: nothing is picked up on the next run
+        with patch("resend.Batch.send") as batch_send:
+            assert await deliver_pending_emails(db_session) == 0
+            batch_send.assert_not_called()
+
+    async def test_gives_up_after_max_attempts(self, db_session: AsyncSession, email_enabled):
+        await enqueue_email(db_session, "invite", "aluno@example.com", INVITE_CONTEXT)
+        await db_session.commit()
+        [message] = await _outbox(db_session)
+        message.attempts = EMAIL_MAX_ATTEMPTS - 1
+        await db_session.commit()
+
+        error = resend.exceptions.ResendError(500, "error", "boom", "retry later")
+        with patch("resend.Batch.send", side_effect=error):
+            await deliver_pending_emails(db_session)
+
+        [message] = await _outbox(db_session)
+        assert message.status == EmailOutboxStatus.FAILED
+        assert message.context == {"trainer_name": "Ana", "org_name": "Studio"}
+
+    async def test_bad_context_fails_without_sending(self, db_session: AsyncSession, email_enabled):
+        await enqueue_email(db_session, "invite", "aluno@example.com", {"unexpected": 1})
+        await db_session.commit()
+
+        with patch("resend.Batch.send") as batch_send:
+            assert await deliver_pending_emails(db_session) == 0
+            batch_send.assert_not_called()
+
+        [message] = await _outbox(db_session)
+        assert message.status == EmailOutboxStatus.FAILED
+        assert message.last_error.startswith("Render failed")
+
+
+class TestRenderEmail:
+    """Tests for rendering outbox templates by name."""
+
+    def test_render_by_template_name(self):
+        rendered = render_email("invite", "aluno@example.com", INVITE_CONTEXT)
+        assert "Ana" in rendered.subject
+        assert "https://myfit.app/invite/tok" in rendered.html_content
+
+    def test_unknown_template_raises(self):
+        with pytest.raises(KeyError):
+            render_email("nope", "aluno@example.com", {})
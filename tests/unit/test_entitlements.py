@@ -0,0 +1,192 @@
+"""Tests for cached entitlement snapshots."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.redis import cache_set
+from src.domains.organizations.models import OrganizationMembership, UserRole
+from src.domains.subscriptions import entitlements
+from src.domains.subscriptions.entitlements import EntitlementSnapshot, FeatureRule
+from src.domains.subscriptions.models import FeatureDefinition, PlatformTier
+from src.domains.subscriptions.service import SubscriptionService
+from src.domains.users.models import User
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    entitlements.clear_cache()
+    yield
+    entitlements.clear_cache()
+
+
+@pytest.fixture
+def query_log(db_session: AsyncSession):
+    statements: list[str] = []
+    engine = db_session.bind.sync_engine
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+async def _add_students(
+    db_session: AsyncSession, organization_id: uuid.UUID, count: int
+) -> list[OrganizationMembership]:
+    memberships = []
+    for _ in range(count):
+        user = User(
+            email=f"student-{uuid.uuid4()}@example.com",
+            name="Aluno",
+            password_hash="$2b$12$test.hash.password",
+        )
+        db_session.add(user)
+        await db_session.flush()
+        membership = OrganizationMembership(
+            user_id=user.id,
+            organization_id=organization_id,
+            role=UserRole.STUDENT,
+            is_active=True,
+        )
+        db_session.add(membership)
+        memberships.append(membership)
+    await db_session.commit()
+    return memberships
+
+
+class TestEntitlementSnapshot:
+    """Tests for in-memory checks against a snapshot."""
+
+    def _snapshot(self, **overrides) -> EntitlementSnapshot:
+        values = {
+            "user_id": uuid.uuid4(),
+            "subscribed_tier": PlatformTier.PRO,
+            "pro_until": None,
+            "is_founder": False,
+            "active_students": 3,
+            "features": {
+                "max_active_students": FeatureRule(
+                    "max_active_students", PlatformTier.FREE, free_tier_limit=3
+                ),
+                "ai_workout_generation": FeatureRule("ai_workout_generation", PlatformTier.PRO),
+            },
+        }
+        values.update(overrides)
+        return EntitlementSnapshot(**values)
+
+    def test_expiry_is_evaluated_at_read_time(self):
+        past = datetime.now(timezone.utc) - timedelta(minutes=1)
+        snapshot = self._snapshot(pro_until=past)
+
+        assert snapshot.tier == PlatformTier.FREE
+        assert snapshot.can_add_student() == (False, 3, 3)
+        assert not snapshot.check_feature("ai_workout_generation").has_access
+
+    def test_pro_has_unlimited_students(self):
+        snapshot = self._snapshot(pro_until=datetime.now(timezone.utc) + timedelta(days=1))
+
+        assert snapshot.can_add_student() == (True, 3, None)
+        assert snapshot.check_feature("ai_workout_generation").has_access
+        assert snapshot.check_feature("undefined_feature").has_access
+
+    def test_json_round_trip(self):
+        snapshot = self._snapshot(pro_until=datetime(2026, 12, 1, tzinfo=timezone.utc), is_founder=True)
+
+        restored = EntitlementSnapshot.from_json(snapshot.to_json(), snapshot.features)
+
+        assert restored == snapshot
+        assert restored.features is snapshot.features
+
+
+class TestEntitlementCache:
+    """Tests for caching and invalidation through the service."""
+
+    async def test_warm_cache_issues_no_queries(
+        self,
+        db_session: AsyncSession,
+        sample_user: dict[str, Any],
+        query_log: list[str],
+    ):
+        service = SubscriptionService(db_session)
+        await service.get_entitlements(sample_user["id"])
+        query_log.clear()
+
+        assert await service.is_pro(sample_user["id"]) is False
+        assert (await service.can_add_student(sample_user["id"]))[0] is True
+        await service.check_feature_access(sample_user["id"], "max_active_students")
+
+        assert query_log == []
+
+    async def test_upgrade_and_cancel_invalidate(
+        self, db_session: AsyncSession, sample_user: dict[str, Any]
+    ):
+        service = SubscriptionService(db_session)
+        assert await service.is_pro(sample_user["id"]) is False
+
+        await service.upgrade_to_pro(sample_user["id"])
+        assert await service.is_pro(sample_user["id"]) is True
+
+        await service.cancel_subscription(sample_user["id"])
+        assert await service.is_pro(sample_user["id"]) is False
+
+    async def test_membership_changes_update_student_count(
+        self, db_session: AsyncSession, sample_user: dict[str, Any]
+    ):
+        service = SubscriptionService(db_session)
+        trainer_id = sample_user["id"]
+        assert await service.can_add_student(trainer_id) == (True, 0, 5)
+
+        memberships = await _add_students(db_session, sample_user["organization_id"], 5)
+        assert await service.can_add_student(trainer_id) == (False, 5, 5)
+
+        memberships[0].is_active = False
+        await db_session.commit()
+        assert await service.can_add_student(trainer_id) == (True, 4, 5)
+        assert await service.get_active_student_count(trainer_id) == 4
+
+    async def test_invalidation_reaches_other_processes(
+        self, db_session: AsyncSession, sample_user: dict[str, Any]
+    ):
+        service = SubscriptionService(db_session)
+        trainer_id = sample_user["id"]
+        assert await service.can_add_student(trainer_id) == (True, 0, 5)
+        stale = entitlements._local[trainer_id]
+
+        await _add_students(db_session, sample_user["organization_id"], 5)
+        await entitlements.flush_invalidations()
+
+        # Another process still holds the old snapshot, and a load that raced
+        # the commit writes it back to Redis
+        entitlements._local[trainer_id] = stale
+        await cache_set(
+            entitlements._redis_key(trainer_id),
+            stale[1].to_json().decode(),
+            entitlements.REDIS_TTL_SECONDS,
+        )
+        assert await service.can_add_student(trainer_id) == (False, 5, 5)
+
+        entitlements._local.clear()
+        assert await service.can_add_student(trainer_id) == (False, 5, 5)
+
+    async def test_feature_changes_clear_rules(
+        self, db_session: AsyncSession, sample_user: dict[str, Any]
+    ):
+        service = SubscriptionService(db_session)
+        assert await service.get_student_limit(sample_user["id"]) == 5
+
+        db_session.add(FeatureDefinition(
+            key="max_active_students",
+            name="Active Students",
+            required_tier=PlatformTier.FREE,
+            free_tier_limit=2,
+        ))
+        await db_session.commit()
+
+        assert await service.get_student_limit(sample_user["id"]) == 2
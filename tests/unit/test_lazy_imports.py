@@ -0,0 +1,31 @@
+"""Tests that heavy SDKs stay out of cold start."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+BUDGET = json.loads((ROOT / "benchmarks" / "import_budget.json").read_text())
+
+
+@pytest.mark.parametrize("entrypoint", sorted(BUDGET["entrypoints"]))
+def test_entrypoint_does_not_import_heavy_sdks(entrypoint: str):
+    imports = "; ".join(f"import {m}" for m in BUDGET["entrypoints"][entrypoint]["imports"])
+    code = f"import sys; {imports}; print('loaded:', [m for m in {BUDGET['forbidden']!r} if m in sys.modules])"
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+
+    assert "loaded: []" in result.stdout.splitlines()
+
+
+def test_sdk_accessors_import_on_first_use():
+    code = (
+        "import sys; from src.core.sdk import get_resend; "
+        "assert 'resend' not in sys.modules; get_resend(); assert 'resend' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
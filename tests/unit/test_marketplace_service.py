@@ -6,9 +6,10 @@ from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.pagination import InvalidCursorError
 from src.domains.marketplace.models import (
     CreatorEarnings,
     CreatorPayout,
@@ -16,6 +17,7 @@ from src.domains.marketplace.models import (
     PaymentProvider,
     PayoutMethod,
     PayoutStatus,
+    PriceBand,
     PurchaseStatus,
     TemplateCategory,
     TemplateDifficulty,
@@ -24,6 +26,7 @@ from src.domains.marketplace.models import (
     TemplateType,
 )
 from src.domains.marketplace.service import PLATFORM_FEE_PERCENT, MarketplaceService
+from src.domains.users.models import User
 
 
 class TestPlatformFeeCalculation:
@@ -814,3 +817,163 @@ class TestDeactivateTemplate:
         templates = await service.list_templates()
 
         assert len(templates) == 0
+
+
+class TestCatalogReadModel:
+    """Tests for the precomputed catalog cards, facets and page cache."""
+
+    async def _create(self, service, creator_id, title, price_cents, category=None):
+        return await service.create_template(
+            creator_id=creator_id,
+            template_type=TemplateType.WORKOUT,
+            title=title,
+            price_cents=price_cents,
+            category=category,
+        )
+
+    async def test_facet_counts(self, db_session: AsyncSession, sample_user: dict):
+        """Facets should count listed templates by category and price band."""
+        service = MarketplaceService(db_session)
+        await self._create(service, sample_user["id"], "A", 0, TemplateCategory.STRENGTH)
+        await self._create(service, sample_user["id"], "B", 4990, TemplateCategory.STRENGTH)
+        hidden = await self._create(service, sample_user["id"], "C", 15000, TemplateCategory.SPORTS)
+        await service.deactivate_template(hidden)
+
+        facets = await service.get_catalog_facets()
+
+        assert facets.total == 2
+        assert {f.value: f.count for f in facets.categories} == {"strength": 2}
+        assert {f.value: f.count for f in facets.price_bands} == {"free": 1, "under_50": 1}
+        assert await service.get_category_counts() == {TemplateCategory.STRENGTH: 2}
+
+    async def test_filter_by_price_band(self, db_session: AsyncSession, sample_user: dict):
+        """Should filter cards by price band."""
+        service = MarketplaceService(db_session)
+        await self._create(service, sample_user["id"], "Cheap", 1000)
+        await self._create(service, sample_user["id"], "Mid", 7500)
+
+        cards = await service.list_templates(price_band=PriceBand.FROM_50_TO_100)
+
+        assert [c.title for c in cards] == ["Mid"]
+
+    async def test_creator_rename_updates_cards(
+        self, db_session: AsyncSession, sample_user: dict
+    ):
+        """Cards should carry the creator's current name."""
+        service = MarketplaceService(db_session)
+        await self._create(service, sample_user["id"], "Treino", 1000)
+
+        user = await db_session.get(User, sample_user["id"])
+        user.name = "Novo Nome"
+        await db_session.commit()
+
+        [card] = await service.list_templates()
+        assert card.creator.name == "Novo Nome"
+
+    async def test_cached_page_skips_database_until_change(
+        self, db_session: AsyncSession, sample_user: dict
+    ):
+        """A repeated browse should be served from cache until the catalog changes."""
+        service = MarketplaceService(db_session)
+        template = await self._create(service, sample_user["id"], "Original", 1000)
+        await service.list_templates()
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            [card] = await service.list_templates()
+            assert statements == []
+            assert card.title == "Original"
+
+            await service.update_template(template, title="Renamed")
+            [card] = await service.list_templates()
+            assert card.title == "Renamed"
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    async def test_price_change_moves_facet_counts(
+        self, db_session: AsyncSession, sample_user: dict
+    ):
+        """Changing a listing column should move the template between facet values."""
+        service = MarketplaceService(db_session)
+        template = await self._create(service, sample_user["id"], "A", 0, TemplateCategory.STRENGTH)
+        await self._create(service, sample_user["id"], "B", 0, TemplateCategory.STRENGTH)
+
+        await service.update_template(template, price_cents=7500, category=TemplateCategory.SPORTS)
+        await db_session.delete(await db_session.get(MarketplaceTemplate, template.id))
+        await db_session.commit()
+        facets = await service.get_catalog_facets()
+
+        assert facets.total == 1
+        assert {f.value: f.count for f in facets.categories} == {"strength": 1}
+        assert {f.value: f.count for f in facets.price_bands} == {"free": 1}
+
+    async def test_purchase_count_updates_card_in_place(
+        self, db_session: AsyncSession, sample_user: dict
+    ):
+        """A card-only change should update the entry without touching the facets."""
+        service = MarketplaceService(db_session)
+        template = await self._create(service, sample_user["id"], "A", 1000)
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            template.purchase_count += 1
+            await db_session.commit()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert not [s for s in statements if "marketplace_catalog_facets" in s]
+        assert not [s for s in statements if s.lstrip().startswith("DELETE")]
+        [card] = await service.list_templates()
+        assert card.purchase_count == 1
+
+    @pytest.mark.parametrize("sort_by", ["created_at", "price_cents", "purchase_count", "rating_average", "title"])
+    @pytest.mark.parametrize("sort_desc", [True, False])
+    async def test_cursor_pages_cover_catalog_in_order(
+        self, db_session: AsyncSession, sample_user: dict, sort_by: str, sort_desc: bool
+    ):
+        """Walking the cursors returns every card once, in offset order."""
+        service = MarketplaceService(db_session)
+        for i in range(7):
+            template = await self._create(service, sample_user["id"], f"T{i % 3}", 1000 * (i % 2))
+            if i % 3:
+                template.rating_average = Decimal("4.50")
+        await db_session.commit()
+
+        expected = await service.list_templates(sort_by=sort_by, sort_desc=sort_desc, limit=50)
+
+        seen, cursor = [], None
+        while True:
+            cards, cursor = await service.list_templates_page(
+                cursor=cursor, sort_by=sort_by, sort_desc=sort_desc, limit=3
+            )
+            seen.extend(cards)
+            if cursor is None:
+                break
+
+        assert [c.id for c in seen] == [c.id for c in expected]
+        assert len(seen) == 7
+
+    async def test_cursor_from_another_sort_is_rejected(
+        self, db_session: AsyncSession, sample_user: dict
+    ):
+        """A cursor is only valid for the sort that issued it."""
+        service = MarketplaceService(db_session)
+        for i in range(2):
+            await self._create(service, sample_user["id"], f"T{i}", 1000)
+
+        _, cursor = await service.list_templates_page(sort_by="title", limit=1)
+
+        with pytest.raises(InvalidCursorError):
+            await service.list_templates_page(cursor=cursor, sort_by="price_cents", limit=1)
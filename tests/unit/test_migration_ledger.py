@@ -0,0 +1,88 @@
+"""Tests for the versioned migration ledger."""
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.migrations.ledger import (
+    MigrationStep,
+    migration_steps,
+    pending_steps,
+    run_migrations,
+    schema_migrations,
+)
+
+
+@pytest.fixture
+async def ledger_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ledger.db'}")
+    yield engine
+    await engine.dispose()
+
+
+def _step(step_id: str, checksum: str, calls: list[str], fail: bool = False) -> MigrationStep:
+    async def apply(conn: AsyncConnection) -> None:
+        calls.append(step_id)
+        if fail:
+            raise RuntimeError("boom")
+
+    return MigrationStep(step_id, checksum, apply)
+
+
+class TestMigrationLedger:
+    """Tests for applying and recording migration steps."""
+
+    async def test_applies_once_then_reads_ledger_only(self, ledger_engine):
+        calls: list[str] = []
+        steps = [_step("a", "1", calls), _step("b", "1", calls)]
+
+        assert await run_migrations(ledger_engine, steps) == ["a", "b"]
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(ledger_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            assert await run_migrations(ledger_engine, steps) == []
+        finally:
+            event.remove(ledger_engine.sync_engine, "before_cursor_execute", record)
+
+        assert calls == ["a", "b"]
+        assert len(statements) == 1
+
+    async def test_changed_checksum_reapplies(self, ledger_engine):
+        calls: list[str] = []
+        await run_migrations(ledger_engine, [_step("a", "1", calls), _step("b", "1", calls)])
+
+        applied = await run_migrations(ledger_engine, [_step("a", "2", calls), _step("b", "1", calls)])
+
+        assert applied == ["a"]
+        async with ledger_engine.connect() as conn:
+            rows = dict((await conn.execute(
+                select(schema_migrations.c.id, schema_migrations.c.checksum)
+            )).all())
+        assert rows == {"a": "2", "b": "1"}
+
+    async def test_failed_step_stops_the_run(self, ledger_engine):
+        calls: list[str] = []
+        steps = [_step("a", "1", calls), _step("b", "1", calls, fail=True), _step("c", "1", calls)]
+
+        with pytest.raises(RuntimeError):
+            await run_migrations(ledger_engine, steps)
+
+        assert calls == ["a", "b"]
+        async with ledger_engine.connect() as conn:
+            assert [step.id for step in await pending_steps(conn, steps)] == ["b", "c"]
+
+    async def test_postgres_only_steps_skipped_elsewhere(self, ledger_engine):
+        steps = migration_steps()
+        assert len({step.id for step in steps}) == len(steps)
+
+        async with ledger_engine.connect() as conn:
+            pending = {step.id for step in await pending_steps(conn, steps)}
+
+        assert "schema:enum_values" not in pending
+        assert "add_waitlist_templates" not in pending
+        assert "schema:create_all" in pending
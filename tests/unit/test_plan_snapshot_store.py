@@ -0,0 +1,203 @@
+"""Unit tests for the content-addressed plan snapshot store."""
+
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domains.users.models import User
+from src.domains.workouts.models import PlanSnapshotBlob, TrainingPlan
+from src.domains.workouts.service import WorkoutService
+from src.domains.workouts.snapshot_store import (
+    PlanSnapshotStore,
+    decode_snapshot,
+    encode_snapshot,
+    normalize_snapshot,
+    snapshot_cache,
+    workout_hash,
+)
+
+
+def _snapshot(reps: str = "10", created_at: str = "2026-01-01T00:00:00+00:00") -> dict:
+    return {
+        "id": "plan-1",
+        "name": "Plano ABC",
+        "snapshot_created_at": created_at,
+        "workouts": [
+            {"id": "w-a", "label": "A", "exercises": [{"id": "e-1", "sets": 3, "reps": reps}]},
+            {"id": "w-b", "label": "B", "exercises": [{"id": "e-2", "sets": 4, "reps": "8"}]},
+        ],
+    }
+
+
+@pytest.fixture
+async def trainer(db_session: AsyncSession) -> User:
+    user = User(
+        id=uuid.uuid4(),
+        email=f"trainer-{uuid.uuid4()}@example.com",
+        name="Trainer",
+        password_hash="$2b$12$test.hash",
+        is_active=True,
+    )
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+async def _make_student(db_session: AsyncSession) -> User:
+    user = User(
+        id=uuid.uuid4(),
+        email=f"student-{uuid.uuid4()}@example.com",
+        name="Student",
+        password_hash="$2b$12$test.hash",
+        is_active=True,
+    )
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+class TestSnapshotEncoding:
+    def test_hash_ignores_snapshot_timestamp(self):
+        first, _, _ = encode_snapshot(_snapshot(created_at="2026-01-01T00:00:00+00:00"))
+        second, _, _ = encode_snapshot(_snapshot(created_at="2026-02-01T00:00:00+00:00"))
+        assert first == second
+
+    def test_hash_changes_with_content(self):
+        first, _, _ = encode_snapshot(_snapshot(reps="10"))
+        second, _, _ = encode_snapshot(_snapshot(reps="12"))
+        assert first != second
+
+    def test_normalize_recomputes_stale_workout_hashes(self):
+        normalized = normalize_snapshot(_snapshot())
+        tampered = _snapshot(reps="15")
+        tampered["workouts"][0]["content_hash"] = normalized["workouts"][0]["content_hash"]
+
+        renormalized = normalize_snapshot(tampered)
+        assert renormalized["workouts"][0]["content_hash"] != normalized["workouts"][0]["content_hash"]
+        assert renormalized["workouts"][1]["content_hash"] == normalized["workouts"][1]["content_hash"]
+
+    def test_workout_hash_without_embedded_value(self):
+        workout = _snapshot()["workouts"][0]
+        assert workout_hash(workout) == normalize_snapshot(_snapshot())["workouts"][0]["content_hash"]
+
+
+class TestPlanSnapshotStore:
+    async def test_put_deduplicates_identical_snapshots(self, db_session: AsyncSession):
+        store = PlanSnapshotStore(db_session)
+        first = await store.put(_snapshot())
+        second = await store.put(_snapshot(created_at="2026-03-01T00:00:00+00:00"))
+        await db_session.commit()
+
+        assert first.content_hash == second.content_hash
+        count = await db_session.scalar(select(func.count()).select_from(PlanSnapshotBlob))
+        assert count == 1
+
+    async def test_get_round_trips_through_cache(self, db_session: AsyncSession):
+        snapshot_cache.clear()
+        store = PlanSnapshotStore(db_session)
+        blob = await store.put(_snapshot())
+        await db_session.commit()
+
+        loaded = await store.get(blob.content_hash)
+        assert loaded["name"] == "Plano ABC"
+        assert loaded["content_hash"] == blob.content_hash
+        assert snapshot_cache.get(blob.content_hash) is loaded
+
+    async def test_assignments_of_same_plan_share_one_blob(
+        self, db_session: AsyncSession, trainer: User
+    ):
+        plan = TrainingPlan(name="Plano Compartilhado", created_by_id=trainer.id)
+        db_session.add(plan)
+        await db_session.commit()
+
+        service = WorkoutService(db_session)
+        assignments = []
+        for _ in range(3):
+            student = await _make_student(db_session)
+            assignments.append(
+                await service.create_plan_assignment(
+                    plan_id=plan.id,
+                    student_id=student.id,
+                    trainer_id=trainer.id,
+                    start_date=date.today(),
+                )
+            )
+
+        hashes = {a.snapshot_hash for a in assignments}
+        assert len(hashes) == 1
+        assert assignments[0].plan_snapshot["name"] == "Plano Compartilhado"
+        assert assignments[0].legacy_plan_snapshot is None
+
+    async def test_shared_blob_keeps_each_assignment_timestamp(
+        self, db_session: AsyncSession, trainer: User
+    ):
+        plan = TrainingPlan(name="Plano Datado", created_by_id=trainer.id)
+        db_session.add(plan)
+        await db_session.commit()
+
+        service = WorkoutService(db_session)
+        first = await service.create_plan_assignment(
+            plan_id=plan.id,
+            student_id=(await _make_student(db_session)).id,
+            trainer_id=trainer.id,
+            start_date=date.today(),
+        )
+        second = await service.create_plan_assignment(
+            plan_id=plan.id,
+            student_id=(await _make_student(db_session)).id,
+            trainer_id=trainer.id,
+            start_date=date.today(),
+        )
+
+        assert first.snapshot_hash == second.snapshot_hash
+        assert "snapshot_created_at" not in decode_snapshot(first.snapshot_blob)
+        assert first.plan_snapshot["snapshot_created_at"] == first.snapshot_created_at.isoformat()
+        assert second.plan_snapshot["snapshot_created_at"] == second.snapshot_created_at.isoformat()
+
+    async def test_version_references_assignment_blob(
+        self, db_session: AsyncSession, trainer: User
+    ):
+        plan = TrainingPlan(name="Plano Versionado", created_by_id=trainer.id)
+        db_session.add(plan)
+        await db_session.commit()
+        student = await _make_student(db_session)
+
+        service = WorkoutService(db_session)
+        assignment = await service.create_plan_assignment(
+            plan_id=plan.id,
+            student_id=student.id,
+            trainer_id=trainer.id,
+            start_date=date.today(),
+        )
+        original_hash = assignment.snapshot_hash
+
+        new_snapshot = dict(assignment.plan_snapshot, name="Plano Versionado v2")
+        updated = await service.update_plan_snapshot(assignment, new_snapshot, trainer.id)
+
+        versions = await service.get_plan_versions(updated.id)
+        assert len(versions) == 1
+        assert versions[0].snapshot_hash == original_hash
+        assert updated.snapshot_hash != original_hash
+        assert updated.plan_snapshot["name"] == "Plano Versionado v2"
+
+
+class TestStructuralDiff:
+    def test_identical_snapshots_short_circuit(self, db_session: AsyncSession):
+        service = WorkoutService(db_session)
+        snapshot = normalize_snapshot(_snapshot())
+        diff = service.compute_snapshot_diff(snapshot, normalize_snapshot(_snapshot()))
+        assert diff == {"plan_changes": [], "workout_changes": [], "exercise_changes": []}
+
+    def test_only_changed_workout_reports_exercise_changes(self, db_session: AsyncSession):
+        service = WorkoutService(db_session)
+        diff = service.compute_snapshot_diff(
+            normalize_snapshot(_snapshot(reps="10")),
+            normalize_snapshot(_snapshot(reps="12")),
+        )
+        assert len(diff["exercise_changes"]) == 1
+        change = diff["exercise_changes"][0]
+        assert change["workout_label"] == "A"
+        assert change["changes"] == [{"field": "reps", "old": "10", "new": "12"}]
@@ -712,3 +712,108 @@ class TestContextTypes:
         """All author roles are defined."""
         assert NoteAuthorRole.TRAINER.value == "trainer"
         assert NoteAuthorRole.STUDENT.value == "student"
+
+
+# =============================================================================
+# Test: Student Audience Index
+# =============================================================================
+
+
+class TestNoteAudience:
+    """Tests for the per-student note audience index."""
+
+    async def _assign_plan(self, workout_service, training_plan, student, trainer):
+        return await workout_service.create_plan_assignment(
+            plan_id=training_plan.id,
+            student_id=student.id,
+            trainer_id=trainer.id,
+            start_date=datetime.now(timezone.utc).date(),
+        )
+
+    async def test_new_note_fans_out_to_assigned_students(
+        self,
+        workout_service: WorkoutService,
+        training_plan: TrainingPlan,
+        trainer: User,
+        student: User,
+        another_student: User,
+    ):
+        """A trainer note reaches students assigned to the plan only."""
+        await self._assign_plan(workout_service, training_plan, student, trainer)
+        note = await workout_service.create_prescription_note(
+            context_type=NoteContextType.PLAN,
+            context_id=training_plan.id,
+            author_id=trainer.id,
+            author_role=NoteAuthorRole.TRAINER,
+            content="Deload next week",
+        )
+
+        notes = await workout_service.list_notes_for_student(student.id)
+        assert [n.id for n in notes] == [note.id]
+        assert await workout_service.list_notes_for_student(another_student.id) == []
+
+    async def test_assignment_exposes_existing_notes(
+        self,
+        workout_service: WorkoutService,
+        trainer_note_on_plan: PrescriptionNote,
+        student_note_on_plan: PrescriptionNote,
+        training_plan: TrainingPlan,
+        trainer: User,
+        student: User,
+    ):
+        """Assigning a plan makes earlier trainer notes visible, not student ones."""
+        assert await workout_service.count_unread_notes_for_student(student.id) == 0
+
+        await self._assign_plan(workout_service, training_plan, student, trainer)
+
+        notes = await workout_service.list_notes_for_student(student.id)
+        assert [n.id for n in notes] == [trainer_note_on_plan.id]
+        assert await workout_service.count_unread_notes_for_student(student.id) == 1
+
+    async def test_read_state_is_per_student(
+        self,
+        workout_service: WorkoutService,
+        trainer_note_on_plan: PrescriptionNote,
+        training_plan: TrainingPlan,
+        trainer: User,
+        student: User,
+        another_student: User,
+    ):
+        """One student reading a note doesn't mark it read for the others."""
+        await self._assign_plan(workout_service, training_plan, student, trainer)
+        await self._assign_plan(workout_service, training_plan, another_student, trainer)
+
+        await workout_service.mark_note_as_read(note=trainer_note_on_plan, user_id=student.id)
+
+        assert await workout_service.count_unread_notes_for_student(student.id) == 0
+        assert await workout_service.count_unread_notes_for_student(another_student.id) == 1
+        unread = await workout_service.list_notes_for_student(another_student.id, unread_only=True)
+        assert [n.id for n in unread] == [trainer_note_on_plan.id]
+
+    async def test_check_detects_and_repairs_drift(
+        self,
+        db_session: AsyncSession,
+        workout_service: WorkoutService,
+        trainer_note_on_plan: PrescriptionNote,
+        training_plan: TrainingPlan,
+        trainer: User,
+        student: User,
+    ):
+        """The consistency check finds rows missing from the index and restores them."""
+        from sqlalchemy import delete
+
+        from src.domains.workouts.models import PrescriptionNoteAudience
+        from src.domains.workouts.note_audience import check_note_audience
+
+        await self._assign_plan(workout_service, training_plan, student, trainer)
+        await db_session.execute(delete(PrescriptionNoteAudience))
+        await db_session.commit()
+
+        result = await check_note_audience(db_session)
+        assert (result.missing, result.stale) == (1, 0)
+
+        await check_note_audience(db_session, repair=True)
+        await db_session.commit()
+
+        assert (await check_note_audience(db_session)).consistent
+        assert await workout_service.count_unread_notes_for_student(student.id) == 1
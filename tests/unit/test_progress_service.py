@@ -570,3 +570,106 @@ class TestProgressStats:
 
         # Progress is 50% toward goal (but negative because it's a gain goal)
         assert stats["goal_progress_percent"] == 50.0
+
+
+class TestProgressSeries:
+    """Tests for time-series summaries and downsampling."""
+
+    async def _log_daily(self, service: ProgressService, user_id, weights, start: datetime):
+        for i, weight in enumerate(weights):
+            await service.create_weight_log(
+                user_id=user_id,
+                weight_kg=weight,
+                logged_at=start + timedelta(days=i, hours=8),
+            )
+
+    async def test_summary_reads_first_last_min_max(
+        self, db_session: AsyncSession, sample_user: dict
+    ):
+        """Summary should aggregate in SQL over the requested range."""
+        from src.domains.progress.timeseries import ProgressSeries
+
+        service = ProgressService(db_session)
+        start = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        await self._log_daily(service, sample_user["id"], [80.0, 82.0, 79.0, 81.0], start)
+
+        summary = await ProgressSeries.weight(db_session).summary(
+            sample_user["id"], from_date=date(2024, 3, 2), to_date=date(2024, 3, 3)
+        )
+
+        assert summary.count == 2
+        assert (summary.first_value, summary.last_value) == (82.0, 79.0)
+        assert (summary.min_value, summary.max_value) == (79.0, 82.0)
+        assert summary.change == -3.0
+
+    async def test_to_date_includes_whole_day(
+        self, db_session: AsyncSession, sample_user: dict
+    ):
+        """Range predicates should keep the inclusive-day semantics."""
+        service = ProgressService(db_session)
+        await service.create_weight_log(
+            user_id=sample_user["id"],
+            weight_kg=70.0,
+            logged_at=datetime(2024, 5, 10, 23, 30, tzinfo=timezone.utc),
+        )
+
+        logs = await service.list_weight_logs(
+            user_id=sample_user["id"], from_date=date(2024, 5, 10), to_date=date(2024, 5, 10)
+        )
+        assert len(logs) == 1
+        logs = await service.list_weight_logs(user_id=sample_user["id"], to_date=date(2024, 5, 9))
+        assert logs == []
+
+    async def test_weekly_buckets(self, db_session: AsyncSession, sample_user: dict):
+        """Weekly resolution should average each Monday-based week."""
+        from src.domains.progress.timeseries import SeriesResolution
+
+        service = ProgressService(db_session)
+        # Monday 2024-03-04 through Sunday 2024-03-17: two full weeks
+        start = datetime(2024, 3, 4, tzinfo=timezone.utc)
+        await self._log_daily(service, sample_user["id"], [80.0] * 7 + [78.0] * 7, start)
+
+        series = await service.get_weight_series(
+            sample_user["id"], resolution=SeriesResolution.WEEK
+        )
+
+        assert series["resolution"] == SeriesResolution.WEEK
+        assert [p.at.date() for p in series["points"]] == [date(2024, 3, 4), date(2024, 3, 11)]
+        assert [p.value for p in series["points"]] == [80.0, 78.0]
+        assert [p.count for p in series["points"]] == [7, 7]
+
+    async def test_auto_resolution_downsamples_long_history(
+        self, db_session: AsyncSession, sample_user: dict
+    ):
+        """Long histories should be reduced to max_points with LTTB."""
+        from src.domains.progress.timeseries import SeriesResolution
+
+        service = ProgressService(db_session)
+        start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        weights = [80.0 + (i % 10) * 0.1 for i in range(100)]
+        weights[50] = 90.0  # spike must survive downsampling
+        await self._log_daily(service, sample_user["id"], weights, start)
+
+        series = await service.get_weight_series(sample_user["id"], max_points=20)
+
+        points = series["points"]
+        assert series["resolution"] == SeriesResolution.LTTB
+        assert series["summary"].count == 100
+        assert len(points) == 20
+        assert points[0].value == weights[0] and points[-1].value == weights[-1]
+        assert 90.0 in [p.value for p in points]
+
+        short = await service.get_weight_series(sample_user["id"], max_points=200)
+        assert short["resolution"] == SeriesResolution.RAW
+        assert len(short["points"]) == 100
+
+    def test_lttb_keeps_endpoints_and_extremes(self):
+        """LTTB should keep first/last points and pick prominent ones."""
+        from src.domains.progress.timeseries import lttb
+
+        xs = [float(i) for i in range(10)]
+        ys = [0, 0, 0, 10, 0, 0, 0, -10, 0, 0]
+
+        keep = lttb(xs, ys, 4)
+        assert keep == [0, 3, 7, 9]
+        assert lttb(xs, ys, 20) == list(range(10))
@@ -0,0 +1,125 @@
+"""Tests for the trainer calendar engine."""
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domains.schedule.calendar import CalendarEngine, Candidate, Interval, merge_intervals
+from src.domains.schedule.models import (
+    Appointment,
+    AppointmentStatus,
+    TrainerAvailability,
+    TrainerBlockedSlot,
+)
+from src.domains.users.models import User
+
+DAY = date(2030, 3, 4)  # a Monday
+
+
+def at(hour: int, minute: int = 0, day: date = DAY) -> datetime:
+    return datetime.combine(day, time(hour, minute))
+
+
+@pytest.fixture
+async def trainer(db_session: AsyncSession) -> dict[str, Any]:
+    """Create a trainer with one booked session, blocks and availability."""
+    trainer = User(email="calendar_trainer@example.com", password_hash="x", name="Trainer")
+    student = User(email="calendar_student@example.com", password_hash="x", name="Ana")
+    db_session.add_all([trainer, student])
+    await db_session.flush()
+
+    db_session.add_all([
+        Appointment(
+            trainer_id=trainer.id, student_id=student.id, date_time=at(9),
+            duration_minutes=60, status=AppointmentStatus.CONFIRMED,
+        ),
+        Appointment(
+            trainer_id=trainer.id, student_id=student.id, date_time=at(15),
+            duration_minutes=60, status=AppointmentStatus.CANCELLED,
+        ),
+        TrainerBlockedSlot(
+            trainer_id=trainer.id, day_of_week=DAY.weekday(), start_time=time(12), end_time=time(13),
+            is_recurring=True,
+        ),
+        TrainerBlockedSlot(
+            trainer_id=trainer.id, specific_date=DAY, start_time=time(18), end_time=time(21),
+            is_recurring=False,
+        ),
+        TrainerAvailability(trainer_id=trainer.id, day_of_week=DAY.weekday(), start_time="06:00", end_time="20:00"),
+    ])
+    await db_session.commit()
+    return {"id": trainer.id, "student_id": student.id}
+
+
+class TestMergeIntervals:
+    """Tests for interval merging."""
+
+    def test_merges_overlapping_and_touching(self):
+        merged = merge_intervals([
+            Interval(at(10), at(11)),
+            Interval(at(8), at(9)),
+            Interval(at(9), at(9, 30)),
+            Interval(at(10, 30), at(12)),
+        ])
+
+        assert merged == [Interval(at(8), at(9, 30)), Interval(at(10), at(12))]
+
+
+class TestAvailableSlots:
+    """Tests for free slot computation."""
+
+    async def test_marks_booked_and_blocked_slots(self, db_session: AsyncSession, trainer: dict[str, Any]):
+        engine = await CalendarEngine(db_session).load([trainer["id"]], DAY, DAY)
+
+        slots = {s.time: s.available for s in engine.available_slots(trainer["id"], DAY, now=at(0))}
+
+        assert slots["06:00"] is True
+        assert slots["08:00"] is True
+        assert slots["08:30"] is False  # runs into the 9:00 session
+        assert slots["09:30"] is False
+        assert slots["10:00"] is True
+        assert slots["12:00"] is False  # recurring block
+        assert slots["15:00"] is True  # cancelled session
+        assert slots["17:30"] is False  # date block from 18:00
+        assert "20:30" not in slots  # day ends at 21:00
+
+    async def test_week_for_several_trainers(self, db_session: AsyncSession, trainer: dict[str, Any]):
+        other = User(email="calendar_other@example.com", password_hash="x", name="Other")
+        db_session.add(other)
+        await db_session.commit()
+
+        engine = await CalendarEngine(db_session).load([trainer["id"], other.id], DAY, DAY + timedelta(days=6))
+
+        next_monday = engine.available_slots(trainer["id"], DAY + timedelta(days=7), now=at(0))
+        tuesday = engine.available_slots(trainer["id"], DAY + timedelta(days=1), now=at(0))
+        assert all(s.available for s in tuesday)
+        assert not next(s for s in next_monday if s.time == "12:00").available
+        assert all(s.available for s in engine.available_slots(other.id, DAY, now=at(0)))
+
+
+class TestConflicts:
+    """Tests for conflict checks."""
+
+    async def test_overlap_buffer_and_availability(self, db_session: AsyncSession, trainer: dict[str, Any]):
+        engine = await CalendarEngine(db_session).load([trainer["id"]], DAY, DAY, student_ids=[trainer["student_id"]])
+
+        overlap = engine.check(trainer["id"], Candidate(at(9, 30), 60))
+        buffer = engine.check(trainer["id"], Candidate(at(10, 5), 60))
+        late = engine.check(trainer["id"], Candidate(at(19, 30), 60))
+
+        assert overlap.has_conflicts
+        assert overlap.conflicts[0].conflicting_student_name == "Ana"
+        assert not buffer.has_conflicts
+        assert [w.type for w in buffer.warnings] == ["buffer_too_short"]
+        assert [w.type for w in late.warnings] == ["outside_availability"]
+
+    async def test_batch_sees_earlier_candidates(self, db_session: AsyncSession, trainer: dict[str, Any]):
+        engine = await CalendarEngine(db_session).load([trainer["id"]], DAY, DAY)
+
+        reports = engine.check_batch(
+            trainer["id"],
+            [Candidate(at(14), 60), Candidate(at(14, 30), 60), Candidate(at(16), 60)],
+        )
+
+        assert [r.has_conflicts for r in reports] == [False, True, False]
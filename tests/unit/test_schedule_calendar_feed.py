@@ -0,0 +1,100 @@
+"""Tests for the subscribable calendar feed."""
+from datetime import date, datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domains.schedule import calendar_feed
+from src.domains.schedule.models import Appointment, AppointmentParticipant, AppointmentStatus
+from src.domains.users.models import User
+
+
+async def _trainer_and_student(db_session: AsyncSession) -> tuple[User, User]:
+    trainer = User(email="feed_trainer@example.com", password_hash="x", name="Trainer")
+    student = User(email="feed_student@example.com", password_hash="x", name="Ana")
+    db_session.add_all([trainer, student])
+    await db_session.flush()
+    return trainer, student
+
+
+class TestScheduleVersion:
+    """Tests for the per-trainer change counter."""
+
+    async def test_rotates_on_appointment_commit(self, db_session: AsyncSession):
+        trainer, student = await _trainer_and_student(db_session)
+        await db_session.commit()
+        version, _ = await calendar_feed.schedule_version(trainer.id)
+        assert (await calendar_feed.schedule_version(trainer.id))[0] == version
+
+        db_session.add(Appointment(
+            trainer_id=trainer.id, student_id=student.id, date_time=datetime(2030, 5, 6, 9),
+            duration_minutes=60, status=AppointmentStatus.CONFIRMED,
+        ))
+        await db_session.commit()
+
+        assert (await calendar_feed.schedule_version(trainer.id))[0] != version
+
+    async def test_rollback_keeps_version(self, db_session: AsyncSession):
+        trainer, student = await _trainer_and_student(db_session)
+        await db_session.commit()
+        version, _ = await calendar_feed.schedule_version(trainer.id)
+
+        db_session.add(Appointment(
+            trainer_id=trainer.id, student_id=student.id, date_time=datetime(2030, 5, 6, 9),
+            duration_minutes=60, status=AppointmentStatus.CONFIRMED,
+        ))
+        await db_session.flush()
+        trainer_id = trainer.id
+        await db_session.rollback()
+
+        assert (await calendar_feed.schedule_version(trainer_id))[0] == version
+
+
+class TestConditionalRequests:
+    """Tests for ETag / Last-Modified validation."""
+
+    async def test_validators(self, db_session: AsyncSession):
+        trainer, _ = await _trainer_and_student(db_session)
+        etag, last_modified = await calendar_feed.feed_validators(trainer.id, date(2030, 1, 1), date(2030, 2, 1))
+        other_range, _ = await calendar_feed.feed_validators(trainer.id, date(2030, 1, 1), date(2030, 3, 1))
+
+        assert etag != other_range
+        assert calendar_feed.not_modified({"if-none-match": f'W/{etag}, "x"'}, etag, last_modified)
+        assert not calendar_feed.not_modified({"if-none-match": other_range}, etag, last_modified)
+        assert calendar_feed.not_modified({"if-modified-since": last_modified}, etag, last_modified)
+        assert not calendar_feed.not_modified({"if-modified-since": "garbage"}, etag, last_modified)
+        assert not calendar_feed.not_modified({}, etag, last_modified)
+
+
+class TestRendering:
+    """Tests for VEVENT rendering from the joined query."""
+
+    async def test_single_and_group_events(self, db_session: AsyncSession):
+        trainer, student = await _trainer_and_student(db_session)
+        single = Appointment(
+            trainer_id=trainer.id, student_id=student.id, date_time=datetime(2030, 5, 6, 9),
+            duration_minutes=45, status=AppointmentStatus.CANCELLED, notes="Trazer\ntoalha",
+        )
+        group = Appointment(
+            trainer_id=trainer.id, student_id=student.id, date_time=datetime(2030, 5, 6, 18),
+            duration_minutes=60, status=AppointmentStatus.CONFIRMED, is_group=True,
+        )
+        db_session.add_all([single, group])
+        await db_session.flush()
+        db_session.add(AppointmentParticipant(appointment_id=group.id, student_id=student.id))
+        await db_session.commit()
+
+        result = await db_session.execute(
+            calendar_feed.event_query()
+            .where(*calendar_feed.range_filter(trainer.id, date(2030, 5, 6), date(2030, 5, 6)))
+            .order_by(Appointment.date_time)
+        )
+        ics = calendar_feed.render_ics(result.all())
+
+        assert ics.startswith("BEGIN:VCALENDAR\r\n") and ics.endswith("END:VCALENDAR")
+        assert ics.count("BEGIN:VEVENT") == 2
+        assert f"UID:{single.id}@myfit.app" in ics
+        assert "DTSTART:20300506T090000\r\nDTEND:20300506T094500" in ics
+        assert "SUMMARY:Ana - Treino" in ics
+        assert "DESCRIPTION:Trazer\\ntoalha" in ics
+        assert "STATUS:CANCELLED" in ics
+        assert "SUMMARY:Grupo (1) - Treino" in ics
@@ -0,0 +1,102 @@
+"""Tests for recurrence expansion and bulk appointment insertion."""
+from datetime import date, datetime, time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domains.schedule.models import Appointment, AppointmentStatus
+from src.domains.schedule.recurrence import (
+    RecurrenceEngine,
+    expand_pattern,
+    expand_weekly,
+    schedule_config_slots,
+)
+from src.domains.schedule.schemas import RecurrencePattern
+from src.domains.users.models import User
+
+
+class TestExpansion:
+    """Tests for expanding patterns into occurrences."""
+
+    def test_monthly_clamps_to_month_end(self):
+        dates = expand_pattern(datetime(2030, 1, 31, 9), RecurrencePattern.MONTHLY, 4)
+
+        assert dates == [
+            datetime(2030, 1, 31, 9),
+            datetime(2030, 2, 28, 9),
+            datetime(2030, 3, 31, 9),
+            datetime(2030, 4, 30, 9),
+        ]
+
+    def test_biweekly(self):
+        dates = expand_pattern(datetime(2030, 1, 1, 7), RecurrencePattern.BIWEEKLY, 3)
+
+        assert [d.day for d in dates] == [1, 15, 29]
+
+    def test_weekly_slots_within_range(self):
+        slots = schedule_config_slots([
+            {"day_of_week": 0, "time": "07:00", "duration_minutes": 45},
+            {"day_of_week": 3, "time": "18:30"},
+        ])
+
+        # Wednesday 2030-01-02 .. Monday 2030-01-14
+        occurrences = expand_weekly(slots, date(2030, 1, 2), date(2030, 1, 14))
+
+        assert occurrences == [
+            (datetime(2030, 1, 3, 18, 30), 60),
+            (datetime(2030, 1, 7, 7, 0), 45),
+            (datetime(2030, 1, 10, 18, 30), 60),
+            (datetime(2030, 1, 14, 7, 0), 45),
+        ]
+        assert slots[1] == (3, time(18, 30), 60)
+
+
+class TestInsertNew:
+    """Tests for deduplicated bulk insertion."""
+
+    async def test_skips_existing_and_repeated_rows(self, db_session: AsyncSession):
+        trainer = User(email="recurrence_trainer@example.com", password_hash="x", name="Trainer")
+        student = User(email="recurrence_student@example.com", password_hash="x", name="Student")
+        db_session.add_all([trainer, student])
+        await db_session.flush()
+        db_session.add_all([
+            Appointment(
+                trainer_id=trainer.id, student_id=student.id, date_time=datetime(2030, 1, 7, 7),
+                duration_minutes=60, status=AppointmentStatus.PENDING,
+            ),
+            Appointment(
+                trainer_id=trainer.id, student_id=student.id, date_time=datetime(2030, 1, 14, 7),
+                duration_minutes=60, status=AppointmentStatus.CANCELLED,
+            ),
+        ])
+        await db_session.commit()
+
+        rows = [
+            {
+                "trainer_id": trainer.id,
+                "student_id": student.id,
+                "date_time": start,
+                "duration_minutes": 60,
+                "status": AppointmentStatus.PENDING,
+            }
+            for start in (
+                datetime(2030, 1, 7, 7),  # exists
+                datetime(2030, 1, 14, 7),  # only a cancelled one exists
+                datetime(2030, 1, 21, 7),
+                datetime(2030, 1, 21, 7),  # repeated
+            )
+        ]
+
+        engine = RecurrenceEngine(db_session)
+        created = await engine.insert_new(rows)
+        await db_session.commit()
+        again = await engine.insert_new(rows)
+
+        assert [a.date_time.replace(tzinfo=None) for a in created] == [
+            datetime(2030, 1, 14, 7),
+            datetime(2030, 1, 21, 7),
+        ]
+        assert created[0].student.name == "Student"
+        assert again == []
+        total = await db_session.scalar(select(func.count(Appointment.id)))
+        assert total == 4
@@ -0,0 +1,220 @@
+"""Tests for the strength analytics rollups (volume, estimated 1RM, PRs)."""
+
+from datetime import date
+from typing import Any
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domains.workouts.models import (
+    Exercise,
+    ExerciseStrengthRollup,
+    MuscleGroup,
+    SessionStatus,
+    WeeklyTrainingVolume,
+    Workout,
+)
+from src.domains.workouts.service import WorkoutService
+from src.domains.workouts.strength_analytics import (
+    StrengthAnalytics,
+    estimate_1rm,
+    week_start,
+)
+
+
+@pytest.fixture
+async def exercises(db_session: AsyncSession) -> list[Exercise]:
+    bench = Exercise(name="Supino reto", muscle_group=MuscleGroup.CHEST, is_public=True)
+    squat = Exercise(name="Agachamento", muscle_group=MuscleGroup.QUADRICEPS, is_public=True)
+    db_session.add_all([bench, squat])
+    await db_session.commit()
+    return [bench, squat]
+
+
+@pytest.fixture
+async def workout(db_session: AsyncSession, sample_user: dict[str, Any]) -> Workout:
+    workout = Workout(name="Treino A", created_by_id=sample_user["id"])
+    db_session.add(workout)
+    await db_session.commit()
+    return workout
+
+
+async def _log_session(
+    service: WorkoutService,
+    user_id,
+    workout: Workout,
+    sets: list[tuple[Exercise, int, float | None]],
+    complete: bool = True,
+):
+    session = await service.start_session(user_id=user_id, workout_id=workout.id)
+    for number, (exercise, reps, weight) in enumerate(sets, start=1):
+        await service.add_session_set(
+            session_id=session.id,
+            exercise_id=exercise.id,
+            set_number=number,
+            reps_completed=reps,
+            weight_kg=weight,
+        )
+    if complete:
+        await service.complete_session(session)
+    return session
+
+
+async def _rollups(db_session: AsyncSession) -> dict:
+    result = await db_session.execute(select(ExerciseStrengthRollup))
+    return {r.exercise_id: r for r in result.scalars().all()}
+
+
+class TestEstimate1RM:
+    """Tests for the Epley estimate."""
+
+    @pytest.mark.parametrize(
+        "weight,reps,expected",
+        [
+            (100.0, 1, 100.0),
+            (100.0, 10, 100.0 * (1 + 10 / 30)),
+            (100.0, 13, None),
+            (None, 5, None),
+            (0.0, 5, None),
+            (80.0, 0, None),
+        ],
+    )
+    def test_estimate(self, weight, reps, expected):
+        result = estimate_1rm(weight, reps)
+        if expected is None:
+            assert result is None
+        else:
+            assert result == pytest.approx(expected)
+
+    def test_week_start_is_monday(self):
+        assert week_start(date(2026, 10, 18)) == date(2026, 10, 12)  # Sunday
+        assert week_start(date(2026, 10, 12)) == date(2026, 10, 12)  # Monday
+
+
+class TestRollupMaintenance:
+    """Tests for folding sets into the rollups."""
+
+    async def test_completed_session_is_folded(
+        self,
+        db_session: AsyncSession,
+        sample_user: dict[str, Any],
+        workout: Workout,
+        exercises: list[Exercise],
+    ):
+        bench, squat = exercises
+        service = WorkoutService(db_session)
+        await _log_session(
+            service, sample_user["id"], workout,
+            [(bench, 10, 60.0), (bench, 8, 70.0), (squat, 5, 100.0), (squat, 15, None)],
+        )
+
+        rollups = await _rollups(db_session)
+        assert rollups[bench.id].total_sets == 2
+        assert rollups[bench.id].total_volume_kg == pytest.approx(600 + 560)
+        assert rollups[bench.id].best_weight_kg == 70.0
+        assert rollups[bench.id].best_estimated_1rm == pytest.approx(estimate_1rm(70.0, 8))
+        assert rollups[squat.id].total_reps == 20
+        assert rollups[squat.id].best_estimated_1rm == pytest.approx(estimate_1rm(100.0, 5))
+
+        [weekly] = (await db_session.execute(
+            select(WeeklyTrainingVolume).where(WeeklyTrainingVolume.exercise_id == bench.id)
+        )).scalars().all()
+        assert weekly.week_start.weekday() == 0
+        assert weekly.volume_kg == pytest.approx(1160)
+
+    async def test_in_progress_sets_are_not_counted(
+        self,
+        db_session: AsyncSession,
+        sample_user: dict[str, Any],
+        workout: Workout,
+        exercises: list[Exercise],
+    ):
+        service = WorkoutService(db_session)
+        await _log_session(
+            service, sample_user["id"], workout, [(exercises[0], 5, 80.0)], complete=False
+        )
+
+        assert await _rollups(db_session) == {}
+
+    async def test_sessions_accumulate_and_keep_bests(
+        self,
+        db_session: AsyncSession,
+        sample_user: dict[str, Any],
+        workout: Workout,
+        exercises: list[Exercise],
+    ):
+        bench = exercises[0]
+        service = WorkoutService(db_session)
+        await _log_session(service, sample_user["id"], workout, [(bench, 1, 100.0)])
+        await _log_session(service, sample_user["id"], workout, [(bench, 5, 80.0)])
+
+        rollup = (await _rollups(db_session))[bench.id]
+        assert rollup.total_sets == 2
+        assert rollup.total_volume_kg == pytest.approx(500)
+        assert rollup.best_weight_kg == 100.0
+        assert rollup.best_estimated_1rm == pytest.approx(100.0)
+
+    async def test_rebuild_matches_incremental(
+        self,
+        db_session: AsyncSession,
+        sample_user: dict[str, Any],
+        workout: Workout,
+        exercises: list[Exercise],
+    ):
+        bench, squat = exercises
+        service = WorkoutService(db_session)
+        await _log_session(service, sample_user["id"], workout, [(bench, 6, 75.0), (squat, 3, 120.0)])
+        await _log_session(service, sample_user["id"], workout, [(bench, 4, 82.5)])
+
+        def snapshot(rollups):
+            return {
+                k: (r.total_sets, r.total_reps, r.total_volume_kg, r.best_estimated_1rm)
+                for k, r in rollups.items()
+            }
+
+        incremental = snapshot(await _rollups(db_session))
+        await StrengthAnalytics(db_session).rebuild(sample_user["id"])
+        await db_session.commit()
+        db_session.expire_all()
+
+        assert snapshot(await _rollups(db_session)) == incremental
+
+    async def test_reopening_session_removes_its_sets(
+        self,
+        db_session: AsyncSession,
+        sample_user: dict[str, Any],
+        workout: Workout,
+        exercises: list[Exercise],
+    ):
+        service = WorkoutService(db_session)
+        session = await _log_session(service, sample_user["id"], workout, [(exercises[0], 5, 80.0)])
+
+        await service.update_session_status(session, SessionStatus.ACTIVE)
+
+        assert await _rollups(db_session) == {}
+
+
+class TestStrengthReads:
+    """Tests for reading precomputed series."""
+
+    async def test_progress_overview(
+        self,
+        db_session: AsyncSession,
+        sample_user: dict[str, Any],
+        workout: Workout,
+        exercises: list[Exercise],
+    ):
+        bench, squat = exercises
+        service = WorkoutService(db_session)
+        await _log_session(service, sample_user["id"], workout, [(bench, 5, 80.0), (squat, 5, 120.0)])
+
+        progress = await StrengthAnalytics(db_session).progress(sample_user["id"])
+
+        assert progress.total_volume_kg == pytest.approx(1000)
+        assert [e.exercise_name for e in progress.exercises] == ["Agachamento", "Supino reto"]
+        [week] = progress.weekly_volume
+        assert week.sets == 2
+        assert week.volume_kg == pytest.approx(1000)
+        assert [pr.exercise_id for pr in progress.personal_records] == [squat.id, bench.id]
+        assert progress.personal_records[0].achieved_week == week.week_start